@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tdoc 집계 사전 계산 (TdocStat 노드)
+
+회의/회사/Agenda/상태/Spec/Release 조합별 Tdoc 개수를 적재 시점에 미리 계산해
+(:TdocStat {dimension, <키...>, count}) 노드로 저장한다.
+query-interface 의 aggregate_router 가 "top 5 회사", "status별 개수" 같은 통계 질문을
+전체 순회 대신 TdocStat 조회로 답한다.
+
+- 적재 스크립트(load_cypher, load_unwind, load_admin_import, load_incremental)가
+  마지막 단계에서 materialize_aggregates() 를 호출한다.
+- dimension 별로 한 트랜잭션에서 삭제 → 재생성 (조회 중에도 일관된 값)
+- 개수는 count(DISTINCT t) (같은 Tdoc 이 여러 관계를 가져도 1번)
+
+사용법:
+    python aggregates.py            # 전체 재계산
+    python aggregates.py --status   # dimension 별 행 수만 출력
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+
+STAT_LABEL = "TdocStat"
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    dimension: str
+    match: str                      # t 를 바인딩하는 MATCH 절
+    keys: Tuple[Tuple[str, str], ...]  # (TdocStat 속성, 그룹 식)
+
+    def query(self) -> str:
+        keys = ", ".join(f"{expr} AS {name}" for name, expr in self.keys)
+        props = ", ".join(f"{name}: {name}" for name, _ in self.keys)
+        return f"""
+            {self.match}
+            WITH {keys}, count(DISTINCT t) AS count
+            CREATE (:{STAT_LABEL} {{dimension: $dimension, {props}, count: count}})
+        """
+
+
+MEETING = ("meeting", "m.meetingNumber")
+COMPANY = ("company", "c.companyName")
+AGENDA = ("agenda", "a.agendaNumber")
+STATUS = ("status", "t.status")
+TYPE = ("type", "t.type")
+RELEASE = ("release", "r.releaseName")
+SPEC = ("spec", "s.specNumber")
+
+AT_MEETING = "MATCH (t:Tdoc)-[:PRESENTED_AT]->(m:Meeting)"
+
+AGGREGATES: List[Aggregate] = [
+    Aggregate("meeting", AT_MEETING, (MEETING,)),
+    Aggregate("meeting_status", AT_MEETING, (MEETING, STATUS)),
+    Aggregate("meeting_type", AT_MEETING, (MEETING, TYPE)),
+    Aggregate("meeting_company", f"{AT_MEETING} MATCH (t)-[:SUBMITTED_BY]->(c:Company)", (MEETING, COMPANY)),
+    Aggregate("meeting_company_status", f"{AT_MEETING} MATCH (t)-[:SUBMITTED_BY]->(c:Company)",
+              (MEETING, COMPANY, STATUS)),
+    Aggregate("meeting_company_type", f"{AT_MEETING} MATCH (t)-[:SUBMITTED_BY]->(c:Company)",
+              (MEETING, COMPANY, TYPE)),
+    Aggregate("meeting_agenda", f"{AT_MEETING} MATCH (t)-[:BELONGS_TO]->(a:AgendaItem)", (MEETING, AGENDA)),
+    Aggregate("meeting_agenda_status", f"{AT_MEETING} MATCH (t)-[:BELONGS_TO]->(a:AgendaItem)",
+              (MEETING, AGENDA, STATUS)),
+    Aggregate("meeting_workitem", f"{AT_MEETING} MATCH (t)-[:RELATED_TO]->(w:WorkItem)",
+              (MEETING, ("workItem", "w.workItemCode"))),
+    Aggregate("meeting_release", f"{AT_MEETING} MATCH (t)-[:TARGET_RELEASE]->(r:Release)", (MEETING, RELEASE)),
+    Aggregate("company", "MATCH (t:Tdoc)-[:SUBMITTED_BY]->(c:Company)", (COMPANY,)),
+    Aggregate("company_status", "MATCH (t:Tdoc)-[:SUBMITTED_BY]->(c:Company)", (COMPANY, STATUS)),
+    Aggregate("release", "MATCH (t:Tdoc)-[:TARGET_RELEASE]->(r:Release)", (RELEASE,)),
+    Aggregate("release_cr", "MATCH (t:CR)-[:TARGET_RELEASE]->(r:Release)", (RELEASE,)),
+    Aggregate("spec_cr", "MATCH (t:CR)-[:MODIFIES]->(s:Spec)", (SPEC,)),
+    Aggregate("spec_release_category",
+              "MATCH (t:CR)-[:MODIFIES]->(s:Spec) OPTIONAL MATCH (t)-[:TARGET_RELEASE]->(r:Release)",
+              (SPEC, RELEASE, ("category", "t.crCategory"))),
+]
+
+DIMENSIONS: Dict[str, Aggregate] = {agg.dimension: agg for agg in AGGREGATES}
+
+
+def materialize_aggregates(driver, aggregates: List[Aggregate] = AGGREGATES, database: Optional[str] = None,
+                           log: Callable[[str], None] = print) -> Dict[str, int]:
+    """dimension 별 TdocStat 재생성 → {dimension: 행 수}"""
+    def rebuild(tx, agg: Aggregate) -> int:
+        tx.run(f"MATCH (s:{STAT_LABEL} {{dimension: $dimension}}) DELETE s", dimension=agg.dimension).consume()
+        summary = tx.run(agg.query(), dimension=agg.dimension).consume()
+        return summary.counters.nodes_created
+
+    counts = {}
+    with driver.session(database=database) as session:
+        for agg in aggregates:
+            start = time.time()
+            counts[agg.dimension] = session.execute_write(rebuild, agg)
+            log(f"  {agg.dimension}: {counts[agg.dimension]:,} ({time.time() - start:.2f}s)")
+    return counts
+
+
+def aggregate_status(driver, database: Optional[str] = None) -> Dict[str, int]:
+    with driver.session(database=database) as session:
+        result = session.run(f"MATCH (s:{STAT_LABEL}) RETURN s.dimension AS dimension, count(s) AS rows")
+        return {record["dimension"]: record["rows"] for record in result}
+
+
+def main():
+    from neo4j import GraphDatabase
+    from graph_version import bump_graph_version
+
+    parser = argparse.ArgumentParser(description="Tdoc 집계 사전 계산 (TdocStat)")
+    parser.add_argument('--uri', default=URI, help='Neo4j Bolt URI')
+    parser.add_argument('--status', action='store_true', help='재계산 없이 상태만 출력')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Tdoc 집계 사전 계산 (TdocStat)")
+    print("=" * 60)
+
+    driver = GraphDatabase.driver(args.uri, auth=AUTH)
+    try:
+        if args.status:
+            status = aggregate_status(driver)
+            for agg in AGGREGATES:
+                print(f"  {agg.dimension:25s} {status.get(agg.dimension, 0):,}")
+        else:
+            start = time.time()
+            counts = materialize_aggregates(driver)
+            bump_graph_version(driver, "aggregates")
+            print(f"\n  {sum(counts.values()):,} rows ({time.time() - start:.2f}s)")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Sub-step 2-3a: JSON-LD → neo4j-admin 벌크 임포트용 CSV 내보내기
+
+load_cypher.py 의 MERGE + 관계별 apoc.periodic.iterate 대신,
+노드/관계 CSV를 직접 생성해 `neo4j-admin database import full` 로 한 번에 적재한다.
+(적재는 load_admin_import.py)
+
+출력: ontology/output/csv/phase-2/
+- nodes_<Label>.csv       Reference 노드 (id:ID, 속성...)
+- nodes_Tdoc.csv          Tdoc/CR/LS 노드 (:LABEL = Tdoc;CR 등)
+- rels_<TYPE>.csv         관계 (:START_ID, :END_ID)
+- import_manifest.json    임포트 인자 (파일 ↔ 라벨/관계 타입, 건수)
+
+load_cypher.py 와 같은 결과를 내도록:
+- 같은 @id 노드는 마지막 값 사용 (MERGE + SET 과 동일)
+- 대상 노드가 없는 관계는 제외 (MATCH 실패와 동일), 중복 관계는 1개로 (MERGE 와 동일)
+"""
+
+import argparse
+import csv
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from graph_mapping import (
+    INSTANCES_DIR, CSV_DIR, REFERENCE_NODES, TDOC_FILE, TDOC_PROPERTIES, RELATIONSHIPS,
+    item_refs, tdoc_labels, iter_instances, instance_path,
+)
+
+# neo4j-admin --array-delimiter (회사 별칭에 ';' 가 포함될 수 있어 제어 문자 사용)
+ARRAY_DELIMITER = "\x1f"
+ARRAY_DELIMITER_ARG = "U+001F"
+
+_TYPE_SUFFIX = {"string": "", "int": ":int", "boolean": ":boolean", "string[]": ":string[]"}
+
+
+def csv_header(mapping: Dict[str, Tuple[str, str]], with_labels: bool = False) -> List[str]:
+    header = ["id:ID"]
+    if with_labels:
+        header.append(":LABEL")
+    header += [f"{name}{_TYPE_SUFFIX[kind]}" for name, kind in mapping.values()]
+    return header
+
+
+def csv_row(item: dict, mapping: Dict[str, Tuple[str, str]], labels: List[str] = None) -> List[object]:
+    row = [item["@id"]]
+    if labels is not None:
+        row.append(";".join(labels))
+    for key, (_, kind) in mapping.items():
+        value = item.get(key)
+        if value is None:
+            row.append("")
+        elif kind == "string[]":
+            row.append(ARRAY_DELIMITER.join(str(v) for v in value))
+        elif kind == "boolean":
+            row.append("true" if value else "false")
+        else:
+            row.append(value)
+    return row
+
+
+def write_csv(path: Path, header: List[str], rows) -> int:
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def export(instances_dir: Path, output_dir: Path) -> dict:
+    """CSV 생성 후 매니페스트 반환"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"array_delimiter": ARRAY_DELIMITER_ARG, "nodes": [], "relationships": []}
+    ids_by_label: Dict[str, Set[str]] = defaultdict(set)
+
+    # 1. Reference 노드
+    print("\n[1/3] Reference 노드...")
+    for label, filename, mapping in REFERENCE_NODES:
+        if instance_path(filename, instances_dir) is None:
+            print(f"  ⚠️ {filename} 없음 - 건너뜀")
+            continue
+        items = {}
+        for item in iter_instances(filename, instances_dir):
+            items[item["@id"]] = item
+        ids_by_label[label].update(items)
+
+        path = output_dir / f"nodes_{label}.csv"
+        count = write_csv(path, csv_header(mapping), (csv_row(item, mapping) for item in items.values()))
+        manifest["nodes"].append({"label": label, "file": path.name, "count": count})
+        print(f"  {label}: {count:,}")
+
+    # 2. Tdoc 노드 (같은 @id 는 마지막 값)
+    print("\n[2/3] Tdoc 노드...")
+    tdocs = {}
+    for item in iter_instances(TDOC_FILE, instances_dir):
+        tdocs[item["@id"]] = item
+    ids_by_label["Tdoc"].update(tdocs)
+
+    path = output_dir / "nodes_Tdoc.csv"
+    count = write_csv(path, csv_header(TDOC_PROPERTIES, with_labels=True),
+                      (csv_row(item, TDOC_PROPERTIES, tdoc_labels(item)) for item in tdocs.values()))
+    manifest["nodes"].append({"label": None, "file": path.name, "count": count})
+    print(f"  Tdoc/CR/LS: {count:,}")
+
+    # 3. 관계 (대상 노드가 있는 것만, 중복 제거)
+    print("\n[3/3] 관계...")
+    for prop, rel_type, target_label in RELATIONSHIPS:
+        targets = ids_by_label[target_label]
+        edges = {}
+        skipped = 0
+        for source_id, item in tdocs.items():
+            for ref in item_refs(item, prop):
+                if ref in targets:
+                    edges[(source_id, ref)] = None
+                else:
+                    skipped += 1
+
+        path = output_dir / f"rels_{rel_type}.csv"
+        count = write_csv(path, [":START_ID", ":END_ID"], edges)
+        manifest["relationships"].append({"type": rel_type, "file": path.name, "count": count,
+                                          "skipped_missing_target": skipped})
+        print(f"  {rel_type}: {count:,} (대상 없음 {skipped:,})")
+
+    with open(output_dir / "import_manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON-LD → neo4j-admin import CSV")
+    parser.add_argument('--input-dir', type=Path, default=INSTANCES_DIR, help='JSON-LD 인스턴스 디렉토리')
+    parser.add_argument('--output-dir', type=Path, default=CSV_DIR, help='CSV 출력 디렉토리')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Sub-step 2-3a: neo4j-admin import CSV 내보내기")
+    print("=" * 60)
+    start = time.time()
+
+    manifest = export(args.input_dir, args.output_dir)
+
+    nodes = sum(n["count"] for n in manifest["nodes"])
+    rels = sum(r["count"] for r in manifest["relationships"])
+    print("\n" + "=" * 60)
+    print(f"노드 {nodes:,}개, 관계 {rels:,}개 → {args.output_dir} ({time.time() - start:.1f}s)")
+    print("=" * 60)
+    print("\n  다음 단계: python load_admin_import.py")
+
+
+if __name__ == "__main__":
+    main()
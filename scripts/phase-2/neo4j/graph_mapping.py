@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+JSON-LD → Neo4j 그래프 매핑 (load_cypher.py 와 동일한 스키마)
+
+노드 라벨/속성, Tdoc 하위 라벨(CR, LS), 관계 타입 정의를 한곳에 모아
+CSV 벌크 임포트와 Cypher 적재 스크립트가 같은 매핑을 사용하도록 한다.
+
+- 노드 ID: JSON-LD @id (예: tdoc:meeting/RAN1_120) → id 속성
+- 관계 키: 03_tdoc_instances 가 일부는 접두사 없이(submittedBy),
+  일부는 tdoc: 접두사로(tdoc:relatedTo) 기록하므로 두 표기 모두 읽는다.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# JSON-LD 읽기는 ontology 스크립트의 reader 재사용 (NDJSON, 미팅별 샤드 포함)
+sys.path.insert(0, str(Path(__file__).parent.parent / "ontology"))
+
+from jsonld_writer import iter_graph, list_shards, resolve_graph_path
+
+# Paths
+ONTOLOGY_DIR = Path(__file__).parent.parent.parent.parent / "ontology"
+INSTANCES_DIR = ONTOLOGY_DIR / "output" / "instances" / "phase-2"
+CSV_DIR = ONTOLOGY_DIR / "output" / "csv" / "phase-2"
+
+# 컨테이너 내부 경로 (docker-compose: ../../../ontology → /import)
+CONTAINER_IMPORT_DIR = "/import"
+
+# Reference 노드: (라벨, 파일, {JSON-LD 키: (속성명, 타입)})
+# 타입: string | int | boolean | string[]
+REFERENCE_NODES = [
+    ("Meeting", "meetings.jsonld", {
+        "tdoc:meetingNumber": ("meetingNumber", "string"),
+        "tdoc:canonicalMeetingNumber": ("canonicalMeetingNumber", "string"),
+        "tdoc:meetingNumberInt": ("meetingNumberInt", "int"),
+        "tdoc:workingGroup": ("workingGroup", "string"),
+    }),
+    ("Release", "releases.jsonld", {
+        "tdoc:releaseName": ("releaseName", "string"),
+    }),
+    ("Spec", "specs.jsonld", {
+        "tdoc:specNumber": ("specNumber", "string"),
+        "tdoc:specVersion": ("specVersion", "string"),
+    }),
+    ("WorkingGroup", "working_groups.jsonld", {
+        "tdoc:wgName": ("wgName", "string"),
+    }),
+    ("Company", "companies.jsonld", {
+        "tdoc:companyName": ("companyName", "string"),
+        "tdoc:aliases": ("aliases", "string[]"),
+    }),
+    ("WorkItem", "work_items.jsonld", {
+        "tdoc:workItemCode": ("workItemCode", "string"),
+    }),
+    ("Contact", "contacts.jsonld", {
+        "tdoc:contactName": ("contactName", "string"),
+        "tdoc:contactId": ("contactId", "string"),
+    }),
+    ("AgendaItem", "agenda_items.jsonld", {
+        "tdoc:agendaNumber": ("agendaNumber", "string"),
+        "tdoc:agendaDescription": ("agendaDescription", "string"),
+    }),
+]
+
+TDOC_FILE = "tdocs.jsonld"
+
+TDOC_PROPERTIES = {
+    "tdoc:tdocNumber": ("tdocNumber", "string"),
+    "tdoc:title": ("title", "string"),
+    "tdoc:type": ("type", "string"),
+    "tdoc:status": ("status", "string"),
+    "tdoc:for": ("for", "string"),
+    "tdoc:abstract": ("abstract", "string"),
+    "tdoc:reservationDate": ("reservationDate", "string"),
+    "tdoc:uploadedDate": ("uploadedDate", "string"),
+    "tdoc:secretaryRemarks": ("secretaryRemarks", "string"),
+    "tdoc:crNumber": ("crNumber", "string"),
+    "tdoc:crCategory": ("crCategory", "string"),
+    "tdoc:clausesAffected": ("clausesAffected", "string"),
+    "tdoc:tsgCRPack": ("tsgCRPack", "string"),
+    "tdoc:affectsUICC": ("affectsUICC", "boolean"),
+    "tdoc:affectsME": ("affectsME", "boolean"),
+    "tdoc:affectsRAN": ("affectsRAN", "boolean"),
+    "tdoc:affectsCN": ("affectsCN", "boolean"),
+    "tdoc:direction": ("direction", "string"),
+}
+
+# Tdoc 하위 클래스 → 추가 라벨
+TDOC_SUBCLASS_LABELS = {
+    "tdoc:CR": "CR",
+    "tdoc:LS": "LS",
+}
+
+# Tdoc 관계: (JSON-LD 속성, 관계 타입, 대상 라벨)
+RELATIONSHIPS = [
+    ("presentedAt", "PRESENTED_AT", "Meeting"),
+    ("belongsTo", "BELONGS_TO", "AgendaItem"),
+    ("hasContact", "HAS_CONTACT", "Contact"),
+    ("targetRelease", "TARGET_RELEASE", "Release"),
+    ("submittedBy", "SUBMITTED_BY", "Company"),
+    ("relatedTo", "RELATED_TO", "WorkItem"),
+    ("modifies", "MODIFIES", "Spec"),
+    ("isRevisionOf", "IS_REVISION_OF", "Tdoc"),
+    ("sentTo", "SENT_TO", "WorkingGroup"),
+    ("ccTo", "CC_TO", "WorkingGroup"),
+    ("replyTo", "REPLY_TO", "Tdoc"),
+    ("originalLS", "ORIGINAL_LS", "Tdoc"),
+    ("revisedTo", "REVISED_TO", "Tdoc"),
+    ("originatedFrom", "ORIGINATED_FROM", "WorkingGroup"),
+]
+
+def item_value(item: dict, prop: str):
+    """tdoc:prop / prop 표기 중 존재하는 값"""
+    value = item.get(f"tdoc:{prop}")
+    return value if value is not None else item.get(prop)
+
+
+def item_refs(item: dict, prop: str) -> List[str]:
+    """관계 속성 값 → 대상 ID 리스트"""
+    value = item_value(item, prop)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def tdoc_labels(item: dict) -> List[str]:
+    """Tdoc 노드 라벨 (Tdoc + CR/LS)"""
+    labels = ["Tdoc"]
+    extra = TDOC_SUBCLASS_LABELS.get(item.get("@type"))
+    if extra:
+        labels.append(extra)
+    return labels
+
+
+def node_properties(item: dict, mapping: Dict[str, Tuple[str, str]]) -> Dict[str, object]:
+    """JSON-LD 항목 → Neo4j 노드 속성 (id 포함, 값 없는 속성 제외)"""
+    props = {"id": item["@id"]}
+    for key, (name, _) in mapping.items():
+        value = item.get(key)
+        if value is not None:
+            props[name] = value
+    return props
+
+
+def iter_instances(filename: str, instances_dir: Path = INSTANCES_DIR) -> Iterator[dict]:
+    """인스턴스 파일(.jsonld / .ndjson / 샤드 디렉토리) 순회"""
+    yield from iter_graph(instances_dir / filename)
+
+
+def instance_path(filename: str, instances_dir: Path = INSTANCES_DIR) -> Optional[Path]:
+    return resolve_graph_path(instances_dir / filename)
+
+
+def instance_files(filename: str, instances_dir: Path = INSTANCES_DIR) -> List[Path]:
+    """인스턴스 파일 목록 (.jsonld / .ndjson 1개, 샤드 디렉토리면 샤드 파일들, 없으면 빈 목록)"""
+    path = instance_path(filename, instances_dir)
+    if path is None:
+        return []
+    return list_shards(path) if path.is_dir() else [path]
+
+
+def container_path(path: Path) -> str:
+    """호스트 경로 (ontology/ 아래) → 컨테이너 /import 경로"""
+    return f"{CONTAINER_IMPORT_DIR}/{path.resolve().relative_to(ONTOLOGY_DIR.resolve()).as_posix()}"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+그래프 버전 스탬프 (GraphVersion 노드)
+
+적재 스크립트가 그래프를 바꾼 뒤 bump_graph_version() 으로 (:GraphVersion {key: 'graph'}) 의
+version (1씩 증가) 과 stamp (randomUUID) 를 갱신한다.
+query-interface 의 result_cache 가 stamp 를 캐시 키에 넣어, 재적재 전까지는 같은 Cypher 결과를 재사용하고
+재적재 후에는 이전 결과를 버린다.
+
+- stamp 는 매번 새 UUID 라 전체 삭제 후 재적재로 version 이 1부터 다시 시작해도 이전 캐시와 겹치지 않는다
+- GraphVersion 노드가 없는 DB (버전 스탬프 이전에 적재) 는 stamp None
+
+사용법:
+    python graph_version.py          # 현재 버전 출력
+    python graph_version.py --bump   # 수동 갱신 (적재 스크립트 밖에서 그래프를 고친 경우)
+"""
+
+import argparse
+from typing import Optional
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+
+VERSION_LABEL = "GraphVersion"
+
+VERSION_QUERY = f"""
+MATCH (v:{VERSION_LABEL} {{key: 'graph'}})
+RETURN v.version AS version, v.stamp AS stamp, v.source AS source, toString(v.updatedAt) AS updatedAt
+"""
+
+
+def bump_graph_version(driver, source: str, database: Optional[str] = None) -> dict:
+    """그래프 변경 후 호출 → {version, stamp, source, updatedAt}"""
+    def bump(tx):
+        return tx.run(f"""
+            MERGE (v:{VERSION_LABEL} {{key: 'graph'}})
+            SET v.version = coalesce(v.version, 0) + 1,
+                v.stamp = randomUUID(),
+                v.source = $source,
+                v.updatedAt = datetime()
+            RETURN v.version AS version, v.stamp AS stamp, v.source AS source, toString(v.updatedAt) AS updatedAt
+        """, source=source).single().data()
+
+    with driver.session(database=database) as session:
+        info = session.execute_write(bump)
+    print(f"  Graph version: {info['version']} ({info['source']}, {info['stamp'][:8]})")
+    return info
+
+
+def read_graph_version(driver, database: Optional[str] = None) -> Optional[dict]:
+    with driver.session(database=database) as session:
+        record = session.run(VERSION_QUERY).single()
+        return record.data() if record else None
+
+
+def main():
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="그래프 버전 스탬프 (GraphVersion)")
+    parser.add_argument('--uri', default=URI, help='Neo4j Bolt URI')
+    parser.add_argument('--bump', action='store_true', help='버전 갱신')
+    args = parser.parse_args()
+
+    driver = GraphDatabase.driver(args.uri, auth=AUTH)
+    try:
+        if args.bump:
+            bump_graph_version(driver, "manual")
+        else:
+            info = read_graph_version(driver)
+            if info is None:
+                print("GraphVersion 없음 (버전 스탬프 이전 적재)")
+            else:
+                print(f"version {info['version']} · {info['stamp']} · {info['source']} · {info['updatedAt']}")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
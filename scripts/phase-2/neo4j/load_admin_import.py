@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Sub-step 2-3b: neo4j-admin 벌크 임포트 (전체 재적재)
+
+export_csv.py 가 만든 CSV를 `neo4j-admin database import full` 로 적재한다.
+트랜잭션/MERGE 없이 스토어 파일을 직접 생성하므로 전체 재구축 시
+load_cypher.py 보다 훨씬 빠르다. 대상 DB는 덮어쓴다.
+
+절차 (docker-compose.yml 의 neo4j 서비스 기준):
+1. docker compose stop neo4j          (오프라인 임포트)
+2. docker compose run --rm neo4j neo4j-admin database import full ...
+   (CSV는 ../../../ontology → /import 마운트 경로로 전달)
+3. docker compose start neo4j
+4. 스키마 적용 (schema.py) + 노드/관계 수 확인
+
+사용법:
+    python export_csv.py && python load_admin_import.py
+    python load_admin_import.py --dry-run     # 실행할 명령만 출력
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from neo4j import GraphDatabase
+
+from graph_mapping import CSV_DIR, container_path
+from schema import apply_schema
+from aggregates import materialize_aggregates
+from graph_version import bump_graph_version
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+DATABASE = "neo4j"
+
+COMPOSE_FILE = Path(__file__).parent / "docker-compose.yml"
+SERVICE = "neo4j"
+
+
+def build_import_command(manifest: dict, csv_dir: Path, database: str = DATABASE) -> list:
+    """neo4j-admin database import full 인자 구성"""
+    command = [
+        "neo4j-admin", "database", "import", "full", database,
+        "--overwrite-destination=true",
+        "--multiline-fields=true",
+        f"--array-delimiter={manifest['array_delimiter']}",
+        "--skip-duplicate-nodes=true",
+        "--skip-bad-relationships=true",
+    ]
+    for node in manifest["nodes"]:
+        path = container_path(csv_dir / node["file"])
+        command.append(f"--nodes={node['label']}={path}" if node["label"] else f"--nodes={path}")
+    for rel in manifest["relationships"]:
+        if rel["count"]:
+            command.append(f"--relationships={rel['type']}={container_path(csv_dir / rel['file'])}")
+    return command
+
+
+def compose(*args: str, dry_run: bool = False):
+    command = ["docker", "compose", "-f", str(COMPOSE_FILE), *args]
+    print(f"  $ {' '.join(command)}")
+    if not dry_run:
+        subprocess.run(command, check=True)
+
+
+def wait_for_bolt(timeout: int = 120):
+    """서버 재시작 후 Bolt 연결 대기"""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            driver = GraphDatabase.driver(URI, auth=AUTH)
+            driver.verify_connectivity()
+            return driver
+        except Exception:
+            if time.time() > deadline:
+                raise
+            time.sleep(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="neo4j-admin 벌크 임포트")
+    parser.add_argument('--csv-dir', type=Path, default=CSV_DIR, help='export_csv.py 출력 디렉토리')
+    parser.add_argument('--dry-run', action='store_true', help='명령만 출력')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Sub-step 2-3b: neo4j-admin 벌크 임포트")
+    print("=" * 60)
+
+    manifest_path = args.csv_dir / "import_manifest.json"
+    if not manifest_path.exists():
+        print(f"  ⚠️ {manifest_path} 없음 - export_csv.py 를 먼저 실행하세요")
+        sys.exit(1)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    total_start = time.time()
+    import_command = build_import_command(manifest, args.csv_dir)
+
+    print("\n[Step 1] Stopping Neo4j...")
+    compose("stop", SERVICE, dry_run=args.dry_run)
+
+    print("\n[Step 2] Running neo4j-admin import...")
+    start = time.time()
+    compose("run", "--rm", "--no-deps", SERVICE, *import_command, dry_run=args.dry_run)
+    import_elapsed = time.time() - start
+    print(f"  Import: {import_elapsed:.2f}s")
+
+    print("\n[Step 3] Starting Neo4j...")
+    compose("start", SERVICE, dry_run=args.dry_run)
+    if args.dry_run:
+        return
+
+    driver = wait_for_bolt()
+    try:
+        print("\n[Step 4] Applying schema (constraints / indexes)...")
+        apply_schema(driver, database=DATABASE)
+
+        print("\n[Step 5] Materializing aggregates (TdocStat)...")
+        materialize_aggregates(driver, database=DATABASE)
+        bump_graph_version(driver, "load_admin_import", database=DATABASE)
+
+        with driver.session(database=DATABASE) as session:
+            print("\n[Step 6] Verification")
+            total_nodes = session.run("MATCH (n) RETURN count(n) AS c").single()["c"]
+            total_rels = session.run("MATCH ()-[r]->() RETURN count(r) AS c").single()["c"]
+    finally:
+        driver.close()
+
+    expected_nodes = sum(n["count"] for n in manifest["nodes"])
+    expected_rels = sum(r["count"] for r in manifest["relationships"])
+    total_elapsed = time.time() - total_start
+
+    print("\n" + "=" * 60)
+    print("Summary")
+    print("=" * 60)
+    print(f"  Total nodes: {total_nodes} (CSV {expected_nodes})")
+    print(f"  Total relationships: {total_rels} (CSV {expected_rels})")
+    print(f"  Import time: {import_elapsed:.2f}s")
+    print(f"  Total time: {total_elapsed:.2f}s ({total_elapsed/60:.1f}m)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,84 @@
 """
 Sub-step 2-2: Neo4j 적재 (직접 Cypher)
 APOC apoc.load.json()으로 JSON-LD를 파싱하고 직접 Cypher로 노드/관계 생성
+
+관계 키는 03_tdoc_instances 가 일부는 접두사 없이(submittedBy), 일부는 tdoc: 접두사로(tdoc:relatedTo)
+기록하므로 graph_mapping.item_value 와 같이 두 표기 모두 읽는다 (tdoc: 우선).
 """
 
 import time
 from neo4j import GraphDatabase
 
+from graph_mapping import INSTANCES_DIR, TDOC_FILE, container_path, instance_files
+from schema import apply_schema
+from aggregates import materialize_aggregates
+from graph_version import bump_graph_version
+
 # Neo4j connection settings (different port for cypher instance)
 URI = "bolt://localhost:7687"
 AUTH = ("neo4j", "password123")
 
 
-def run_query(driver, query, description="", show_result=False):
+# apoc.load.json 결과 → @graph 항목 (.jsonld: value['@graph'], .ndjson: 1행 = 항목 1개, @context 행 제외)
+GRAPH_ITEMS = "UNWIND coalesce(value['@graph'], [value]) AS item WITH item WHERE item['@id'] IS NOT NULL"
+
+# Tdoc 노드 (apoc.periodic.iterate, $url = 파일 / 샤드 1개)
+TDOC_NODE_QUERY = """
+    CALL apoc.periodic.iterate(
+        "CALL apoc.load.json($url) YIELD value
+         """ + GRAPH_ITEMS + """ RETURN item",
+        "WITH item
+         MERGE (t:Tdoc {id: item['@id']})
+         SET t.tdocNumber = item['tdoc:tdocNumber'],
+             t.title = item['tdoc:title'],
+             t.type = item['tdoc:type'],
+             t.status = item['tdoc:status'],
+             t.`for` = item['tdoc:for'],
+             t.abstract = item['tdoc:abstract'],
+             t.reservationDate = item['tdoc:reservationDate'],
+             t.uploadedDate = item['tdoc:uploadedDate'],
+             t.secretaryRemarks = item['tdoc:secretaryRemarks'],
+             t.crNumber = item['tdoc:crNumber'],
+             t.crCategory = item['tdoc:crCategory'],
+             t.clausesAffected = item['tdoc:clausesAffected'],
+             t.tsgCRPack = item['tdoc:tsgCRPack'],
+             t.affectsUICC = item['tdoc:affectsUICC'],
+             t.affectsME = item['tdoc:affectsME'],
+             t.affectsRAN = item['tdoc:affectsRAN'],
+             t.affectsCN = item['tdoc:affectsCN'],
+             t.direction = item['tdoc:direction'],
+             t._submittedBy = coalesce(item['tdoc:submittedBy'], item['submittedBy']),
+             t._hasContact = coalesce(item['tdoc:hasContact'], item['hasContact']),
+             t._belongsTo = coalesce(item['tdoc:belongsTo'], item['belongsTo']),
+             t._presentedAt = coalesce(item['tdoc:presentedAt'], item['presentedAt']),
+             t._targetRelease = coalesce(item['tdoc:targetRelease'], item['targetRelease']),
+             t._relatedTo = coalesce(item['tdoc:relatedTo'], item['relatedTo']),
+             t._modifies = coalesce(item['tdoc:modifies'], item['modifies']),
+             t._isRevisionOf = coalesce(item['tdoc:isRevisionOf'], item['isRevisionOf']),
+             t._revisedTo = coalesce(item['tdoc:revisedTo'], item['revisedTo']),
+             t._replyTo = coalesce(item['tdoc:replyTo'], item['replyTo']),
+             t._replyIn = coalesce(item['tdoc:replyIn'], item['replyIn']),
+             t._sentTo = coalesce(item['tdoc:sentTo'], item['sentTo']),
+             t._ccTo = coalesce(item['tdoc:ccTo'], item['ccTo']),
+             t._originalLS = coalesce(item['tdoc:originalLS'], item['originalLS']),
+             t._originatedFrom = coalesce(item['tdoc:originatedFrom'], item['originatedFrom'])
+         WITH item, t
+         CALL apoc.do.case([
+             item['@type'] = 'tdoc:CR', 'SET t:CR',
+             item['@type'] = 'tdoc:LS', 'SET t:LS'
+         ], '', {t: t})
+         YIELD value RETURN count(*)",
+        {batchSize: 5000, parallel: false, params: {url: $url}}
+    ) YIELD batches, total, errorMessages
+    RETURN batches, total, errorMessages
+"""
+
+
+def run_query(driver, query, description="", show_result=False, **params):
     """Execute a Cypher query and return results with timing."""
     start = time.time()
     with driver.session() as session:
-        result = session.run(query)
+        result = session.run(query, params)
         records = list(result)
         elapsed = time.time() - start
 
@@ -26,6 +89,23 @@ def run_query(driver, query, description="", show_result=False):
     return records, elapsed
 
 
+def graph_urls(filename):
+    """인스턴스 파일 (.jsonld / .ndjson / 03 --shard 샤드 디렉토리) → apoc.load.json URL 목록"""
+    files = instance_files(filename)
+    if not files:
+        raise FileNotFoundError(f"인스턴스 파일 없음: {INSTANCES_DIR / filename}")
+    return [f"file://{container_path(path)}" for path in files]
+
+
+def load_graph_file(driver, filename, statement, description, per_item=True):
+    """인스턴스 파일 / 샤드마다 statement 실행 ($url = 파일 URL, per_item: apoc.load.json → item 을 앞에 붙임)"""
+    urls = graph_urls(filename)
+    for url in urls:
+        label = f"{description} ({url.rsplit('/', 1)[-1]})" if len(urls) > 1 else description
+        query = f"CALL apoc.load.json($url) YIELD value {GRAPH_ITEMS}\n{statement}" if per_item else statement
+        run_query(driver, query, label, True, url=url)
+
+
 def main():
     print("=" * 60)
     print("Sub-step 2-2: Neo4j 적재 (직접 Cypher)")
@@ -35,158 +115,81 @@ def main():
     total_start = time.time()
 
     try:
-        # Step 1: Create indexes
-        print("\n[Step 1] Creating indexes...")
-        indexes = [
-            ("CREATE INDEX idx_meeting_id IF NOT EXISTS FOR (m:Meeting) ON (m.id)", "Meeting index"),
-            ("CREATE INDEX idx_release_id IF NOT EXISTS FOR (r:Release) ON (r.id)", "Release index"),
-            ("CREATE INDEX idx_company_id IF NOT EXISTS FOR (c:Company) ON (c.id)", "Company index"),
-            ("CREATE INDEX idx_contact_id IF NOT EXISTS FOR (c:Contact) ON (c.id)", "Contact index"),
-            ("CREATE INDEX idx_workitem_id IF NOT EXISTS FOR (w:WorkItem) ON (w.id)", "WorkItem index"),
-            ("CREATE INDEX idx_agenda_id IF NOT EXISTS FOR (a:AgendaItem) ON (a.id)", "AgendaItem index"),
-            ("CREATE INDEX idx_spec_id IF NOT EXISTS FOR (s:Spec) ON (s.id)", "Spec index"),
-            ("CREATE INDEX idx_wg_id IF NOT EXISTS FOR (w:WorkingGroup) ON (w.id)", "WorkingGroup index"),
-            ("CREATE INDEX idx_tdoc_id IF NOT EXISTS FOR (t:Tdoc) ON (t.id)", "Tdoc index"),
-            ("CREATE INDEX idx_tdoc_number IF NOT EXISTS FOR (t:Tdoc) ON (t.tdocNumber)", "Tdoc number index"),
-        ]
-        for query, desc in indexes:
-            run_query(driver, query, desc)
+        # Step 1: Constraints / indexes (schema.py)
+        print("\n[Step 1] Applying schema (constraints / indexes)...")
+        apply_schema(driver)
 
         # Step 2: Load Reference Classes
         print("\n[Step 2] Loading Reference Classes...")
 
         # 2.1 Meetings
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/meetings.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "meetings.jsonld", """
             MERGE (m:Meeting {id: item['@id']})
             SET m.meetingNumber = item['tdoc:meetingNumber'],
                 m.canonicalMeetingNumber = item['tdoc:canonicalMeetingNumber'],
                 m.meetingNumberInt = item['tdoc:meetingNumberInt'],
                 m.workingGroup = item['tdoc:workingGroup']
             RETURN count(m) AS count
-        """, "Meetings loaded", True)
+        """, "Meetings loaded")
 
         # 2.2 Releases
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/releases.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "releases.jsonld", """
             MERGE (r:Release {id: item['@id']})
             SET r.releaseName = item['tdoc:releaseName']
             RETURN count(r) AS count
-        """, "Releases loaded", True)
+        """, "Releases loaded")
 
         # 2.3 Specs
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/specs.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "specs.jsonld", """
             MERGE (s:Spec {id: item['@id']})
             SET s.specNumber = item['tdoc:specNumber'],
                 s.specVersion = item['tdoc:specVersion']
             RETURN count(s) AS count
-        """, "Specs loaded", True)
+        """, "Specs loaded")
 
         # 2.4 Working Groups
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/working_groups.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "working_groups.jsonld", """
             MERGE (w:WorkingGroup {id: item['@id']})
             SET w.wgName = item['tdoc:wgName']
             RETURN count(w) AS count
-        """, "Working Groups loaded", True)
+        """, "Working Groups loaded")
 
         # 2.5 Companies
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/companies.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "companies.jsonld", """
             MERGE (c:Company {id: item['@id']})
             SET c.companyName = item['tdoc:companyName'],
                 c.aliases = item['tdoc:aliases']
             RETURN count(c) AS count
-        """, "Companies loaded", True)
+        """, "Companies loaded")
 
         # 2.6 Work Items
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/work_items.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "work_items.jsonld", """
             MERGE (w:WorkItem {id: item['@id']})
             SET w.workItemCode = item['tdoc:workItemCode']
             RETURN count(w) AS count
-        """, "Work Items loaded", True)
+        """, "Work Items loaded")
 
         # 2.7 Contacts
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/contacts.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "contacts.jsonld", """
             MERGE (c:Contact {id: item['@id']})
             SET c.contactName = item['tdoc:contactName'],
                 c.contactId = item['tdoc:contactId']
             RETURN count(c) AS count
-        """, "Contacts loaded", True)
+        """, "Contacts loaded")
 
         # 2.8 Agenda Items
-        run_query(driver, """
-            CALL apoc.load.json("file:///import/output/instances/phase-2/agenda_items.jsonld") YIELD value
-            UNWIND value['@graph'] AS item
+        load_graph_file(driver, "agenda_items.jsonld", """
             MERGE (a:AgendaItem {id: item['@id']})
             SET a.agendaNumber = item['tdoc:agendaNumber'],
                 a.agendaDescription = item['tdoc:agendaDescription']
             RETURN count(a) AS count
-        """, "Agenda Items loaded", True)
+        """, "Agenda Items loaded")
 
         # Step 3: Load Tdocs using periodic.iterate for batch processing
         print("\n[Step 3] Loading Tdocs (batch processing)...")
 
-        # 3.1 Create Tdoc nodes
-        run_query(driver, """
-            CALL apoc.periodic.iterate(
-                "CALL apoc.load.json('file:///import/output/instances/phase-2/tdocs.jsonld') YIELD value
-                 UNWIND value['@graph'] AS item RETURN item",
-                "WITH item
-                 MERGE (t:Tdoc {id: item['@id']})
-                 SET t.tdocNumber = item['tdoc:tdocNumber'],
-                     t.title = item['tdoc:title'],
-                     t.type = item['tdoc:type'],
-                     t.status = item['tdoc:status'],
-                     t.`for` = item['tdoc:for'],
-                     t.abstract = item['tdoc:abstract'],
-                     t.reservationDate = item['tdoc:reservationDate'],
-                     t.uploadedDate = item['tdoc:uploadedDate'],
-                     t.secretaryRemarks = item['tdoc:secretaryRemarks'],
-                     t.crNumber = item['tdoc:crNumber'],
-                     t.crCategory = item['tdoc:crCategory'],
-                     t.clausesAffected = item['tdoc:clausesAffected'],
-                     t.tsgCRPack = item['tdoc:tsgCRPack'],
-                     t.affectsUICC = item['tdoc:affectsUICC'],
-                     t.affectsME = item['tdoc:affectsME'],
-                     t.affectsRAN = item['tdoc:affectsRAN'],
-                     t.affectsCN = item['tdoc:affectsCN'],
-                     t.direction = item['tdoc:direction'],
-                     t._submittedBy = item['submittedBy'],
-                     t._hasContact = item['hasContact'],
-                     t._belongsTo = item['belongsTo'],
-                     t._presentedAt = item['presentedAt'],
-                     t._targetRelease = item['targetRelease'],
-                     t._relatedTo = item['relatedTo'],
-                     t._modifies = item['modifies'],
-                     t._isRevisionOf = item['isRevisionOf'],
-                     t._revisedTo = item['revisedTo'],
-                     t._replyTo = item['replyTo'],
-                     t._replyIn = item['replyIn'],
-                     t._sentTo = item['sentTo'],
-                     t._ccTo = item['ccTo'],
-                     t._originalLS = item['originalLS'],
-                    t._originatedFrom = item['originatedFrom']
-                 WITH item, t
-                 CALL apoc.do.case([
-                     item['@type'] = 'tdoc:CR', 'SET t:CR',
-                     item['@type'] = 'tdoc:LS', 'SET t:LS'
-                 ], '', {t: t})
-                 YIELD value RETURN count(*)",
-                {batchSize: 5000, parallel: false}
-            ) YIELD batches, total, errorMessages
-            RETURN batches, total, errorMessages
-        """, "Tdoc nodes created", True)
+        # 3.1 Create Tdoc nodes (파일 / 샤드마다)
+        load_graph_file(driver, TDOC_FILE, TDOC_NODE_QUERY, "Tdoc nodes created", per_item=False)
 
         # Step 4: Create relationships
         print("\n[Step 4] Creating relationships...")
@@ -350,13 +353,18 @@ def main():
             ) YIELD batches, total RETURN batches, total
         """, "originatedFrom relationships", True)
 
-        # Step 5: Verification
+        # Step 5: Aggregates (TdocStat)
+        print("\n[Step 5] Materializing aggregates (TdocStat)...")
+        materialize_aggregates(driver)
+        bump_graph_version(driver, "load_cypher")
+
+        # Step 6: Verification
         print("\n" + "=" * 60)
-        print("[Step 5] Verification")
+        print("[Step 6] Verification")
         print("=" * 60)
 
         # Node counts by label
-        print("\n[5.1] Node counts by label:")
+        print("\n[6.1] Node counts by label:")
         with driver.session() as session:
             result = session.run(
                 """MATCH (n)
@@ -370,7 +378,7 @@ def main():
             print(f"    TOTAL: {total_nodes}")
 
         # Relationship counts
-        print("\n[5.2] Relationship counts by type:")
+        print("\n[6.2] Relationship counts by type:")
         with driver.session() as session:
             result = session.run(
                 """MATCH ()-[r]->()
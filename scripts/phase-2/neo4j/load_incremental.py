@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Sub-step 2-2c: Neo4j 증분 적재 (미팅 단위 변경 감지)
+
+전체 MERGE/SET 재실행 대신, 미팅별 콘텐츠 해시를 Meeting 노드에 저장해 두고
+새 JSON-LD 와 비교해 바뀐 미팅의 Tdoc / Resolution / 관계만 생성·수정·삭제한다.
+
+- 레코드 해시: 정규화 JSON 의 SHA-256 → 노드의 contentHash
+- 미팅 해시: (id, 레코드 해시) 목록의 SHA-256 → Meeting.tdocHash / Meeting.resolutionHash
+- 바뀐 미팅만:
+  - 새 JSON-LD 어디에도 없는 Tdoc/Resolution → DETACH DELETE
+  - 새로 생기거나 해시가 바뀐 Tdoc → 노드 MERGE + 속성 교체, 나가는 관계 삭제 후 재생성
+    (들어오는 REFERENCES 등은 유지), Resolution 은 삭제 후 재생성
+- Reference 노드(Company, Contact 등)는 미팅 간 공유이므로 해시가 바뀐 것만 MERGE (삭제 없음)
+- Phase-2 변경이 있으면 TdocStat 집계(aggregates.py) 재계산, 변경이 있으면 그래프 버전(graph_version.py) 갱신
+
+미팅 구분은 Tdoc 의 presentedAt(단일 파일/샤드 모두 동일), Resolution 의 madeAt.
+변경되지 않은 Tdoc 에서 새로 생긴 Tdoc 으로 가는 관계는 만들지 않으므로 주기적으로 전체 적재 권장.
+
+사용법:
+    python load_incremental.py
+    python load_incremental.py --dry-run            # 변경 계획만 출력
+    python load_incremental.py --skip-resolutions   # Phase-2 만
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from neo4j import GraphDatabase
+
+from graph_mapping import (
+    INSTANCES_DIR, REFERENCE_NODES, TDOC_FILE, TDOC_PROPERTIES, TDOC_SUBCLASS_LABELS,
+    RELATIONSHIPS, item_refs, tdoc_labels, iter_instances, instance_path,
+)
+from load_unwind import write_batches
+from schema import apply_schema
+from aggregates import materialize_aggregates
+from graph_version import bump_graph_version
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Phase-3 Resolution 적재 쿼리 재사용 (01_load_decisions.py)
+PHASE3_NEO4J_DIR = Path(__file__).parent.parent.parent / "phase-3" / "neo4j"
+
+TDOC_REL_TYPES = "|".join(rel_type for _, rel_type, _ in RELATIONSHIPS)
+TDOC_EXTRA_LABELS = ", ".join(f"t:`{label}`" for label in TDOC_SUBCLASS_LABELS.values())
+
+
+# ============================================================
+# 해시
+# ============================================================
+
+def record_hash(item: dict) -> str:
+    """레코드 정규화 JSON 의 SHA-256 (키 순서/서식 무관)"""
+    canonical = json.dumps(item, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def group_hash(hashes: Dict[str, str]) -> str:
+    """미팅 해시: (id, 레코드 해시) 정렬 목록의 SHA-256"""
+    digest = hashlib.sha256()
+    for record_id in sorted(hashes):
+        digest.update(f"{record_id}\t{hashes[record_id]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def scan_groups(items: Iterable[dict], id_key: str,
+                group_of: Callable[[dict], Optional[str]]) -> Dict[str, Dict[str, str]]:
+    """1차 패스: 그룹(미팅)별 {id: 레코드 해시} (같은 id 는 마지막 값)"""
+    latest: Dict[str, Tuple[Optional[str], str]] = {}
+    for item in items:
+        latest[item[id_key]] = (group_of(item), record_hash(item))
+
+    groups: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for record_id, (group, digest) in latest.items():
+        if group is not None:
+            groups[group][record_id] = digest
+    return groups
+
+
+def changed_groups(groups: Dict[str, Dict[str, str]], stored: Dict[str, Optional[str]]) -> Dict[str, str]:
+    """저장된 미팅 해시와 다른 그룹 → 새 해시 (새 데이터에서 사라진 미팅은 빈 그룹)"""
+    changed = {}
+    for group, hashes in groups.items():
+        digest = group_hash(hashes)
+        if stored.get(group) != digest:
+            changed[group] = digest
+    for group, digest in stored.items():
+        if digest is not None and group not in groups:
+            changed[group] = group_hash({})
+    return changed
+
+
+def read_rows(driver, query: str, **params) -> List[dict]:
+    with driver.session() as session:
+        return [record.data() for record in session.run(query, **params)]
+
+
+# ============================================================
+# Reference 노드
+# ============================================================
+
+def full_properties(item: dict, mapping: dict) -> dict:
+    """매핑된 모든 속성 (값 없으면 None → SET += 에서 제거)"""
+    return {name: item.get(key) for key, (name, _) in mapping.items()}
+
+
+def sync_reference_nodes(driver, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """해시가 바뀐/새 Reference 노드만 MERGE"""
+    counts = {}
+    for label, filename, mapping in REFERENCE_NODES:
+        if instance_path(filename) is None:
+            continue
+        stored = {
+            row["id"]: row["hash"]
+            for row in read_rows(driver, f"MATCH (n:`{label}`) RETURN n.id AS id, n.contentHash AS hash")
+        }
+        rows = {}
+        for item in iter_instances(filename):
+            digest = record_hash(item)
+            if stored.get(item["@id"]) != digest:
+                rows[item["@id"]] = {"id": item["@id"], "props": {**full_properties(item, mapping), "contentHash": digest}}
+            else:
+                rows.pop(item["@id"], None)
+        counts[label] = len(rows)
+        if rows and not dry_run:
+            write_batches(driver, f"UNWIND $rows AS row MERGE (n:`{label}` {{id: row.id}}) SET n += row.props",
+                          list(rows.values()), batch_size)
+    return counts
+
+
+# ============================================================
+# Tdoc (미팅 = presentedAt)
+# ============================================================
+
+def tdoc_meeting(item: dict) -> Optional[str]:
+    refs = item_refs(item, "presentedAt")
+    return refs[0] if refs else None
+
+
+def stored_meeting_hashes(driver, prop: str) -> Dict[str, Optional[str]]:
+    return {row["id"]: row["hash"] for row in read_rows(driver, f"MATCH (m:Meeting) RETURN m.id AS id, m.{prop} AS hash")}
+
+
+def sync_tdocs(driver, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """바뀐 미팅의 Tdoc 만 삭제/업서트 후 Meeting.tdocHash 갱신"""
+    groups = scan_groups(iter_instances(TDOC_FILE), "@id", tdoc_meeting)
+    changed = changed_groups(groups, stored_meeting_hashes(driver, "tdocHash"))
+    stats = {"meetings": len(groups), "changed_meetings": len(changed), "created": 0, "updated": 0, "deleted": 0}
+    if not changed:
+        return stats
+
+    current_ids = {record_id for hashes in groups.values() for record_id in hashes}
+    deleted, upserts = [], {}
+    for meeting_id in changed:
+        stored = {
+            row["id"]: row["hash"]
+            for row in read_rows(driver, """
+                MATCH (t:Tdoc)-[:PRESENTED_AT]->(:Meeting {id: $meeting})
+                WHERE t.id IS NOT NULL
+                RETURN t.id AS id, t.contentHash AS hash
+            """, meeting=meeting_id)
+        }
+        new = groups.get(meeting_id, {})
+        # 다른 미팅으로 옮겨진 Tdoc 은 삭제하지 않음 (해당 미팅에서 업서트)
+        deleted += [record_id for record_id in stored if record_id not in current_ids]
+        for record_id, digest in new.items():
+            if stored.get(record_id) != digest:
+                upserts[record_id] = digest
+                stats["updated" if record_id in stored else "created"] += 1
+    stats["deleted"] = len(deleted)
+
+    if dry_run:
+        return stats
+
+    # 2차 패스: 업서트 대상 레코드만 수집 (같은 id 는 마지막 값)
+    items = {}
+    for item in iter_instances(TDOC_FILE):
+        if item["@id"] in upserts:
+            items[item["@id"]] = item
+
+    write_batches(driver, "UNWIND $rows AS id MATCH (t:Tdoc {id: id}) DETACH DELETE t", deleted, batch_size)
+
+    # 노드: 라벨 조합별 MERGE + 속성 교체 (CR/LS 라벨 재지정)
+    by_labels: Dict[str, list] = defaultdict(list)
+    for record_id, item in items.items():
+        props = {**full_properties(item, TDOC_PROPERTIES), "contentHash": upserts[record_id],
+                 "tdocKey": item.get("tdoc:tdocNumber")}
+        by_labels[":".join(f"`{label}`" for label in tdoc_labels(item))].append({"id": record_id, "props": props})
+    for labels, rows in by_labels.items():
+        write_batches(driver, (
+            "UNWIND $rows AS row MERGE (t:Tdoc {id: row.id}) SET t += row.props "
+            f"REMOVE {TDOC_EXTRA_LABELS} SET t:{labels}"
+        ), rows, batch_size)
+
+    # 관계: 업서트한 Tdoc 의 나가는 Phase-2 관계 삭제 후 원본 레코드에서 재생성
+    write_batches(driver, f"UNWIND $rows AS id MATCH (:Tdoc {{id: id}})-[r:{TDOC_REL_TYPES}]->() DELETE r",
+                  list(items), batch_size)
+    for prop, rel_type, target_label in RELATIONSHIPS:
+        pairs = {(record_id, ref): None for record_id, item in items.items() for ref in item_refs(item, prop)}
+        write_batches(driver, (
+            "UNWIND $rows AS row "
+            "MATCH (s:Tdoc {id: row[0]}) "
+            f"MATCH (t:`{target_label}` {{id: row[1]}}) "
+            f"MERGE (s)-[:`{rel_type}`]->(t)"
+        ), [list(pair) for pair in pairs], batch_size)
+
+    write_batches(driver, "UNWIND $rows AS row MATCH (m:Meeting {id: row.id}) SET m.tdocHash = row.hash",
+                  [{"id": meeting_id, "hash": digest} for meeting_id, digest in changed.items()], batch_size)
+    return stats
+
+
+# ============================================================
+# Resolution (미팅 = madeAt)
+# ============================================================
+
+def sync_resolutions(driver, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """바뀐 미팅의 Resolution 만 삭제/업서트 후 Meeting.resolutionHash 갱신"""
+    sys.path.insert(0, str(PHASE3_NEO4J_DIR))
+    decisions = importlib.import_module("01_load_decisions")
+
+    resolutions: Dict[str, Tuple[str, dict]] = {}
+    for resolution_type, filename in decisions.RESOLUTION_FILES:
+        if (decisions.INSTANCES_DIR / filename).exists():
+            for item in decisions.load_jsonld(filename):
+                resolutions[item["resolutionId"]] = (resolution_type, item)
+
+    with driver.session() as session:
+        meetings = decisions.meeting_ids(session)
+
+    def meeting_of(entry: dict) -> Optional[str]:
+        # madeAt → Meeting id (canonicalMeetingNumber 경유, 여러 개면 가장 작은 id - collect() 순서와 무관하게 고정)
+        ids = meetings.get(decisions.canonical_meeting(entry["madeAt"])) if "madeAt" in entry else None
+        return min(ids) if ids else None
+
+    groups = scan_groups(({**item, "@type": resolution_type} for resolution_type, item in resolutions.values()),
+                         "resolutionId", meeting_of)
+    changed = changed_groups(groups, stored_meeting_hashes(driver, "resolutionHash"))
+    stats = {"meetings": len(groups), "changed_meetings": len(changed), "created": 0, "updated": 0, "deleted": 0}
+    if not changed:
+        return stats
+
+    deleted, upserts = [], {}
+    for meeting_id in changed:
+        stored = {
+            row["id"]: row["hash"]
+            for row in read_rows(driver, """
+                MATCH (res:Resolution)-[:MADE_AT]->(:Meeting {id: $meeting})
+                RETURN res.resolutionId AS id, res.contentHash AS hash
+            """, meeting=meeting_id)
+        }
+        new = groups.get(meeting_id, {})
+        deleted += [record_id for record_id in stored if record_id not in resolutions]
+        for record_id, digest in new.items():
+            if stored.get(record_id) != digest:
+                upserts[record_id] = digest
+                stats["updated" if record_id in stored else "created"] += 1
+    stats["deleted"] = len(deleted)
+
+    if dry_run:
+        return stats
+
+    # Resolution 은 나가는 관계만 가지므로 바뀐 노드도 삭제 후 재생성 (하위 타입 변경 포함)
+    write_batches(driver, "UNWIND $rows AS id MATCH (res:Resolution {resolutionId: id}) DETACH DELETE res",
+                  deleted + list(upserts), batch_size)
+
+    by_type: Dict[str, list] = defaultdict(list)
+    for record_id in upserts:
+        resolution_type, item = resolutions[record_id]
+        by_type[resolution_type].append(item)
+    with driver.session() as session:
+        for resolution_type, items in by_type.items():
+            decisions.load_resolutions(session, resolution_type, items, meetings, batch_size)
+
+    write_batches(driver, "UNWIND $rows AS row MATCH (res:Resolution {resolutionId: row.id}) SET res.contentHash = row.hash",
+                  [{"id": record_id, "hash": digest} for record_id, digest in upserts.items()], batch_size)
+    write_batches(driver, "UNWIND $rows AS row MATCH (m:Meeting {id: row.id}) SET m.resolutionHash = row.hash",
+                  [{"id": meeting_id, "hash": digest} for meeting_id, digest in changed.items()], batch_size)
+    return stats
+
+
+def print_stats(name: str, stats: Dict[str, int]):
+    print(f"  {name}: 미팅 {stats['changed_meetings']}/{stats['meetings']} 변경 → "
+          f"생성 {stats['created']:,}, 수정 {stats['updated']:,}, 삭제 {stats['deleted']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neo4j 증분 적재 (미팅 단위 변경 감지)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='트랜잭션당 행 수')
+    parser.add_argument('--dry-run', action='store_true', help='변경 계획만 출력')
+    parser.add_argument('--skip-resolutions', action='store_true', help='Phase-3 Resolution 제외')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Sub-step 2-2c: Neo4j 증분 적재" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 60)
+    print(f"  입력: {INSTANCES_DIR}")
+
+    driver = GraphDatabase.driver(URI, auth=AUTH)
+    total_start = time.time()
+
+    try:
+        if not args.dry_run:
+            print("\n[Step 1] Applying schema (constraints / indexes)...")
+            apply_schema(driver)
+
+        print("\n[Step 2] Reference nodes...")
+        reference_changes = sync_reference_nodes(driver, args.batch_size, args.dry_run)
+        for label, count in reference_changes.items():
+            if count:
+                print(f"  {label}: {count:,} 변경")
+
+        print("\n[Step 3] Tdocs...")
+        tdoc_stats = sync_tdocs(driver, args.batch_size, args.dry_run)
+        print_stats("Tdoc", tdoc_stats)
+
+        resolution_stats = {"changed_meetings": 0}
+        if not args.skip_resolutions:
+            print("\n[Step 4] Resolutions...")
+            resolution_stats = sync_resolutions(driver, args.batch_size, args.dry_run)
+            print_stats("Resolution", resolution_stats)
+
+        phase2_changed = tdoc_stats["changed_meetings"] or any(reference_changes.values())
+        if not args.dry_run and phase2_changed:
+            print("\n[Step 5] Materializing aggregates (TdocStat)...")
+            materialize_aggregates(driver)
+        if not args.dry_run and (phase2_changed or resolution_stats["changed_meetings"]):
+            bump_graph_version(driver, "load_incremental")
+    finally:
+        driver.close()
+
+    print("\n" + "=" * 60)
+    print(f"Total time: {time.time() - total_start:.2f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
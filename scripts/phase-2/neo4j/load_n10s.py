@@ -7,6 +7,8 @@ neosemantics 플러그인을 사용하여 RDF/JSON-LD 데이터를 Neo4j에 적
 import time
 from neo4j import GraphDatabase
 
+from graph_version import bump_graph_version
+
 # Neo4j connection settings
 URI = "bolt://localhost:7687"
 AUTH = ("neo4j", "password123")
@@ -116,6 +118,8 @@ def main():
             else:
                 print(f"    WARNING: No result returned for {filename}")
 
+        bump_graph_version(driver, "load_n10s")
+
         # Step 5: Verification
         print("\n" + "=" * 60)
         print("[Step 5] Verification")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Sub-step 2-2b: Neo4j 적재 (드라이버 측 UNWIND 배치)
+
+load_cypher.py 는 서버에서 apoc.load.json 으로 파일을 읽고 MERGE 한 뒤,
+_presentedAt 같은 임시 속성을 관계 타입마다 전체 Tdoc 스캔으로 풀어낸다.
+이 스크립트는 JSON-LD(샤드 포함)를 Python에서 스트리밍해
+- 노드: id 유니크 제약 하에서 `UNWIND $rows ... CREATE` 배치
+- 관계: 원본 레코드에서 바로 (시작, 끝) 쌍을 만들어 `UNWIND $rows ... MATCH ... CREATE`
+- 관계 타입별로 독립 세션을 병렬 실행 (교착 시 execute_write 재시도)
+으로 적재한다. 임시 속성과 관계 타입별 전체 스캔이 없다.
+
+결과는 load_cypher.py 와 같다:
+- 같은 @id 노드는 마지막 값 (2-pass: 1차로 마지막 위치만 기록, 2차에서 해당 레코드만 적재)
+- 대상 노드가 없는 관계는 생성하지 않음, 중복 관계는 1개
+
+CREATE 기반이므로 빈 DB(또는 --clear)에서 실행한다.
+
+사용법:
+    python load_unwind.py --clear
+    python load_unwind.py --batch-size 10000 --workers 6
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from neo4j import GraphDatabase
+
+from graph_mapping import (
+    INSTANCES_DIR, REFERENCE_NODES, TDOC_FILE, TDOC_PROPERTIES, RELATIONSHIPS,
+    item_refs, tdoc_labels, node_properties, iter_instances, instance_path,
+)
+from schema import NODE_LABELS, apply_schema
+from aggregates import materialize_aggregates
+from graph_version import bump_graph_version
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_WORKERS = 4
+
+
+def batched(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def write_batches(driver, query: str, rows: list, batch_size: int) -> int:
+    """rows 를 batch_size 단위 트랜잭션으로 기록"""
+    def work(tx, batch):
+        tx.run(query, rows=batch).consume()
+
+    with driver.session() as session:
+        for batch in batched(rows, batch_size):
+            session.execute_write(work, batch)
+    return len(rows)
+
+
+# ============================================================
+# 초기화
+# ============================================================
+
+def clear_phase2(driver, batch_size: int):
+    """Phase-2 라벨 노드 삭제 (배치 트랜잭션)"""
+    with driver.session() as session:
+        for label in NODE_LABELS:
+            session.run(
+                f"MATCH (n:`{label}`) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS"
+            ).consume()
+
+
+# ============================================================
+# 노드
+# ============================================================
+
+def load_reference_nodes(driver, batch_size: int) -> Dict[str, int]:
+    counts = {}
+    for label, filename, mapping in REFERENCE_NODES:
+        if instance_path(filename) is None:
+            print(f"  ⚠️ {filename} 없음 - 건너뜀")
+            continue
+        rows = {}
+        for item in iter_instances(filename):
+            rows[item["@id"]] = node_properties(item, mapping)
+        query = f"UNWIND $rows AS row CREATE (n:`{label}`) SET n = row"
+        counts[label] = write_batches(driver, query, list(rows.values()), batch_size)
+        print(f"  {label}: {counts[label]:,}")
+    return counts
+
+
+def last_positions() -> Dict[str, int]:
+    """1차 패스: @id 별 마지막 등장 위치"""
+    positions = {}
+    for position, item in enumerate(iter_instances(TDOC_FILE)):
+        positions[item["@id"]] = position
+    return positions
+
+
+def load_tdoc_nodes(driver, batch_size: int) -> Tuple[int, Dict[str, List[Tuple[str, str]]]]:
+    """2차 패스: Tdoc 노드 배치 CREATE + 관계 쌍 수집"""
+    positions = last_positions()
+    buffers: Dict[str, list] = defaultdict(list)  # 라벨 조합 → 노드 행
+    edges: Dict[str, dict] = {rel_type: {} for _, rel_type, _ in RELATIONSHIPS}
+    count = 0
+
+    def flush(labels: str):
+        nonlocal count
+        rows = buffers.pop(labels, [])
+        if rows:
+            write_batches(driver, f"UNWIND $rows AS row CREATE (n:{labels}) SET n = row", rows, batch_size)
+            count += len(rows)
+
+    for position, item in enumerate(iter_instances(TDOC_FILE)):
+        source_id = item["@id"]
+        if positions.get(source_id) != position:
+            continue
+        labels = ":".join(f"`{label}`" for label in tdoc_labels(item))
+        buffers[labels].append(node_properties(item, TDOC_PROPERTIES))
+        if len(buffers[labels]) >= batch_size:
+            flush(labels)
+
+        for prop, rel_type, _ in RELATIONSHIPS:
+            for ref in item_refs(item, prop):
+                edges[rel_type][(source_id, ref)] = None
+
+    for labels in list(buffers):
+        flush(labels)
+
+    return count, {rel_type: list(pairs) for rel_type, pairs in edges.items()}
+
+
+# ============================================================
+# 관계
+# ============================================================
+
+def load_relationships(driver, edges: Dict[str, List[Tuple[str, str]]], batch_size: int, workers: int) -> Dict[str, int]:
+    """관계 타입별 병렬 적재 (대상 노드가 없으면 MATCH 단계에서 제외)"""
+    targets = {rel_type: target for _, rel_type, target in RELATIONSHIPS}
+
+    def load(rel_type: str) -> Tuple[str, int, float]:
+        start = time.time()
+        query = (
+            "UNWIND $rows AS row "
+            "MATCH (s:Tdoc {id: row[0]}) "
+            f"MATCH (t:`{targets[rel_type]}` {{id: row[1]}}) "
+            f"CREATE (s)-[:`{rel_type}`]->(t) "
+        )
+        rows = [list(pair) for pair in edges[rel_type]]
+        write_batches(driver, query, rows, batch_size)
+        return rel_type, len(rows), time.time() - start
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for rel_type, candidates, elapsed in executor.map(load, [t for t in edges if edges[t]]):
+            results[rel_type] = candidates
+            print(f"  {rel_type}: {candidates:,} candidates ({elapsed:.2f}s)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neo4j 적재 (UNWIND 배치)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='트랜잭션당 행 수')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='관계 타입 병렬 세션 수')
+    parser.add_argument('--clear', action='store_true', help='기존 Phase-2 노드 삭제 후 적재')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Sub-step 2-2b: Neo4j 적재 (UNWIND 배치)")
+    print("=" * 60)
+    print(f"  입력: {INSTANCES_DIR}")
+
+    driver = GraphDatabase.driver(URI, auth=AUTH, max_connection_pool_size=max(args.workers + 2, 10))
+    total_start = time.time()
+
+    try:
+        with driver.session() as session:
+            existing = session.run("MATCH (t:Tdoc) RETURN count(t) AS c").single()["c"]
+        if existing and not args.clear:
+            print(f"\n  ⚠️ Tdoc 노드 {existing:,}개가 이미 있습니다. --clear 로 다시 적재하세요.")
+            return None
+        if args.clear:
+            print("\n[Step 0] Clearing Phase-2 nodes...")
+            clear_phase2(driver, args.batch_size)
+
+        print("\n[Step 1] Applying schema (constraints / indexes)...")
+        apply_schema(driver)
+
+        print("\n[Step 2] Loading reference nodes...")
+        step_start = time.time()
+        load_reference_nodes(driver, args.batch_size)
+        print(f"  ({time.time() - step_start:.2f}s)")
+
+        print("\n[Step 3] Loading Tdoc nodes...")
+        step_start = time.time()
+        tdoc_count, edges = load_tdoc_nodes(driver, args.batch_size)
+        print(f"  Tdoc/CR/LS: {tdoc_count:,} ({time.time() - step_start:.2f}s)")
+
+        print(f"\n[Step 4] Creating relationships ({args.workers} parallel sessions)...")
+        step_start = time.time()
+        load_relationships(driver, edges, args.batch_size, args.workers)
+        print(f"  ({time.time() - step_start:.2f}s)")
+
+        print("\n[Step 5] Materializing aggregates (TdocStat)...")
+        materialize_aggregates(driver)
+        bump_graph_version(driver, "load_unwind")
+
+        print("\n[Step 6] Verification")
+        with driver.session() as session:
+            total_nodes = session.run("MATCH (n) RETURN count(n) AS c").single()["c"]
+            total_rels = session.run("MATCH ()-[r]->() RETURN count(r) AS c").single()["c"]
+    finally:
+        driver.close()
+
+    total_elapsed = time.time() - total_start
+    print("\n" + "=" * 60)
+    print("Summary")
+    print("=" * 60)
+    print(f"  Total nodes: {total_nodes}")
+    print(f"  Total relationships: {total_rels}")
+    print(f"  Total time: {total_elapsed:.2f}s ({total_elapsed/60:.1f}m)")
+    print("=" * 60)
+
+    return {
+        "method": "unwind",
+        "nodes": total_nodes,
+        "relationships": total_rels,
+        "time_seconds": total_elapsed
+    }
+
+
+if __name__ == "__main__":
+    stats = main()
+    print(f"\nStats: {stats}")
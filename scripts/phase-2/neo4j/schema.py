@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Neo4j 스키마 관리 (제약 / 인덱스)
+
+모든 적재 스크립트(load_cypher, load_unwind, load_admin_import, Phase-3 로더)가
+적재 전에 apply_schema() 를 호출해 같은 스키마를 멱등하게 적용한다.
+
+- 유니크 제약: Phase-2 노드 라벨별 id, Resolution.resolutionId
+  (MERGE/MATCH 가 라벨 스캔 대신 제약 인덱스를 사용)
+- 스칼라 키: Tdoc.tdocKey (tdocNumber 가 배열로 적재된 경우에도 인덱스 조회)
+- 복합 인덱스: AgendaItem(meetingNumber, agendaNumber), Resolution(meeting, agenda)
+- 전문 인덱스: Tdoc(title, abstract), Resolution(content)
+- 집계 노드: TdocStat(dimension), TdocStat(dimension, meeting) (aggregates.py)
+
+같은 라벨/속성의 일반 RANGE 인덱스(이전 load_cypher 의 idx_*_id 등)는
+제약 생성과 충돌하므로 먼저 제거한다. 적용 후 SHOW INDEXES 로 채우기 진행률을 보고한다.
+
+사용법:
+    python schema.py            # 적용 + 진행률
+    python schema.py --status   # 현재 상태만 출력
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from graph_mapping import REFERENCE_NODES
+
+# Neo4j connection settings
+URI = "bolt://localhost:7687"
+AUTH = ("neo4j", "password123")
+
+INDEX_TIMEOUT = 600  # 인덱스 채우기 대기 (초)
+
+
+@dataclass(frozen=True)
+class SchemaItem:
+    kind: str                   # unique | range | fulltext
+    name: str
+    label: str
+    properties: Tuple[str, ...]
+
+    def create_query(self) -> str:
+        if self.kind == "unique":
+            return (f"CREATE CONSTRAINT {self.name} IF NOT EXISTS "
+                    f"FOR (n:`{self.label}`) REQUIRE n.{self.properties[0]} IS UNIQUE")
+        props = ", ".join(f"n.{p}" for p in self.properties)
+        if self.kind == "fulltext":
+            return (f"CREATE FULLTEXT INDEX {self.name} IF NOT EXISTS "
+                    f"FOR (n:`{self.label}`) ON EACH [{props}]")
+        return f"CREATE INDEX {self.name} IF NOT EXISTS FOR (n:`{self.label}`) ON ({props})"
+
+    def describe(self) -> str:
+        return f"{self.kind:8s} {self.name} :{self.label}({', '.join(self.properties)})"
+
+
+NODE_LABELS = [label for label, _, _ in REFERENCE_NODES] + ["Tdoc"]
+
+SCHEMA: List[SchemaItem] = [
+    *(SchemaItem("unique", f"uniq_{label.lower()}_id", label, ("id",)) for label in NODE_LABELS),
+    SchemaItem("unique", "uniq_resolution_id", "Resolution", ("resolutionId",)),
+    SchemaItem("range", "idx_tdoc_number", "Tdoc", ("tdocNumber",)),
+    SchemaItem("range", "idx_tdoc_key", "Tdoc", ("tdocKey",)),
+    SchemaItem("range", "idx_agenda_meeting_number", "AgendaItem", ("meetingNumber", "agendaNumber")),
+    SchemaItem("range", "idx_resolution_meeting_agenda", "Resolution", ("meeting", "agenda")),
+    SchemaItem("range", "idx_tdocstat_dimension", "TdocStat", ("dimension",)),
+    SchemaItem("range", "idx_tdocstat_dimension_meeting", "TdocStat", ("dimension", "meeting")),
+    SchemaItem("fulltext", "ft_tdoc_text", "Tdoc", ("title", "abstract")),
+    SchemaItem("fulltext", "ft_resolution_content", "Resolution", ("content",)),
+]
+
+
+def existing_indexes(session) -> List[dict]:
+    return [record.data() for record in session.run(
+        "SHOW INDEXES YIELD name, type, state, populationPercent, owningConstraint, labelsOrTypes, properties "
+        "RETURN name, type, state, populationPercent, owningConstraint, labelsOrTypes, properties"
+    )]
+
+
+def conflicting_indexes(item: SchemaItem, indexes: List[dict]) -> List[str]:
+    """item 과 같은 라벨/속성 집합을 가진 다른 이름의 일반 RANGE 인덱스"""
+    if item.kind == "fulltext":
+        return []
+    return [
+        index["name"] for index in indexes
+        if index["type"] == "RANGE"
+        and index["owningConstraint"] is None
+        and index["name"] != item.name
+        and index["labelsOrTypes"] == [item.label]
+        and set(index["properties"] or []) == set(item.properties)
+    ]
+
+
+def wait_for_indexes(session, names: List[str], timeout: int = INDEX_TIMEOUT,
+                     log: Callable[[str], None] = print) -> Dict[str, str]:
+    """SHOW INDEXES 를 폴링해 채우기 진행률 출력, ONLINE/FAILED 가 될 때까지 대기"""
+    deadline = time.time() + timeout
+    reported: Dict[str, float] = {}
+    while True:
+        states = {}
+        for index in existing_indexes(session):
+            if index["name"] not in names:
+                continue
+            states[index["name"]] = index["state"]
+            percent = index["populationPercent"] or 0.0
+            if index["state"] == "POPULATING" and reported.get(index["name"]) != percent:
+                log(f"  {index['name']}: {percent:.1f}%")
+                reported[index["name"]] = percent
+
+        pending = [name for name, state in states.items() if state == "POPULATING"]
+        if not pending:
+            failed = [name for name, state in states.items() if state == "FAILED"]
+            if failed:
+                raise RuntimeError(f"인덱스 생성 실패: {', '.join(failed)}")
+            return states
+        if time.time() > deadline:
+            raise TimeoutError(f"인덱스 채우기 시간 초과: {', '.join(pending)}")
+        time.sleep(1)
+
+
+def apply_schema(driver, items: List[SchemaItem] = SCHEMA, database: Optional[str] = None,
+                 wait: bool = True, log: Callable[[str], None] = print) -> Dict[str, str]:
+    """제약/인덱스 멱등 적용 (충돌 인덱스 제거 → 생성 → 채우기 대기)"""
+    with driver.session(database=database) as session:
+        indexes = existing_indexes(session)
+        existing = {index["name"] for index in indexes}
+
+        for item in items:
+            for name in conflicting_indexes(item, indexes):
+                session.run(f"DROP INDEX `{name}` IF EXISTS").consume()
+                log(f"  dropped {name} (conflicts with {item.name})")
+            if item.name in existing:
+                continue
+            session.run(item.create_query()).consume()
+            log(f"  created {item.describe()}")
+
+        if not wait:
+            return {}
+        return wait_for_indexes(session, [item.name for item in items], log=log)
+
+
+def main():
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="Neo4j 스키마 적용")
+    parser.add_argument('--uri', default=URI, help='Neo4j Bolt URI')
+    parser.add_argument('--status', action='store_true', help='적용 없이 상태만 출력')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Neo4j 스키마 (제약 / 인덱스)")
+    print("=" * 60)
+
+    driver = GraphDatabase.driver(args.uri, auth=AUTH)
+    try:
+        if not args.status:
+            apply_schema(driver)
+        with driver.session() as session:
+            states = {index["name"]: index for index in existing_indexes(session)}
+    finally:
+        driver.close()
+
+    print()
+    for item in SCHEMA:
+        index = states.get(item.name)
+        state = f"{index['state']} {index['populationPercent'] or 0:.0f}%" if index else "MISSING"
+        print(f"  {item.describe():70s} {state}")
+
+
+if __name__ == "__main__":
+    main()
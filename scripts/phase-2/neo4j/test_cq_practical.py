@@ -15,7 +15,6 @@
 """
 
 import time
-from neo4j import GraphDatabase
 from typing import Dict, List, Any
 
 URI = "bolt://localhost:7688"
@@ -383,6 +382,8 @@ def run_test_cq(driver, cq_id: str, cq: Dict) -> Dict[str, Any]:
 
 
 def main():
+    from neo4j import GraphDatabase
+
     print("=" * 70)
     print("실전적인 CQ 테스트")
     print("=" * 70)
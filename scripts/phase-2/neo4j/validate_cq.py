@@ -5,7 +5,6 @@ Sub-step 2-4: CQ 25개 Cypher 쿼리 검증
 """
 
 import time
-from neo4j import GraphDatabase
 
 URI = "bolt://localhost:7688"
 AUTH = ("neo4j", "password123")
@@ -258,6 +257,8 @@ CQ_QUERIES = {
 
 
 def main():
+    from neo4j import GraphDatabase
+
     print("=" * 70)
     print("Sub-step 2-4: CQ 25개 Cypher 쿼리 검증")
     print("=" * 70)
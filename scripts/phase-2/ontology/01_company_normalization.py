@@ -7,6 +7,7 @@ Spec 7.6 기반 - 5단계 파이프라인:
 2. 역할 분리
 3. 고유 회사명 추출
 4. LLM 정규화 (수동/반자동)
+   4b. 미등록 회사명 근사 매칭 후보 생성 (alias_matcher)
 5. company_aliases.json 저장
 
 입력: ontology/input/meetings/RAN1/*.xlsx (59개 파일)
@@ -18,8 +19,13 @@ from pathlib import Path
 from collections import Counter
 import json
 import re
+import sys
 from typing import List, Tuple, Dict, Set
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from alias_matcher import AliasIndex, suggest_aliases, save_suggestions
+
 # 경로 설정
 PROJECT_ROOT = Path(__file__).parent.parent
 INPUT_DIR = PROJECT_ROOT / "input" / "meetings" / "RAN1"
@@ -354,6 +360,30 @@ def find_canonical_name(name: str) -> str:
     return name
 
 
+def find_unresolved_companies(companies: List[str]) -> List[str]:
+    """KNOWN_ALIASES로 해석되지 않는 유효 회사명 목록"""
+    unresolved = set()
+    for company in companies:
+        if not is_valid_company(company):
+            continue
+        normalized = normalize_company_name(company)
+        if find_canonical_name(normalized) not in KNOWN_ALIASES:
+            unresolved.add(normalized)
+    return sorted(unresolved)
+
+
+def build_alias_suggestions(companies: List[str], counts: Counter) -> List[Dict]:
+    """Step 4b: 미등록 회사명에 대한 대표명 후보 생성 (검토용)"""
+    index = AliasIndex.from_aliases(KNOWN_ALIASES)
+    unresolved = find_unresolved_companies(companies)
+
+    normalized_counts = Counter()
+    for company, count in counts.items():
+        normalized_counts[normalize_company_name(company)] += count
+
+    return suggest_aliases(unresolved, index, counts=normalized_counts)
+
+
 # ============================================================
 # Step 5: 결과 저장
 # ============================================================
@@ -468,10 +498,14 @@ def main():
     # Step 4: 정규화 적용
     aliases_dict = build_company_aliases(unique_companies, counts)
 
+    # Step 4b: 미등록 회사명 별칭 후보
+    suggestions = build_alias_suggestions(unique_companies, counts)
+
     # Step 5: 결과 저장
     output_path = INTERMEDIATE_DIR / "company_aliases.json"
     raw_output_path = INTERMEDIATE_DIR / "company_raw.json"
     save_results(aliases_dict, output_path, raw_output_path, unique_companies, counts)
+    save_suggestions(suggestions, INTERMEDIATE_DIR / "company_alias_suggestions.json")
 
     # 요약 출력
     print_summary(aliases_dict)
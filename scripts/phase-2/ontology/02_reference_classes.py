@@ -17,8 +17,10 @@ Spec 기반: docs/phase-2/specs/tdoc-ontology-spec.md Step 7.3
 8. WorkingGroup - To, Cc 컬럼
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Any
 from collections import defaultdict
@@ -26,6 +28,10 @@ import pandas as pd
 from concurrent.futures import ProcessPoolExecutor
 import warnings
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from jsonld_writer import FORMATS, DEFAULT_FORMAT, write_jsonld, output_path_for, remove_stale_outputs
+
 warnings.filterwarnings('ignore')
 
 # 경로 설정
@@ -157,30 +163,6 @@ def generate_meetings(files: List[Path]) -> Dict[str, dict]:
     return meetings
 
 
-def generate_releases(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """Release 인스턴스 생성
-
-    Spec 7.3.2: Release 컬럼 고유값
-    속성: releaseName
-    """
-    releases = {}
-
-    for df in all_data:
-        if 'Release' not in df.columns:
-            continue
-
-        for release in df['Release'].dropna().unique():
-            release = str(release).strip()
-            if release and release not in releases:
-                releases[release] = {
-                    "@id": f"tdoc:release/{release.replace('-', '_')}",
-                    "@type": "tdoc:Release",
-                    "tdoc:releaseName": release
-                }
-
-    return releases
-
-
 def generate_companies(aliases_path: Path) -> Dict[str, dict]:
     """Company 인스턴스 생성
 
@@ -205,31 +187,68 @@ def generate_companies(aliases_path: Path) -> Dict[str, dict]:
     return companies
 
 
-def generate_contacts(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """Contact 인스턴스 생성
+# ============================================================
+# 미팅별 부분 집합 (증분 빌드용)
+# ============================================================
 
-    Spec 7.3.4: Contact, Contact ID 컬럼
-    속성: contactName, contactId
-    """
-    contacts = {}
+# (키, 클래스명, 출력 파일) - Company는 별칭 사전 기반이라 미팅 단위 부분 집합에서 제외
+PARTIAL_CLASSES = [
+    ("meetings", "Meeting", "meetings.jsonld"),
+    ("releases", "Release", "releases.jsonld"),
+    ("contacts", "Contact", "contacts.jsonld"),
+    ("work_items", "WorkItem", "work_items.jsonld"),
+    ("agenda_items", "AgendaItem", "agenda_items.jsonld"),
+    ("specs", "Spec", "specs.jsonld"),
+    ("working_groups", "WorkingGroup", "working_groups.jsonld"),
+]
 
-    for df in all_data:
-        if 'Contact' not in df.columns or 'Contact ID' not in df.columns:
-            continue
 
-        for _, row in df.iterrows():
-            contact_name = row.get('Contact', '')
-            contact_id = row.get('Contact ID', '')
+def _column(df: pd.DataFrame, name: str) -> list:
+    """컬럼 값 리스트 (없으면 None으로 채움)"""
+    if name in df.columns:
+        return df[name].tolist()
+    return [None] * len(df)
 
-            if pd.isna(contact_name) or not str(contact_name).strip():
-                continue
 
+def _is_blank(value) -> bool:
+    return value is None or pd.isna(value) or not str(value).strip()
+
+
+def extract_reference_partial(df: pd.DataFrame, filepath: Path) -> Dict[str, Dict[str, dict]]:
+    """미팅 파일 1개의 Reference 인스턴스 부분 집합 (단일 패스)
+
+    Meeting 을 제외한 Reference 클래스를 행 1회 순회로 동시에 추출한다.
+    Spec 7.3.2 Release (releaseName), 7.3.4 Contact (contactName, contactId),
+    7.3.5 WorkItem (workItemCode), 7.3.6 AgendaItem (agendaNumber, agendaDescription),
+    7.3.7 Spec (specNumber), 7.3.8 WorkingGroup (wgName, To → Cc 순서 유지)
+    """
+    releases, contacts, work_items, agenda_items, specs = {}, {}, {}, {}, {}
+    wg_to, wg_cc = {}, {}
+
+    has_contact = 'Contact' in df.columns and 'Contact ID' in df.columns
+    has_agenda = 'Agenda item' in df.columns
+
+    rows = zip(
+        _column(df, 'Release'), _column(df, 'Contact'), _column(df, 'Contact ID'),
+        _column(df, 'Related WIs'), _column(df, 'Agenda item'), _column(df, 'Agenda item description'),
+        _column(df, 'Spec'), _column(df, 'To'), _column(df, 'Cc'),
+    )
+    for release, contact_name, contact_id, wis, agenda_num, agenda_desc, spec_num, to, cc in rows:
+        # Release
+        if release is not None and not pd.isna(release):
+            release = str(release).strip()
+            if release and release not in releases:
+                releases[release] = {
+                    "@id": f"tdoc:release/{release.replace('-', '_')}",
+                    "@type": "tdoc:Release",
+                    "tdoc:releaseName": release
+                }
+
+        # Contact
+        if has_contact and not _is_blank(contact_name):
             contact_name = str(contact_name).strip()
             contact_id = str(contact_id).strip() if not pd.isna(contact_id) else ""
-
-            # Contact ID를 키로 사용 (고유)
             key = contact_id if contact_id else contact_name
-
             if key and key not in contacts:
                 contacts[key] = {
                     "@id": f"tdoc:contact/{re.sub(r'[^a-zA-Z0-9]', '_', key)}",
@@ -238,24 +257,9 @@ def generate_contacts(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
                     "tdoc:contactId": contact_id
                 }
 
-    return contacts
-
-
-def generate_work_items(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """WorkItem 인스턴스 생성
-
-    Spec 7.3.5: Related WIs 컬럼
-    속성: workItemCode
-    """
-    work_items = {}
-
-    for df in all_data:
-        if 'Related WIs' not in df.columns:
-            continue
-
-        for value in df['Related WIs'].dropna():
-            items = parse_work_items(value)
-            for item in items:
+        # WorkItem
+        if wis is not None:
+            for item in parse_work_items(wis):
                 if item not in work_items:
                     work_items[item] = {
                         "@id": f"tdoc:workitem/{re.sub(r'[^a-zA-Z0-9_-]', '_', item)}",
@@ -263,31 +267,10 @@ def generate_work_items(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
                         "tdoc:workItemCode": item
                     }
 
-    return work_items
-
-
-def generate_agenda_items(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """AgendaItem 인스턴스 생성
-
-    Spec 7.3.6: Agenda item, Agenda item description 컬럼
-    속성: agendaNumber, agendaDescription
-    """
-    agenda_items = {}
-
-    for df in all_data:
-        if 'Agenda item' not in df.columns:
-            continue
-
-        for _, row in df.iterrows():
-            agenda_num = row.get('Agenda item', '')
-            agenda_desc = row.get('Agenda item description', '')
-
-            if pd.isna(agenda_num) or not str(agenda_num).strip():
-                continue
-
+        # AgendaItem
+        if has_agenda and not _is_blank(agenda_num):
             agenda_num = str(agenda_num).strip()
-            agenda_desc = str(agenda_desc).strip() if not pd.isna(agenda_desc) else ""
-
+            agenda_desc = "" if agenda_desc is None or pd.isna(agenda_desc) else str(agenda_desc).strip()
             if agenda_num not in agenda_items:
                 agenda_items[agenda_num] = {
                     "@id": f"tdoc:agenda/{re.sub(r'[^a-zA-Z0-9.]', '_', agenda_num)}",
@@ -296,26 +279,11 @@ def generate_agenda_items(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
                     "tdoc:agendaDescription": agenda_desc
                 }
             elif not agenda_items[agenda_num].get("tdoc:agendaDescription") and agenda_desc:
-                # 기존에 description이 없고 새로 발견되면 업데이트
                 agenda_items[agenda_num]["tdoc:agendaDescription"] = agenda_desc
 
-    return agenda_items
-
-
-def generate_specs(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """Spec 인스턴스 생성
-
-    Spec 7.3.7: Spec 컬럼
-    속성: specNumber
-    """
-    specs = {}
-
-    for df in all_data:
-        if 'Spec' not in df.columns:
-            continue
-
-        for value in df['Spec'].dropna():
-            spec_num = str(value).strip()
+        # Spec
+        if spec_num is not None and not pd.isna(spec_num):
+            spec_num = str(spec_num).strip()
             if spec_num and spec_num not in specs:
                 specs[spec_num] = {
                     "@id": f"tdoc:spec/{spec_num.replace('.', '_')}",
@@ -323,60 +291,106 @@ def generate_specs(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
                     "tdoc:specNumber": spec_num
                 }
 
-    return specs
+        # WorkingGroup (To / Cc)
+        for value, target in ((to, wg_to), (cc, wg_cc)):
+            if value is None:
+                continue
+            for wg in parse_working_groups(value):
+                target.setdefault(wg, None)
+
+    working_groups = {}
+    for wg in list(wg_to) + list(wg_cc):
+        if wg not in working_groups:
+            working_groups[wg] = {
+                "@id": f"tdoc:wg/{re.sub(r'[^a-zA-Z0-9]', '_', wg)}",
+                "@type": "tdoc:WorkingGroup",
+                "tdoc:wgName": wg
+            }
+
+    return {
+        "meetings": generate_meetings([filepath]),
+        "releases": releases,
+        "contacts": contacts,
+        "work_items": work_items,
+        "agenda_items": agenda_items,
+        "specs": specs,
+        "working_groups": working_groups,
+    }
 
 
-def generate_working_groups(all_data: List[pd.DataFrame]) -> Dict[str, dict]:
-    """WorkingGroup 인스턴스 생성
+def extract_file_partial(filepath: Path) -> Dict[str, Dict[str, dict]]:
+    """파일 로드 + 부분 집합 추출 (ProcessPoolExecutor 작업 단위)"""
+    return extract_reference_partial(load_excel_file(filepath), filepath)
 
-    Spec 7.3.8: To, Cc 컬럼
-    속성: wgName
-    """
-    working_groups = {}
 
-    for df in all_data:
-        # To 컬럼
-        if 'To' in df.columns:
-            for value in df['To'].dropna():
-                wgs = parse_working_groups(value)
-                for wg in wgs:
-                    if wg not in working_groups:
-                        working_groups[wg] = {
-                            "@id": f"tdoc:wg/{re.sub(r'[^a-zA-Z0-9]', '_', wg)}",
-                            "@type": "tdoc:WorkingGroup",
-                            "tdoc:wgName": wg
-                        }
-
-        # Cc 컬럼
-        if 'Cc' in df.columns:
-            for value in df['Cc'].dropna():
-                wgs = parse_working_groups(value)
-                for wg in wgs:
-                    if wg not in working_groups:
-                        working_groups[wg] = {
-                            "@id": f"tdoc:wg/{re.sub(r'[^a-zA-Z0-9]', '_', wg)}",
-                            "@type": "tdoc:WorkingGroup",
-                            "tdoc:wgName": wg
-                        }
-
-    return working_groups
-
-
-def save_jsonld(data: Dict[str, dict], output_path: Path, class_name: str):
-    """JSON-LD 형식으로 저장"""
-    output = {
-        **CONTEXT,
-        "@graph": list(data.values())
+def extract_references(files: List[Path], workers: int = None) -> Dict[str, Dict[str, dict]]:
+    """전체 파일 Reference 추출: 파일별 병렬 단일 패스 → 입력 순서대로 병합"""
+    if workers == 1:
+        partials = [extract_file_partial(filepath) for filepath in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(extract_file_partial, files))
+    return merge_reference_partials(partials)
+
+
+def merge_reference_partials(partials: List[Dict[str, Dict[str, dict]]]) -> Dict[str, Dict[str, dict]]:
+    """부분 집합 병합 (입력 파일 순서대로 전달 시 전체 생성과 동일한 결과)
+
+    - 먼저 등장한 인스턴스 유지 (generate_* 와 동일)
+    - AgendaItem: 기존 description이 비어 있으면 이후 값으로 보완
+    """
+    merged = {key: {} for key, _, _ in PARTIAL_CLASSES}
+    for partial in partials:
+        for key, _, _ in PARTIAL_CLASSES:
+            target = merged[key]
+            for item_key, instance in partial.get(key, {}).items():
+                if item_key not in target:
+                    target[item_key] = dict(instance)
+                elif key == "agenda_items":
+                    desc = instance.get("tdoc:agendaDescription")
+                    if desc and not target[item_key].get("tdoc:agendaDescription"):
+                        target[item_key]["tdoc:agendaDescription"] = desc
+    return merged
+
+
+def save_reference_summary(references: Dict[str, Dict[str, dict]], companies: Dict[str, dict]):
+    """Phase B 결과를 intermediate에도 저장 (Phase C에서 참조용)"""
+    reference_summary = {
+        "meetings": list(references["meetings"].keys()),
+        "releases": list(references["releases"].keys()),
+        "companies": list(companies.keys()),
+        "contacts": list(references["contacts"].keys()),
+        "work_items": list(references["work_items"].keys()),
+        "agenda_items": list(references["agenda_items"].keys()),
+        "specs": list(references["specs"].keys()),
+        "working_groups": list(references["working_groups"].keys())
     }
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    summary_path = INTERMEDIATE_DIR / "reference_summary.json"
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(reference_summary, f, ensure_ascii=False, indent=2)
+    print(f"\n참조 요약 저장: {summary_path}")
+
+
+def save_jsonld(data: Dict[str, dict], output_path: Path, class_name: str, fmt: str = DEFAULT_FORMAT):
+    """JSON-LD 형식으로 저장 (@graph 항목을 스트리밍 기록)"""
+    output_path = output_path_for(output_path.parent, output_path.stem, fmt)
+    write_jsonld(output_path, CONTEXT["@context"], data.values(), fmt)
+    remove_stale_outputs(output_path.parent, output_path.stem, [output_path])  # 다른 형식의 이전 출력
 
     print(f"  ✅ {class_name}: {len(data)}개 → {output_path.name}")
 
 
 def main():
     """Phase B 메인 실행"""
+    parser = argparse.ArgumentParser(description="Phase B: Reference 클래스 인스턴스 생성")
+    parser.add_argument('--format', choices=FORMATS, default=DEFAULT_FORMAT,
+                        help='출력 형식: pretty(들여쓰기), compact(들여쓰기 없음), ndjson')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='파일별 추출 병렬 프로세스 수 (기본: CPU 수, 1이면 순차)')
+    args = parser.parse_args()
+    fmt = args.format
+
     print("=" * 60)
     print("Phase B: Reference 클래스 인스턴스 생성")
     print("=" * 60)
@@ -388,59 +402,31 @@ def main():
     files = sorted(INPUT_DIR.glob("*.xlsx"))
     print(f"\n입력 파일: {len(files)}개")
 
-    # 모든 Excel 파일 로드
-    print("\n[1/9] 데이터 로딩 중...")
-    all_data = []
-    for filepath in files:
-        df = load_excel_file(filepath)
-        if not df.empty:
-            all_data.append(df)
-    print(f"  로드 완료: {len(all_data)}개 파일")
-
-    # 1. Meeting
-    print("\n[2/9] Meeting 인스턴스 생성...")
-    meetings = generate_meetings(files)
-    save_jsonld(meetings, OUTPUT_DIR / "meetings.jsonld", "Meeting")
-
-    # 2. Release
-    print("\n[3/9] Release 인스턴스 생성...")
-    releases = generate_releases(all_data)
-    save_jsonld(releases, OUTPUT_DIR / "releases.jsonld", "Release")
-
-    # 3. Company
-    print("\n[4/9] Company 인스턴스 생성...")
+    # 파일별 병렬 단일 패스 추출 (Company 제외 7개 클래스)
+    print("\n[1/3] Reference 추출 중 (파일별 단일 패스)...")
+    references = extract_references(files, args.workers)
+    meetings = references["meetings"]
+    releases = references["releases"]
+    contacts = references["contacts"]
+    work_items = references["work_items"]
+    agenda_items = references["agenda_items"]
+    specs = references["specs"]
+    working_groups = references["working_groups"]
+    print(f"  추출 완료: {len(files)}개 파일")
+
+    # Company
+    print("\n[2/3] Company 인스턴스 생성...")
     aliases_path = INTERMEDIATE_DIR / "company_aliases_significant.json"
     if aliases_path.exists():
         companies = generate_companies(aliases_path)
-        save_jsonld(companies, OUTPUT_DIR / "companies.jsonld", "Company")
+        save_jsonld(companies, OUTPUT_DIR / "companies.jsonld", "Company", fmt)
     else:
         print(f"  ⚠️ {aliases_path} 없음 - Phase A를 먼저 실행하세요")
         companies = {}
 
-    # 4. Contact
-    print("\n[5/9] Contact 인스턴스 생성...")
-    contacts = generate_contacts(all_data)
-    save_jsonld(contacts, OUTPUT_DIR / "contacts.jsonld", "Contact")
-
-    # 5. WorkItem
-    print("\n[6/9] WorkItem 인스턴스 생성...")
-    work_items = generate_work_items(all_data)
-    save_jsonld(work_items, OUTPUT_DIR / "work_items.jsonld", "WorkItem")
-
-    # 6. AgendaItem
-    print("\n[7/9] AgendaItem 인스턴스 생성...")
-    agenda_items = generate_agenda_items(all_data)
-    save_jsonld(agenda_items, OUTPUT_DIR / "agenda_items.jsonld", "AgendaItem")
-
-    # 7. Spec
-    print("\n[8/9] Spec 인스턴스 생성...")
-    specs = generate_specs(all_data)
-    save_jsonld(specs, OUTPUT_DIR / "specs.jsonld", "Spec")
-
-    # 8. WorkingGroup
-    print("\n[9/9] WorkingGroup 인스턴스 생성...")
-    working_groups = generate_working_groups(all_data)
-    save_jsonld(working_groups, OUTPUT_DIR / "working_groups.jsonld", "WorkingGroup")
+    print("\n[3/3] JSON-LD 저장...")
+    for key, class_name, filename in PARTIAL_CLASSES:
+        save_jsonld(references[key], OUTPUT_DIR / filename, class_name, fmt)
 
     # 요약
     print("\n" + "=" * 60)
@@ -462,21 +448,7 @@ def main():
     print(f"\n출력 디렉토리: {OUTPUT_DIR}")
 
     # Phase B 결과를 intermediate에도 저장 (Phase C에서 참조용)
-    reference_summary = {
-        "meetings": list(meetings.keys()),
-        "releases": list(releases.keys()),
-        "companies": list(companies.keys()),
-        "contacts": list(contacts.keys()),
-        "work_items": list(work_items.keys()),
-        "agenda_items": list(agenda_items.keys()),
-        "specs": list(specs.keys()),
-        "working_groups": list(working_groups.keys())
-    }
-
-    summary_path = INTERMEDIATE_DIR / "reference_summary.json"
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(reference_summary, f, ensure_ascii=False, indent=2)
-    print(f"\n참조 요약 저장: {summary_path}")
+    save_reference_summary(references, companies)
 
 
 if __name__ == "__main__":
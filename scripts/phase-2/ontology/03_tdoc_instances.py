@@ -5,6 +5,7 @@ Phase C: Tdoc/CR/LS 인스턴스 생성
 Spec 기반: docs/phase-2/specs/tdoc-ontology-spec.md Step 7.3.9~7.3.11
 입력: ontology/input/meetings/RAN1/*.xlsx (59개 파일)
 출력: ontology/output/instances/tdocs.jsonld
+      (--shard: ontology/output/instances/tdocs/{meeting}.jsonld 미팅별 샤드)
 
 클래스별 판단 로직 (Spec 4.5):
 - CR: Type이 'CR', 'draftCR', 'pCR'
@@ -12,8 +13,10 @@ Spec 기반: docs/phase-2/specs/tdoc-ontology-spec.md Step 7.3.9~7.3.11
 - Tdoc: 그 외 모든 Type
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from collections import defaultdict
@@ -21,6 +24,12 @@ import pandas as pd
 from datetime import datetime
 import warnings
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from jsonld_writer import (
+    FORMATS, DEFAULT_FORMAT, JsonLdWriter, output_path_for, shard_name, graph_size_bytes, remove_stale_outputs
+)
+
 warnings.filterwarnings('ignore')
 
 # 경로 설정
@@ -448,6 +457,12 @@ def process_file(filepath: Path, company_map: Dict[str, str]) -> Tuple[List[dict
         print(f"  Error loading {filepath.name}: {e}")
         return [], {}
 
+    return process_dataframe(df, meeting_id, company_map)
+
+
+def process_dataframe(df: pd.DataFrame, meeting_id: str,
+                      company_map: Dict[str, str]) -> Tuple[List[dict], Dict[str, int]]:
+    """로드된 미팅 DataFrame 처리 (증분 빌드에서 파일을 한 번만 읽기 위해 분리)"""
     instances = []
     stats = {"Tdoc": 0, "CR": 0, "LS": 0}
 
@@ -471,46 +486,68 @@ def process_file(filepath: Path, company_map: Dict[str, str]) -> Tuple[List[dict
 
 def main():
     """Phase C 메인 실행"""
+    parser = argparse.ArgumentParser(description="Phase C: Tdoc/CR/LS 인스턴스 생성")
+    parser.add_argument('--format', choices=FORMATS, default=DEFAULT_FORMAT,
+                        help='출력 형식: pretty(들여쓰기), compact(들여쓰기 없음), ndjson')
+    parser.add_argument('--shard', action='store_true',
+                        help='미팅별 샤드 파일로 분할 저장 (tdocs/{meeting}.*)')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Phase C: Tdoc/CR/LS 인스턴스 생성")
     print("=" * 60)
 
     # Company 정규화 맵 로드
-    print("\n[1/4] Company 정규화 맵 로딩...")
+    print("\n[1/3] Company 정규화 맵 로딩...")
     company_map = load_company_aliases()
     print(f"  정규화 맵 로드: {len(company_map)}개 별칭")
 
     # 입력 파일 목록
     files = sorted(INPUT_DIR.glob("*.xlsx"))
-    print(f"\n[2/4] 입력 파일: {len(files)}개")
-
-    # 파일별 처리
-    print("\n[3/4] 인스턴스 생성 중...")
-    all_instances = []
-    total_stats = {"Tdoc": 0, "CR": 0, "LS": 0}
+    print(f"\n[2/3] 입력 파일: {len(files)}개")
 
-    for i, filepath in enumerate(files, 1):
-        instances, stats = process_file(filepath, company_map)
-        all_instances.extend(instances)
-
-        for k, v in stats.items():
-            total_stats[k] += v
-
-        if i % 10 == 0 or i == len(files):
-            print(f"  {i}/{len(files)} 파일 처리 완료...")
-
-    # 저장
-    print(f"\n[4/4] JSON-LD 저장...")
+    # 파일별 처리 + 즉시 기록 (전체 인스턴스를 메모리에 모으지 않음)
+    print(f"\n[3/3] 인스턴스 생성 및 JSON-LD 스트리밍 저장 ({args.format})...")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    total_stats = {"Tdoc": 0, "CR": 0, "LS": 0}
+    context = CONTEXT["@context"]
 
-    output = {
-        **CONTEXT,
-        "@graph": all_instances
-    }
+    written = []
+    if args.shard:
+        output_path = OUTPUT_DIR / "tdocs"
+        writer = None
+    else:
+        output_path = output_path_for(OUTPUT_DIR, "tdocs", args.format)
+        writer = JsonLdWriter(output_path, context, args.format)
+        writer.open()
 
-    output_path = OUTPUT_DIR / "tdocs.jsonld"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    try:
+        for i, filepath in enumerate(files, 1):
+            instances, stats = process_file(filepath, company_map)
+
+            if args.shard:
+                meeting_id = extract_meeting_from_filename(filepath.name)
+                if meeting_id:
+                    shard_path = output_path_for(output_path, shard_name(meeting_id), args.format)
+                    with JsonLdWriter(shard_path, context, args.format) as shard_writer:
+                        shard_writer.write_many(instances)
+                    written.append(shard_path)
+            else:
+                writer.write_many(instances)
+
+            for k, v in stats.items():
+                total_stats[k] += v
+
+            if i % 10 == 0 or i == len(files):
+                print(f"  {i}/{len(files)} 파일 처리 완료...")
+    finally:
+        if writer is not None:
+            writer.close()
+            written.append(output_path)
+
+    # 다른 형식 / 샤드 여부의 이전 출력 제거 (resolve_graph_path 가 tdocs.jsonld 를 먼저 읽음)
+    for stale in remove_stale_outputs(OUTPUT_DIR, "tdocs", written):
+        print(f"  🗑️ {stale.relative_to(OUTPUT_DIR)} (이전 출력)")
 
     # 요약
     print("\n" + "=" * 60)
@@ -525,8 +562,8 @@ def main():
     print(f"  {'─' * 22}")
     print(f"  총계:        {total:>8}개")
 
-    print(f"\n출력 파일: {output_path}")
-    print(f"파일 크기: {output_path.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"\n출력 경로: {output_path}")
+    print(f"파일 크기: {graph_size_bytes(output_path) / 1024 / 1024:.1f} MB")
 
 
 if __name__ == "__main__":
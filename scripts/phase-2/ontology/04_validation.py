@@ -9,18 +9,32 @@ Spec 기반: docs/phase-2/specs/tdoc-ontology-spec.md Step 7.10
 3. 필수 속성: 모두 존재
 4. 내부 참조: 모두 유효
 5. Enum 값: 정의된 범위 내
+
+출력 파일은 InstanceStore로 한 번만 파싱하고, Tdoc/CR/LS 규칙(2~5)은
+행 단위 단일 패스로 함께 적용한다 (--workers 로 청크 병렬).
 """
 
+import argparse
 import json
+import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Any
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from jsonld_writer import load_graph
+from instance_store import InstanceStore, Table
+from shape_constraints import parse_ttl, enum_values
+
 # 경로 설정
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output" / "instances"
 REPORT_DIR = BASE_DIR / "output"
+TTL_PATH = BASE_DIR / "tdoc-ontology.ttl"
 
 # 예상 수치 (Spec 7.2.1)
 EXPECTED_COUNTS = {
@@ -37,231 +51,224 @@ EXPECTED_COUNTS = {
     "LS": 6301
 }
 
-# Enum 정의 (Spec 6.8)
-ENUMS = {
-    "type": {
-        "discussion", "other", "draftCR", "LS out", "CR", "LS in",
-        "draft TR", "report", "agenda", "draft TS", "Work Plan",
-        "pCR", "response", "WID new", "SID new", "WI summary"
-    },
-    "status": {
-        "not treated", "available", "noted", "revised", "agreed",
-        "withdrawn", "not pursued", "endorsed", "approved", "treated",
-        "postponed", "reserved", "merged", "not concluded", "conditionally agreed"
-    },
-    "for": {
-        "Decision", "Discussion", "Agreement", "Approval",
-        "Endorsement", "Information", "Presentation", "Action"
-    },
-    "direction": {"in", "out"},
-    "crCategory": {"F", "B", "A", "D", "C", "E"}
+# Enum 정의 (Spec 6.8) - tdoc-ontology.ttl rdfs:comment 의 "Values:" 목록에서 로드
+ENUMS = enum_values(parse_ttl(TTL_PATH))
+
+
+# Reference 클래스 → 출력 파일 stem
+REF_FILES = {
+    "Meeting": "meetings",
+    "Release": "releases",
+    "Company": "companies",
+    "Contact": "contacts",
+    "WorkItem": "work_items",
+    "AgendaItem": "agenda_items",
+    "Spec": "specs",
+    "WorkingGroup": "working_groups"
 }
 
+# Tdoc/CR/LS 규칙
+TDOC_REQUIRED = ["tdocNumber", "title", "type", "status"]
+LS_REQUIRED = ["direction"]  # CR의 modifies는 선택
+REF_PROPERTIES = [
+    "submittedBy", "hasContact", "relatedTo", "belongsTo",
+    "targetRelease", "presentedAt", "modifies", "sentTo", "ccTo"
+]
 
-def load_jsonld(filepath: Path) -> List[dict]:
-    """JSON-LD 파일 로드"""
-    if not filepath.exists():
-        return []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data.get("@graph", [])
+# 에러 샘플 수 (리포트용)
+MAX_PROP_ERRORS = 10
+MAX_REF_ERRORS = 5
 
+# 규칙 청크 크기 (병렬 실행 단위)
+CHUNK_SIZE = 20000
 
-def validate_instance_count() -> Tuple[bool, Dict[str, Tuple[int, int]]]:
-    """검증 1: 인스턴스 수 검증"""
-    results = {}
-    all_passed = True
 
-    # Reference 클래스
-    ref_files = {
-        "Meeting": "meetings.jsonld",
-        "Release": "releases.jsonld",
-        "Company": "companies.jsonld",
-        "Contact": "contacts.jsonld",
-        "WorkItem": "work_items.jsonld",
-        "AgendaItem": "agenda_items.jsonld",
-        "Spec": "specs.jsonld",
-        "WorkingGroup": "working_groups.jsonld"
-    }
-
-    for class_name, filename in ref_files.items():
-        instances = load_jsonld(OUTPUT_DIR / filename)
-        actual = len(instances)
-        expected = EXPECTED_COUNTS.get(class_name, 0)
-        results[class_name] = (expected, actual)
-        if actual != expected:
-            all_passed = False
+def load_jsonld(filepath: Path) -> List[dict]:
+    """JSON-LD 파일 로드 (compact/NDJSON, 미팅별 샤드 디렉토리 포함)"""
+    return load_graph(filepath)
 
-    # Tdoc/CR/LS
-    tdocs = load_jsonld(OUTPUT_DIR / "tdocs.jsonld")
-    type_counts = defaultdict(int)
-    for item in tdocs:
-        item_type = item.get("@type", "")
-        if item_type == "tdoc:Tdoc":
-            type_counts["Tdoc"] += 1
-        elif item_type == "tdoc:CR":
-            type_counts["CR"] += 1
-        elif item_type == "tdoc:LS":
-            type_counts["LS"] += 1
 
-    for class_name in ["Tdoc", "CR", "LS"]:
-        actual = type_counts[class_name]
-        expected = EXPECTED_COUNTS.get(class_name, 0)
-        results[class_name] = (expected, actual)
-        if actual != expected:
-            all_passed = False
+# ============================================================
+# 단일 패스 규칙 실행
+# ============================================================
 
-    return all_passed, results
+class RuleResult:
+    """Tdoc/CR/LS 규칙 결과 (청크별 결과를 순서대로 병합 가능)
 
+    에러는 전체 건수와 앞쪽 샘플만 보관한다.
+    """
 
-def validate_required_properties() -> Tuple[bool, Dict[str, List[str]]]:
-    """검증 2: 필수 속성 검증"""
-    errors = defaultdict(list)
-    all_passed = True
+    def __init__(self):
+        self.type_counts = defaultdict(int)
+        self.missing: Dict[str, List] = {}      # item_type → [건수, 샘플]
+        self.ref_stats = defaultdict(int)
+        self.ref_errors: Dict[str, List] = {}   # prop → [건수, 샘플]
+        self.ref_notes = defaultdict(int)
+        self.invalid_values: Dict[str, Dict[str, int]] = {}  # enum → {값: 건수}
+
+    @staticmethod
+    def _add_error(target: Dict[str, List], key: str, message: str, limit: int):
+        entry = target.setdefault(key, [0, []])
+        entry[0] += 1
+        if len(entry[1]) < limit:
+            entry[1].append(message)
+
+    def merge(self, other: "RuleResult"):
+        for k, v in other.type_counts.items():
+            self.type_counts[k] += v
+        for target, source, limit in ((self.missing, other.missing, MAX_PROP_ERRORS),
+                                      (self.ref_errors, other.ref_errors, MAX_REF_ERRORS)):
+            for key, (count, samples) in source.items():
+                entry = target.setdefault(key, [0, []])
+                entry[0] += count
+                entry[1].extend(samples[:limit - len(entry[1])])
+        for k, v in other.ref_stats.items():
+            self.ref_stats[k] += v
+        for k, v in other.ref_notes.items():
+            self.ref_notes[k] += v
+        for enum_name, values in other.invalid_values.items():
+            target = self.invalid_values.setdefault(enum_name, {})
+            for val, count in values.items():
+                target[val] = target.get(val, 0) + count
+
+
+def _sampled(errors: Dict[str, List], limit: int) -> Dict[str, List[str]]:
+    """[건수, 샘플] → 기존 리포트 형식의 에러 목록"""
+    result = {}
+    for key, (count, samples) in errors.items():
+        result[key] = samples + ([f"... and {count - limit} more"] if count > limit else [])
+    return result
+
+
+# 워커 프로세스용 입력 (fork 시 복사 없이 상속)
+_RULE_INPUT = None
+
+
+def _init_rule_worker(tdocs: Table, valid_ids: Set[str]):
+    global _RULE_INPUT
+    _RULE_INPUT = (tdocs, valid_ids)
+
+
+def check_tdoc_rows(start: int, end: int) -> RuleResult:
+    """[start, end) 행에 인스턴스 수/필수 속성/내부 참조/Enum 규칙을 한 번에 적용"""
+    tdocs, valid_ids = _RULE_INPUT
+    result = RuleResult()
+
+    required = [(prop, tdocs.column(f"tdoc:{prop}")) for prop in TDOC_REQUIRED]
+    ls_required = [(prop, tdocs.column(f"tdoc:{prop}")) for prop in LS_REQUIRED]
+    references = [(prop, tdocs.columns[f"tdoc:{prop}"]) for prop in REF_PROPERTIES
+                  if f"tdoc:{prop}" in tdocs.columns]
+    enums = [(name, tdocs.column(f"tdoc:{name}")) for name in ENUMS]
+
+    for i in range(start, end):
+        item_type = tdocs.types[i]
+        item_id = tdocs.ids[i]
+
+        # 검증 1: 클래스 분류
+        if item_type in ("tdoc:Tdoc", "tdoc:CR", "tdoc:LS"):
+            result.type_counts[item_type[5:]] += 1
+
+        # 검증 2: 필수 속성
+        for prop, column in required:
+            if not column[i]:
+                result._add_error(result.missing, item_type, f"{item_id}: missing {prop}", MAX_PROP_ERRORS)
+        if item_type == "tdoc:LS":
+            for prop, column in ls_required:
+                if not column[i]:
+                    result._add_error(result.missing, item_type, f"{item_id}: missing {prop}", MAX_PROP_ERRORS)
+
+        # 검증 3: 내부 참조
+        for prop, column in references:
+            refs = column[i]
+            if refs is None:
+                continue
+            if not isinstance(refs, list):
+                refs = [refs]
+            for ref in refs:
+                result.ref_stats[prop] += 1
+                if ref in valid_ids:
+                    continue
+                # 외부 참조는 허용 (다른 미팅의 Tdoc 등)
+                if ref.startswith("tdoc:R"):
+                    continue
+                # submittedBy: low-frequency 회사는 정규화에서 제외되었으므로 참고사항으로 처리
+                if prop == "submittedBy":
+                    result.ref_notes["submittedBy (low-frequency company)"] += 1
+                    continue
+                result._add_error(result.ref_errors, prop, f"{item_id} → {ref}", MAX_REF_ERRORS)
+
+        # 검증 4: Enum 값
+        for name, column in enums:
+            value = column[i]
+            if value and value not in ENUMS[name]:
+                invalid = result.invalid_values.setdefault(name, {})
+                invalid[value] = invalid.get(value, 0) + 1
+
+    return result
+
+
+def run_tdoc_rules(store: InstanceStore, workers: int = 1) -> RuleResult:
+    """Tdoc/CR/LS 전체에 규칙 적용 (workers > 1 이면 청크 단위 병렬)"""
+    tdocs = store.table("tdocs")
+    valid_ids = store.ids_in(list(REF_FILES.values()) + ["tdocs"])
+    _init_rule_worker(tdocs, valid_ids)
+
+    chunks = [(i, min(i + CHUNK_SIZE, len(tdocs))) for i in range(0, len(tdocs), CHUNK_SIZE)]
+    result = RuleResult()
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rule_worker,
+                                 initargs=(tdocs, valid_ids)) as executor:
+            partials = list(executor.map(check_tdoc_rows, *zip(*chunks)))
+    else:
+        partials = [check_tdoc_rows(start, end) for start, end in chunks]
+    for partial in partials:
+        result.merge(partial)
+    return result
 
-    # Tdoc 필수 속성
-    tdoc_required = ["tdocNumber", "title", "type", "status"]
-    cr_required = []  # modifies는 선택
-    ls_required = ["direction"]
 
-    tdocs = load_jsonld(OUTPUT_DIR / "tdocs.jsonld")
+# ============================================================
+# 검증 항목
+# ============================================================
 
-    for item in tdocs:
-        item_type = item.get("@type", "")
-        item_id = item.get("@id", "unknown")
+def validate_instance_count(store: InstanceStore, rules: RuleResult) -> Tuple[bool, Dict[str, Tuple[int, int]]]:
+    """검증 1: 인스턴스 수 검증"""
+    results = {}
 
-        # 기본 Tdoc 속성
-        for prop in tdoc_required:
-            if not item.get(f"tdoc:{prop}"):
-                errors[item_type].append(f"{item_id}: missing {prop}")
-                all_passed = False
+    # Reference 클래스
+    for class_name, name in REF_FILES.items():
+        results[class_name] = (EXPECTED_COUNTS.get(class_name, 0), store.count(name))
 
-        # LS 추가 검증
-        if item_type == "tdoc:LS":
-            for prop in ls_required:
-                if not item.get(f"tdoc:{prop}"):
-                    errors[item_type].append(f"{item_id}: missing {prop}")
-                    all_passed = False
+    # Tdoc/CR/LS
+    for class_name in ["Tdoc", "CR", "LS"]:
+        results[class_name] = (EXPECTED_COUNTS.get(class_name, 0), rules.type_counts[class_name])
 
-    # 에러가 너무 많으면 샘플만 유지
-    for k in errors:
-        if len(errors[k]) > 10:
-            errors[k] = errors[k][:10] + [f"... and {len(errors[k]) - 10} more"]
+    all_passed = all(expected == actual for expected, actual in results.values())
+    return all_passed, results
 
-    return all_passed, dict(errors)
 
+def validate_required_properties(rules: RuleResult) -> Tuple[bool, Dict[str, List[str]]]:
+    """검증 2: 필수 속성 검증"""
+    errors = _sampled(rules.missing, MAX_PROP_ERRORS)
+    return not errors, errors
 
-def validate_internal_references() -> Tuple[bool, Dict[str, int], Dict[str, List[str]], Dict[str, int]]:
+
+def validate_internal_references(rules: RuleResult) -> Tuple[bool, Dict[str, int], Dict[str, List[str]], Dict[str, int]]:
     """검증 3: 내부 참조 무결성 검증
 
     Note: submittedBy는 significant company(10건+)만 등록되므로
     low-frequency 회사 참조는 '유효하지 않음'으로 처리하지 않음
     """
-    # 유효한 ID 수집
-    valid_ids = set()
-
-    # Reference 클래스
-    ref_files = [
-        "meetings.jsonld", "releases.jsonld", "companies.jsonld",
-        "contacts.jsonld", "work_items.jsonld", "agenda_items.jsonld",
-        "specs.jsonld", "working_groups.jsonld", "tdocs.jsonld"
-    ]
-
-    for filename in ref_files:
-        for item in load_jsonld(OUTPUT_DIR / filename):
-            valid_ids.add(item.get("@id", ""))
-
-    # 참조 검증
-    stats = defaultdict(int)
-    errors = defaultdict(list)
-    notes = defaultdict(int)  # 참고사항 (에러가 아닌 정보)
-    all_passed = True
-
-    tdocs = load_jsonld(OUTPUT_DIR / "tdocs.jsonld")
-
-    # 검증할 참조 속성
-    ref_properties = [
-        "submittedBy", "hasContact", "relatedTo", "belongsTo",
-        "targetRelease", "presentedAt", "modifies", "sentTo", "ccTo"
-    ]
-
-    for item in tdocs:
-        item_id = item.get("@id", "")
-
-        for prop in ref_properties:
-            full_prop = f"tdoc:{prop}"
-            if full_prop not in item:
-                continue
-
-            refs = item[full_prop]
-            if not isinstance(refs, list):
-                refs = [refs]
-
-            for ref in refs:
-                stats[prop] += 1
-                if ref not in valid_ids:
-                    # 외부 참조는 허용 (다른 미팅의 Tdoc 등)
-                    if ref.startswith("tdoc:R"):
-                        continue
-
-                    # submittedBy: low-frequency 회사는 정규화에서 제외되었으므로 참고사항으로 처리
-                    if prop == "submittedBy":
-                        notes["submittedBy (low-frequency company)"] += 1
-                        continue
-
-                    errors[prop].append(f"{item_id} → {ref}")
-                    all_passed = False
+    errors = _sampled(rules.ref_errors, MAX_REF_ERRORS)
+    return not errors, dict(rules.ref_stats), errors, dict(rules.ref_notes)
 
-    # 에러 샘플링
-    for k in errors:
-        if len(errors[k]) > 5:
-            errors[k] = errors[k][:5] + [f"... and {len(errors[k]) - 5} more"]
 
-    return all_passed, dict(stats), dict(errors), dict(notes)
+def validate_enum_values(rules: RuleResult) -> Tuple[bool, Dict[str, Dict[str, int]]]:
+    """검증 4: Enum 값 검증"""
+    invalid_values = {k: dict(v) for k, v in rules.invalid_values.items()}
+    return not invalid_values, invalid_values
 
 
-def validate_enum_values() -> Tuple[bool, Dict[str, Dict[str, int]]]:
-    """검증 4: Enum 값 검증"""
-    invalid_values = defaultdict(lambda: defaultdict(int))
-    all_passed = True
-
-    tdocs = load_jsonld(OUTPUT_DIR / "tdocs.jsonld")
-
-    for item in tdocs:
-        # type
-        type_val = item.get("tdoc:type", "")
-        if type_val and type_val not in ENUMS["type"]:
-            invalid_values["type"][type_val] += 1
-            all_passed = False
-
-        # status
-        status_val = item.get("tdoc:status", "")
-        if status_val and status_val not in ENUMS["status"]:
-            invalid_values["status"][status_val] += 1
-            all_passed = False
-
-        # for
-        for_val = item.get("tdoc:for", "")
-        if for_val and for_val not in ENUMS["for"]:
-            invalid_values["for"][for_val] += 1
-            all_passed = False
-
-        # direction (LS only)
-        direction_val = item.get("tdoc:direction", "")
-        if direction_val and direction_val not in ENUMS["direction"]:
-            invalid_values["direction"][direction_val] += 1
-            all_passed = False
-
-        # crCategory (CR only)
-        cr_cat = item.get("tdoc:crCategory", "")
-        if cr_cat and cr_cat not in ENUMS["crCategory"]:
-            invalid_values["crCategory"][cr_cat] += 1
-            all_passed = False
-
-    return all_passed, {k: dict(v) for k, v in invalid_values.items()}
-
-
-def generate_report(results: Dict[str, Any]) -> str:
+def generate_report(results: Dict[str, Any], store: InstanceStore) -> str:
     """검증 리포트 생성"""
     report = []
     report.append("# Ontology 검증 리포트")
@@ -377,10 +384,11 @@ def generate_report(results: Dict[str, Any]) -> str:
     report.append("| 파일 | 인스턴스 수 | 크기 |")
     report.append("|------|------------|------|")
 
-    for filename in sorted(OUTPUT_DIR.glob("*.jsonld")):
-        instances = load_jsonld(filename)
-        size_mb = filename.stat().st_size / 1024 / 1024
-        report.append(f"| {filename.name} | {len(instances):,} | {size_mb:.1f} MB |")
+    for path in store.discover():
+        table = store.add_file(path)
+        size_mb = table.size_bytes / 1024 / 1024
+        name = f"{path.name}/" if path.is_dir() else path.name
+        report.append(f"| {name} | {len(table):,} | {size_mb:.1f} MB |")
 
     report.append("")
 
@@ -389,29 +397,43 @@ def generate_report(results: Dict[str, Any]) -> str:
 
 def main():
     """Phase D 메인 실행"""
+    parser = argparse.ArgumentParser(description="Phase D: 온톨로지 검증")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Tdoc 규칙 병렬 프로세스 수 (기본: 1)')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Phase D: 온톨로지 검증")
     print("=" * 60)
 
     results = {}
 
+    # 출력 파일 1회 로드 → 인덱스 구성
+    print("\n[0/4] 인스턴스 로드...")
+    start = time.time()
+    store = InstanceStore.load(OUTPUT_DIR)
+    print(f"  {len(store.tables)}개 파일, {sum(len(t) for t in store.tables.values()):,}개 인스턴스 ({time.time() - start:.1f}s)")
+
+    # Tdoc/CR/LS 규칙 단일 패스
+    rules = run_tdoc_rules(store, args.workers)
+
     # 검증 1: 인스턴스 수
     print("\n[1/4] 인스턴스 수 검증...")
-    count_passed, count_results = validate_instance_count()
+    count_passed, count_results = validate_instance_count(store, rules)
     results["count_passed"] = count_passed
     results["instance_count"] = count_results
     print(f"  결과: {'✅ 통과' if count_passed else '⚠️ 일부 불일치'}")
 
     # 검증 2: 필수 속성
     print("\n[2/4] 필수 속성 검증...")
-    props_passed, prop_errors = validate_required_properties()
+    props_passed, prop_errors = validate_required_properties(rules)
     results["props_passed"] = props_passed
     results["required_properties"] = prop_errors
     print(f"  결과: {'✅ 통과' if props_passed else '⚠️ 누락 발견'}")
 
     # 검증 3: 내부 참조
     print("\n[3/4] 내부 참조 검증...")
-    refs_passed, ref_stats, ref_errors, ref_notes = validate_internal_references()
+    refs_passed, ref_stats, ref_errors, ref_notes = validate_internal_references(rules)
     results["refs_passed"] = refs_passed
     results["reference_stats"] = ref_stats
     results["reference_errors"] = ref_errors
@@ -420,14 +442,14 @@ def main():
 
     # 검증 4: Enum 값
     print("\n[4/4] Enum 값 검증...")
-    enum_passed, enum_errors = validate_enum_values()
+    enum_passed, enum_errors = validate_enum_values(rules)
     results["enum_passed"] = enum_passed
     results["enum_errors"] = enum_errors
     print(f"  결과: {'✅ 통과' if enum_passed else '⚠️ 유효하지 않은 값 발견'}")
 
     # 리포트 생성
     print("\n리포트 생성 중...")
-    report = generate_report(results)
+    report = generate_report(results, store)
     report_path = REPORT_DIR / "VALIDATION_REPORT.md"
     with open(report_path, 'w', encoding='utf-8') as f:
         f.write(report)
@@ -441,6 +463,7 @@ def main():
 
     all_passed = all([count_passed, props_passed, refs_passed, enum_passed])
     print(f"\n최종 결과: {'✅ 모든 검증 통과' if all_passed else '⚠️ 일부 검증 실패'}")
+    print(f"소요 시간: {time.time() - start:.1f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+신규 미팅 TDoc List의 미등록 회사명 별칭 후보 생성
+
+새 미팅 스프레드시트를 추가할 때 Phase A 전체를 다시 돌리지 않고,
+해당 파일의 Source 회사명 중 기존 별칭 사전으로 해석되지 않는 이름만
+alias_matcher로 대표 회사 후보를 제안한다.
+
+입력: 신규 TDoc_List_*.xlsx (인자로 지정, 생략 시 INPUT_DIR 전체)
+      intermediate/company_aliases_significant.json (기존 별칭 사전)
+출력: intermediate/company_alias_suggestions_new.json (검토용)
+
+사용법:
+    python 05_suggest_company_aliases.py TDoc_List_Meeting_RAN1#123.xlsx
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from alias_matcher import AliasIndex, suggest_aliases, save_suggestions, DEFAULT_MIN_SCORE, DEFAULT_TOP_K
+
+# Phase A의 분리/정규화 규칙 재사용 (모듈명이 숫자로 시작하므로 importlib 사용)
+normalization = importlib.import_module("01_company_normalization")
+
+# 경로 설정
+BASE_DIR = Path(__file__).parent.parent
+INPUT_DIR = BASE_DIR / "input" / "meetings" / "RAN1"
+INTERMEDIATE_DIR = BASE_DIR / "intermediate"
+
+
+def build_known_map(aliases_path: Path) -> Dict[str, str]:
+    """기존 별칭 사전 + KNOWN_ALIASES → 소문자 역매핑"""
+    known = {}
+    for canonical, aliases in normalization.KNOWN_ALIASES.items():
+        known[canonical.lower()] = canonical
+        for alias in aliases:
+            known[alias.lower()] = canonical
+
+    if aliases_path.exists():
+        with open(aliases_path, 'r', encoding='utf-8') as f:
+            for canonical, data in json.load(f).items():
+                known[canonical.lower()] = canonical
+                for alias in data.get("aliases", []):
+                    known[alias.lower()] = canonical
+    return known
+
+
+def collect_unknown_companies(files: List[Path], known: Dict[str, str]) -> Counter:
+    """신규 파일에서 기존 사전으로 해석되지 않는 회사명 빈도 집계"""
+    unknown = Counter()
+    for filepath in files:
+        df = pd.read_excel(filepath, engine='openpyxl')
+        if 'Source' not in df.columns:
+            continue
+        for source in df['Source'].dropna():
+            for company in normalization.split_companies(source):
+                if not normalization.is_valid_company(company):
+                    continue
+                name = normalization.normalize_company_name(company)
+                if name.lower() not in known:
+                    unknown[name] += 1
+    return unknown
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신규 TDoc List 회사명 별칭 후보 생성")
+    parser.add_argument('files', nargs='*', type=Path,
+                        help='신규 TDoc List xlsx 파일 (생략 시 INPUT_DIR 전체)')
+    parser.add_argument('--aliases', type=Path,
+                        default=INTERMEDIATE_DIR / "company_aliases_significant.json",
+                        help='기존 별칭 사전 경로')
+    parser.add_argument('--output', type=Path,
+                        default=INTERMEDIATE_DIR / "company_alias_suggestions_new.json",
+                        help='제안 결과 저장 경로')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE)
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("신규 회사명 별칭 후보 생성")
+    print("=" * 60)
+
+    start = time.time()
+    files = args.files or sorted(INPUT_DIR.glob("*.xlsx"))
+    print(f"\n입력 파일: {len(files)}개")
+
+    known = build_known_map(args.aliases)
+    index = AliasIndex.from_aliases_file(args.aliases) if args.aliases.exists() \
+        else AliasIndex.from_aliases(normalization.KNOWN_ALIASES)
+    print(f"기존 별칭: {len(known):,}개 (인덱스 {len(index):,}건)")
+
+    unknown = collect_unknown_companies(files, known)
+    print(f"미등록 회사명: {len(unknown):,}개")
+
+    results = suggest_aliases(unknown.keys(), index, counts=unknown,
+                              top_k=args.top_k, min_score=args.min_score)
+    save_suggestions(results, args.output, min_score=args.min_score)
+
+    for r in results[:20]:
+        best = r["candidates"][0] if r["candidates"] else None
+        target = f"{best['canonical']} ({best['score']:.2f})" if best else "-"
+        print(f"  {r['name'][:40]:40} ({r['count']:>4}) → {target}")
+
+    print(f"\n소요 시간: {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
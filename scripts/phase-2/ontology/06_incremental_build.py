@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+증분 온톨로지 빌드: TDoc List가 바뀐 미팅만 재생성
+
+Phase B/C(02, 03)를 미팅 단위로 실행하고 결과를 캐시한다.
+- Tdoc/CR/LS:  output/instances/tdocs/{meeting}.jsonld (미팅별 샤드)
+- Reference:   intermediate/partials/{meeting}.json (미팅별 부분 집합)
+- 매니페스트:  intermediate/build_manifest.json (입력/별칭/스크립트 해시)
+
+재실행 시 해시가 일치하는 미팅은 건너뛰고, 변경/신규 미팅만 다시 처리한 뒤
+Reference 클래스(meetings, releases, contacts, work_items, agenda_items,
+specs, working_groups)를 부분 집합 병합으로 다시 기록한다.
+새 미팅 1개 추가 시 빌드 비용은 해당 미팅 처리 + 부분 집합 병합뿐이다.
+
+사용법:
+    python 06_incremental_build.py            # 변경분만
+    python 06_incremental_build.py --force    # 전체 재생성
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_manifest import BuildManifest, MeetingEntry, file_sha256, sources_sha256
+from jsonld_writer import FORMATS, write_jsonld, output_path_for, shard_name
+
+# 모듈명이 숫자로 시작하므로 importlib 사용
+reference_classes = importlib.import_module("02_reference_classes")
+tdoc_instances = importlib.import_module("03_tdoc_instances")
+
+# 경로 설정
+BASE_DIR = Path(__file__).parent.parent
+INPUT_DIR = BASE_DIR / "input" / "meetings" / "RAN1"
+INTERMEDIATE_DIR = BASE_DIR / "intermediate"
+OUTPUT_DIR = BASE_DIR / "output" / "instances"
+SHARD_DIR = OUTPUT_DIR / "tdocs"
+PARTIAL_DIR = INTERMEDIATE_DIR / "partials"
+MANIFEST_PATH = INTERMEDIATE_DIR / "build_manifest.json"
+ALIASES_PATH = INTERMEDIATE_DIR / "company_aliases_significant.json"
+
+# 산출물에 영향을 주는 스크립트 (내용이 바뀌면 전체 미팅 재생성)
+SCRIPT_SOURCES = [
+    Path(__file__).parent / "02_reference_classes.py",
+    Path(__file__).parent / "03_tdoc_instances.py",
+    Path(__file__).parent / "jsonld_writer.py",
+]
+
+
+def remove_meeting_outputs(meeting_key: str):
+    """미팅의 기존 샤드(모든 형식)와 부분 집합 삭제"""
+    for suffix in (".jsonld", ".ndjson"):
+        (SHARD_DIR / f"{meeting_key}{suffix}").unlink(missing_ok=True)
+    (PARTIAL_DIR / f"{meeting_key}.json").unlink(missing_ok=True)
+
+
+def build_meeting(filepath: Path, meeting_id: str, company_map: dict, fmt: str) -> int:
+    """미팅 1개의 Tdoc 샤드 + Reference 부분 집합 생성 (xlsx 1회 로드)"""
+    meeting_key = shard_name(meeting_id)
+    remove_meeting_outputs(meeting_key)
+
+    df = reference_classes.load_excel_file(filepath)
+
+    instances, _ = tdoc_instances.process_dataframe(df, meeting_id, company_map)
+    shard_path = output_path_for(SHARD_DIR, meeting_key, fmt)
+    write_jsonld(shard_path, tdoc_instances.CONTEXT["@context"], instances, fmt)
+
+    partial = reference_classes.extract_reference_partial(df, filepath)
+    PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(PARTIAL_DIR / f"{meeting_key}.json", 'w', encoding='utf-8') as f:
+        json.dump(partial, f, ensure_ascii=False)
+
+    return len(instances)
+
+
+def merge_references(meeting_keys: list, fmt: str) -> dict:
+    """부분 집합 병합 → Reference JSON-LD + reference_summary.json 기록"""
+    partials = []
+    for meeting_key in meeting_keys:
+        with open(PARTIAL_DIR / f"{meeting_key}.json", 'r', encoding='utf-8') as f:
+            partials.append(json.load(f))
+
+    references = reference_classes.merge_reference_partials(partials)
+    for key, class_name, filename in reference_classes.PARTIAL_CLASSES:
+        reference_classes.save_jsonld(references[key], OUTPUT_DIR / filename, class_name, fmt)
+
+    companies = {}
+    if ALIASES_PATH.exists():
+        companies = reference_classes.generate_companies(ALIASES_PATH)
+        reference_classes.save_jsonld(companies, OUTPUT_DIR / "companies.jsonld", "Company", fmt)
+    else:
+        print(f"  ⚠️ {ALIASES_PATH} 없음 - Phase A를 먼저 실행하세요")
+
+    reference_classes.save_reference_summary(references, companies)
+    return references
+
+
+def main():
+    parser = argparse.ArgumentParser(description="증분 온톨로지 빌드 (변경된 미팅만 재생성)")
+    parser.add_argument('--format', choices=FORMATS, default="compact",
+                        help='샤드/Reference 출력 형식 (기본: compact)')
+    parser.add_argument('--force', action='store_true', help='매니페스트 무시하고 전체 재생성')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("증분 온톨로지 빌드")
+    print("=" * 60)
+    start = time.time()
+
+    manifest = BuildManifest(MANIFEST_PATH)
+    alias_hash = file_sha256(ALIASES_PATH)
+    script_version = sources_sha256(SCRIPT_SOURCES)
+    company_map = tdoc_instances.load_company_aliases()
+
+    files = sorted(INPUT_DIR.glob("*.xlsx"))
+    print(f"\n입력 파일: {len(files)}개 (기록된 미팅 {len(manifest.meetings)}개)")
+
+    # 1. 변경 감지 및 미팅별 재생성
+    print("\n[1/3] 변경 미팅 재생성...")
+    meeting_keys = []
+    rebuilt, skipped = [], 0
+    for filepath in files:
+        meeting_id = reference_classes.extract_meeting_from_filename(filepath.name)[0]
+        if not meeting_id:
+            continue
+        meeting_key = shard_name(meeting_id)
+        meeting_keys.append(meeting_key)
+
+        input_hash = file_sha256(filepath)
+        shard_rel = output_path_for(SHARD_DIR, meeting_key, args.format).relative_to(BASE_DIR)
+        entry = manifest.meetings.get(meeting_id)
+        if (not args.force and entry is not None and entry.shard == str(shard_rel)
+                and manifest.is_current(meeting_id, input_hash, alias_hash, script_version, BASE_DIR)):
+            skipped += 1
+            continue
+
+        count = build_meeting(filepath, meeting_id, company_map, args.format)
+        manifest.record(MeetingEntry(
+            meeting_id=meeting_id,
+            input_file=filepath.name,
+            input_hash=input_hash,
+            alias_hash=alias_hash,
+            script_version=script_version,
+            shard=str(shard_rel),
+            partial=str((PARTIAL_DIR / f"{meeting_key}.json").relative_to(BASE_DIR)),
+            instance_count=count,
+        ))
+        rebuilt.append(meeting_id)
+        print(f"  🔄 {meeting_id}: {count:,}개 인스턴스")
+
+    print(f"  재생성 {len(rebuilt)}개, 유지 {skipped}개")
+
+    # 2. 삭제된 미팅 정리
+    print("\n[2/3] 삭제된 미팅 정리...")
+    current_ids = {m for m in manifest.meetings if shard_name(m) in set(meeting_keys)}
+    stale = manifest.stale_meetings(current_ids)
+    for meeting_id in stale:
+        remove_meeting_outputs(shard_name(meeting_id))
+        manifest.remove(meeting_id)
+        print(f"  🗑️ {meeting_id}")
+    if not stale:
+        print("  없음")
+
+    # 단일 파일이 있으면 샤드 디렉토리보다 우선 읽히므로 제거
+    for legacy in (OUTPUT_DIR / "tdocs.jsonld", OUTPUT_DIR / "tdocs.ndjson"):
+        if legacy.exists():
+            legacy.unlink()
+            print(f"  🗑️ {legacy.name} (샤드 디렉토리로 대체)")
+
+    manifest.save()
+
+    # 3. Reference 클래스 병합 (변경이 있을 때만)
+    print("\n[3/3] Reference 클래스 병합...")
+    if rebuilt or stale or args.force:
+        merge_references(meeting_keys, args.format)
+    else:
+        print("  변경 없음 - 건너뜀")
+
+    print("\n" + "=" * 60)
+    print(f"증분 빌드 완료: {time.time() - start:.1f}s")
+    print("=" * 60)
+    print(f"  샤드 디렉토리: {SHARD_DIR}")
+    print(f"  매니페스트:    {MANIFEST_PATH}")
+    if rebuilt or stale:
+        print("\n  다음 단계: python 04_validation.py")
+
+
+if __name__ == "__main__":
+    main()
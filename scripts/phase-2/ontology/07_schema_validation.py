@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+스키마 기반 제약 검증 (tdoc-ontology.ttl → 제약 컴파일 → 일괄 검사)
+
+04_validation.py 가 인스턴스 수/필수 속성/참조/Enum 을 점검한다면,
+이 스크립트는 TTL 선언(domain, range, xsd datatype, Values 열거, 카디널리티)
+전체를 제약으로 컴파일해 재생성된 온톨로지를 한 번에 검사한다.
+
+대상:
+- 기본: output/instances 의 JSON-LD (InstanceStore 1회 로드)
+- --neo4j: 적재된 Neo4j 그래프 (라벨/관계 타입별 집계 쿼리)
+
+출력: output/SCHEMA_VALIDATION_REPORT.md
+
+사용법:
+    python 07_schema_validation.py
+    python 07_schema_validation.py --neo4j --uri bolt://localhost:7687
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from instance_store import InstanceStore
+from shape_constraints import parse_ttl, compile_constraints, validate_store, validate_neo4j, format_results
+
+# 필수 속성 목록은 04_validation 과 공유 (TTL에 최소 카디널리티 선언이 없음)
+validation = importlib.import_module("04_validation")
+
+# 경로 설정
+BASE_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = BASE_DIR / "output" / "instances"
+REPORT_DIR = BASE_DIR / "output"
+TTL_PATH = BASE_DIR / "tdoc-ontology.ttl"
+
+# Neo4j 기본 연결 (load_cypher.py 와 동일)
+NEO4J_URI = "bolt://localhost:7687"
+NEO4J_AUTH = ("neo4j", "password123")
+
+REQUIRED = {
+    "Tdoc": validation.TDOC_REQUIRED,
+    "LS": validation.LS_REQUIRED,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTL 스키마 기반 제약 검증")
+    parser.add_argument('--ttl', type=Path, default=TTL_PATH, help='온톨로지 TTL 경로')
+    parser.add_argument('--neo4j', action='store_true', help='JSON-LD 대신 Neo4j 그래프 검증')
+    parser.add_argument('--uri', default=NEO4J_URI, help='Neo4j Bolt URI')
+    parser.add_argument('--id-property', default="id",
+                        help='Neo4j 노드 ID 속성 (load_cypher: id, n10s: uri)')
+    parser.add_argument('--output', type=Path, default=REPORT_DIR / "SCHEMA_VALIDATION_REPORT.md")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("스키마 기반 제약 검증")
+    print("=" * 60)
+    start = time.time()
+
+    schema = parse_ttl(args.ttl)
+    constraints = compile_constraints(schema, REQUIRED)
+    print(f"\n스키마: 클래스 {len(schema.parents)}개, 속성 {len(schema.properties)}개 → 제약 {len(constraints)}개")
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        print(f"\n[Neo4j] {args.uri} 검증 중...")
+        driver = GraphDatabase.driver(args.uri, auth=NEO4J_AUTH)
+        try:
+            results = validate_neo4j(driver, schema, constraints, id_property=args.id_property)
+        finally:
+            driver.close()
+        target = args.uri
+    else:
+        print(f"\n[JSON-LD] {OUTPUT_DIR} 로드 중...")
+        store = InstanceStore.load(OUTPUT_DIR)
+        print(f"  {len(store.tables)}개 파일, {sum(len(t) for t in store.tables.values()):,}개 인스턴스")
+        results = validate_store(store, schema, constraints)
+        target = str(OUTPUT_DIR)
+
+    failed = [r for r in results if not r.passed]
+    elapsed = time.time() - start
+
+    report = [
+        "# 스키마 제약 검증 리포트",
+        "",
+        f"**검증일**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"**스키마**: {args.ttl.name}",
+        f"**대상**: {target}",
+        f"**제약**: {len(constraints)}개 (위반 {len(failed)}개)",
+        "",
+        format_results(results),
+        "",
+    ]
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write("\n".join(report))
+
+    for r in failed:
+        print(f"  ⚠️ {r.constraint.describe()}: {r.violations:,}건")
+
+    print("\n" + "=" * 60)
+    print(f"결과: {'✅ 모든 제약 통과' if not failed else f'⚠️ {len(failed)}개 제약 위반'} ({elapsed:.1f}s)")
+    print(f"리포트: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
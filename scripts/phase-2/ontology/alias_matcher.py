@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Company 별칭 근사 매칭 엔진
+
+KNOWN_ALIASES / company_aliases_significant.json 에 없는 Source 회사명에 대해
+대표 회사(canonical) 후보를 제안한다.
+
+2단계 구조:
+1. Blocking: 문자 n-gram MinHash + LSH band 버킷으로 후보 별칭만 추림
+   (전체 N² 비교 대신 버킷 충돌 쌍만 비교)
+2. Scoring: n-gram Jaccard + 토큰 포함도 + 편집 유사도 가중합
+
+결과는 검토용 JSON으로 저장하며, 자동으로 별칭 사전에 반영하지 않는다.
+"""
+
+import json
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# n-gram / MinHash 설정
+NGRAM_SIZE = 3
+NUM_PERM = 64
+NUM_BANDS = 16  # band당 4행 → Jaccard ~0.5 부근에서 후보 확률 급상승
+
+# 점수 가중치
+WEIGHT_NGRAM = 0.5
+WEIGHT_TOKEN = 0.3
+WEIGHT_RATIO = 0.2
+
+# 기본 제안 임계값
+DEFAULT_MIN_SCORE = 0.55
+DEFAULT_TOP_K = 3
+
+# 매칭 키 생성 시 제거할 법인 접미사 (INVALID_COMPANIES와 동일 계열)
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "ltd", "limited", "co", "corp", "corporation",
+    "gmbh", "ag", "sa", "bv", "nv", "llc", "plc", "pvt", "group",
+    "holdings", "holding", "company",
+}
+
+# MinHash 순열 계수 (결정적: 실행마다 동일한 서명)
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERMUTATIONS = [
+    (
+        (zlib.crc32(f"a{i}".encode()) * 2654435761 + 1) % _MERSENNE_PRIME,
+        (zlib.crc32(f"b{i}".encode()) * 2246822519) % _MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+
+# ============================================================
+# 정규화 / 특징 추출
+# ============================================================
+
+def tokenize(name: str) -> List[str]:
+    """소문자 토큰 분리 (법인 접미사 제거)"""
+    tokens = re.findall(r"[a-z0-9&]+", name.lower())
+    return [t for t in tokens if t not in LEGAL_SUFFIXES]
+
+
+def match_key(name: str) -> str:
+    """비교용 정규화 키
+
+    예: "Samsung Electronics Co., Ltd." → "samsung electronics"
+    """
+    return " ".join(tokenize(name))
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """문자 n-gram 집합 (양끝 공백 패딩)"""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def minhash_signature(shingles: Set[str]) -> Tuple[int, ...]:
+    """MinHash 서명 생성"""
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+    signature = []
+    for a, b in _PERMUTATIONS:
+        signature.append(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes))
+    return tuple(signature)
+
+
+def lsh_buckets(signature: Tuple[int, ...], bands: int = NUM_BANDS) -> List[Tuple[int, Tuple[int, ...]]]:
+    """서명을 band 단위로 잘라 LSH 버킷 키 생성"""
+    rows = len(signature) // bands
+    return [(b, signature[b * rows:(b + 1) * rows]) for b in range(bands)]
+
+
+# ============================================================
+# 점수 계산
+# ============================================================
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _token_similar(a: str, b: str) -> bool:
+    """토큰 근사 일치 (오타/축약 허용)"""
+    if a == b:
+        return True
+    if len(a) >= 4 and len(b) >= 4 and (a.startswith(b) or b.startswith(a)):
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= 0.8
+
+
+def token_containment(a: List[str], b: List[str]) -> float:
+    """짧은 쪽 토큰이 긴 쪽에 (근사) 포함되는 비율
+
+    "Samsung" vs "Samsung Research America" 처럼 접두/접미 확장된 이름,
+    "Qualcom" vs "Qualcomm" 같은 오타 대응
+    """
+    if not a or not b:
+        return 0.0
+    shorter, longer = (a, b) if len(set(a)) <= len(set(b)) else (b, a)
+    shorter = set(shorter)
+    hits = sum(1 for t in shorter if any(_token_similar(t, u) for u in longer))
+    return hits / len(shorter)
+
+
+@dataclass
+class Suggestion:
+    """별칭 후보 1건"""
+    name: str
+    canonical: str
+    matched_alias: str
+    score: float
+    ngram_jaccard: float
+    token_score: float
+    edit_ratio: float
+
+
+# ============================================================
+# 인덱스
+# ============================================================
+
+class AliasIndex:
+    """기존 별칭 사전에 대한 MinHash LSH 인덱스"""
+
+    def __init__(self, num_bands: int = NUM_BANDS):
+        self.num_bands = num_bands
+        self._entries: List[Tuple[str, str, str, Set[str], List[str]]] = []  # (canonical, alias, key, ngrams, tokens)
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._first_token: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def from_aliases(cls, aliases: Dict[str, Iterable[str]], **kwargs) -> "AliasIndex":
+        """{canonical: [alias, ...]} 형태에서 인덱스 생성"""
+        index = cls(**kwargs)
+        for canonical, names in aliases.items():
+            index.add(canonical, canonical)
+            for alias in names:
+                index.add(canonical, alias)
+        return index
+
+    @classmethod
+    def from_aliases_file(cls, path: Path, **kwargs) -> "AliasIndex":
+        """company_aliases*.json 파일에서 인덱스 생성"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls.from_aliases(
+            {canonical: entry.get("aliases", []) for canonical, entry in data.items()},
+            **kwargs
+        )
+
+    def add(self, canonical: str, alias: str):
+        key = match_key(alias)
+        if not key:
+            return
+        grams = char_ngrams(key)
+        tokens = key.split()
+        idx = len(self._entries)
+        self._entries.append((canonical, alias, key, grams, tokens))
+
+        self._exact[key].append(idx)
+        self._first_token[tokens[0]].append(idx)
+        for bucket in lsh_buckets(minhash_signature(grams), self.num_bands):
+            self._buckets[bucket].append(idx)
+
+    def candidates(self, name: str) -> Set[int]:
+        """Blocking: 버킷 충돌 + 정규화 키 일치 + 첫 토큰 일치"""
+        key = match_key(name)
+        if not key:
+            return set()
+        found = set(self._exact.get(key, ()))
+        found.update(self._first_token.get(key.split()[0], ()))
+        for bucket in lsh_buckets(minhash_signature(char_ngrams(key)), self.num_bands):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+    def suggest(self, name: str, top_k: int = DEFAULT_TOP_K,
+                min_score: float = DEFAULT_MIN_SCORE) -> List[Suggestion]:
+        """후보별 점수 계산 후 대표 회사 단위 상위 top_k 반환"""
+        key = match_key(name)
+        if not key:
+            return []
+        grams = char_ngrams(key)
+        tokens = key.split()
+
+        best: Dict[str, Suggestion] = {}
+        for idx in self.candidates(name):
+            canonical, alias, alias_key, alias_grams, alias_tokens = self._entries[idx]
+            ng = jaccard(grams, alias_grams)
+            tok = token_containment(tokens, alias_tokens)
+            ratio = SequenceMatcher(None, key, alias_key).ratio()
+            score = WEIGHT_NGRAM * ng + WEIGHT_TOKEN * tok + WEIGHT_RATIO * ratio
+            if key == alias_key:
+                score = 1.0
+            if score < min_score:
+                continue
+            current = best.get(canonical)
+            if current is None or score > current.score:
+                best[canonical] = Suggestion(
+                    name=name,
+                    canonical=canonical,
+                    matched_alias=alias,
+                    score=round(score, 4),
+                    ngram_jaccard=round(ng, 4),
+                    token_score=round(tok, 4),
+                    edit_ratio=round(ratio, 4),
+                )
+
+        return sorted(best.values(), key=lambda s: -s.score)[:top_k]
+
+
+# ============================================================
+# 일괄 제안 / 저장
+# ============================================================
+
+def suggest_aliases(names: Iterable[str], index: AliasIndex, counts: Optional[Dict[str, int]] = None,
+                    top_k: int = DEFAULT_TOP_K, min_score: float = DEFAULT_MIN_SCORE) -> List[dict]:
+    """미등록 회사명 목록에 대한 후보 생성
+
+    Returns:
+        [{"name", "count", "candidates": [Suggestion dict, ...]}] (빈도 내림차순)
+    """
+    counts = counts or {}
+    results = []
+    for name in names:
+        suggestions = index.suggest(name, top_k=top_k, min_score=min_score)
+        results.append({
+            "name": name,
+            "count": counts.get(name, 0),
+            "candidates": [asdict(s) for s in suggestions],
+        })
+    results.sort(key=lambda r: (-r["count"], r["name"]))
+    return results
+
+
+def save_suggestions(results: List[dict], output_path: Path, min_score: float = DEFAULT_MIN_SCORE):
+    """검토용 제안 파일 저장 (min_score: 제안에 실제로 적용한 임계값)"""
+    matched = [r for r in results if r["candidates"]]
+    output = {
+        "total_names": len(results),
+        "with_candidates": len(matched),
+        "without_candidates": len(results) - len(matched),
+        "params": {
+            "ngram_size": NGRAM_SIZE,
+            "num_perm": NUM_PERM,
+            "num_bands": NUM_BANDS,
+            "min_score": min_score,
+        },
+        "suggestions": results,
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+
+    print(f"별칭 후보 저장: {output_path}")
+    print(f"  - 대상 이름: {len(results):,}개 (후보 있음 {len(matched):,}개)")
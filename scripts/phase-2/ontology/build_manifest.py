@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+증분 온톨로지 빌드용 의존성 매니페스트
+
+미팅(입력 xlsx)별로 다음을 기록하고, 모두 일치하면 재생성을 건너뛴다:
+- input_hash:     TDoc List 파일 내용 SHA-256
+- alias_hash:     company_aliases_significant.json SHA-256 (submittedBy 정규화에 영향)
+- script_version: 인스턴스 생성 스크립트 소스 SHA-256
+
+저장 위치: intermediate/build_manifest.json
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 해시 (없으면 빈 문자열)"""
+    path = Path(path)
+    if not path.exists():
+        return ""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sources_sha256(paths: Iterable[Path]) -> str:
+    """여러 소스 파일을 묶은 버전 해시 (파일명 + 내용)"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(file_sha256(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+@dataclass
+class MeetingEntry:
+    """미팅 1개의 빌드 기록"""
+    meeting_id: str
+    input_file: str
+    input_hash: str
+    alias_hash: str
+    script_version: str
+    shard: str
+    partial: str
+    instance_count: int = 0
+    built_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+
+class BuildManifest:
+    """미팅별 빌드 기록 관리"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meetings: Dict[str, MeetingEntry] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.meetings = {
+                    meeting_id: MeetingEntry(**entry)
+                    for meeting_id, entry in data.get("meetings", {}).items()
+                }
+
+    def is_current(self, meeting_id: str, input_hash: str, alias_hash: str, script_version: str,
+                   base_dir: Optional[Path] = None) -> bool:
+        """기록이 현재 입력/별칭/스크립트와 일치하고 산출물이 존재하는지"""
+        entry = self.meetings.get(meeting_id)
+        if entry is None:
+            return False
+        if (entry.input_hash, entry.alias_hash, entry.script_version) != (input_hash, alias_hash, script_version):
+            return False
+        if base_dir is not None:
+            return (base_dir / entry.shard).exists() and (base_dir / entry.partial).exists()
+        return True
+
+    def record(self, entry: MeetingEntry):
+        self.meetings[entry.meeting_id] = entry
+
+    def stale_meetings(self, current_ids: Iterable[str]) -> List[str]:
+        """입력 파일이 사라진 미팅 목록"""
+        current = set(current_ids)
+        return sorted(m for m in self.meetings if m not in current)
+
+    def remove(self, meeting_id: str) -> Optional[MeetingEntry]:
+        return self.meetings.pop(meeting_id, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "meetings": {m: asdict(e) for m, e in sorted(self.meetings.items())},
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
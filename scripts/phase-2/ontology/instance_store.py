@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+JSON-LD 인스턴스 인메모리 저장소 (검증용)
+
+output/instances 의 JSON-LD 파일(샤드 디렉토리 포함)을 한 번만 파싱해
+- 파일(테이블)별 @id / @type 배열과 속성별 컬럼 배열
+- 클래스(@type)별 ID 집합
+으로 보관한다. 검증 규칙은 파일을 다시 읽지 않고 이 인덱스만 사용한다.
+
+사용법:
+    store = InstanceStore.load(OUTPUT_DIR)
+    tdocs = store.table("tdocs")          # tdocs.jsonld / tdocs.ndjson / tdocs/
+    for status in tdocs.column("tdoc:status"): ...
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from jsonld_writer import iter_graph, graph_size_bytes, resolve_graph_path
+
+
+class Table:
+    """JSON-LD 파일 1개의 컬럼형 표현
+
+    columns[prop][i] = i번째 인스턴스의 prop 값 (없으면 None)
+    """
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self.ids: List[str] = []
+        self.types: List[object] = []
+        self.columns: Dict[str, list] = {}
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, item: dict):
+        row = len(self.ids)
+        self.ids.append(item.get("@id", ""))
+        self.types.append(item.get("@type", ""))
+        for key, value in item.items():
+            if key in ("@id", "@type"):
+                continue
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * row
+            elif len(column) < row:
+                column.extend([None] * (row - len(column)))
+            column.append(value)
+
+    def finalize(self):
+        """모든 컬럼 길이를 행 수에 맞춤"""
+        n = len(self.ids)
+        for column in self.columns.values():
+            if len(column) < n:
+                column.extend([None] * (n - len(column)))
+
+    def column(self, prop: str) -> list:
+        """속성 컬럼 (해당 속성이 없는 테이블이면 None 배열)"""
+        column = self.columns.get(prop)
+        return column if column is not None else [None] * len(self.ids)
+
+    def row(self, i: int) -> dict:
+        """i번째 인스턴스 복원 (에러 메시지/디버깅용)"""
+        item = {"@id": self.ids[i], "@type": self.types[i]}
+        for prop, column in self.columns.items():
+            if column[i] is not None:
+                item[prop] = column[i]
+        return item
+
+
+class InstanceStore:
+    """출력 디렉토리 전체에 대한 인덱스"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.tables: Dict[str, Table] = {}  # 실제 경로 → 테이블
+        self.ids_by_class: Dict[str, Set[str]] = defaultdict(set)
+
+    @classmethod
+    def load(cls, output_dir: Path, names: Optional[Iterable[str]] = None) -> "InstanceStore":
+        """출력 파일을 한 번씩 파싱해 저장소 구성
+
+        Args:
+            names: 로드할 파일 stem 목록 (생략 시 디렉토리 내 전체)
+        """
+        store = cls(output_dir)
+        paths = store.discover() if names is None else [store.output_dir / f"{n}.jsonld" for n in names]
+        for path in paths:
+            store.add_file(path)
+        return store
+
+    def discover(self) -> List[Path]:
+        """출력 디렉토리의 JSON-LD / NDJSON 파일 및 샤드 디렉토리"""
+        if not self.output_dir.exists():
+            return []
+        return sorted(
+            p for p in self.output_dir.iterdir()
+            if p.suffix in (".jsonld", ".ndjson") or (p.is_dir() and resolve_graph_path(p))
+        )
+
+    def add_file(self, path: Path) -> Optional[Table]:
+        """파일 1개 파싱 (이미 로드된 경로면 캐시 반환)"""
+        resolved = resolve_graph_path(path)
+        if resolved is None:
+            return None
+        key = str(resolved)
+        if key in self.tables:
+            return self.tables[key]
+
+        table = Table(resolved.name, resolved)
+        for item in iter_graph(resolved):
+            table.append(item)
+            item_id = item.get("@id", "")
+            item_types = item.get("@type", "")
+            for item_type in item_types if isinstance(item_types, list) else [item_types]:
+                self.ids_by_class[item_type].add(item_id)
+        table.finalize()
+        table.size_bytes = graph_size_bytes(resolved)
+        self.tables[key] = table
+        return table
+
+    def table(self, name: str) -> Table:
+        """파일 stem 으로 테이블 조회 (stem.jsonld → stem.ndjson → stem/ 순, 없으면 빈 테이블)"""
+        return self.add_file(self.output_dir / f"{name}.jsonld") or Table(name, self.output_dir / name)
+
+    def count(self, name: str) -> int:
+        return len(self.table(name))
+
+    def ids_in(self, names: Iterable[str]) -> Set[str]:
+        """지정 파일들의 @id 합집합"""
+        ids = set()
+        for name in names:
+            ids.update(self.table(name).ids)
+        return ids
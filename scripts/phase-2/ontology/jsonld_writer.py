@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+스트리밍 JSON-LD 입출력
+
+전체 인스턴스를 리스트/딕셔너리로 모은 뒤 json.dump 하는 대신,
+@graph 항목을 생성되는 즉시 파일에 기록한다.
+
+출력 형식 (FORMATS):
+- pretty:  기존과 동일한 들여쓰기 JSON-LD (*.jsonld)
+- compact: 들여쓰기 없는 JSON-LD (*.jsonld)
+- ndjson:  1행 = @context, 이후 1행 = @graph 항목 1개 (*.ndjson)
+
+미팅별 샤드: <stem>/<meeting>.jsonld 형태로 디렉토리에 분할 저장
+(Neo4j 적재 시 샤드 단위 병렬 처리 가능)
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+FORMATS = ("pretty", "compact", "ndjson")
+DEFAULT_FORMAT = "pretty"
+
+_EXTENSIONS = {"pretty": ".jsonld", "compact": ".jsonld", "ndjson": ".ndjson"}
+
+
+def output_path_for(output_dir: Path, stem: str, fmt: str = DEFAULT_FORMAT) -> Path:
+    """형식에 맞는 출력 파일 경로"""
+    return output_dir / f"{stem}{_EXTENSIONS[fmt]}"
+
+
+def shard_name(meeting_id: str) -> str:
+    """Meeting ID → 샤드 파일명 stem (RAN1#100b-e → RAN1_100b-e)"""
+    return meeting_id.replace('#', '_')
+
+
+class JsonLdWriter:
+    """@graph 항목을 하나씩 기록하는 JSON-LD writer
+
+    사용법:
+        with JsonLdWriter(path, CONTEXT["@context"], fmt="compact") as writer:
+            for instance in instances:
+                writer.write(instance)
+    """
+
+    def __init__(self, path: Path, context: dict, fmt: str = DEFAULT_FORMAT):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown JSON-LD format: {fmt} (choose from {FORMATS})")
+        self.path = Path(path)
+        self.context = context
+        self.fmt = fmt
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> "JsonLdWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        context = json.dumps(self.context, ensure_ascii=False)
+
+        if self.fmt == "ndjson":
+            self._file.write(json.dumps({"@context": self.context}, ensure_ascii=False) + "\n")
+        elif self.fmt == "compact":
+            self._file.write('{"@context":' + context + ',"@graph":[')
+        else:
+            context = json.dumps(self.context, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            self._file.write('{\n  "@context": ' + context + ',\n  "@graph": [')
+
+    def write(self, item: dict):
+        """@graph 항목 1개 기록"""
+        if self.fmt == "ndjson":
+            self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        elif self.fmt == "compact":
+            if self.count:
+                self._file.write(",")
+            self._file.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+        else:
+            body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+            self._file.write(("," if self.count else "") + "\n    " + body)
+        self.count += 1
+
+    def write_many(self, items: Iterable[dict]):
+        for item in items:
+            self.write(item)
+
+    def close(self):
+        if self._file is None:
+            return
+        if self.fmt == "compact":
+            self._file.write("]}\n")
+        elif self.fmt == "pretty":
+            self._file.write("\n  ]\n}\n" if self.count else "]\n}\n")
+        self._file.close()
+        self._file = None
+
+
+def write_jsonld(path: Path, context: dict, items: Iterable[dict], fmt: str = DEFAULT_FORMAT) -> int:
+    """items 전체를 기록하고 항목 수 반환"""
+    with JsonLdWriter(path, context, fmt) as writer:
+        writer.write_many(items)
+    return writer.count
+
+
+def remove_stale_outputs(output_dir: Path, stem: str, keep: Iterable[Path]) -> List[Path]:
+    """stem 의 이전 출력 (stem.jsonld / stem.ndjson / stem/ 샤드) 중 keep 에 없는 파일 삭제
+
+    resolve_graph_path 는 stem.jsonld → stem.ndjson → stem/ 순으로 읽으므로, 형식이나 샤드 여부를
+    바꿔 다시 생성한 뒤 이전 출력이 남아 있으면 검증/적재가 오래된 데이터를 읽는다.
+    """
+    keep = {Path(p) for p in keep}
+    base = Path(output_dir) / stem
+    candidates = [Path(f"{base}{suffix}") for suffix in sorted(set(_EXTENSIONS.values()))]
+    if base.is_dir():
+        candidates += list_shards(base)
+    removed = []
+    for path in candidates:
+        if path not in keep and path.is_file():
+            path.unlink()
+            removed.append(path)
+    if base.is_dir() and not any(base.iterdir()):
+        base.rmdir()
+    return removed
+
+
+# ============================================================
+# 읽기
+# ============================================================
+
+def resolve_graph_path(path: Path) -> Optional[Path]:
+    """stem.jsonld 가 없으면 stem.ndjson / stem/ (샤드 디렉토리) 순으로 탐색"""
+    path = Path(path)
+    if path.exists():
+        return path
+    stem = path.with_suffix("")
+    for candidate in (stem.with_suffix(".ndjson"), stem):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def list_shards(directory: Path) -> List[Path]:
+    """샤드 디렉토리 내 파일 목록 (정렬)"""
+    return sorted(p for p in Path(directory).iterdir() if p.suffix in (".jsonld", ".ndjson"))
+
+
+def iter_graph(path: Path) -> Iterator[dict]:
+    """JSON-LD / NDJSON 파일 또는 샤드 디렉토리의 @graph 항목 순회"""
+    resolved = resolve_graph_path(path)
+    if resolved is None:
+        return
+
+    if resolved.is_dir():
+        for shard in list_shards(resolved):
+            yield from iter_graph(shard)
+        return
+
+    if resolved.suffix == ".ndjson":
+        with open(resolved, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if "@context" in item and "@id" not in item:
+                    continue
+                yield item
+        return
+
+    with open(resolved, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from data.get("@graph", [])
+
+
+def load_graph(path: Path) -> List[dict]:
+    """@graph 항목 전체 로드"""
+    return list(iter_graph(path))
+
+
+def graph_size_bytes(path: Path) -> int:
+    """파일 또는 샤드 디렉토리 전체 크기"""
+    resolved = resolve_graph_path(path)
+    if resolved is None:
+        return 0
+    if resolved.is_dir():
+        return sum(p.stat().st_size for p in list_shards(resolved))
+    return resolved.stat().st_size
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+TTL 기반 선언적 제약 검증 (SHACL 스타일)
+
+tdoc-ontology.ttl 의 클래스/속성 선언을 읽어 제약 목록으로 컴파일한 뒤
+JSON-LD 인스턴스(InstanceStore) 또는 Neo4j 그래프에 일괄 적용한다.
+
+컴파일되는 제약:
+- domain:   속성을 가진 인스턴스가 rdfs:domain 클래스(하위 클래스 포함)인지
+- class:    ObjectProperty 값이 rdfs:range 클래스 인스턴스를 가리키는지
+- datatype: DatatypeProperty 값이 rdfs:range xsd 타입인지
+- in:       rdfs:comment 의 "Values: a, b (설명), ..." 열거값
+- minCount / maxCount: owl:Restriction 카디널리티, owl:FunctionalProperty
+                       (TTL에 없으면 호출 측 required 목록으로 minCount 보완)
+
+JSON-LD 모드는 제약별로 속성 컬럼 1개를 스캔하고,
+Neo4j 모드는 라벨/관계 타입별로 제약을 묶어 집계 쿼리 1회로 계산한다.
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+PREFIX = "tdoc:"
+
+# 검증 결과 샘플 수
+MAX_SAMPLES = 5
+
+# xsd 타입 → 값 검사 함수 (JSON-LD)
+_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+XSD_CHECKS = {
+    "xsd:string": lambda v: isinstance(v, str),
+    "xsd:integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "xsd:boolean": lambda v: isinstance(v, bool),
+    "xsd:dateTime": lambda v: isinstance(v, str) and bool(_DATETIME_RE.match(v)),
+    "xsd:date": lambda v: isinstance(v, str) and bool(_DATE_RE.match(v)),
+}
+
+# xsd 타입 → Cypher 타입 술어 (Neo4j 5 `IS ::`)
+XSD_CYPHER_TYPES = {
+    "xsd:string": ["STRING"],
+    "xsd:integer": ["INTEGER"],
+    "xsd:boolean": ["BOOLEAN"],
+    "xsd:dateTime": ["STRING", "LOCAL DATETIME", "ZONED DATETIME"],
+    "xsd:date": ["STRING", "DATE"],
+}
+
+
+# ============================================================
+# TTL 파싱
+# ============================================================
+
+@dataclass
+class PropertyDef:
+    """ObjectProperty / DatatypeProperty 선언"""
+    name: str
+    kind: str  # "object" | "datatype"
+    domain: Optional[str] = None
+    range: Optional[str] = None
+    comment: str = ""
+    functional: bool = False
+    enum: Optional[List[str]] = None
+
+
+@dataclass
+class OntologySchema:
+    """TTL에서 읽은 클래스 계층, 속성, 카디널리티 제한"""
+    parents: Dict[str, List[str]] = field(default_factory=dict)
+    properties: Dict[str, PropertyDef] = field(default_factory=dict)
+    restrictions: List[Tuple[str, str, Optional[int], Optional[int]]] = field(default_factory=list)
+
+    def subclasses(self, cls: str) -> Set[str]:
+        """cls 와 모든 하위 클래스"""
+        result = {cls}
+        changed = True
+        while changed:
+            changed = False
+            for child, parents in self.parents.items():
+                if child not in result and result.intersection(parents):
+                    result.add(child)
+                    changed = True
+        return result
+
+
+def local_name(term: str) -> str:
+    """tdoc:Tdoc → Tdoc"""
+    return term.split(":", 1)[1] if ":" in term else term
+
+
+def parse_enum(comment: str) -> Optional[List[str]]:
+    """rdfs:comment 의 "Values: ..." 목록 추출 (괄호 설명 제거)
+
+    예: "CR category. Values: F (Fix), A (Mirror)" → ["F", "A"]
+    """
+    match = re.search(r"Values:\s*(.+)$", comment)
+    if not match:
+        return None
+    values = []
+    for part in match.group(1).split(","):
+        value = re.sub(r"\s*\([^)]*\)", "", part).strip()
+        if value:
+            values.append(value)
+    return values or None
+
+
+_STATEMENT_RE = re.compile(r"^(\S+)\s+a\s+(.+?)\s*(?:;|\.\s*$)", re.DOTALL)
+_RESTRICTION_RE = re.compile(
+    r"rdfs:subClassOf\s*\[\s*a\s+owl:Restriction\s*;\s*owl:onProperty\s+(\S+)\s*;\s*"
+    r"owl:(minCardinality|maxCardinality|cardinality|minQualifiedCardinality|"
+    r"maxQualifiedCardinality|qualifiedCardinality)\s+\"?(\d+)"
+)
+
+
+def parse_ttl(path: Path) -> OntologySchema:
+    """tdoc-ontology.ttl 파싱 (이 온톨로지가 사용하는 Turtle 부분집합)"""
+    text = Path(path).read_text(encoding="utf-8")
+    lines = [line for line in text.splitlines() if not line.lstrip().startswith(("#", "@prefix"))]
+    # 문장 종료: 줄 끝의 " ."
+    statements = re.split(r"\s\.\s*\n", "\n".join(lines) + "\n")
+
+    schema = OntologySchema()
+    for statement in statements:
+        statement = statement.strip()
+        match = _STATEMENT_RE.match(statement)
+        if not match:
+            continue
+        subject = match.group(1)
+        types = {t.strip() for t in match.group(2).split(",")}
+
+        if "owl:Class" in types:
+            parents = re.findall(r"rdfs:subClassOf\s+([\w:]+)", statement)
+            schema.parents[subject] = parents
+            for prop, kind, number in _RESTRICTION_RE.findall(statement):
+                n = int(number)
+                min_count = n if kind.startswith("min") or kind in ("cardinality", "qualifiedCardinality") else None
+                max_count = n if kind.startswith("max") or kind in ("cardinality", "qualifiedCardinality") else None
+                schema.restrictions.append((subject, prop, min_count, max_count))
+            continue
+
+        kind = "object" if "owl:ObjectProperty" in types else "datatype" if "owl:DatatypeProperty" in types else None
+        if kind is None:
+            continue
+        comment = re.search(r'rdfs:comment\s+"((?:[^"\\]|\\.)*)"', statement)
+        domain = re.search(r"rdfs:domain\s+([\w:]+)", statement)
+        range_ = re.search(r"rdfs:range\s+([\w:]+)", statement)
+        prop = PropertyDef(
+            name=subject,
+            kind=kind,
+            domain=domain.group(1) if domain else None,
+            range=range_.group(1) if range_ else None,
+            comment=comment.group(1) if comment else "",
+            functional="owl:FunctionalProperty" in types,
+        )
+        if kind == "datatype":
+            prop.enum = parse_enum(prop.comment)
+        schema.properties[subject] = prop
+
+    return schema
+
+
+def enum_values(schema: OntologySchema) -> Dict[str, Set[str]]:
+    """열거형 속성 → 허용값 (04_validation ENUMS 형식: 접두사 없는 속성명)"""
+    return {local_name(p.name): set(p.enum) for p in schema.properties.values() if p.enum}
+
+
+# ============================================================
+# 제약 컴파일
+# ============================================================
+
+@dataclass
+class Constraint:
+    """컴파일된 제약 1개"""
+    kind: str            # domain | class | datatype | in | minCount | maxCount
+    focus: Optional[str]  # 대상 클래스 (domain 제약은 None: 속성을 가진 모든 인스턴스)
+    prop: str
+    param: object = None
+
+    def describe(self) -> str:
+        focus = local_name(self.focus) if self.focus else "*"
+        param = self.param
+        if self.kind == "in":
+            param = f"{len(self.param)} values"
+        return f"{focus}.{local_name(self.prop)} {self.kind} {param}"
+
+
+def compile_constraints(schema: OntologySchema,
+                        required: Optional[Dict[str, Iterable[str]]] = None) -> List[Constraint]:
+    """스키마 → 제약 목록
+
+    Args:
+        required: {클래스 로컬명: [속성 로컬명]} - TTL에 최소 카디널리티가 없을 때 보완
+    """
+    constraints = []
+    for prop in schema.properties.values():
+        if prop.domain:
+            constraints.append(Constraint("domain", None, prop.name, prop.domain))
+        focus = prop.domain
+        if prop.kind == "object" and prop.range:
+            constraints.append(Constraint("class", focus, prop.name, prop.range))
+        if prop.kind == "datatype" and prop.range in XSD_CHECKS:
+            constraints.append(Constraint("datatype", focus, prop.name, prop.range))
+        if prop.enum:
+            constraints.append(Constraint("in", focus, prop.name, frozenset(prop.enum)))
+        if prop.functional:
+            constraints.append(Constraint("maxCount", focus, prop.name, 1))
+
+    declared_min = set()
+    for cls, prop, min_count, max_count in schema.restrictions:
+        if min_count:
+            constraints.append(Constraint("minCount", cls, prop, min_count))
+            declared_min.add((cls, prop))
+        if max_count is not None:
+            constraints.append(Constraint("maxCount", cls, prop, max_count))
+
+    for cls, props in (required or {}).items():
+        for prop in props:
+            key = (f"{PREFIX}{cls}", f"{PREFIX}{prop}")
+            if key not in declared_min:
+                constraints.append(Constraint("minCount", key[0], key[1], 1))
+
+    return constraints
+
+
+# ============================================================
+# 결과
+# ============================================================
+
+@dataclass
+class ConstraintResult:
+    constraint: Constraint
+    focus_count: int = 0
+    violations: int = 0
+    unresolved: int = 0  # class 제약: 그래프에 없는 대상 (오류 아님)
+    samples: List[str] = field(default_factory=list)
+    values: Counter = field(default_factory=Counter)
+
+    @property
+    def passed(self) -> bool:
+        return self.violations == 0
+
+
+def format_results(results: List[ConstraintResult]) -> str:
+    """제약 결과 Markdown 표"""
+    lines = [
+        "| 제약 | 대상 | 위반 | 미해결 참조 | 샘플 |",
+        "|------|------|------|-------------|------|",
+    ]
+    for r in results:
+        if r.focus_count == 0 and r.violations == 0:
+            continue
+        status = "✅" if r.passed else f"⚠️ {r.violations:,}"
+        sample = ", ".join(r.samples[:3])
+        if r.values:
+            sample = ", ".join(f"`{v}`({c})" for v, c in r.values.most_common(3))
+        unresolved = f"{r.unresolved:,}" if r.unresolved else "-"
+        lines.append(f"| {r.constraint.describe()} | {r.focus_count:,} | {status} | {unresolved} | {sample} |")
+    return "\n".join(lines)
+
+
+# ============================================================
+# JSON-LD (InstanceStore) 검증
+# ============================================================
+
+def _values(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _column(table, prop: str) -> list:
+    """tdoc:prop / prop 두 표기 모두 지원 (03은 일부 관계를 접두사 없이 기록)"""
+    prefixed = table.columns.get(prop)
+    bare = table.columns.get(local_name(prop))
+    if prefixed is None:
+        return bare if bare is not None else [None] * len(table)
+    if bare is None:
+        return prefixed
+    return [p if p is not None else b for p, b in zip(prefixed, bare)]
+
+
+def _focus_rows(table, classes: Optional[Set[str]]) -> List[int]:
+    if classes is None:
+        return list(range(len(table)))
+    rows = []
+    for i, item_type in enumerate(table.types):
+        if isinstance(item_type, list):
+            if classes.intersection(item_type):
+                rows.append(i)
+        elif item_type in classes:
+            rows.append(i)
+    return rows
+
+
+def validate_store(store, schema: OntologySchema, constraints: List[Constraint]) -> List[ConstraintResult]:
+    """InstanceStore 의 모든 테이블에 제약 적용"""
+    closures = {}
+
+    def closure(cls):
+        if cls not in closures:
+            closures[cls] = schema.subclasses(cls)
+        return closures[cls]
+
+    class_ids = {}
+
+    def ids_of(cls):
+        if cls not in class_ids:
+            ids = set()
+            for c in closure(cls):
+                ids.update(store.ids_by_class.get(c, ()))
+            class_ids[cls] = ids
+        return class_ids[cls]
+
+    all_ids = set()
+    for ids in store.ids_by_class.values():
+        all_ids.update(ids)
+
+    results = []
+    tables = list(store.tables.values())
+    focus_cache = {}
+
+    for constraint in constraints:
+        result = ConstraintResult(constraint)
+        focus = closure(constraint.focus) if constraint.focus else None
+
+        for table in tables:
+            if constraint.prop not in table.columns and local_name(constraint.prop) not in table.columns \
+                    and constraint.kind != "minCount":
+                continue
+            key = (id(table), constraint.focus)
+            if key not in focus_cache:
+                focus_cache[key] = _focus_rows(table, focus)
+            rows = focus_cache[key]
+            if not rows:
+                continue
+            column = _column(table, constraint.prop)
+            ids = table.ids
+
+            if constraint.kind == "domain":
+                allowed = closure(constraint.param)
+                present = [i for i in rows if column[i] is not None]
+                result.focus_count += len(present)
+                bad = [i for i in present if not _type_in(table.types[i], allowed)]
+            elif constraint.kind == "class":
+                targets = ids_of(constraint.param)
+                present = [i for i in rows if column[i] is not None]
+                result.focus_count += len(present)
+                bad = []
+                for i in present:
+                    for ref in _values(column[i]):
+                        if ref in targets:
+                            continue
+                        if ref in all_ids:
+                            bad.append(i)
+                        else:
+                            result.unresolved += 1
+            elif constraint.kind == "datatype":
+                check = XSD_CHECKS[constraint.param]
+                present = [i for i in rows if column[i] is not None]
+                result.focus_count += len(present)
+                bad = [i for i in present if not all(check(v) for v in _values(column[i]))]
+            elif constraint.kind == "in":
+                allowed = constraint.param
+                present = [i for i in rows if column[i]]
+                result.focus_count += len(present)
+                bad = [i for i in present if any(v not in allowed for v in _values(column[i]))]
+                result.values.update(str(column[i]) for i in bad)
+            elif constraint.kind == "minCount":
+                result.focus_count += len(rows)
+                bad = [i for i in rows if len([v for v in _values(column[i]) if v != ""]) < constraint.param]
+            else:  # maxCount
+                present = [i for i in rows if column[i] is not None]
+                result.focus_count += len(present)
+                bad = [i for i in present if len(_values(column[i])) > constraint.param]
+
+            result.violations += len(bad)
+            room = MAX_SAMPLES - len(result.samples)
+            if room > 0:
+                result.samples.extend(ids[i] for i in bad[:room])
+
+        results.append(result)
+    return results
+
+
+def _type_in(item_type, classes: Set[str]) -> bool:
+    if isinstance(item_type, list):
+        return bool(classes.intersection(item_type))
+    return item_type in classes
+
+
+# ============================================================
+# Neo4j 검증
+# ============================================================
+
+def relationship_type(prop: str) -> str:
+    """presentedAt → PRESENTED_AT (load_cypher / n10s applyNeo4jNaming 규칙)"""
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", local_name(prop)).upper()
+
+
+def _cypher_type_check(var: str, xsd: str) -> str:
+    checks = []
+    for t in XSD_CYPHER_TYPES[xsd]:
+        checks.append(f"{var} IS :: {t}")
+        checks.append(f"{var} IS :: LIST<{t} NOT NULL>")
+    return "(" + " OR ".join(checks) + ")"
+
+
+def _node_condition(constraint: Constraint, var: str = "n") -> Optional[str]:
+    """노드 속성 제약 → 위반 조건식 (ObjectProperty class/domain 은 관계 쿼리에서 처리)"""
+    value = f"{var}.`{local_name(constraint.prop)}`"
+    if constraint.kind == "datatype":
+        return f"{value} IS NOT NULL AND NOT {_cypher_type_check(value, constraint.param)}"
+    if constraint.kind == "in":
+        return f"{value} IS NOT NULL AND {value} <> '' AND NOT {value} IN $in_{id(constraint)}"
+    if constraint.kind == "minCount":
+        return f"({value} IS NULL OR {value} = '' OR {value} = [])"
+    if constraint.kind == "maxCount":
+        return f"{value} IS :: LIST<ANY> AND size({value}) > {constraint.param}"
+    if constraint.kind == "domain":
+        return f"{value} IS NOT NULL AND NOT {var}:`{local_name(constraint.param)}`"
+    return None
+
+
+def validate_neo4j(driver, schema: OntologySchema, constraints: List[Constraint],
+                   id_property: str = "id", database: Optional[str] = None) -> List[ConstraintResult]:
+    """Neo4j 그래프에 제약 적용
+
+    - 데이터 속성 제약: 대상 라벨별 노드 스캔 1회에 모든 조건을 count(CASE ...) 로 집계
+    - 관계 제약: 관계 타입별 스캔 1회에 domain/range/maxCount 를 집계
+    """
+    results = {id(c): ConstraintResult(c) for c in constraints}
+    props = schema.properties
+
+    def run(query, **params):
+        with driver.session(database=database) as session:
+            return session.run(query, **params).single()
+
+    # 1. 노드 속성 제약 (라벨별 묶음)
+    by_label = defaultdict(list)
+    for c in constraints:
+        prop = props.get(c.prop)
+        if prop is not None and prop.kind == "object":
+            continue
+        if c.kind in ("datatype", "in", "minCount", "maxCount"):
+            by_label[local_name(c.focus)].append(c)
+        elif c.kind == "domain":
+            by_label[None].append(c)
+
+    for label, group in by_label.items():
+        match = f"MATCH (n:`{label}`)" if label else "MATCH (n)"
+        returns = ["count(n) AS total"]
+        params = {}
+        for k, c in enumerate(group):
+            condition = _node_condition(c)
+            returns.append(f"count(CASE WHEN {condition} THEN 1 END) AS v{k}")
+            returns.append(f"collect(CASE WHEN {condition} THEN n.`{id_property}` END)[..{MAX_SAMPLES}] AS s{k}")
+            if c.kind == "in":
+                params[f"in_{id(c)}"] = sorted(c.param)
+        record = run(f"{match} RETURN " + ", ".join(returns), **params)
+        for k, c in enumerate(group):
+            r = results[id(c)]
+            r.focus_count = record["total"]
+            r.violations = record[f"v{k}"]
+            r.samples = [str(s) for s in record[f"s{k}"]]
+
+        # 열거값 위반 분포
+        for c in group:
+            if c.kind == "in" and results[id(c)].violations:
+                value = f"n.`{local_name(c.prop)}`"
+                with driver.session(database=database) as session:
+                    for row in session.run(
+                        f"{match} WHERE {_node_condition(c)} RETURN {value} AS value, count(*) AS count",
+                        **{f"in_{id(c)}": sorted(c.param)}
+                    ):
+                        results[id(c)].values[str(row["value"])] = row["count"]
+
+    # 2. 관계 제약 (관계 타입별 묶음)
+    by_rel = defaultdict(list)
+    for c in constraints:
+        prop = props.get(c.prop)
+        if prop is not None and prop.kind == "object" and c.kind in ("domain", "class", "maxCount"):
+            by_rel[c.prop].append(c)
+
+    for prop_name, group in by_rel.items():
+        rel = relationship_type(prop_name)
+        returns = ["count(r) AS total"]
+        for k, c in enumerate(group):
+            if c.kind == "domain":
+                condition = f"NOT s:`{local_name(c.param)}`"
+            elif c.kind == "class":
+                condition = f"NOT o:`{local_name(c.param)}`"
+            else:
+                condition = None
+            if condition:
+                returns.append(f"count(CASE WHEN {condition} THEN 1 END) AS v{k}")
+                returns.append(f"collect(CASE WHEN {condition} THEN s.`{id_property}` END)[..{MAX_SAMPLES}] AS s{k}")
+        record = run(f"MATCH (s)-[r:`{rel}`]->(o) RETURN " + ", ".join(returns))
+        for k, c in enumerate(group):
+            r = results[id(c)]
+            r.focus_count = record["total"]
+            if c.kind == "maxCount":
+                over = run(
+                    f"MATCH (s)-[r:`{rel}`]->() WITH s, count(r) AS c WHERE c > $max "
+                    f"RETURN count(s) AS v, collect(s.`{id_property}`)[..{MAX_SAMPLES}] AS samples",
+                    max=c.param
+                )
+                r.violations = over["v"]
+                r.samples = [str(s) for s in over["samples"]]
+            else:
+                r.violations = record[f"v{k}"]
+                r.samples = [str(s) for s in record[f"s{k}"]]
+
+    return [results[id(c)] for c in constraints]
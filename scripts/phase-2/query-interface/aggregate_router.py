@@ -0,0 +1,119 @@
+"""
+집계 질문 라우팅 (TdocStat)
+"RAN1#120 회사 top 5", "status별 개수" 같은 통계 질문을 LLM Cypher 생성 없이
+사전 계산된 TdocStat 노드 조회로 변환한다 (phase-2/neo4j/aggregates.py).
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "neo4j"))
+
+from aggregates import STAT_LABEL, DIMENSIONS
+
+
+@dataclass
+class Route:
+    dimension: str
+    cypher: str
+    params: Dict[str, object] = field(default_factory=dict)
+    kind: str = "aggregate"     # aggregate: 결과가 없으면 LLM 으로, template: 결과 없음도 답 (template_router)
+
+
+def stat_query(dimension: str, filters: Dict[str, object], group_by: List[str],
+               limit: Optional[int] = None, order_by_key: bool = False) -> Route:
+    """TdocStat 조회 Cypher (group_by 가 없으면 필터 키로 묶어 1행)"""
+    if dimension not in DIMENSIONS:
+        raise KeyError(dimension)
+    keys = group_by or list(filters)
+    conditions = []
+    params: Dict[str, object] = {"dimension": dimension}
+    for name, value in filters.items():
+        if name == "company":
+            conditions.append(f"toLower(s.{name}) = toLower(${name})")
+        else:
+            conditions.append(f"s.{name} = ${name}")
+        params[name] = value
+
+    cypher = f"MATCH (s:{STAT_LABEL} {{dimension: $dimension}})"
+    if conditions:
+        cypher += "\nWHERE " + " AND ".join(conditions)
+    cypher += "\nRETURN " + ", ".join(f"s.{key} AS {key}" for key in keys) + ", sum(s.count) AS count"
+    cypher += "\nORDER BY " + (", ".join(keys) if order_by_key else "count DESC, " + ", ".join(keys))
+    if limit:
+        cypher += f"\nLIMIT {int(limit)}"
+    return Route(dimension, cypher, params)
+
+
+MEETING = r"(?P<meeting>[A-Z][A-Za-z]*\d*#\d+[-A-Za-z0-9]*)"
+COMPANY = r"(?P<company>[A-Za-z][A-Za-z0-9&.\-]*(?: [A-Z][A-Za-z0-9&.\-]*)*)"
+RELEASE = r"(?P<release>Rel-\d+)"
+SPEC = r"(?P<spec>\d{2}\.\d{3})"
+TOP = r"(?:.*?top\s*(?P<limit>\d+))?"
+TDOC = r"T[Dd]oc"
+
+
+def _limit(m: re.Match) -> Optional[int]:
+    value = m.groupdict().get("limit")
+    return int(value) if value else None
+
+
+# (패턴, 패턴 매치 → Route) - 위에서부터 첫 매치
+RULES: List[Tuple[re.Pattern, Callable[[re.Match], Route]]] = [
+    (re.compile(rf"{MEETING}.*CR\s*타입을 가장 많이 제출한 회사{TOP}", re.I),
+     lambda m: stat_query("meeting_company_type", {"meeting": m["meeting"], "type": "CR"}, ["company"], _limit(m))),
+    (re.compile(rf"{MEETING}.*가장 많이 .*제출한 회사{TOP}", re.I),
+     lambda m: stat_query("meeting_company", {"meeting": m["meeting"]}, ["company"], _limit(m))),
+    (re.compile(rf"top\s*(?P<limit>\d+) compan(?:y|ies).*(?:at|in) {MEETING}", re.I),
+     lambda m: stat_query("meeting_company", {"meeting": m["meeting"]}, ["company"], _limit(m))),
+    (re.compile(rf"^{COMPANY}의 {MEETING} {TDOC} status별 개수", re.I),
+     lambda m: stat_query("meeting_company_status", {"meeting": m["meeting"], "company": m["company"]},
+                          ["status"])),
+    (re.compile(rf"^{COMPANY}의 {TDOC} status별 개수", re.I),
+     lambda m: stat_query("company_status", {"company": m["company"]}, ["status"])),
+    (re.compile(rf"{MEETING}의 {TDOC} status별 개수", re.I),
+     lambda m: stat_query("meeting_status", {"meeting": m["meeting"]}, ["status"])),
+    (re.compile(rf"{MEETING}의 {TDOC} type별 개수", re.I),
+     lambda m: stat_query("meeting_type", {"meeting": m["meeting"]}, ["type"])),
+    (re.compile(rf"{MEETING}의 Agenda Item별 {TDOC} 개수{TOP}", re.I),
+     lambda m: stat_query("meeting_agenda", {"meeting": m["meeting"]}, ["agenda"], _limit(m))),
+    (re.compile(rf"{MEETING}의 Agenda (?:Item )?(?P<agenda>\d+(?:\.\d+)*) .*status별 개수", re.I),
+     lambda m: stat_query("meeting_agenda_status", {"meeting": m["meeting"], "agenda": m["agenda"]}, ["status"])),
+    (re.compile(rf"{MEETING}의 Work Item별 {TDOC} 개수{TOP}", re.I),
+     lambda m: stat_query("meeting_workitem", {"meeting": m["meeting"]}, ["workItem"], _limit(m))),
+    (re.compile(rf"{MEETING}의 (?:Target )?Release별 {TDOC} 개수", re.I),
+     lambda m: stat_query("meeting_release", {"meeting": m["meeting"]}, ["release"])),
+    (re.compile(rf"{MEETING}(?:에서|의) {COMPANY}(?:이|가)? 제출한 {TDOC} (?:수|개수|총 개수)", re.I),
+     lambda m: stat_query("meeting_company", {"meeting": m["meeting"], "company": m["company"]}, [])),
+    (re.compile(rf"{MEETING}.*{TDOC} 총 개수", re.I),
+     lambda m: stat_query("meeting", {"meeting": m["meeting"]}, [])),
+    (re.compile(rf"Meeting별 {TDOC} 개수", re.I),
+     lambda m: stat_query("meeting", {}, ["meeting"], order_by_key=True)),
+    (re.compile(rf"Company별 {TDOC} 개수{TOP}", re.I),
+     lambda m: stat_query("company", {}, ["company"], _limit(m))),
+    (re.compile(rf"{SPEC}.*CR.*(?:category|카테고리)별", re.I),
+     lambda m: stat_query("spec_release_category", {"spec": m["spec"]}, ["release", "category"])),
+    (re.compile(r"Spec을 수정하는 CR 개수", re.I),
+     lambda m: stat_query("spec_cr", {}, ["spec"])),
+    (re.compile(rf"Release별 {TDOC} 개수", re.I),
+     lambda m: stat_query("release", {}, ["release"], order_by_key=True)),
+    (re.compile(rf"{RELEASE}\S* (?:타겟|target).*CR.*(?:개수|수)", re.I),
+     lambda m: stat_query("release_cr", {"release": m["release"]}, [])),
+    (re.compile(rf"{RELEASE}\S* (?:타겟|target).*{TDOC}.*(?:개수|수)", re.I),
+     lambda m: stat_query("release", {"release": m["release"]}, [])),
+    (re.compile(rf"^{COMPANY}(?:이|가)? 제출한 {TDOC} (?:수|개수|총 개수)", re.I),
+     lambda m: stat_query("company", {"company": m["company"]}, [])),
+]
+
+
+def route_question(question: str) -> Optional[Route]:
+    """통계 질문이면 TdocStat 조회 Route, 아니면 None (LLM Cypher 생성)"""
+    question = " ".join(question.split())
+    for pattern, build in RULES:
+        m = pattern.search(question)
+        if m:
+            return build(m)
+    return None
@@ -0,0 +1,496 @@
+"""
+비동기 배치 QA 파이프라인
+CQ 목록을 stage 별 큐 (Cypher 생성 → 실행 → 답변 생성) 로 동시에 처리한다.
+질문 하나는 여전히 LLM → Neo4j → LLM 순서지만, 여러 질문의 대기 시간이 겹친다.
+
+- LLM 호출 (Cypher 생성 + 답변 생성 합산) / Neo4j 세션 동시 실행 수 제한
+- 429 / 5xx 는 Retry-After 또는 지수 백오프로 재시도, 초당 요청 수 제한 (LLM_MAX_RPS)
+- 결과는 입력 순서 그대로 (JSON / 마크다운 리포트)
+- 집계 / 템플릿 라우팅, 다단계 질문 계획 (하위 쿼리 동시 실행 + 조인), Cypher 캐시는 qa_engine.ask() 와 동일하게 적용
+
+사용법:
+    python async_qa.py                              # CQ_LIST 전체
+    python async_qa.py --llm-concurrency 16 --report docs/phase-2/cq_qa_report.md
+    OPENROUTER_API_BASE=http://localhost:8099/v1 python async_qa.py   # stub_llm_server.py 로 측정
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+OUTPUT_PATH = Path(__file__).parent.parent.parent.parent / "logs" / "phase-2" / "query-interface" / "cq_qa_async_results.json"
+
+
+@dataclass
+class QATask:
+    index: int
+    question: str
+    meta: Dict[str, Any] = field(default_factory=dict)
+    route: str = "llm"
+    route_kind: Optional[str] = None
+    cypher: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    from_cache: bool = False
+    plan: Any = None
+    results: list = field(default_factory=list)
+    success: bool = False
+    error: Optional[str] = None
+    answer: Optional[str] = None
+    answer_error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class QAHooks:
+    """stage 별 프롬프트 / 파싱 (기본은 라우팅·캐시 없음, 스크립트별로 상속)"""
+
+    def route(self, question: str):
+        """Route (dimension, cypher, params, kind) 또는 None"""
+        return None
+
+    def cached_cypher(self, question: str) -> Optional[str]:
+        return None
+
+    def store_cypher(self, question: str, cypher: str, seconds: float):
+        pass
+
+    def invalidate(self, question: str):
+        pass
+
+    def cypher_prompt(self, question: str) -> str:
+        raise NotImplementedError
+
+    def parse_cypher(self, response: str) -> str:
+        return response.strip()
+
+    def should_plan(self, question: str) -> bool:
+        """라우팅되지 않은 질문을 하위 쿼리 계획으로 처리할지"""
+        return False
+
+    def plan_prompt(self, question: str) -> str:
+        raise NotImplementedError
+
+    def parse_plan(self, question: str, response: str, seconds: float):
+        """계획 LLM 응답 → plan (steps: cypher / params / rows / seconds, describe()), 실패하면 예외"""
+        raise NotImplementedError
+
+    def join_plan(self, plan) -> list:
+        """실행된 하위 쿼리 결과 조인, 조인할 수 없으면 예외"""
+        raise NotImplementedError
+
+    def convert(self, record: dict) -> dict:
+        return record
+
+    def answer_prompt(self, task: QATask) -> Optional[str]:
+        """답변 생성 프롬프트 (None 이면 LLM 호출 없이 task.answer 그대로)"""
+        raise NotImplementedError
+
+
+class QAEngineHooks(QAHooks):
+    """qa_engine.ask() 와 같은 프롬프트 / 집계·템플릿 라우팅 / 질문 계획 / Cypher 캐시"""
+
+    def __init__(self):
+        from qa_engine import build_answer_prompt, route
+        from runtime import get_runtime
+        from text_to_cypher import CYPHER_GENERATION_PROMPT, clean_cypher
+
+        self._route = route
+        self._answer_prompt = build_answer_prompt
+        self._cypher_prompt = CYPHER_GENERATION_PROMPT
+        self._clean = clean_cypher
+        self.validator = get_runtime().cypher_validator
+        self.cache = get_runtime().cypher_cache
+        self.cache.companies()  # 회사명 슬롯 / 별칭 인덱스는 이벤트 루프 밖에서 미리 로드
+        get_runtime().template_router.load()
+        get_runtime().topic_router.load()
+        self.planner = get_runtime().planner
+
+    def route(self, question):
+        return self._route(question)
+
+    def cached_cypher(self, question):
+        return self.cache.get(question)
+
+    def store_cypher(self, question, cypher, seconds):
+        self.cache.put(question, cypher, seconds)
+
+    def invalidate(self, question):
+        self.cache.invalidate(question)
+
+    def cypher_prompt(self, question):
+        return self._cypher_prompt.format(question=question)
+
+    def parse_cypher(self, response):
+        # 스키마 실수 자동 수정, 남은 위반은 생성 실패로 (EXPLAIN 은 동기 드라이버라 생략)
+        return self.validator.check(self._clean(response))
+
+    def should_plan(self, question):
+        return self.planner.should_plan(question)
+
+    def plan_prompt(self, question):
+        return self.planner.prompt(question)
+
+    def parse_plan(self, question, response, seconds):
+        return self.planner.build(question, response, plan_seconds=seconds)
+
+    def join_plan(self, plan):
+        return self.planner.join(plan)
+
+    def answer_prompt(self, task):
+        return self._answer_prompt(task.question, task.results)
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (요청 간 최소 간격, rate=0 이면 제한 없음)"""
+
+    def __init__(self, rate: float = 0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """재시도할 오류면 서버가 요청한 대기 시간 (없으면 0), 아니면 None"""
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status not in RETRY_STATUS and "rate limit" not in str(exc).lower():
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AsyncQAPipeline:
+    """
+    stage 별 asyncio.Queue + 워커
+      generate (LLM) → execute (Neo4j) → answer (LLM)
+    - Route / 캐시 적중 질문은 generate 를 건너뛴다
+    - 계획 질문 (hooks.should_plan) 은 generate 에서 계획 LLM → 하위 쿼리 동시 실행 → 조인 후 answer 로
+      (계획 / 실행 / 조인이 실패하면 generate 로 되돌린다)
+    - Route 조회가 실패하면 (집계 Route 는 결과가 없어도) generate 로 되돌린다
+    - result_cache 가 있으면 같은 그래프 버전에서 실행한 Cypher 는 Neo4j 를 건너뛴다
+    """
+
+    def __init__(self, llm, driver, hooks: QAHooks, llm_concurrency: int = 8, neo4j_concurrency: int = 8,
+                 max_rps: float = 0, max_retries: int = 5, backoff: float = 1.0, database: str = None,
+                 verbose: bool = True, result_cache=None):
+        self.llm = llm
+        self.driver = driver
+        self.hooks = hooks
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.neo4j_concurrency = max(1, neo4j_concurrency)
+        self.max_rps = max_rps
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.database = database
+        self.verbose = verbose
+        self.result_cache = result_cache
+        self.stats = {"llm_calls": 0, "retries": 0, "queries": 0, "result_cache_hits": 0, "elapsed": 0.0}
+
+    # -- 호출 --
+    async def _complete(self, task: QATask, prompt: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            await self._limiter.wait()
+            try:
+                async with self._llm_slots:
+                    self.stats["llm_calls"] += 1
+                    start = time.monotonic()
+                    try:
+                        response = await self.llm.acomplete(prompt)
+                    finally:
+                        task.timings["llm"] = task.timings.get("llm", 0.0) + time.monotonic() - start
+                return response.text
+            except Exception as e:
+                wait = retry_after(e)
+                if wait is None or attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(max(wait, self.backoff * 2 ** attempt) + random.uniform(0, self.backoff))
+
+    async def _execute(self, task: QATask, cypher: str = None, params: dict = None) -> list:
+        """task.cypher (또는 하위 쿼리 cypher) 실행, Neo4j 세션은 neo4j_concurrency 개까지"""
+        if cypher is None:
+            cypher, params = task.cypher, task.params
+        if self.result_cache is not None:
+            rows = self.result_cache.get(cypher, params, self._graph_version)
+            if rows is not None:
+                self.stats["result_cache_hits"] += 1
+                return [self.hooks.convert(row) for row in rows]
+        self.stats["queries"] += 1
+        async with self._neo4j_slots:
+            start = time.monotonic()
+            try:
+                async with self.driver.session(database=self.database) as session:
+                    result = await session.run(cypher, params or {})
+                    rows = [dict(record) async for record in result]
+            finally:
+                task.timings["neo4j"] = task.timings.get("neo4j", 0.0) + time.monotonic() - start
+        if self.result_cache is not None:
+            self.result_cache.put(cypher, params, rows, time.monotonic() - start, self._graph_version)
+        return [self.hooks.convert(row) for row in rows]
+
+    # -- stage --
+    async def _plan(self, task: QATask):
+        """계획 LLM → 하위 쿼리 동시 실행 → 조인 (실패하면 LLM Cypher 생성으로)"""
+        try:
+            llm_before = task.timings.get("llm", 0.0)
+            response = await self._complete(task, self.hooks.plan_prompt(task.question))
+            task.plan = self.hooks.parse_plan(task.question, response, task.timings["llm"] - llm_before)
+
+            async def run_step(step):
+                start = time.monotonic()
+                try:
+                    step.rows = await self._execute(task, step.cypher, step.params)
+                finally:
+                    step.seconds = time.monotonic() - start
+
+            start = time.monotonic()
+            await asyncio.gather(*(run_step(step) for step in task.plan.steps))
+            task.plan.execute_seconds = time.monotonic() - start
+            task.results = self.hooks.join_plan(task.plan)
+        except Exception as e:
+            task.route, task.route_kind, task.plan, task.results = "llm", None, None, []
+            if self.verbose:
+                print(f"  ⚠️ [{task.meta.get('id', task.index + 1)}] 계획 실패, Cypher 생성으로 전환: {e}")
+            await self._generate_queue.put(task)
+            return
+        task.cypher, task.success = task.plan.describe(), True
+        await self._answer_queue.put(task)
+
+    async def _generate(self, task: QATask):
+        if task.route_kind == "plan":
+            await self._plan(task)
+            return
+        llm_before = task.timings.get("llm", 0.0)
+        try:
+            task.cypher = self.hooks.parse_cypher(await self._complete(task, self.hooks.cypher_prompt(task.question)))
+        except Exception as e:
+            task.error = f"Cypher generation failed: {e}"
+            await self._answer_queue.put(task)
+            return
+        self.hooks.store_cypher(task.question, task.cypher, task.timings["llm"] - llm_before)
+        await self._execute_queue.put(task)
+
+    async def _run_query(self, task: QATask):
+        try:
+            task.results = await self._execute(task)
+            task.success = True
+        except Exception as e:
+            task.results = []
+            task.success = False
+            task.error = str(e)
+
+        if task.route != "llm" and (not task.success or (not task.results and task.route_kind == "aggregate")):
+            # 집계/템플릿 조회 실패, 집계 결과 없음 → LLM Cypher 생성 (집계는 ask() 처럼 계획 질문이면 계획 먼저)
+            plan = task.route_kind == "aggregate" and self.hooks.should_plan(task.question)
+            task.route, task.route_kind = ("plan", "plan") if plan else ("llm", None)
+            task.cypher, task.params = None, {}
+            task.success, task.error = False, None
+            await self._generate_queue.put(task)
+            return
+        if not task.success:
+            self.hooks.invalidate(task.question)
+        await self._answer_queue.put(task)
+
+    async def _answer(self, task: QATask):
+        prompt = self.hooks.answer_prompt(task)
+        if prompt is not None:
+            try:
+                task.answer = (await self._complete(task, prompt)).strip()
+            except Exception as e:
+                task.answer_error = str(e)
+        self._finish(task)
+
+    def _finish(self, task: QATask):
+        task.timings["total"] = time.monotonic() - self._started[task.index]
+        self._done[task.index] = task
+        if self.verbose:
+            mark = "✅" if task.success and task.results else ("⚠️" if task.success else "❌")
+            label = task.meta.get("id", task.index + 1)
+            print(f"  {mark} [{label}] {task.timings['total']:.1f}s ({task.route}) {len(task.results)}건")
+        if len(self._done) == self._total:
+            self._all_done.set()
+
+    async def _worker(self, stage: str, queue: asyncio.Queue, handler):
+        while True:
+            task = await queue.get()
+            start = time.monotonic()
+            try:
+                await handler(task)
+            except Exception as e:
+                task.error = task.error or f"{stage}: {e}"
+                task.success = False
+                self._finish(task)
+            finally:
+                task.timings[stage] = task.timings.get(stage, 0.0) + time.monotonic() - start
+                queue.task_done()
+
+    # -- 실행 --
+    async def run(self, questions: List[str], metas: List[dict] = None) -> List[QATask]:
+        """질문 목록 처리 → 입력 순서대로 QATask"""
+        self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        self._neo4j_slots = asyncio.Semaphore(self.neo4j_concurrency)
+        self._limiter = RateLimiter(self.max_rps)
+        self._generate_queue = asyncio.Queue()
+        self._execute_queue = asyncio.Queue()
+        self._answer_queue = asyncio.Queue()
+        self._done: Dict[int, QATask] = {}
+        self._total = len(questions)
+        self._all_done = asyncio.Event()
+        self._started = {}
+        self._graph_version = None
+        if self.result_cache is not None:
+            # 버전 조회는 동기 드라이버라 실행기 스레드에서 한 번만
+            self._graph_version = await asyncio.get_running_loop().run_in_executor(None, self.result_cache.version)
+
+        start = time.monotonic()
+        for index, question in enumerate(questions):
+            task = QATask(index, question, (metas or [{}] * len(questions))[index])
+            self._started[index] = time.monotonic()
+            route = self.hooks.route(question)
+            cached = self.hooks.cached_cypher(question) if route is None else None
+            if route is None and self.hooks.should_plan(question):
+                task.route = task.route_kind = "plan"
+                await self._generate_queue.put(task)
+            elif route is not None:
+                task.route, task.route_kind = route.dimension, route.kind
+                task.cypher, task.params = route.cypher, route.params
+                await self._execute_queue.put(task)
+            elif cached is not None:
+                task.cypher, task.from_cache = cached, True
+                await self._execute_queue.put(task)
+            else:
+                await self._generate_queue.put(task)
+
+        workers = (
+            [asyncio.create_task(self._worker("generate", self._generate_queue, self._generate))
+             for _ in range(self.llm_concurrency)]
+            + [asyncio.create_task(self._worker("execute", self._execute_queue, self._run_query))
+               for _ in range(self.neo4j_concurrency)]
+            + [asyncio.create_task(self._worker("answer", self._answer_queue, self._answer))
+               for _ in range(self.llm_concurrency)]
+        )
+        try:
+            if self._total:
+                await self._all_done.wait()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.stats["elapsed"] = time.monotonic() - start
+        return [self._done[index] for index in range(self._total)]
+
+
+def to_result(task: QATask) -> dict:
+    """qa_engine.ask() 결과와 같은 형태 (+ timings)"""
+    from qa_engine import serialize_neo4j_result
+
+    return {
+        "id": task.meta.get("id"),
+        "category": task.meta.get("cat"),
+        "question": task.question,
+        "cypher": task.cypher,
+        "route": task.route,
+        "from_cache": task.from_cache,
+        "results": [serialize_neo4j_result(r) for r in task.results],
+        "result_count": len(task.results),
+        "answer": task.answer if task.answer is not None else task.answer_error,
+        "success": task.success,
+        "error": task.error,
+        "timings": {k: round(v, 3) for k, v in task.timings.items()},
+    }
+
+
+async def run_cq_list(cq_list: List[dict], llm_concurrency: int, neo4j_concurrency: int,
+                      max_rps: float, max_retries: int) -> tuple:
+    from graph_store import get_async_neo4j_driver
+    from runtime import get_runtime
+    import config
+
+    hooks = QAEngineHooks()
+    driver = get_async_neo4j_driver(**dict(config.NEO4J_POOL_CONFIG,
+                                           max_connection_pool_size=max(neo4j_concurrency,
+                                                                        config.NEO4J_POOL_CONFIG["max_connection_pool_size"])))
+    pipeline = AsyncQAPipeline(get_runtime().llm, driver, hooks, llm_concurrency, neo4j_concurrency,
+                               max_rps, max_retries, result_cache=get_runtime().result_cache)
+    try:
+        tasks = await pipeline.run([cq["q"] for cq in cq_list], cq_list)
+    finally:
+        await driver.close()
+    return tasks, pipeline.stats
+
+
+def main():
+    import config
+    from qa_engine import CQ_LIST, write_report
+
+    defaults = config.ASYNC_QA_CONFIG
+    parser = argparse.ArgumentParser(description="비동기 배치 CQ QA")
+    parser.add_argument('--llm-concurrency', type=int, default=defaults["llm_concurrency"],
+                        help='동시 LLM 호출 수 (Cypher 생성 + 답변 생성)')
+    parser.add_argument('--neo4j-concurrency', type=int, default=defaults["neo4j_concurrency"],
+                        help='동시 Neo4j 세션 수')
+    parser.add_argument('--max-rps', type=float, default=defaults["max_rps"], help='초당 LLM 요청 수 (0=제한 없음)')
+    parser.add_argument('--max-retries', type=int, default=defaults["max_retries"], help='429/5xx 재시도 횟수')
+    parser.add_argument('--limit', type=int, help='앞에서부터 N개 CQ 만')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='결과 JSON')
+    parser.add_argument('--report', help='마크다운 리포트 경로 (qa_engine.run_all_cq 와 같은 형식)')
+    args = parser.parse_args()
+
+    cq_list = CQ_LIST[:args.limit] if args.limit else CQ_LIST
+
+    print("=" * 60)
+    print("비동기 배치 CQ QA")
+    print("=" * 60)
+    print(f"CQ {len(cq_list)}개, LLM 동시 {args.llm_concurrency}, Neo4j 동시 {args.neo4j_concurrency}"
+          + (f", {args.max_rps:g} req/s" if args.max_rps else ""))
+
+    tasks, stats = asyncio.run(run_cq_list(cq_list, args.llm_concurrency, args.neo4j_concurrency,
+                                           args.max_rps, args.max_retries))
+    results = [to_result(task) for task in tasks]
+
+    # 순차 실행 추정 = 질문별 LLM + Neo4j 시간 합 (큐 대기 제외)
+    busy = [task.timings.get("llm", 0.0) + task.timings.get("neo4j", 0.0) for task in tasks]
+    sequential, slowest = sum(busy), max(busy, default=0.0)
+    print(f"\n⏱️ 전체 {stats['elapsed']:.1f}s (가장 느린 질문 {slowest:.1f}s, 순차 실행 추정 {sequential:.1f}s)")
+    print(f"   LLM 호출 {stats['llm_calls']}회 (재시도 {stats['retries']}회), Cypher 실행 {stats['queries']}회"
+          f" (결과 캐시 적중 {stats['result_cache_hits']}회)")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "generated_at": datetime.now().isoformat(),
+            "settings": {k: getattr(args, k) for k in ("llm_concurrency", "neo4j_concurrency", "max_rps", "max_retries")},
+            "stats": {**stats, "sequential_estimate": sequential, "slowest_question": slowest},
+            "results": results,
+        }, f, ensure_ascii=False, indent=2, default=str)
+    print(f"결과 저장: {output}")
+
+    if args.report:
+        write_report(results, args.report)
+
+
+if __name__ == "__main__":
+    main()
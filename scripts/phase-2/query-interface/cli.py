@@ -0,0 +1,160 @@
+"""
+Query Interface 명령행 진입점
+하위 명령에 필요한 모듈만 import 한다 (모듈 최상위는 표준 라이브러리만):
+- cypher: Neo4j 드라이버만 (LlamaIndex / httpx 로드 없음)
+- ask / repl / cq / batch: LLM 클라이언트는 첫 LLM 호출 때 (repl 은 입력을 기다리는 동안 백그라운드에서) 로드
+- plan: 하위 쿼리 계획만 확인 (--dry-run) 또는 동시 실행 + 조인 결과 (답변 생성 없음)
+- bench-import: 모듈별 import 시간과 무거운 모듈 로드 여부 확인 (import_bench.py)
+
+사용법:
+    python cli.py ask "RAN1#120에서 Huawei가 제출한 Tdoc 5개"
+    python cli.py cypher "MATCH (m:Meeting) RETURN m.meetingNumber AS meeting LIMIT 5"
+    python cli.py cypher "MATCH (t:Tdoc {tdocNumber: \\$tdoc}) RETURN t.title AS title" -p tdoc=R1-2400001
+    python cli.py plan "Rel-18 CR 중 38.214 를 수정하면서 RAN1#120에서 agreed 된 CR 의 회사" --dry-run
+    python cli.py repl
+    python cli.py cq --report docs/phase-2/cq_qa_report.md
+    python cli.py batch --llm-concurrency 16
+    python cli.py bench-import
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def _param(text: str):
+    """-p name=value (값은 JSON 으로 해석되면 JSON, 아니면 문자열)"""
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"name=value 형식이 아님: {text}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def cmd_ask(args) -> int:
+    from qa_engine import ask
+
+    result = ask(args.question, verbose=not args.json)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+    return 0 if result["success"] else 1
+
+
+def cmd_cypher(args) -> int:
+    from runtime import get_runtime
+    from qa_engine import results_table
+
+    start = time.time()
+    rows = get_runtime().execute(args.cypher, dict(args.param), use_cache=not args.no_cache)
+    elapsed = time.time() - start
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+    else:
+        print(results_table(rows, limit=args.rows))
+        print(f"({len(rows)}건, {elapsed * 1000:.0f}ms)")
+    return 0
+
+
+def cmd_plan(args) -> int:
+    from runtime import get_runtime
+    from qa_engine import results_table
+
+    planner = get_runtime().planner
+    plan = planner.plan(args.question)
+    print(plan.describe())
+    if args.dry_run:
+        return 0
+    rows = planner.execute(plan)
+    for i, step in enumerate(plan.steps, 1):
+        print(f"[{i}] {len(step.rows)}건 ({step.seconds * 1000:.0f}ms)")
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+    else:
+        print(results_table(rows, limit=args.rows))
+        print(f"({len(rows)}건, 동시 실행 {plan.execute_seconds * 1000:.0f}ms, "
+              f"계획 {plan.plan_seconds * 1000:.0f}ms)")
+    return 0
+
+
+def cmd_repl(args) -> int:
+    from text_to_cypher import interactive_mode
+
+    interactive_mode()
+    return 0
+
+
+def cmd_cq(args) -> int:
+    from qa_engine import run_all_cq
+
+    results = run_all_cq(args.report)
+    return 0 if all(r["success"] for r in results) else 1
+
+
+def cmd_batch(args) -> int:
+    import async_qa
+
+    sys.argv = ["async_qa.py", *args.options]
+    async_qa.main()
+    return 0
+
+
+def cmd_bench_import(args) -> int:
+    import import_bench
+
+    return import_bench.main(args.options)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="3GPP TDoc Knowledge Graph Query Interface")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("ask", help="자연어 질문 → Cypher → 실행 → 답변")
+    p.add_argument("question")
+    p.add_argument("--json", action="store_true", help="결과 dict 를 JSON 으로 출력")
+    p.set_defaults(handler=cmd_ask)
+
+    p = commands.add_parser("cypher", help="Cypher 직접 실행 (LLM 없음)")
+    p.add_argument("cypher")
+    p.add_argument("-p", "--param", type=_param, action="append", default=[], help="name=value, 반복 가능")
+    p.add_argument("--rows", type=int, default=25, help="표로 출력할 최대 행 수")
+    p.add_argument("--json", action="store_true", help="전체 결과를 JSON 으로 출력")
+    p.add_argument("--no-cache", action="store_true", help="결과 캐시 건너뜀")
+    p.set_defaults(handler=cmd_cypher)
+
+    p = commands.add_parser("plan", help="질문 → 하위 쿼리 계획 → 동시 실행 + 조인 (답변 생성 없음)")
+    p.add_argument("question")
+    p.add_argument("--dry-run", action="store_true", help="계획 (검증된 하위 쿼리) 만 출력")
+    p.add_argument("--rows", type=int, default=25, help="표로 출력할 최대 행 수")
+    p.add_argument("--json", action="store_true", help="조인 결과를 JSON 으로 출력")
+    p.set_defaults(handler=cmd_plan)
+
+    p = commands.add_parser("repl", help="대화형 질의 모드")
+    p.set_defaults(handler=cmd_repl)
+
+    p = commands.add_parser("cq", help="CQ_LIST 순차 실행 + 리포트")
+    p.add_argument("--report", help="마크다운 리포트 경로")
+    p.set_defaults(handler=cmd_cq)
+
+    p = commands.add_parser("batch", help="비동기 배치 CQ QA (나머지 옵션은 async_qa.py 로)", add_help=False)
+    p.set_defaults(handler=cmd_batch, passthrough=True)
+
+    p = commands.add_parser("bench-import", help="import 시간 측정 (나머지 옵션은 import_bench.py 로)",
+                            add_help=False)
+    p.set_defaults(handler=cmd_bench_import, passthrough=True)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args, options = parser.parse_known_args(argv)
+    if options and not getattr(args, "passthrough", False):
+        parser.error(f"알 수 없는 인자: {' '.join(options)}")
+    args.options = options
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,46 @@
 """
 Step-3 Query Interface Configuration
 Neo4j + LlamaIndex + OpenRouter 설정
+
+import 는 가볍게 유지한다 (os + dotenv). httpx / urllib3 SSL 패치는 LLM 클라이언트를 만들 때
+graph_store 가 apply_ssl_patch() 로 적용하므로, Cypher 만 실행하는 경로는 HTTP 스택을 로드하지 않는다.
 """
 
 import os
-import urllib3
-import httpx
+import threading
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# SSL 경고 비활성화 및 SSL 검증 우회 (WSL 환경 대응)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+_ssl_patch_lock = threading.Lock()
+_ssl_patched = False
+
+
+def apply_ssl_patch():
+    """SSL 경고 비활성화 및 httpx SSL 검증 우회 (WSL 환경 대응, LlamaIndex가 httpx 사용), 한 번만 적용"""
+    global _ssl_patched
+    with _ssl_patch_lock:
+        if _ssl_patched:
+            return
+        import httpx
+        import urllib3
+
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# httpx SSL 검증 비활성화 패치 (LlamaIndex가 httpx 사용)
-_original_client_init = httpx.Client.__init__
-def _patched_client_init(self, *args, **kwargs):
-    kwargs['verify'] = False
-    _original_client_init(self, *args, **kwargs)
-httpx.Client.__init__ = _patched_client_init
+        original_client_init = httpx.Client.__init__
+        def patched_client_init(self, *args, **kwargs):
+            kwargs['verify'] = False
+            original_client_init(self, *args, **kwargs)
+        httpx.Client.__init__ = patched_client_init
+
+        original_async_init = httpx.AsyncClient.__init__
+        def patched_async_init(self, *args, **kwargs):
+            kwargs['verify'] = False
+            original_async_init(self, *args, **kwargs)
+        httpx.AsyncClient.__init__ = patched_async_init
+        _ssl_patched = True
 
-_original_async_init = httpx.AsyncClient.__init__
-def _patched_async_init(self, *args, **kwargs):
-    kwargs['verify'] = False
-    _original_async_init(self, *args, **kwargs)
-httpx.AsyncClient.__init__ = _patched_async_init
 
 # Neo4j 설정 (Step-2에서 구축한 DB)
 NEO4J_CONFIG = {
@@ -33,16 +49,84 @@ NEO4J_CONFIG = {
     "password": "password123",
 }
 
+# Neo4j 드라이버 커넥션 풀 (runtime.py 가 프로세스당 드라이버 1개를 재사용)
+NEO4J_POOL_CONFIG = {
+    "max_connection_pool_size": int(os.getenv("NEO4J_POOL_SIZE", "16")),
+    "connection_acquisition_timeout": float(os.getenv("NEO4J_POOL_ACQUIRE_TIMEOUT", "30")),
+    "max_connection_lifetime": int(os.getenv("NEO4J_POOL_MAX_LIFETIME", "3600")),
+    "keep_alive": True,
+}
+
+# 질문 → Cypher 캐시 (cypher_cache.py)
+CYPHER_CACHE_PATH = os.getenv(
+    "CYPHER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..",
+                 "logs", "phase-2", "query-interface", "cypher_cache.json"),
+)
+
+# Cypher 결과 캐시 (result_cache.py, 그래프 버전이 바뀌면 무효)
+RESULT_CACHE_CONFIG = {
+    "enabled": os.getenv("RESULT_CACHE", "1") == "1",
+    "max_entries": int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024")),
+    "max_mb": float(os.getenv("RESULT_CACHE_MAX_MB", "64")),
+    "disk_dir": os.getenv(
+        "RESULT_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..",
+                     "logs", "phase-2", "query-interface", "result_cache"),
+    ),                                                          # 빈 값이면 메모리만
+    "disk_max_mb": float(os.getenv("RESULT_CACHE_DISK_MAX_MB", "256")),
+    "version_ttl": float(os.getenv("RESULT_CACHE_VERSION_TTL", "30")),  # 그래프 버전 재확인 간격 (초)
+}
+
+# 주제어 질문 하이브리드 검색 (topic_router.py, 색인은 phase-2/retrieval/build_index.py)
+RETRIEVAL_CONFIG = {
+    "enabled": os.getenv("RETRIEVAL", "1") == "1",
+    "index_dir": os.getenv(
+        "RETRIEVAL_INDEX_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..",
+                     "ontology", "output", "retrieval", "phase-2"),
+    ),
+    "vector": os.getenv("RETRIEVAL_VECTOR", "1") == "1",                # 임베딩 색인이 있으면 함께 사용
+    "candidates": int(os.getenv("RETRIEVAL_CANDIDATES", "100")),        # Cypher 에 넘길 후보 키 수
+}
+
+# 생성된 Cypher 사전 검증 (cypher_validator.py)
+CYPHER_VALIDATOR_CONFIG = {
+    "default_limit": int(os.getenv("CYPHER_DEFAULT_LIMIT", "25")),  # LIMIT 없는 쿼리에 추가 (0=추가 안 함)
+    "explain": os.getenv("CYPHER_EXPLAIN", "1") == "1",             # 실행 전 EXPLAIN 으로 구문 확인
+}
+
+# 다단계 질문 계획 (planner.py, 하위 쿼리 동시 실행 + 클라이언트 조인)
+PLANNER_CONFIG = {
+    "enabled": os.getenv("PLANNER", "1") == "1",
+    "min_conditions": int(os.getenv("PLANNER_MIN_CONDITIONS", "2")),  # 조건 수 (+ 연결 표현) 기준
+    "max_steps": int(os.getenv("PLANNER_MAX_STEPS", "4")),
+    "concurrency": int(os.getenv("PLANNER_CONCURRENCY", "4")),        # NEO4J_POOL_SIZE 이하
+    "step_limit": int(os.getenv("PLANNER_STEP_LIMIT", "5000")),       # 하위 쿼리에 추가하는 LIMIT (조인 전)
+}
+
+# 명령행 시작 시간 목표 (cli.py 모듈 import, import_bench.py 로 확인)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+
 # OpenRouter 설정
 OPENROUTER_CONFIG = {
     "api_key": os.getenv("OPENROUTER_API_KEY"),
     "model": "google/gemini-2.5-flash",
-    "api_base": "https://openrouter.ai/api/v1",
+    "api_base": os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1"),
+}
+
+# 비동기 배치 QA (async_qa.py)
+ASYNC_QA_CONFIG = {
+    "llm_concurrency": int(os.getenv("ASYNC_QA_LLM_CONCURRENCY", "8")),
+    "neo4j_concurrency": int(os.getenv("ASYNC_QA_NEO4J_CONCURRENCY", "8")),
+    "max_rps": float(os.getenv("LLM_MAX_RPS", "0")),      # 0 = 제한 없음
+    "max_retries": int(os.getenv("LLM_MAX_RETRIES", "5")),
 }
 
 # Neo4j 스키마 정보 (TextToCypherRetriever 정확도 향상용)
 SCHEMA_INFO = """
-Node Labels: Tdoc, CR, LS, Meeting, Company, Contact, WorkItem, AgendaItem, Release, Spec, WorkingGroup
+Node Labels: Tdoc (+ CR, LS, Summary, SessionNotes), Meeting, Company, Contact, WorkItem, AgendaItem, Release, Spec,
+WorkingGroup, Resolution (+ Agreement, Conclusion, WorkingAssumption)
 
 Relationships:
 - (Tdoc)-[:PRESENTED_AT]->(Meeting)
@@ -58,11 +142,18 @@ Relationships:
 - (LS)-[:CC_TO]->(WorkingGroup)
 - (LS)-[:ORIGINATED_FROM]->(WorkingGroup)
 - (LS)-[:REPLY_TO]->(Tdoc)
+- (Summary)-[:MODERATED_BY]->(Company)
+- (SessionNotes)-[:CHAIRED_BY]->(Company)
+- (Resolution)-[:MADE_AT]->(Meeting)
+- (Resolution)-[:RESOLUTION_BELONGS_TO]->(AgendaItem)
+- (Resolution)-[:REFERENCES]->(Tdoc)
 
 Key Properties:
-- Tdoc: tdocNumber, title, type, status, for
+- Tdoc: tdocNumber, tdocKey (scalar tdocNumber), title, type, status, for
+- Summary: summaryType, roundNumber
 - Company: companyName, aliases
 - Meeting: meetingNumber
 - WorkItem: workItemCode
 - AgendaItem: agendaNumber, description
+- Resolution: resolutionId, content, meeting, agenda, hasFFS, hasTBD (Agreement / WorkingAssumption), hasConsensus (Conclusion)
 """
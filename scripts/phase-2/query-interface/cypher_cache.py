@@ -0,0 +1,289 @@
+"""
+질문 → Cypher 캐시 (Text-to-Cypher)
+질문의 엔티티(Tdoc 번호, 회의, Spec, Release, Agenda, 회사, top-N)를 슬롯으로 바꾼 정규화 질문을 키로
+슬롯 자리표시가 들어간 Cypher 템플릿을 저장한다. 같은 질문과 엔티티만 다른 질문은 LLM 호출 없이 생성.
+
+- 정확히 같은 질문: exact 캐시 (템플릿화할 수 없는 Cypher 포함)
+- 엔티티만 다른 질문: 템플릿 캐시 (모든 슬롯 값이 생성된 Cypher 에 그대로 나타날 때만 저장,
+  회사는 질문과 같은 표기 / 소문자 / 대문자만, 바뀐 대소문자는 {{COMPANY_1|lower}} 로 기록해 채울 때 다시 적용)
+- 실행 오류가 난 Cypher 는 invalidate() 로 제거
+- 적중률 / 절약한 LLM 시간은 stats() / report()
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+CACHE_PATH = Path(config.CYPHER_CACHE_PATH).resolve()
+
+
+@dataclass(frozen=True)
+class SlotType:
+    name: str
+    pattern: re.Pattern            # 질문에서 찾기 (group "v" 가 값)
+    in_cypher: Callable[[str], str]  # 값 → Cypher 에서 찾을 정규식
+
+
+def _literal(value: str) -> str:
+    return rf"(?<![A-Za-z0-9]){re.escape(value)}(?![A-Za-z0-9])"
+
+
+SLOT_TYPES: List[SlotType] = [
+    SlotType("TDOC", re.compile(r"(?<![A-Za-z0-9])(?P<v>[A-Z]\d-\d{6,7})(?![0-9])"), _literal),
+    SlotType("MEETING", re.compile(r"(?P<v>[A-Z][A-Za-z]*\d*#\d+[-A-Za-z0-9]*)"), _literal),
+    SlotType("SPEC", re.compile(r"(?<![\d.])(?P<v>\d{2}\.\d{3})(?![\d.])"), _literal),
+    SlotType("RELEASE", re.compile(r"(?P<v>Rel-\d+)(?![0-9])", re.I), _literal),
+    SlotType("AGENDA", re.compile(r"(?:Agenda(?:\s*Item)?|AI)\s*(?P<v>\d+(?:\.\d+){0,3})(?![\d.])", re.I), _literal),
+    SlotType("TOP", re.compile(r"(?:top\s*(?P<v>\d+)(?!\d))|(?:(?<![\d.])(?P<n>\d+)\s*개)", re.I),
+             lambda value: rf"(?i)(?<=LIMIT ){re.escape(value)}(?!\d)"),
+]
+
+# 회사 슬롯의 대소문자 변환 (toLower(c.companyName) CONTAINS 'samsung' 처럼 Cypher 에서 바뀐 표기)
+CASE_TRANSFORMS: Dict[str, Callable[[str], str]] = {"lower": str.lower, "upper": str.upper}
+
+# 슬롯 뒤 조사 (받침에 따라 바뀌는 쌍은 하나로)
+PARTICLES = {"가": "이", "는": "은", "를": "을", "와": "과", "로": "으로"}
+
+
+@dataclass
+class Normalized:
+    key: str                         # 정규화 질문 (슬롯 자리표시 포함)
+    slots: List[Tuple[str, str]]     # (슬롯 이름, 질문에 나온 값)
+
+
+class CypherCache:
+    def __init__(self, path: Optional[Path] = CACHE_PATH, companies: Optional[Iterable[str]] = None,
+                 company_loader: Optional[Callable[[], Iterable[str]]] = None):
+        self.path = Path(path) if path else None
+        self._companies = sorted(set(companies), key=len, reverse=True) if companies is not None else None
+        self._company_loader = company_loader
+        self._company_re = None
+        self._lock = threading.Lock()
+        self.exact: Dict[str, dict] = {}
+        self.templates: Dict[str, dict] = {}
+        self.counters = {"exact_hits": 0, "template_hits": 0, "misses": 0,
+                         "saved_seconds": 0.0, "llm_seconds": 0.0}
+        self._load()
+
+    # -- 저장 --
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.exact = data.get("exact", {})
+            self.templates = data.get("templates", {})
+        except (OSError, ValueError):
+            self.exact, self.templates = {}, {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"exact": self.exact, "templates": self.templates}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    # -- 정규화 --
+    def companies(self) -> List[str]:
+        """회사 이름/별칭 (첫 사용 시 로드, 실패하면 회사 슬롯 없이 진행하고 다음 호출에서 다시 로드)"""
+        if self._companies is None:
+            names = []
+            if self._company_loader is not None:
+                try:
+                    names = list(self._company_loader())
+                except Exception as e:
+                    print(f"⚠️ 회사 이름 로드 실패, 회사 슬롯 없이 진행 (다음 질문에서 다시 시도): {e}")
+                    return []
+            self._companies = sorted({n for n in names if n and len(n) >= 2}, key=len, reverse=True)
+        return self._companies
+
+    def _company_pattern(self) -> Optional[re.Pattern]:
+        if self._company_re is None and self.companies():
+            names = "|".join(re.escape(name) for name in self.companies())
+            self._company_re = re.compile(rf"(?<![A-Za-z0-9])(?P<v>{names})(?![A-Za-z0-9])", re.I)
+        return self._company_re
+
+    def normalize(self, question: str) -> Normalized:
+        text = " ".join(question.split()).rstrip("?？. ")
+        found: List[Tuple[int, int, str, str]] = []   # (start, end, 슬롯 종류, 값)
+        taken = [False] * len(text)
+
+        slot_types = list(SLOT_TYPES)
+        company = self._company_pattern()
+        if company is not None:
+            slot_types.append(SlotType("COMPANY", company, _literal))
+
+        for slot in slot_types:
+            for m in slot.pattern.finditer(text):
+                group = "v" if m.group("v") is not None else "n"
+                start, end = m.span(group)
+                if any(taken[start:end]):
+                    continue
+                for i in range(start, end):
+                    taken[i] = True
+                found.append((start, end, slot.name, m.group(group)))
+
+        found.sort()
+        counts: Dict[str, int] = {}
+        slots, parts, last = [], [], 0
+        for start, end, kind, value in found:
+            counts[kind] = counts.get(kind, 0) + 1
+            name = f"{kind}_{counts[kind]}"
+            parts.append(text[last:start].lower())
+            parts.append("{" + name + "}")
+            slots.append((name, value))
+            last = end
+        parts.append(text[last:].lower())
+        key = "".join(parts)
+        key = re.sub(r"(\{[A-Z]+_\d+\})(가|는|를|와|로)(?![가-힣])",
+                     lambda m: m.group(1) + PARTICLES[m.group(2)], key)
+        return Normalized(key, slots)
+
+    # -- 템플릿 --
+    @staticmethod
+    def _slot_kind(name: str) -> str:
+        return name.rsplit("_", 1)[0]
+
+    def _pattern_for(self, name: str, value: str) -> str:
+        kind = self._slot_kind(name)
+        for slot in SLOT_TYPES:
+            if slot.name == kind:
+                return slot.in_cypher(value)
+        return _literal(value)
+
+    @staticmethod
+    def _case_placeholder(name: str, value: str, found: str) -> Optional[str]:
+        """Cypher 에 나온 회사 표기 → 자리표시 (질문 표기 그대로 / 소문자 / 대문자가 아니면 None)"""
+        if found == value:
+            return "{{" + name + "}}"
+        for transform, apply in CASE_TRANSFORMS.items():
+            if found == apply(value):
+                return "{{" + name + "|" + transform + "}}"
+        return None
+
+    def make_template(self, cypher: str, slots: List[Tuple[str, str]]) -> Optional[str]:
+        """슬롯 값을 자리표시로 바꾼 템플릿 (값이 Cypher 에 없거나 겹치거나 회사 표기를 되살릴 수 없으면 None)"""
+        if "{{" in cypher or "}}" in cypher:
+            return None
+        template = cypher
+        for name, value in sorted(slots, key=lambda s: len(s[1]), reverse=True):
+            if self._slot_kind(name) != "COMPANY":
+                pattern = re.compile(self._pattern_for(name, value))
+                if not pattern.search(template):
+                    return None
+                template = pattern.sub("{{" + name + "}}", template)
+                continue
+            matches = list(re.finditer(self._pattern_for(name, value), template, re.I))
+            placeholders = [self._case_placeholder(name, value, m.group(0)) for m in matches]
+            if not matches or None in placeholders:
+                return None
+            for m, placeholder in reversed(list(zip(matches, placeholders))):
+                template = template[:m.start()] + placeholder + template[m.end():]
+        # 같은 값이 두 슬롯에 있으면 어느 쪽인지 알 수 없음
+        values = [value.lower() for _, value in slots]
+        if len(values) != len(set(values)):
+            return None
+        return template
+
+    @staticmethod
+    def fill(template: str, slots: List[Tuple[str, str]]) -> str:
+        cypher = template
+        for name, value in slots:
+            for transform, apply in [(None, str)] + list(CASE_TRANSFORMS.items()):
+                escaped = apply(value).replace("\\", "\\\\").replace("'", "\\'").replace('"', '\\"')
+                cypher = cypher.replace("{{" + name + (f"|{transform}" if transform else "") + "}}", escaped)
+        return cypher
+
+    # -- 조회 / 저장 --
+    @staticmethod
+    def _exact_key(question: str) -> str:
+        return " ".join(question.split()).rstrip("?？. ").lower()
+
+    def get(self, question: str) -> Optional[str]:
+        """캐시된 Cypher (없으면 None)"""
+        with self._lock:
+            entry = self.exact.get(self._exact_key(question))
+            if entry is not None:
+                entry["hits"] = entry.get("hits", 0) + 1
+                self.counters["exact_hits"] += 1
+                self.counters["saved_seconds"] += entry.get("llm_seconds", 0.0)
+                return entry["cypher"]
+
+            normalized = self.normalize(question)
+            entry = self.templates.get(normalized.key)
+            if entry is not None and [n for n, _ in normalized.slots] == entry["slots"]:
+                entry["hits"] = entry.get("hits", 0) + 1
+                self.counters["template_hits"] += 1
+                self.counters["saved_seconds"] += entry.get("llm_seconds", 0.0)
+                return self.fill(entry["template"], normalized.slots)
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, question: str, cypher: str, llm_seconds: float = 0.0):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self.counters["llm_seconds"] += llm_seconds
+            self.exact[self._exact_key(question)] = {"cypher": cypher, "llm_seconds": llm_seconds,
+                                                     "hits": 0, "created": now}
+            normalized = self.normalize(question)
+            if normalized.slots:
+                template = self.make_template(cypher, normalized.slots)
+                if template is not None:
+                    self.templates[normalized.key] = {
+                        "template": template, "slots": [n for n, _ in normalized.slots],
+                        "example": question, "llm_seconds": llm_seconds, "hits": 0, "created": now,
+                    }
+            self._save()
+
+    def invalidate(self, question: str):
+        """실행 오류가 난 질문의 캐시 제거 (exact + 템플릿)"""
+        with self._lock:
+            removed = self.exact.pop(self._exact_key(question), None) is not None
+            removed |= self.templates.pop(self.normalize(question).key, None) is not None
+            if removed:
+                self._save()
+
+    def get_or_generate(self, question: str, generate: Callable[[str], str]) -> str:
+        cypher = self.get(question)
+        if cypher is not None:
+            return cypher
+        start = time.time()
+        cypher = generate(question)
+        self.put(question, cypher, time.time() - start)
+        return cypher
+
+    # -- 통계 --
+    def stats(self) -> dict:
+        c = self.counters
+        lookups = c["exact_hits"] + c["template_hits"] + c["misses"]
+        hits = c["exact_hits"] + c["template_hits"]
+        return {
+            "lookups": lookups,
+            "exact_hits": c["exact_hits"],
+            "template_hits": c["template_hits"],
+            "misses": c["misses"],
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_seconds": c["saved_seconds"],
+            "llm_seconds": c["llm_seconds"],
+            "exact_entries": len(self.exact),
+            "template_entries": len(self.templates),
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (f"Cypher 캐시: 조회 {s['lookups']}회, 적중 {s['exact_hits'] + s['template_hits']}회 "
+                f"(exact {s['exact_hits']}, 템플릿 {s['template_hits']}, {100 * s['hit_rate']:.1f}%), "
+                f"절약 LLM 시간 {s['saved_seconds']:.1f}s / 사용 {s['llm_seconds']:.1f}s, "
+                f"저장 {s['exact_entries']}개 질문 · {s['template_entries']}개 템플릿")
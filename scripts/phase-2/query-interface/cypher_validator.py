@@ -0,0 +1,373 @@
+"""
+Cypher 사전 검증 + 자동 수정 (Text-to-Cypher)
+LLM 이 생성한 Cypher 를 실행 전에 그래프 스키마(phase-2/neo4j/graph_mapping.py, aggregates.py,
+phase-3/neo4j/01_load_decisions.py, 02_load_roles.py)로 검사한다.
+실행 오류 / 빈 결과로 DB 왕복 + LLM 재호출을 하던 실수를 로컬에서 고친다.
+
+- 라벨 / 관계 타입 / 속성명 검사 (CR, LS, Summary, SessionNotes 는 Tdoc,
+  Agreement / Conclusion / WorkingAssumption 은 Resolution 을 상속)
+- 알려진 실수 자동 수정: c.uri → c.id, t.tdocId → t.tdocNumber, t.decision → t.status,
+  SUBMITTEDBY → SUBMITTED_BY (n10s 표기), 대소문자만 다른 이름
+- 관계 방향이 스키마와 반대면 화살표를 뒤집음 ((c:Company)-[:SUBMITTED_BY]->(t:Tdoc) 등)
+- LIMIT 이 없으면 기본 LIMIT 추가 (집계 1행 RETURN 제외)
+- 쓰기 절 (CREATE, MERGE, SET, DELETE ...) 은 거부
+
+정규식 기반 경량 파서라 모든 Cypher 문법을 다루지는 않는다. 해석하지 못한 부분은 통과시키고
+EXPLAIN (runtime.explain) 으로 구문 / 의미 오류를 실행 전에 확인한다.
+"""
+
+import difflib
+import importlib
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "neo4j"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "phase-3" / "neo4j"))
+
+from aggregates import STAT_LABEL, AGGREGATES
+from graph_mapping import REFERENCE_NODES, RELATIONSHIPS, TDOC_PROPERTIES, TDOC_SUBCLASS_LABELS
+
+decisions = importlib.import_module("01_load_decisions")
+roles = importlib.import_module("02_load_roles")
+
+
+# 라벨 → 상위 라벨 (CR, LS, Summary, SessionNotes 는 Tdoc 노드에, Resolution 세부 유형은 Resolution 노드에 추가된 라벨)
+PARENT_LABELS = {label: "Tdoc" for label in TDOC_SUBCLASS_LABELS.values()}
+PARENT_LABELS.update({label: roles.ROLE_PARENT_LABEL for label in roles.ROLE_LABELS})
+PARENT_LABELS.update({label: decisions.RESOLUTION_LABEL for label, _ in decisions.RESOLUTION_FILES})
+
+# 자주 나오는 잘못된 이름 (phase-3 fix_cq_properties.py / fix_relationship_names.py 에서 고친 실수 포함)
+PROPERTY_FIXES: Dict[Optional[str], Dict[str, str]] = {
+    None: {"uri": "id", "tdocId": "tdocNumber", "decision": "status"},   # 모든 라벨
+    "Company": {"name": "companyName", "company": "companyName"},
+    "Meeting": {"name": "meetingNumber", "meeting": "meetingNumber", "meetingId": "id"},
+    "Release": {"name": "releaseName", "release": "releaseName"},
+    "Spec": {"number": "specNumber", "spec": "specNumber"},
+    "WorkingGroup": {"name": "wgName", "workingGroup": "wgName"},
+    "WorkItem": {"name": "workItemCode", "code": "workItemCode"},
+    "Contact": {"name": "contactName"},
+    "AgendaItem": {"description": "agendaDescription", "number": "agendaNumber", "agenda": "agendaNumber"},
+}
+LABEL_FIXES = {"Document": "Tdoc", "TDoc": "Tdoc", "Agenda": "AgendaItem", "Organization": "Company",
+               "WG": "WorkingGroup", "ChangeRequest": "CR", "LiaisonStatement": "LS"}
+
+# 쓰기 절: 절 위치 (문장 시작 / 앞 절의 끝 뒤, AS 별칭 아님) + 절의 형태 (SET n.x =, CREATE (, ...) 일 때만
+# (문자열 리터럴은 마스킹 후 검사, 공백은 한 칸으로 정규화 후 검사)
+WRITE_CLAUSE = re.compile(
+    r"(?:^|(?<=[\s;{})\]]))(?<!\bAS )(?<!\.)(?P<clause>(?P<keyword>CREATE|MERGE|SET|DETACH|DELETE|REMOVE|DROP|FOREACH|LOAD)"
+    r"(?:(?<=CREATE)\s*\(|(?<=CREATE)\s+(?:INDEX|CONSTRAINT|DATABASE|USER|ROLE)\b|(?<=MERGE)\s*\(|"
+    r"(?<=SET)\s+`?[A-Za-z_]\w*`?\s*(?:\.|:|\+?=)|(?<=DETACH)\s+DELETE\b|(?<=DELETE)\s+[`(A-Za-z_]|"
+    r"(?<=REMOVE)\s+`?[A-Za-z_]\w*`?\s*[.:]|(?<=DROP)\s+(?:INDEX|CONSTRAINT|DATABASE|USER|ROLE)\b|"
+    r"(?<=FOREACH)\s*\(|(?<=LOAD)\s+CSV\b))",
+    re.I,
+)
+AGGREGATE_FUNCTION = re.compile(r"^(count|sum|avg|min|max|collect)\s*\(", re.I)
+
+STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+NODE = r"(?<![\w)\]])\(\s*(?P<{p}var>[A-Za-z_]\w*)?\s*(?P<{p}labels>(?::\s*`?\w+`?\s*)+)?(?P<{p}map>\{{[^{{}}]*\}})?\s*\)"
+NODE_PATTERN = re.compile(NODE.format(p=""))
+RELATIONSHIP_PATTERN = re.compile(
+    NODE.format(p="l")
+    + r"\s*(?P<rel>(?P<left><)?-\s*\[\s*(?P<relvar>[A-Za-z_]\w*)?\s*(?::\s*(?P<types>[\w|:`\s]+?))?"
+    + r"\s*(?P<rest>[*{][^\]]*)?\]\s*-(?P<right>>)?)\s*(?="
+    + NODE.format(p="r") + ")"
+)
+PROPERTY_ACCESS = re.compile(r"(?<![\w.$])(?P<var>[A-Za-z_]\w*)\.(?P<prop>[A-Za-z_]\w*)\b(?!\s*\()")
+MAP_KEY = re.compile(r"(?P<key>[A-Za-z_]\w*)\s*:")
+
+
+class CypherValidationError(ValueError):
+    """자동 수정할 수 없는 스키마 위반 / 쓰기 쿼리"""
+
+    def __init__(self, result: "ValidationResult"):
+        super().__init__("; ".join(result.errors))
+        self.result = result
+
+
+@dataclass
+class ValidationResult:
+    original: str
+    cypher: str
+    repairs: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def changed(self) -> bool:
+        return self.cypher != self.original
+
+
+class GraphSchema:
+    """라벨별 속성, 관계 (시작 라벨, 타입, 끝 라벨)"""
+
+    def __init__(self, properties: Dict[str, Set[str]], relationships: List[Tuple[str, str, str]]):
+        self.properties = properties
+        self.relationships: Dict[str, List[Tuple[str, str]]] = {}
+        for start, rel_type, end in relationships:
+            self.relationships.setdefault(rel_type, []).append((start, end))
+
+    @classmethod
+    def from_mapping(cls) -> "GraphSchema":
+        """
+        적재 스크립트와 같은 매핑 (graph_mapping.py) + TdocStat (aggregates.py)
+        + Phase-3 Resolution (01_load_decisions.py) / Summary, SessionNotes (02_load_roles.py)
+        """
+        properties = {label: {"id"} | {name for name, _ in mapping.values()}
+                      for label, _, mapping in REFERENCE_NODES}
+        properties["Tdoc"] = {"id", roles.TDOC_KEY_PROPERTY} | {name for name, _ in TDOC_PROPERTIES.values()}
+        properties["AgendaItem"] |= set(decisions.AGENDA_ITEM_PROPERTIES)
+        properties[decisions.RESOLUTION_LABEL] = set(decisions.RESOLUTION_PROPERTIES)
+        for label, parent in PARENT_LABELS.items():
+            properties[label] = properties[parent] | set(roles.ROLE_LABELS.get(label, []))
+        properties[STAT_LABEL] = {"dimension", "count"} | {key for agg in AGGREGATES for key, _ in agg.keys}
+        relationships = [("Tdoc", rel_type, target) for _, rel_type, target in RELATIONSHIPS]
+        relationships += [(decisions.RESOLUTION_LABEL, rel_type, target)
+                          for rel_type, target in decisions.RESOLUTION_RELATIONSHIPS]
+        # 역할 관계는 tdocKey 로 찾은 Tdoc 에 붙음 (한 Tdoc 이 Summary / SessionNotes 라벨을 함께 가질 수 있음)
+        relationships += [(roles.ROLE_PARENT_LABEL, rel_type, target) for _, rel_type, target in roles.ROLE_RELATIONSHIPS]
+        return cls(properties, relationships)
+
+    def matches(self, labels: Set[str], expected: str) -> bool:
+        """라벨을 모르는 변수는 통과, CR/LS 는 Tdoc 으로도 매치"""
+        if not labels:
+            return True
+        return any(label == expected or PARENT_LABELS.get(label) == expected
+                   or PARENT_LABELS.get(expected) == label for label in labels)
+
+    def allows(self, rel_type: str, start: Set[str], end: Set[str]) -> bool:
+        return any(self.matches(start, s) and self.matches(end, e) for s, e in self.relationships.get(rel_type, []))
+
+
+def _mask_strings(cypher: str) -> Tuple[str, List[str]]:
+    """문자열 리터럴을 자리표시로 (리터럴 안의 '.' / '(' 를 패턴으로 오인하지 않도록)"""
+    literals = []
+
+    def keep(m):
+        literals.append(m.group(0))
+        return f"'\x00{len(literals) - 1}\x00'"
+
+    return STRING.sub(keep, cypher), literals
+
+
+def _unmask_strings(cypher: str, literals: List[str]) -> str:
+    return re.sub(r"'\x00(\d+)\x00'", lambda m: literals[int(m.group(1))], cypher)
+
+
+def _split_top_level(text: str) -> List[str]:
+    """괄호 밖의 쉼표로 분리"""
+    items, depth, current = [], 0, ""
+    for char in text:
+        depth += char in "([{"
+        depth -= char in ")]}"
+        if char == "," and depth == 0:
+            items.append(current)
+            current = ""
+        else:
+            current += char
+    return items + [current]
+
+
+class CypherValidator:
+    """스키마 검사 + 알려진 실수 자동 수정 (DB 접근 없음, 스레드 안전)"""
+
+    def __init__(self, schema: GraphSchema = None, default_limit: int = 25):
+        self.schema = schema or GraphSchema.from_mapping()
+        self.default_limit = default_limit
+        self.counters = {"validated": 0, "repaired": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    # -- 이름 수정 --
+    def _fix_label(self, label: str) -> Optional[str]:
+        if label in self.schema.properties:
+            return label
+        fixed = LABEL_FIXES.get(label)
+        if fixed:
+            return fixed
+        folded = {name.lower(): name for name in self.schema.properties}
+        return folded.get(label.lower())
+
+    def _fix_rel_type(self, rel_type: str) -> Optional[str]:
+        if rel_type in self.schema.relationships:
+            return rel_type
+        folded = {name.replace("_", "").lower(): name for name in self.schema.relationships}
+        return folded.get(rel_type.replace("_", "").lower())
+
+    def _allowed_properties(self, labels: Set[str]) -> Set[str]:
+        allowed = set()
+        for label in labels:
+            allowed |= self.schema.properties.get(label, set())
+        return allowed
+
+    def _fix_property(self, labels: Set[str], prop: str) -> Optional[str]:
+        allowed = self._allowed_properties(labels)
+        if not allowed or prop in allowed:
+            return prop
+        for label in sorted(labels) + [None]:
+            fixed = PROPERTY_FIXES.get(label, {}).get(prop)
+            if fixed in allowed:
+                return fixed
+        folded = {name.lower(): name for name in allowed}
+        return folded.get(prop.lower())
+
+    # -- 검사 단계 --
+    def _labels(self, masked: str, result: ValidationResult) -> str:
+        def fix_label(m):
+            label = m.group(1)
+            fixed = self._fix_label(label)
+            if fixed is None:
+                result.errors.append(f"알 수 없는 라벨 :{label}")
+                return m.group(0)
+            if fixed != label:
+                result.repairs.append(f":{label} → :{fixed}")
+            return f":{fixed}"
+
+        def fix(m):
+            if not m.group("labels"):
+                return m.group(0)
+            labels = re.sub(r":\s*`?(\w+)`?", fix_label, m.group("labels"))
+            return m.group(0).replace(m.group("labels"), labels, 1)
+
+        return NODE_PATTERN.sub(fix, masked)
+
+    def _variables(self, masked: str) -> Dict[str, Set[str]]:
+        """노드 변수 → 라벨 (쿼리 전체에서 모음)"""
+        variables: Dict[str, Set[str]] = {}
+        for m in NODE_PATTERN.finditer(masked):
+            if m.group("var"):
+                labels = set(re.findall(r"`?(\w+)`?", m.group("labels") or ""))
+                variables.setdefault(m.group("var"), set()).update(labels)
+        return variables
+
+    def _relationships(self, masked: str, variables: Dict[str, Set[str]], result: ValidationResult) -> str:
+        def node_labels(m, p):
+            labels = set(re.findall(r"`?(\w+)`?", m.group(f"{p}labels") or ""))
+            return labels | variables.get(m.group(f"{p}var") or "", set())
+
+        edits = []
+        for m in RELATIONSHIP_PATTERN.finditer(masked):
+            if not m.group("types"):
+                continue
+            start, end = node_labels(m, "l"), node_labels(m, "r")
+            if m.group("left") and not m.group("right"):
+                start, end = end, start
+            names = [name.strip("`") for name in re.split(r"\s*\|:?\s*", m.group("types").strip())]
+            types = []
+            for rel_type in names:
+                fixed = self._fix_rel_type(rel_type)
+                if fixed is None:
+                    result.errors.append(f"알 수 없는 관계 :{rel_type}")
+                    fixed = rel_type
+                elif fixed != rel_type:
+                    result.repairs.append(f":{rel_type} → :{fixed}")
+                types.append(fixed)
+
+            directed = bool(m.group("left")) != bool(m.group("right"))
+            known = [t for t in types if t in self.schema.relationships]
+            forward = all(self.schema.allows(t, start, end) for t in known)
+            backward = all(self.schema.allows(t, end, start) for t in known)
+            flip = directed and known and not forward and backward
+            if flip:
+                result.repairs.append(f"-[:{'|'.join(types)}]- 방향 반전")
+            elif known and not forward and not (not directed and backward):
+                result.errors.append(f"스키마에 없는 패턴 ({'/'.join(sorted(start)) or '?'})"
+                                     f"-[:{'|'.join(types)}]->({'/'.join(sorted(end)) or '?'})")
+
+            if not flip and types == names:
+                continue
+            inner = f"{m.group('relvar') or ''}:{'|'.join(types)}{m.group('rest') or ''}"
+            left, right = bool(m.group("left")), bool(m.group("right"))
+            if flip:
+                left, right = right, left
+            edits.append((m.span("rel"), f"{'<' if left else ''}-[{inner}]-{'>' if right else ''}"))
+
+        for (begin, finish), text in reversed(edits):
+            masked = masked[:begin] + text + masked[finish:]
+        return masked
+
+    def _properties(self, masked: str, variables: Dict[str, Set[str]], result: ValidationResult) -> str:
+        def check(labels: Set[str], prop: str, where: str) -> str:
+            fixed = self._fix_property(labels, prop)
+            if fixed is None:
+                suggestion = difflib.get_close_matches(prop, sorted(self._allowed_properties(labels)), n=1)
+                result.errors.append(f"{'/'.join(sorted(labels))} 에 없는 속성 {where}{prop}"
+                                     + (f" ({suggestion[0]}?)" if suggestion else ""))
+                return prop
+            if fixed != prop:
+                result.repairs.append(f"{where}{prop} → {where}{fixed}")
+            return fixed
+
+        def access(m):
+            labels = variables.get(m.group("var"))
+            if not labels:
+                return m.group(0)
+            return f"{m.group('var')}.{check(labels, m.group('prop'), m.group('var') + '.')}"
+
+        def inline_map(m):
+            labels = set(re.findall(r"`?(\w+)`?", m.group("labels") or ""))
+            labels |= variables.get(m.group("var") or "", set())
+            if not m.group("map") or not labels:
+                return m.group(0)
+            fixed = MAP_KEY.sub(lambda k: f"{check(labels, k.group('key'), '')}:", m.group("map"))
+            return m.group(0).replace(m.group("map"), fixed, 1)
+
+        masked = PROPERTY_ACCESS.sub(access, masked)
+        return NODE_PATTERN.sub(inline_map, masked)
+
+    def _limit(self, masked: str, result: ValidationResult) -> str:
+        if not self.default_limit or re.search(r"\b(LIMIT|UNION)\b", masked, re.I):
+            return masked
+        returns = list(re.finditer(r"\bRETURN\b", masked, re.I))
+        if not returns:
+            return masked
+        clause = re.split(r"\bORDER\s+BY\b|\bSKIP\b", masked[returns[-1].end():], flags=re.I)[0]
+        items = [re.sub(r"^\s*DISTINCT\s+", "", item, flags=re.I).strip() for item in _split_top_level(clause)]
+        if all(AGGREGATE_FUNCTION.match(item) for item in items):
+            return masked
+        result.repairs.append(f"LIMIT {self.default_limit} 추가")
+        return f"{masked.rstrip()}\nLIMIT {self.default_limit}"
+
+    # -- 공개 API --
+    def validate(self, cypher: str, record: bool = True) -> ValidationResult:
+        """검사 + 자동 수정 → ValidationResult (errors 가 남으면 실행하지 않는다, record: 통계에 반영)"""
+        original = cypher.strip()
+        result = ValidationResult(original, original)
+        masked, literals = _mask_strings(original.rstrip(";").rstrip())
+
+        write = WRITE_CLAUSE.search(" ".join(masked.split()))
+        if write:
+            result.errors.append(f"읽기 전용: {write.group('keyword').upper()} 절 사용 불가")
+        else:
+            masked = self._labels(masked, result)
+            variables = self._variables(masked)
+            masked = self._relationships(masked, variables, result)
+            masked = self._properties(masked, variables, result)
+            masked = self._limit(masked, result)
+            if result.repairs:
+                result.repairs = list(dict.fromkeys(result.repairs))
+                result.cypher = _unmask_strings(masked, literals)
+
+        if not record:
+            return result
+        with self._lock:
+            self.counters["validated"] += 1
+            self.counters["repaired"] += bool(result.repairs)
+            self.counters["rejected"] += bool(result.errors)
+        return result
+
+    def check(self, cypher: str, record: bool = True) -> str:
+        """수정된 Cypher, 오류가 남으면 CypherValidationError"""
+        result = self.validate(cypher, record)
+        if not result.ok:
+            raise CypherValidationError(result)
+        return result.cypher
+
+    def report(self) -> str:
+        c = self.counters
+        return f"Cypher 검증: {c['validated']}회, 자동 수정 {c['repaired']}회, 실행 전 거부 {c['rejected']}회"
@@ -1,18 +1,25 @@
 """
 Step-3 Sub-step 3-2: Neo4j + LlamaIndex 연동
 Neo4j PropertyGraphStore 래퍼 및 연결 테스트
+
+LlamaIndex / OpenRouter / neo4j 는 각 함수 안에서 import 한다
+(Cypher 만 실행하는 경로는 LlamaIndex 를, import 만 하는 경로는 드라이버도 로드하지 않음).
 """
 
-# config를 먼저 import하여 SSL 패치 적용
+from typing import TYPE_CHECKING
+
 import config
 
-from llama_index.graph_stores.neo4j import Neo4jPropertyGraphStore
-from llama_index.llms.openrouter import OpenRouter
-from neo4j import GraphDatabase
+if TYPE_CHECKING:
+    from llama_index.graph_stores.neo4j import Neo4jPropertyGraphStore
+    from llama_index.llms.openrouter import OpenRouter
 
 
-def get_graph_store() -> Neo4jPropertyGraphStore:
+def get_graph_store() -> "Neo4jPropertyGraphStore":
     """Neo4j PropertyGraphStore 인스턴스 반환"""
+    config.apply_ssl_patch()
+    from llama_index.graph_stores.neo4j import Neo4jPropertyGraphStore
+
     return Neo4jPropertyGraphStore(
         username=config.NEO4J_CONFIG["username"],
         password=config.NEO4J_CONFIG["password"],
@@ -20,19 +27,37 @@ def get_graph_store() -> Neo4jPropertyGraphStore:
     )
 
 
-def get_llm() -> OpenRouter:
-    """OpenRouter LLM 인스턴스 반환"""
+def get_llm() -> "OpenRouter":
+    """OpenRouter LLM 인스턴스 반환 (SSL 패치 후 httpx 클라이언트 생성)"""
+    config.apply_ssl_patch()
+    from llama_index.llms.openrouter import OpenRouter
+
     return OpenRouter(
         model=config.OPENROUTER_CONFIG["model"],
         api_key=config.OPENROUTER_CONFIG["api_key"],
+        api_base=config.OPENROUTER_CONFIG["api_base"],
     )
 
 
-def get_neo4j_driver():
-    """Neo4j 드라이버 직접 접근"""
+def get_neo4j_driver(**pool_options):
+    """Neo4j 드라이버 직접 접근 (pool_options: max_connection_pool_size 등)"""
+    from neo4j import GraphDatabase
+
     return GraphDatabase.driver(
         config.NEO4J_CONFIG["uri"],
-        auth=(config.NEO4J_CONFIG["username"], config.NEO4J_CONFIG["password"])
+        auth=(config.NEO4J_CONFIG["username"], config.NEO4J_CONFIG["password"]),
+        **pool_options
+    )
+
+
+def get_async_neo4j_driver(**pool_options):
+    """Neo4j 비동기 드라이버 (async_qa 배치 파이프라인용)"""
+    from neo4j import AsyncGraphDatabase
+
+    return AsyncGraphDatabase.driver(
+        config.NEO4J_CONFIG["uri"],
+        auth=(config.NEO4J_CONFIG["username"], config.NEO4J_CONFIG["password"]),
+        **pool_options
     )
 
 
@@ -0,0 +1,105 @@
+"""
+Query Interface import 시간 측정 (명령행 시작 시간 회귀 확인)
+모듈마다 새 파이썬 프로세스에서 import 시간을 재고 (--repeat 회 중앙값),
+LlamaIndex / LangChain / httpx 같은 무거운 모듈이 import 만으로 로드되는지 확인한다.
+
+- 목표: config.IMPORT_BUDGET_MS (환경 변수 IMPORT_BUDGET_MS, 기본 300ms) - 중앙값이 넘으면 실패
+- 무거운 모듈 (HEAVY_MODULES) 이 로드되면 실패 (LLM 클라이언트는 첫 호출 때 로드해야 함)
+- 실패하면 종료 코드 1 (CI 에서 사용), --detail 이면 -X importtime 누적 상위 모듈 출력
+
+사용법:
+    python import_bench.py
+    python import_bench.py --repeat 10 --budget-ms 200
+    python import_bench.py --module runtime --detail
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+# 명령행 / 라이브러리 진입점
+MODULES = ["cli", "config", "runtime", "text_to_cypher", "qa_engine", "async_qa"]
+
+# import 만으로 로드되면 안 되는 모듈 (최상위 패키지 이름)
+HEAVY_MODULES = ["llama_index", "langchain", "langchain_core", "openai", "httpx", "urllib3", "numpy"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def probe(module: str) -> dict:
+    """새 프로세스에서 module import → {seconds, heavy}"""
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def import_detail(module: str, top: int = 10) -> list:
+    """-X importtime 누적 시간 상위 (모듈, ms)"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(cumulative) / 1000))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def startup(repeat: int) -> float:
+    """cli.py --help 프로세스 전체 시간 중앙값 (인터프리터 시작 포함)"""
+    import time
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "cli.py", "--help"], cwd=HERE, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    import config
+
+    parser = argparse.ArgumentParser(description="Query Interface import 시간 측정")
+    parser.add_argument('--module', action='append', help=f'측정할 모듈 (기본: {", ".join(MODULES)})')
+    parser.add_argument('--repeat', type=int, default=5, help='모듈별 측정 횟수 (중앙값)')
+    parser.add_argument('--budget-ms', type=float, default=config.IMPORT_BUDGET_MS, help='import 시간 목표 (ms)')
+    parser.add_argument('--detail', action='store_true', help='-X importtime 상위 모듈 출력')
+    args = parser.parse_args(argv)
+
+    modules = args.module or MODULES
+    failed = False
+    print(f"{'모듈':<16} {'중앙값':>8} {'최대':>8}  무거운 모듈")
+    for module in modules:
+        results = [probe(module) for _ in range(max(1, args.repeat))]
+        timings = [1000 * r["seconds"] for r in results]
+        heavy = sorted({name for r in results for name in r["heavy"]})
+        median = statistics.median(timings)
+        over = median > args.budget_ms
+        failed = failed or over or bool(heavy)
+        mark = "❌" if over or heavy else "✅"
+        print(f"{module:<16} {median:>6.0f}ms {max(timings):>6.0f}ms  {', '.join(heavy) or '-'} {mark}")
+        if args.detail:
+            for name, ms in import_detail(module):
+                print(f"    {ms:>8.1f}ms  {name}")
+
+    print(f"\ncli.py --help 프로세스 전체: {1000 * startup(max(1, args.repeat)):.0f}ms (인터프리터 시작 포함)")
+    print(f"목표 {args.budget_ms:.0f}ms: {'실패' if failed else '통과'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
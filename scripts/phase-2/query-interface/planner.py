@@ -0,0 +1,261 @@
+"""
+다단계 질문 계획 (하위 쿼리 분해 → 동시 실행 → 클라이언트 조인)
+"Samsung 이 세션 의장을 맡은 회의에서 agreed 된 Rel-18 CR 중 38.214 를 수정하는 CR 을 낸 회사" 처럼
+조건이 여러 개 얽힌 질문을 거대한 Cypher 하나로 생성하지 않고, LLM 에게 서로 독립인 작은 하위 쿼리 + 공통 조인 키로
+계획을 받아 풀링된 드라이버로 동시에 실행한 뒤 결과를 키로 조인한다. 답변 문장은 조인 결과로 qa_engine 이 만든다.
+
+- 계획 대상: 라우터 (집계 / 템플릿 / 주제어) 가 처리하지 못한 질문 중 조건이 여럿인 질문 (should_plan)
+- 하위 쿼리마다 cypher_validator 검사 / 자동 수정 (LIMIT 은 step_limit, 위반이 남으면 계획 실패 → 단일 Cypher 생성)
+- 하위 쿼리 결과가 step_limit 행에 닿으면 (잘린 결과) 조인하지 않고 실패 → 단일 Cypher 생성
+- 하위 쿼리는 runtime.execute 로 실행 (결과 캐시 공유 → 같은 조건은 다른 질문에서도 재사용)
+- 스키마: config.SCHEMA_INFO (Phase-3 세션 역할 SessionNotes / Summary → Company 포함, 회의 키로 조인)
+- join: intersect (모든 하위 쿼리 결과에 있는 키, 기본) / union, 같은 키의 행은 모든 조합 (해시 조인),
+  열은 먼저 나온 하위 쿼리 값 우선
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import config
+from aggregate_router import Route
+from cypher_validator import STRING, CypherValidator
+from template_router import MEETING, RELEASE, SPEC, TDOC
+
+# 계획 프롬프트
+PLAN_PROMPT = """You are a Neo4j query planner. The question below combines several conditions.
+Split it into 2-{max_steps} INDEPENDENT read-only Cypher sub-queries that can run in parallel.
+Each sub-query applies one condition (or one hop) and returns the same join key column.
+
+## Neo4j Schema
+{schema}
+
+## Rules
+1. Every sub-query returns the join key column with exactly the same alias (e.g. "tdocNumber", "company", "meeting")
+2. Sub-queries never use results of other sub-queries; the client joins them on the key
+3. Return specific properties, never raw nodes; DISTINCT rows; no LIMIT
+4. Relationship directions are fixed: always start from Tdoc (or CR, LS, Summary, SessionNotes, Resolution)
+   and follow arrows to the right (->)
+5. "join" is "intersect" when every condition must hold, "union" when any may hold
+6. Session roles: a company chairing sessions at a meeting is
+   (n:SessionNotes)-[:CHAIRED_BY]->(c:Company), (n)-[:PRESENTED_AT]->(m:Meeting);
+   moderating is (s:Summary)-[:MODERATED_BY]->(c:Company). Join such conditions on the meeting key
+   (m.meetingNumber AS meeting) and return the meeting from the other sub-queries too
+
+## Question
+{question}
+
+Return ONLY JSON:
+{{"key": "<join key alias>", "join": "intersect", "steps": [{{"purpose": "<one line>", "cypher": "<query>"}}]}}
+"""
+
+# 조건 표현 (회의 / Release / Spec / Tdoc 번호 / 인용 값 / 상태 / 세션 역할)
+CONDITIONS = [
+    re.compile(MEETING),
+    re.compile(RELEASE, re.I),
+    re.compile(SPEC),
+    re.compile(TDOC),
+    re.compile(r"'[^']+'|\"[^\"]+\""),
+    re.compile(r"\b(?:agreed|approved|noted|revised|withdrawn|postponed|not treated|endorsed)(?![A-Za-z])", re.I),
+    re.compile(r"\b(?:chair(?:ed|s|man|person)?|moderat(?:ed|es|or|ors))(?![A-Za-z])|의장|좌장|모더레이터|사회를 본",
+               re.I),
+]
+# 조건을 잇는 표현
+CONNECTORS = re.compile(r"(?:\s중(?:에서)?\s|이면서|면서|동시에|모두|그리고|또한|둘 다|"
+                        r"\b(?:where|which|whose|that (?:were|was|are|is)|and also|both)\b)", re.I)
+
+
+class PlanError(ValueError):
+    """계획을 만들 수 없음 (LLM 응답 형식, 하위 쿼리 검증 실패)"""
+
+
+@dataclass
+class SubQuery:
+    purpose: str
+    cypher: str
+    params: Dict[str, object] = field(default_factory=dict)
+    rows: Optional[List[dict]] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class Plan:
+    question: str
+    key: str
+    join: str
+    steps: List[SubQuery]
+    plan_seconds: float = 0.0
+    execute_seconds: float = 0.0
+
+    def describe(self) -> str:
+        """하위 쿼리 목록 (cypher 이벤트 / 리포트용)"""
+        lines = [f"// join {self.join} on {self.key}"]
+        for i, step in enumerate(self.steps, 1):
+            lines.append(f"// [{i}] {step.purpose}")
+            lines.append(step.cypher)
+        return "\n".join(lines)
+
+    def route(self) -> Route:
+        return Route("plan", self.describe(), {}, kind="plan")
+
+
+def count_conditions(question: str) -> int:
+    return sum(len(pattern.findall(question)) for pattern in CONDITIONS)
+
+
+def join_rows(key: str, how: str, step_rows: List[List[dict]]) -> List[dict]:
+    """
+    하위 쿼리 결과 → 키 해시 조인 (키 순서는 첫 결과 순서, union 은 뒤 결과의 새 키를 이어 붙임)
+    같은 키의 행이 여러 개면 하위 쿼리별 행의 모든 조합을 만든다 (union 은 키가 있는 하위 쿼리끼리만)
+    """
+    def hashable(value):
+        return tuple(value) if isinstance(value, list) else value
+
+    indexes = []
+    for rows in step_rows:
+        index: Dict[object, List[dict]] = {}
+        for row in rows:
+            if key not in row:
+                raise PlanError(f"하위 쿼리 결과에 조인 키 '{key}' 열이 없음: {sorted(row)}")
+            index.setdefault(hashable(row[key]), []).append(row)
+        indexes.append(index)
+    if not indexes:
+        return []
+
+    if how == "union":
+        keys = list(dict.fromkeys(k for index in indexes for k in index))
+    else:
+        keys = [k for k in indexes[0] if all(k in index for index in indexes[1:])]
+
+    joined = []
+    for k in keys:
+        for combination in itertools.product(*(index[k] for index in indexes if k in index)):
+            merged: Dict[str, object] = {}
+            for row in combination:
+                for column, value in row.items():
+                    merged.setdefault(column, value)
+            joined.append(merged)
+    return joined
+
+
+class QueryPlanner:
+    """질문 → Plan (LLM 1회) → 하위 쿼리 동시 실행 → 조인 결과"""
+
+    def __init__(self, complete: Callable[[str], str], execute: Callable[[str, dict], list],
+                 max_steps: int = 4, concurrency: int = 4, step_limit: int = 5000, min_conditions: int = 2):
+        self._complete = complete
+        self._execute = execute
+        self.max_steps = max_steps
+        self.concurrency = concurrency
+        self.min_conditions = min_conditions
+        self.step_limit = step_limit
+        self.validator = CypherValidator(default_limit=step_limit)
+        self.counters = {"planned": 0, "failed": 0, "steps": 0, "plan_seconds": 0.0,
+                         "execute_seconds": 0.0, "sequential_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, complete: Callable[[str], str], execute: Callable[[str, dict], list]) -> "QueryPlanner":
+        cfg = config.PLANNER_CONFIG
+        return cls(complete, execute, max_steps=cfg["max_steps"], concurrency=cfg["concurrency"],
+                   step_limit=cfg["step_limit"], min_conditions=cfg["min_conditions"])
+
+    def should_plan(self, question: str) -> bool:
+        """조건이 min_conditions 개 이상 + 연결 표현, 또는 조건이 min_conditions + 1 개 이상"""
+        if not config.PLANNER_CONFIG["enabled"]:
+            return False
+        conditions = count_conditions(question)
+        return conditions > self.min_conditions or (conditions >= self.min_conditions
+                                                    and CONNECTORS.search(question) is not None)
+
+    def prompt(self, question: str) -> str:
+        return PLAN_PROMPT.format(max_steps=self.max_steps, schema=config.SCHEMA_INFO, question=question)
+
+    def plan(self, question: str) -> Plan:
+        """LLM 으로 하위 쿼리 계획 (각 하위 쿼리 검증 / 자동 수정), 형식이 틀리면 PlanError"""
+        start = time.time()
+        response = self._complete(self.prompt(question))
+        return self.build(question, response, plan_seconds=time.time() - start)
+
+    def build(self, question: str, response: str, plan_seconds: float = 0.0) -> Plan:
+        """계획 LLM 응답 → Plan (async_qa 는 LLM 을 직접 호출하고 응답만 넘김)"""
+        try:
+            spec = self._parse(response)
+            steps = []
+            for step in spec["steps"][:self.max_steps]:
+                if re.search(r"\bLIMIT\b", STRING.sub("''", step["cypher"]), re.I):
+                    raise PlanError(f"하위 쿼리에 LIMIT 사용 (조인 전 결과가 잘림): {step['cypher']}")
+                steps.append(SubQuery(step.get("purpose", ""), self.validator.check(step["cypher"])))
+            if not steps:
+                raise PlanError("하위 쿼리 없음")
+        except (KeyError, TypeError, ValueError) as e:
+            with self._lock:
+                self.counters["failed"] += 1
+            raise e if isinstance(e, PlanError) else PlanError(f"계획 실패: {e}") from e
+        join = spec.get("join", "intersect")
+        plan = Plan(question, str(spec["key"]), join if join in ("intersect", "union") else "intersect", steps,
+                    plan_seconds=plan_seconds)
+        with self._lock:
+            self.counters["planned"] += 1
+            self.counters["steps"] += len(steps)
+            self.counters["plan_seconds"] += plan.plan_seconds
+        return plan
+
+    @staticmethod
+    def _parse(response: str) -> dict:
+        """LLM 응답에서 JSON 객체 추출 (```json 블록 / 앞뒤 설명 허용)"""
+        m = re.search(r"\{.*\}", response, re.S)
+        if not m:
+            raise PlanError(f"JSON 계획 없음: {response[:200]}")
+        try:
+            spec = json.loads(m.group(0))
+        except ValueError as e:
+            raise PlanError(f"JSON 계획 파싱 실패: {e}") from e
+        if not isinstance(spec.get("steps"), list) or not spec.get("key"):
+            raise PlanError("계획에 key / steps 없음")
+        return spec
+
+    def execute(self, plan: Plan) -> List[dict]:
+        """하위 쿼리 동시 실행 → 조인 결과 (하나라도 실패하거나 LIMIT 에 닿으면 예외)"""
+        def run(step: SubQuery):
+            start = time.time()
+            try:
+                step.rows = self._execute(step.cypher, step.params)
+            except Exception as e:
+                step.error = str(e)
+                raise
+            finally:
+                step.seconds = time.time() - start
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(plan.steps)))) as pool:
+            for future in [pool.submit(run, step) for step in plan.steps]:
+                future.result()
+        plan.execute_seconds = time.time() - start
+        return self.join(plan)
+
+    def join(self, plan: Plan) -> List[dict]:
+        """실행이 끝난 하위 쿼리 (step.rows / seconds) → 조인 결과 (LIMIT 에 닿은 하위 쿼리가 있으면 PlanError)"""
+        truncated = [i for i, step in enumerate(plan.steps, 1)
+                     if self.step_limit and len(step.rows) >= self.step_limit]
+        if truncated:
+            with self._lock:
+                self.counters["failed"] += 1
+            raise PlanError(f"하위 쿼리 {truncated} 결과가 LIMIT {self.step_limit} 에 닿음 (잘린 결과로 조인하지 않음)")
+        rows = join_rows(plan.key, plan.join, [step.rows for step in plan.steps])
+        with self._lock:
+            self.counters["execute_seconds"] += plan.execute_seconds
+            self.counters["sequential_seconds"] += sum(step.seconds for step in plan.steps)
+        return rows
+
+    def report(self) -> str:
+        c = self.counters
+        return (f"질문 계획: {c['planned']}회 (하위 쿼리 {c['steps']}개), 실패 {c['failed']}회, "
+                f"계획 LLM {c['plan_seconds']:.1f}s, 동시 실행 {c['execute_seconds']:.2f}s "
+                f"(순차 합계 {c['sequential_seconds']:.2f}s)")
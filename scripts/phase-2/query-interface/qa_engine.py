@@ -1,19 +1,26 @@
 """
 CQ 25개 자연어 QA 엔진
 질문 → Cypher 생성 → 실행 → 자연어 답변 생성
+(통계 질문은 aggregate_router 로 사전 계산된 TdocStat 조회, 결과가 없으면 LLM Cypher 생성)
+(알려진 질문 형태는 template_router 의 검증된 Cypher, 나머지만 LLM Cypher 생성)
+(조건이 여럿인 질문은 planner 가 하위 쿼리로 나눠 동시 실행 후 조인)
 """
 
 import json
 from datetime import datetime
-import config
-from text_to_cypher import generate_cypher, execute_cypher
-from graph_store import get_llm
+from text_to_cypher import generate_cypher, execute_cypher, validate_cypher
+from aggregate_router import route_question
+from runtime import get_runtime
+
+# Route.kind → cypher 이벤트 라벨
+ROUTE_LABELS = {"aggregate": "집계", "template": "템플릿", "plan": "계획"}
 
 # 답변 생성 프롬프트
 ANSWER_PROMPT = """Based on the query results below, provide a natural language answer in Korean.
 
 Question: {question}
-Query Results: {results}
+Query Results (header line, then one row per line, columns separated by "|"):
+{results}
 
 Instructions:
 1. Answer in Korean naturally
@@ -39,22 +46,177 @@ def serialize_neo4j_result(obj):
         return obj
 
 
-def generate_answer(question: str, results: list) -> str:
-    """쿼리 결과를 자연어 답변으로 변환"""
-    llm = get_llm()
-
-    # Neo4j 결과를 직렬화 가능한 형태로 변환
-    serialized_results = [serialize_neo4j_result(r) for r in results[:10]]
-
-    # 결과를 문자열로 변환 (최대 10개)
-    try:
-        results_str = json.dumps(serialized_results, ensure_ascii=False, indent=2)
-    except TypeError as e:
-        results_str = str(serialized_results)
-
-    prompt = ANSWER_PROMPT.format(question=question, results=results_str)
-    response = llm.complete(prompt)
-    return response.text.strip()
+def format_cell(value, max_length: int = 120) -> str:
+    """표 셀 문자열 (리스트는 ', ' 로, 노드/맵은 한 줄 JSON, 긴 값은 자름)"""
+    value = serialize_neo4j_result(value)
+    if value is None:
+        text = ""
+    elif isinstance(value, list):
+        text = ", ".join(format_cell(item, max_length) for item in value)
+    elif isinstance(value, dict):
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    else:
+        text = str(value)
+    text = " ".join(text.split()).replace("|", "/")
+    return text if len(text) <= max_length else text[:max_length - 1] + "…"
+
+
+def results_table(results: list, limit: int = 10) -> str:
+    """결과 행 → 압축 표 (헤더 1줄 + 행당 1줄, 컬럼명 반복 없음)"""
+    if not results:
+        return "(0 rows)"
+    rows = [serialize_neo4j_result(r) for r in results[:limit]]
+    columns = []
+    for row in rows:
+        for key in (row if isinstance(row, dict) else {"value": row}):
+            if key not in columns:
+                columns.append(key)
+    lines = [" | ".join(columns)]
+    for row in rows:
+        row = row if isinstance(row, dict) else {"value": row}
+        lines.append(" | ".join(format_cell(row.get(column)) for column in columns))
+    if len(results) > limit:
+        lines.append(f"... ({len(results)} rows, first {limit} shown)")
+    return "\n".join(lines)
+
+
+def build_answer_prompt(question: str, results: list) -> str:
+    """답변 생성 프롬프트 (결과 최대 10개, 압축 표)"""
+    return ANSWER_PROMPT.format(question=question, results=results_table(results))
+
+
+def route(question: str):
+    """집계 Route → 템플릿 Route → 주제어 검색 Route → None (LLM)"""
+    runtime = get_runtime()
+    return (route_question(question) or runtime.template_router.route(question)
+            or runtime.topic_router.route(question))
+
+
+def _stream_rows(cypher: str, params: dict, results: list, preview_rows: int):
+    """실행하며 results 에 쌓고, 첫 preview_rows 행이 모이는 즉시 rows 이벤트"""
+    sent = False
+    for record in get_runtime().stream_execute(cypher, params):
+        results.append(record)
+        if not sent and len(results) == preview_rows:
+            sent = True
+            yield {"type": "rows", "rows": list(results)}
+    if not sent:
+        yield {"type": "rows", "rows": list(results)}
+
+
+def ask_stream(question: str, preview_rows: int = 5):
+    """
+    스트리밍 QA 파이프라인: 단계별 이벤트를 만들어지는 즉시 yield
+      cypher    {"cypher", "route", "label"}     실행 전 Cypher
+      plan      {"key", "join", "steps", "seconds"}  하위 쿼리 계획 실행 완료 (steps: purpose / rows / seconds)
+      fallback  {"label", "error"}               집계/계획/템플릿 조회 실패 → LLM Cypher 생성
+      rows      {"rows"}                         첫 preview_rows 행 (전체 결과 전)
+      count     {"count", "success", "error"}    실행 완료
+      token     {"text"}                         답변 토큰
+      done      {"result"}                       ask() 와 같은 결과 dict
+    """
+    # 1. 집계 / 템플릿 라우팅 → 실패하면 (집계는 결과가 없어도) Cypher 생성
+    selected = route(question)
+    results = None
+    if selected is not None and selected.kind == "aggregate":
+        try:
+            results = execute_cypher(selected.cypher, selected.params)
+        except Exception as e:
+            results = []
+            yield {"type": "fallback", "label": "집계", "error": str(e)}
+        if not results:
+            selected, results = None, None
+
+    # 조건이 여럿인 질문 → 하위 쿼리 동시 실행 + 조인 (계획 실패면 Cypher 생성, 조인 결과 없음은 답)
+    planner = get_runtime().planner
+    if selected is None and planner.should_plan(question):
+        try:
+            plan = planner.plan(question)
+            results = planner.execute(plan)
+            selected = plan.route()
+            yield {"type": "plan", "key": plan.key, "join": plan.join, "seconds": plan.execute_seconds,
+                   "steps": [{"purpose": step.purpose, "rows": len(step.rows), "seconds": step.seconds}
+                             for step in plan.steps]}
+        except Exception as e:
+            results = None
+            yield {"type": "fallback", "label": "계획", "error": str(e)}
+
+    # 2. 쿼리 실행 (템플릿 / LLM 은 행을 받는 대로)
+    success, error = True, None
+    while True:
+        if selected is None:
+            cypher, params, label = generate_cypher(question), None, "생성된 Cypher"
+        else:
+            cypher, params = selected.cypher, selected.params
+            label = f"{ROUTE_LABELS[selected.kind]} 조회 ({selected.dimension})"
+        yield {"type": "cypher", "cypher": cypher, "label": label,
+               "route": selected.dimension if selected is not None else "llm"}
+
+        if results is not None:
+            yield {"type": "rows", "rows": results[:preview_rows]}
+            break
+        results = []
+        try:
+            if selected is None:
+                cypher = validate_cypher(cypher)
+            yield from _stream_rows(cypher, params, results, preview_rows)
+            break
+        except Exception as e:
+            results = None
+            if selected is not None:
+                yield {"type": "fallback", "label": "템플릿", "error": str(e)}
+                selected = None
+                continue
+            results, success, error = [], False, str(e)
+            get_runtime().cypher_cache.invalidate(question)
+            break
+    yield {"type": "count", "count": len(results), "success": success, "error": error}
+
+    # 3. 자연어 답변 생성 (토큰 스트리밍)
+    tokens = []
+    for text in get_runtime().stream(build_answer_prompt(question, results)):
+        tokens.append(text)
+        yield {"type": "token", "text": text}
+
+    yield {"type": "done", "result": {
+        "question": question,
+        "cypher": cypher,
+        "route": selected.dimension if selected is not None else "llm",
+        "results": results,
+        "result_count": len(results),
+        "answer": "".join(tokens).strip(),
+        "success": success,
+        "error": error
+    }}
+
+
+def print_event(event: dict):
+    """ask_stream 이벤트 출력 (ask(verbose=True), 대화형 모드)"""
+    kind = event["type"]
+    if kind == "fallback":
+        print(f"\n⚠️ {event['label']} 조회 실패, Cypher 생성으로 전환: {event['error']}")
+    elif kind == "plan":
+        print(f"\n🧩 하위 쿼리 {len(event['steps'])}개 동시 실행 ({event['seconds'] * 1000:.0f}ms, "
+              f"{event['join']} on {event['key']}):")
+        for i, step in enumerate(event["steps"], 1):
+            print(f"   [{i}] {step['purpose']} → {step['rows']}건 ({step['seconds'] * 1000:.0f}ms)")
+    elif kind == "cypher":
+        icon = "🔧" if event["route"] == "llm" else "📈"
+        print(f"\n{icon} {event['label']}:\n{event['cypher']}")
+    elif kind == "rows":
+        for i, row in enumerate(event["rows"]):
+            print(f"   {i+1}. {row}")
+    elif kind == "count":
+        if event["success"]:
+            print(f"\n📊 결과: {event['count']}건")
+        else:
+            print(f"\n❌ 쿼리 오류: {event['error']}")
+        print(f"\n{'='*60}")
+        print("🗣️ 답변:")
+    elif kind == "token":
+        print(event["text"], end="", flush=True)
+    elif kind == "done":
+        print(f"\n{'='*60}")
 
 
 def ask(question: str, verbose: bool = True) -> dict:
@@ -64,45 +226,13 @@ def ask(question: str, verbose: bool = True) -> dict:
         print(f"📝 질문: {question}")
         print(f"{'='*60}")
 
-    # 1. Cypher 생성
-    cypher = generate_cypher(question)
-    if verbose:
-        print(f"\n🔧 생성된 Cypher:\n{cypher}")
-
-    # 2. 쿼리 실행
-    try:
-        results = execute_cypher(cypher)
-        success = True
-        error = None
-        if verbose:
-            print(f"\n📊 결과: {len(results)}건")
-    except Exception as e:
-        results = []
-        success = False
-        error = str(e)
+    result = None
+    for event in ask_stream(question):
         if verbose:
-            print(f"\n❌ 쿼리 오류: {e}")
-
-    # 3. 자연어 답변 생성
-    if verbose:
-        print(f"\n💬 답변 생성 중...")
-
-    answer = generate_answer(question, results)
-
-    if verbose:
-        print(f"\n{'='*60}")
-        print(f"🗣️ 답변:\n{answer}")
-        print(f"{'='*60}")
-
-    return {
-        "question": question,
-        "cypher": cypher,
-        "results": results,
-        "result_count": len(results),
-        "answer": answer,
-        "success": success,
-        "error": error
-    }
+            print_event(event)
+        if event["type"] == "done":
+            result = event["result"]
+    return result
 
 
 # 확장된 CQ 목록 (카테고리별 10개 이상, 총 50+ 질문)
@@ -188,6 +318,7 @@ CQ_LIST = [
 def run_all_cq(output_path: str = None):
     """모든 CQ 실행 및 리포트 생성"""
     results = []
+    get_runtime().warm_up()
 
     for cq in CQ_LIST:
         print(f"\n{'#'*60}")
@@ -199,6 +330,16 @@ def run_all_cq(output_path: str = None):
         result['category'] = cq['cat']
         results.append(result)
 
+    write_report(results, output_path)
+    return results
+
+
+def write_report(results: list, output_path: str = None) -> str:
+    """CQ 실행 결과 → 마크다운 리포트 (output_path 가 있으면 저장)"""
+    reports = get_runtime().reports()
+    print("\n" + "\n".join(reports))
+    report_lines = "\n".join(f"- {line}" for line in reports)
+
     # 리포트 생성
     success_count = sum(1 for r in results if r['success'] and r['result_count'] > 0)
 
@@ -215,6 +356,8 @@ def run_all_cq(output_path: str = None):
 | 성공 (결과 있음) | {success_count} |
 | 성공률 | {100*success_count/len(results):.1f}% |
 
+{report_lines}
+
 ---
 
 """
@@ -250,7 +393,7 @@ def run_all_cq(output_path: str = None):
             f.write(md)
         print(f"\n\n리포트 저장: {output_path}")
 
-    return results
+    return md
 
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+"""
+Cypher 결과 캐시 (그래프 버전 무효화)
+같은 Cypher + 파라미터를 대화형 모드, qa_engine / async_qa CQ 실행에서 반복 실행하지 않도록
+정규화한 Cypher 텍스트 + 파라미터 + 그래프 버전 스탬프(phase-2/neo4j/graph_version.py)를 키로 결과 행을 저장한다.
+
+- 메모리: LRU (항목 수 / 바이트 한도)
+- 디스크 (선택): 항목별 JSON 파일, 총 바이트 한도를 넘으면 오래된 파일부터 삭제
+- 적재 스크립트가 버전을 올리면 이전 버전 항목은 조회 시 버린다 (버전은 version_ttl 초마다 다시 읽음)
+- GraphVersion 노드가 없는 DB 는 메모리에만 저장 (프로세스 종료 시 사라짐)
+- JSON 으로 직렬화되지 않는 값 (neo4j 시간 타입 등) 이 든 결과는 메모리에만 저장
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import config
+
+STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+
+
+def normalize_cypher(cypher: str) -> str:
+    """문자열 리터럴 밖의 공백을 한 칸으로, 끝의 ';' 제거"""
+    parts, last = [], 0
+    for m in STRING.finditer(cypher):
+        parts.append(re.sub(r"\s+", " ", cypher[last:m.start()]))
+        parts.append(m.group(0))
+        last = m.end()
+    parts.append(re.sub(r"\s+", " ", cypher[last:]))
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def cache_key(cypher: str, params: dict = None) -> str:
+    payload = json.dumps({"cypher": normalize_cypher(cypher), "params": params or {}},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Cypher 결과 LRU (메모리 + 선택적 디스크), 그래프 버전이 바뀌면 무효"""
+
+    def __init__(self, version_loader: Callable[[], Optional[str]], max_entries: int = 1024,
+                 max_bytes: int = 64 * 2**20, disk_dir: Optional[str] = None, disk_max_bytes: int = 256 * 2**20,
+                 version_ttl: float = 30.0):
+        self.version_loader = version_loader
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir).resolve() if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.version_ttl = version_ttl
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()   # key → (version, rows, 바이트, 실행 시간)
+        self.memory_bytes = 0
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stale": 0, "stored": 0,
+                         "evicted": 0, "saved_seconds": 0.0}
+        self._version = None
+        self._version_checked = 0.0
+        self._disk_bytes = None
+        self._lock = threading.RLock()
+
+    # -- 그래프 버전 --
+    def version(self, refresh: bool = False) -> Optional[str]:
+        """현재 그래프 버전 스탬프 (version_ttl 초 동안 재사용)"""
+        with self._lock:
+            if refresh or time.monotonic() - self._version_checked > self.version_ttl:
+                version = self.version_loader()
+                if version != self._version:
+                    self._drop_memory()
+                self._version, self._version_checked = version, time.monotonic()
+            return self._version
+
+    def _drop_memory(self):
+        self.memory.clear()
+        self.memory_bytes = 0
+
+    # -- 조회 / 저장 --
+    def get(self, cypher: str, params: dict = None, version: str = None) -> Optional[List[dict]]:
+        """캐시된 행 (없거나 버전이 다르면 None), version 을 주면 버전 조회 생략 (async 파이프라인)"""
+        key = cache_key(cypher, params)
+        with self._lock:
+            version = self.version() if version is None else version
+            entry = self.memory.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self.memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    self.counters["saved_seconds"] += entry[3]
+                    return [dict(row) for row in entry[1]]
+                self._remove(key)
+                self.counters["stale"] += 1
+
+            entry = self._disk_get(key, version)
+            if entry is not None:
+                rows, seconds, size = entry
+                self.counters["disk_hits"] += 1
+                self.counters["saved_seconds"] += seconds
+                self._memory_put(key, version, rows, size, seconds)
+                return [dict(row) for row in rows]
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, cypher: str, params: dict, rows: List[dict], seconds: float = 0.0, version: str = None):
+        """실행 결과 저장 (seconds: 실행 시간, 적중 시 절약 시간으로 집계)"""
+        key = cache_key(cypher, params)
+        try:
+            data = json.dumps(rows, ensure_ascii=False)
+            serializable = True
+        except (TypeError, ValueError):
+            data = json.dumps(rows, ensure_ascii=False, default=str)
+            serializable = False
+        size = len(data.encode("utf-8"))
+
+        with self._lock:
+            version = self.version() if version is None else version
+            if size > self.max_bytes:
+                return
+            self._memory_put(key, version, [dict(row) for row in rows], size, seconds)
+            self.counters["stored"] += 1
+            if serializable and version is not None:
+                self._disk_put(key, version, cypher, params, rows, seconds)
+
+    def _memory_put(self, key: str, version: Optional[str], rows: List[dict], size: int, seconds: float):
+        if key in self.memory:
+            self._remove(key)
+        self.memory[key] = (version, rows, size, seconds)
+        self.memory_bytes += size
+        while self.memory and (len(self.memory) > self.max_entries or self.memory_bytes > self.max_bytes):
+            self._remove(next(iter(self.memory)))
+            self.counters["evicted"] += 1
+
+    def _remove(self, key: str):
+        entry = self.memory.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry[2]
+
+    # -- 디스크 --
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _disk_get(self, key: str, version: Optional[str]):
+        if self.disk_dir is None or version is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != version:
+            self._disk_remove(path)
+            self.counters["stale"] += 1
+            return None
+        os.utime(path)  # 디스크 LRU: 최근 사용 = mtime
+        return entry["rows"], entry.get("seconds", 0.0), path.stat().st_size
+
+    def _disk_put(self, key: str, version: str, cypher: str, params: dict, rows: List[dict], seconds: float):
+        if self.disk_dir is None:
+            return
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        usage = self._disk_usage()
+        path = self._disk_path(key)
+        old = path.stat().st_size if path.exists() else 0
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "cypher": normalize_cypher(cypher), "params": params or {},
+                       "seconds": seconds, "rows": rows}, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+        self._disk_bytes = usage - old + path.stat().st_size
+        if self._disk_bytes > self.disk_max_bytes:
+            self._disk_evict()
+
+    def _disk_usage(self) -> int:
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*.json"))
+        return self._disk_bytes
+
+    def _disk_remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes -= size
+
+    def _disk_evict(self):
+        """오래 사용하지 않은 파일부터 한도의 90% 까지 삭제"""
+        files = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            if self._disk_bytes <= self.disk_max_bytes * 0.9:
+                break
+            self._disk_remove(path)
+            self.counters["evicted"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._drop_memory()
+            if self.disk_dir is not None and self.disk_dir.exists():
+                for path in self.disk_dir.glob("*.json"):
+                    self._disk_remove(path)
+                self._disk_bytes = 0
+
+    # -- 통계 --
+    def stats(self) -> dict:
+        c = self.counters
+        hits = c["memory_hits"] + c["disk_hits"]
+        lookups = hits + c["misses"]
+        return {
+            "lookups": lookups,
+            "memory_hits": c["memory_hits"],
+            "disk_hits": c["disk_hits"],
+            "misses": c["misses"],
+            "stale": c["stale"],
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_seconds": c["saved_seconds"],
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": self._disk_bytes or 0,
+            "version": self._version,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        version = (s["version"] or "없음")[:8]
+        return (f"결과 캐시: 조회 {s['lookups']}회, 적중 {s['memory_hits'] + s['disk_hits']}회 "
+                f"(메모리 {s['memory_hits']}, 디스크 {s['disk_hits']}, {100 * s['hit_rate']:.1f}%), "
+                f"절약 Neo4j 시간 {s['saved_seconds']:.2f}s, 메모리 {s['memory_entries']}개 "
+                f"{s['memory_bytes'] / 2**20:.1f}MB, 디스크 {s['disk_bytes'] / 2**20:.1f}MB, 그래프 버전 {version}")
+
+
+def from_config(version_loader: Callable[[], Optional[str]]) -> Optional[ResultCache]:
+    """config.RESULT_CACHE_CONFIG 로 생성 (비활성이면 None)"""
+    cfg = config.RESULT_CACHE_CONFIG
+    if not cfg["enabled"]:
+        return None
+    return ResultCache(version_loader, max_entries=cfg["max_entries"], max_bytes=int(cfg["max_mb"] * 2**20),
+                       disk_dir=cfg["disk_dir"] or None, disk_max_bytes=int(cfg["disk_max_mb"] * 2**20),
+                       version_ttl=cfg["version_ttl"])
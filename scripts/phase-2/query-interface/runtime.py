@@ -0,0 +1,251 @@
+"""
+Query Interface 런타임
+프로세스당 Neo4j 드라이버(커넥션 풀) 1개와 LLM 클라이언트 1개를 만들어 재사용
+(질문마다 드라이버 생성/종료, TLS 연결 수립을 하지 않음)
+"""
+
+import atexit
+import sys
+import threading
+import time
+from pathlib import Path
+
+import config
+from graph_store import get_llm, get_neo4j_driver
+from cypher_cache import CypherCache
+from cypher_validator import CypherValidator
+from planner import QueryPlanner
+import result_cache
+from template_router import TemplateRouter
+from topic_router import TopicRouter
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "neo4j"))
+
+from graph_version import VERSION_QUERY
+
+
+class QueryRuntime:
+    """풀링된 Neo4j 드라이버 + keep-alive LLM 클라이언트 (지연 생성, 스레드 안전)"""
+
+    def __init__(self, pool_options: dict = None, database: str = None):
+        self.pool_options = dict(config.NEO4J_POOL_CONFIG, **(pool_options or {}))
+        self.database = database
+        self._driver = None
+        self._llm = None
+        self._cypher_cache = None
+        self._template_router = None
+        self._cypher_validator = None
+        self._topic_router = None
+        self._planner = None
+        self._result_cache = None
+        self._result_cache_loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            with self._lock:
+                if self._driver is None:
+                    self._driver = get_neo4j_driver(**self.pool_options)
+        return self._driver
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    self._llm = get_llm()
+        return self._llm
+
+    @property
+    def cypher_cache(self) -> CypherCache:
+        """질문 → Cypher 캐시 (회사명 슬롯은 첫 사용 시 Neo4j 에서 로드)"""
+        if self._cypher_cache is None:
+            with self._lock:
+                if self._cypher_cache is None:
+                    self._cypher_cache = CypherCache(company_loader=self.company_names)
+        return self._cypher_cache
+
+    @property
+    def template_router(self) -> TemplateRouter:
+        """질문 형태별 검증된 Cypher (회사 별칭 인덱스는 첫 사용 시 Neo4j 에서 로드)"""
+        if self._template_router is None:
+            with self._lock:
+                if self._template_router is None:
+                    self._template_router = TemplateRouter(company_loader=self.companies)
+        return self._template_router
+
+    @property
+    def topic_router(self) -> TopicRouter:
+        """주제어 질문 → 검색 후보 키 Cypher (phase-2/retrieval 색인은 첫 사용 시 로드, 회사 이름은 제외)"""
+        template_router = self.template_router
+        if self._topic_router is None:
+            with self._lock:
+                if self._topic_router is None:
+                    self._topic_router = TopicRouter.from_config(is_company=template_router.is_company)
+        return self._topic_router
+
+    @property
+    def cypher_validator(self) -> CypherValidator:
+        """생성된 Cypher 스키마 검사 / 자동 수정 (적재 매핑 기준, DB 접근 없음)"""
+        if self._cypher_validator is None:
+            with self._lock:
+                if self._cypher_validator is None:
+                    self._cypher_validator = CypherValidator(
+                        default_limit=config.CYPHER_VALIDATOR_CONFIG["default_limit"])
+        return self._cypher_validator
+
+    @property
+    def planner(self) -> QueryPlanner:
+        """조건이 여럿인 질문 → 하위 쿼리 계획 (LLM) / 동시 실행 (이 런타임의 풀, 결과 캐시 공유)"""
+        if self._planner is None:
+            with self._lock:
+                if self._planner is None:
+                    self._planner = QueryPlanner.from_config(complete=self.complete, execute=self.execute)
+        return self._planner
+
+    @property
+    def result_cache(self):
+        """Cypher 결과 캐시 (RESULT_CACHE=0 이면 None)"""
+        if not self._result_cache_loaded:
+            with self._lock:
+                if not self._result_cache_loaded:
+                    self._result_cache = result_cache.from_config(self.graph_version)
+                    self._result_cache_loaded = True
+        return self._result_cache
+
+    def graph_version(self):
+        """GraphVersion 스탬프 (적재 스크립트가 갱신, 없으면 None)"""
+        with self.driver.session(database=self.database) as session:
+            record = session.run(VERSION_QUERY).single()
+            return record["stamp"] if record else None
+
+    def companies(self) -> list:
+        """[(companyName, [별칭, ...])]"""
+        companies = []
+        for record in self.execute("MATCH (c:Company) RETURN c.companyName AS name, c.aliases AS aliases"):
+            aliases = record["aliases"] or []
+            companies.append((record["name"], aliases if isinstance(aliases, list) else [aliases]))
+        return companies
+
+    def company_names(self) -> list:
+        names = []
+        for name, aliases in self.companies():
+            names.append(name)
+            names.extend(aliases)
+        return [name for name in names if isinstance(name, str)]
+
+    def execute(self, cypher: str, params: dict = None, use_cache: bool = True) -> list:
+        """Cypher 실행 (풀에서 세션 획득, 같은 그래프 버전의 같은 쿼리는 결과 캐시에서)"""
+        cache = self.result_cache if use_cache else None
+        if cache is not None:
+            rows = cache.get(cypher, params)
+            if rows is not None:
+                return rows
+        start = time.time()
+        with self.driver.session(database=self.database) as session:
+            result = session.run(cypher, params or {})
+            rows = [dict(record) for record in result]
+        if cache is not None:
+            cache.put(cypher, params, rows, time.time() - start)
+        return rows
+
+    def stream_execute(self, cypher: str, params: dict = None, use_cache: bool = True):
+        """Cypher 실행, 레코드를 받는 대로 yield (전체 결과 전에 첫 행 표시, 끝까지 받으면 캐시)"""
+        cache = self.result_cache if use_cache else None
+        if cache is not None:
+            rows = cache.get(cypher, params)
+            if rows is not None:
+                yield from rows
+                return
+        rows = []
+        start = time.time()
+        with self.driver.session(database=self.database) as session:
+            for record in session.run(cypher, params or {}):
+                rows.append(dict(record))
+                yield rows[-1]
+        if cache is not None:
+            cache.put(cypher, params, rows, time.time() - start)
+
+    def explain(self, cypher: str, params: dict = None):
+        """EXPLAIN 으로 계획만 세워 구문 / 의미 오류 확인 (실행하지 않음, 오류면 Neo4j 예외)"""
+        with self.driver.session(database=self.database) as session:
+            session.run(f"EXPLAIN {cypher}", params or {}).consume()
+
+    def complete(self, prompt: str) -> str:
+        return self.llm.complete(prompt).text
+
+    def stream(self, prompt: str):
+        """LLM completion 을 토큰(델타) 단위로 yield"""
+        for response in self.llm.stream_complete(prompt):
+            if response.delta:
+                yield response.delta
+
+    def reports(self) -> list:
+        """캐시 / 검증 / 주제어 검색 / 질문 계획 통계 (대화형 모드 종료 시, CQ 리포트)"""
+        lines = [self.cypher_cache.report(), self.cypher_validator.report(), self.topic_router.report(),
+                 self.planner.report()]
+        if self.result_cache is not None:
+            lines.append(self.result_cache.report())
+        return lines
+
+    def warm_up(self, connections: int = 1, llm: bool = False, background_llm: bool = False) -> dict:
+        """
+        연결 미리 수립 (대화형 모드/배치 CQ 시작 시)
+        - connections: 미리 열어 둘 Bolt 연결 수 (동시에 세션을 열어 풀에 남김)
+        - llm: True 면 짧은 completion 으로 HTTP keep-alive 연결까지 수립
+        - background_llm: LLM 클라이언트 (LlamaIndex import 포함) 를 백그라운드 스레드에서 준비
+          (대화형 모드: 첫 질문을 입력하는 동안 로드, timings 에 llm 없음)
+        """
+        timings = {}
+        start = time.time()
+        self.driver.verify_connectivity()
+        sessions = [self.driver.session(database=self.database) for _ in range(max(1, connections))]
+        try:
+            for session in sessions:
+                session.run("RETURN 1").consume()
+        finally:
+            for session in sessions:
+                session.close()
+        timings["neo4j"] = time.time() - start
+
+        def prepare_llm():
+            client = self.llm
+            if llm:
+                client.complete("Reply with OK.")
+
+        if background_llm:
+            def prepare_quietly():
+                try:
+                    prepare_llm()
+                except Exception:
+                    pass  # 첫 질문의 LLM 호출에서 같은 오류로 보고됨
+
+            threading.Thread(target=prepare_quietly, name="llm-warm-up", daemon=True).start()
+            return timings
+        start = time.time()
+        prepare_llm()
+        timings["llm"] = time.time() - start
+        return timings
+
+    def close(self):
+        with self._lock:
+            if self._driver is not None:
+                self._driver.close()
+                self._driver = None
+            self._llm = None
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> QueryRuntime:
+    """프로세스 공용 런타임 (종료 시 드라이버 close)"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = QueryRuntime()
+                atexit.register(_runtime.close)
+    return _runtime
@@ -0,0 +1,159 @@
+"""
+로컬 stub LLM 서버 (OpenAI 호환 /chat/completions, /completions)
+async_qa.py 동시 실행 효과를 OpenRouter 비용/변동 없이 측정할 때 사용한다.
+
+- 응답마다 --latency ± --jitter 초 지연 (질문별로 느린/빠른 호출 재현)
+- "stream": true 요청은 SSE 로 토큰마다 --token-delay 초 간격 전송 (첫 토큰까지는 위 지연)
+- Cypher 생성 프롬프트에는 --cypher, 답변 프롬프트에는 고정 한국어 답변
+- --rate-limit-every N: N 번째 요청마다 429 + Retry-After
+
+사용법:
+    python stub_llm_server.py --port 8099 --latency 1.5 --jitter 1.0
+    OPENROUTER_API_BASE=http://localhost:8099/v1 OPENROUTER_API_KEY=stub python async_qa.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CYPHER = "MATCH (m:Meeting) RETURN m.meetingNumber AS meeting ORDER BY meeting LIMIT 5"
+
+
+class StubState:
+    def __init__(self, latency: float, jitter: float, cypher: str, rate_limit_every: int, retry_after: float,
+                 token_delay: float = 0.02):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.cypher = cypher
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with state.lock:
+                state.requests += 1
+                limited = state.rate_limit_every and state.requests % state.rate_limit_every == 0
+                if limited:
+                    state.rate_limited += 1
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit exceeded", "code": 429}},
+                           {"Retry-After": f"{state.retry_after:g}"})
+                return
+
+            if "messages" in payload:
+                prompt = "\n".join(str(m.get("content", "")) for m in payload["messages"])
+            else:
+                prompt = str(payload.get("prompt", ""))
+            if prompt.rstrip().endswith("Cypher Query:") or "Return ONLY the Cypher query" in prompt:
+                text = f"```cypher\n{state.cypher}\n```"
+            else:
+                text = "조회 결과 5개의 회의가 있습니다. 가장 최근 회의부터 순서대로 정리하면 다음과 같습니다. (stub 응답)"
+
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(max(0.0, state.latency + random.uniform(-state.jitter, state.jitter)))
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+            if payload.get("stream"):
+                self._stream(payload, text)
+                return
+
+            usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                     "total_tokens": (len(prompt) + len(text)) // 4}
+            base = {"id": f"stub-{state.requests}", "created": int(time.time()),
+                    "model": payload.get("model", "stub"), "usage": usage}
+            if self.path.endswith("/chat/completions"):
+                choice = {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}
+                self._send(200, {**base, "object": "chat.completion", "choices": [choice]})
+            else:
+                choice = {"index": 0, "finish_reason": "stop", "text": text, "logprobs": None}
+                self._send(200, {**base, "object": "text_completion", "choices": [choice]})
+
+        def _stream(self, payload: dict, text: str):
+            """SSE (data: {...} 청크, 마지막 data: [DONE])"""
+            chat = self.path.endswith("/chat/completions")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def chunk(piece, finish=None):
+                choice = ({"index": 0, "delta": {"content": piece} if piece else {}, "finish_reason": finish}
+                          if chat else {"index": 0, "text": piece, "finish_reason": finish})
+                body = {"id": f"stub-{state.requests}", "created": int(time.time()),
+                        "model": payload.get("model", "stub"),
+                        "object": "chat.completion.chunk" if chat else "text_completion", "choices": [choice]}
+                self.wfile.write(f"data: {json.dumps(body, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            pieces = [piece + " " for piece in text.split(" ")]
+            for i, piece in enumerate(pieces):
+                if i:
+                    time.sleep(state.token_delay)
+                chunk(piece)
+            chunk("", "stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 stub LLM 서버 (OpenAI 호환)")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=1.5, help='평균 응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=1.0, help='지연 편차 (± 초)')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='스트리밍 토큰 간격 (초)')
+    parser.add_argument('--cypher', default=DEFAULT_CYPHER, help='Cypher 생성 프롬프트에 돌려줄 쿼리')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='N 번째 요청마다 429 (0=없음)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='429 Retry-After (초)')
+    args = parser.parse_args()
+
+    state = StubState(args.latency, args.jitter, args.cypher, args.rate_limit_every, args.retry_after,
+                      args.token_delay)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    server.daemon_threads = True
+    print(f"stub LLM: http://127.0.0.1:{args.port}/v1 (지연 {args.latency}±{args.jitter}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"요청 {state.requests}회, 429 {state.rate_limited}회, 최대 동시 {state.max_in_flight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+템플릿 라우팅 (LLM 없이 검증된 Cypher)
+"R1-2400001의 title은?", "RAN1#120에서 Huawei가 제출한 Tdoc 5개", "38.211 Spec을 수정하는 CR 5개" 처럼
+CQ_LIST 에 반복되는 질문 형태를 정규식 + 회사 별칭 인덱스로 의도/슬롯을 뽑아
+파라미터화된 Cypher 로 바로 변환한다. 매치되지 않는 질문만 LLM Cypher 생성으로 간다.
+
+- 관계 방향은 템플릿에 고정 (Tdoc → Meeting/Company/...), LLM 의 방향 뒤집기 오류가 없다
+- 슬롯 값은 모두 $파라미터 (Cypher 에 문자열로 끼워 넣지 않음)
+- 회사 이름/별칭 → 정식 companyName (Neo4j Company 노드, 첫 사용 시 로드)
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from aggregate_router import Route
+
+DEFAULT_LIMIT = 25
+
+TDOC = r"(?P<tdoc>[A-Z]\d-\d{6,7})"
+MEETING = r"(?P<meeting>[A-Z][A-Za-z]*\d*#\d+[-A-Za-z0-9]*)"
+RELEASE = r"(?P<release>Rel-\d+)"
+SPEC = r"(?P<spec>\d{2}\.\d{3})"
+AGENDA = r"(?P<agenda>\d+(?:\.\d+){0,3})"
+QUOTED = r"'(?P<value>[^']+)'"
+STATUS = r"(?P<status>[A-Za-z][A-Za-z ]*?)"
+LIMIT = r"(?P<limit>\d+)\s*개"
+COMPANY = "{COMPANY}"  # 회사 별칭 인덱스로 치환
+SUBJ = r"(?:이|가)"
+OBJ = r"(?:을|를)"
+
+TDOC_COLUMNS = "t.tdocNumber AS tdocNumber, t.title AS title, t.type AS type, t.status AS status"
+
+# Tdoc 속성 질문 → 속성명
+TDOC_PROPERTIES = {"title": "title", "status": "status", "type": "type", "for 필드": "for", "abstract": "abstract"}
+
+
+def _template(intent: str, cypher: str, params: Dict[str, object]) -> Route:
+    return Route(f"template:{intent}", cypher, params, kind="template")
+
+
+def _limit(m: re.Match) -> int:
+    value = m.groupdict().get("limit")
+    return int(value) if value else DEFAULT_LIMIT
+
+
+def _tdoc_list(intent: str, match: str, where: str, m: re.Match, params: Dict[str, object]) -> Route:
+    cypher = match + (f"\nWHERE {where}" if where else "")
+    cypher += f"\nRETURN DISTINCT {TDOC_COLUMNS}\nORDER BY tdocNumber\nLIMIT $limit"
+    return _template(intent, cypher, dict(params, limit=_limit(m)))
+
+
+def _tdoc_related(intent: str, rel: str, label: str, columns: str) -> Callable[[re.Match, "TemplateRouter"], Route]:
+    """단일 Tdoc → 관계 대상 (방향 고정)"""
+    def build(m: re.Match, router: "TemplateRouter") -> Route:
+        cypher = (f"MATCH (t:Tdoc {{tdocNumber: $tdoc}})-[:{rel}]->(x:{label})\n"
+                  f"RETURN t.tdocNumber AS tdocNumber, {columns}")
+        return _template(intent, cypher, {"tdoc": m["tdoc"]})
+    return build
+
+
+def _tdoc_property(m: re.Match, router: "TemplateRouter") -> Route:
+    prop = TDOC_PROPERTIES[m["prop"].lower()]
+    cypher = f"MATCH (t:Tdoc {{tdocNumber: $tdoc}})\nRETURN t.tdocNumber AS tdocNumber, t.`{prop}` AS `{prop}`"
+    return _template("tdoc_property", cypher, {"tdoc": m["tdoc"]})
+
+
+AT_MEETING = "MATCH (t:Tdoc)-[:PRESENTED_AT]->(m:Meeting {meetingNumber: $meeting})"
+BY_COMPANY = "MATCH (t)-[:SUBMITTED_BY]->(c:Company {companyName: $company})"
+
+# (패턴, (매치, 라우터) → Route) - 위에서부터 첫 매치, {COMPANY} 는 회사 별칭 정규식
+RULES: List[Tuple[str, Callable[[re.Match, "TemplateRouter"], Route]]] = [
+    # 단일 Tdoc
+    (rf"^{TDOC}의 (?P<prop>title|status|type|for 필드|abstract)(?:은|는)?$", _tdoc_property),
+    (rf"^{TDOC}의 contact 정보",
+     _tdoc_related("tdoc_contact", "HAS_CONTACT", "Contact", "x.contactName AS contactName, x.contactId AS contactId")),
+    (rf"^{TDOC}{SUBJ} 제출된 (?:회의|Meeting)",
+     _tdoc_related("tdoc_meeting", "PRESENTED_AT", "Meeting", "x.meetingNumber AS meetingNumber")),
+    (rf"^{TDOC}{OBJ} 제출한 회사",
+     _tdoc_related("tdoc_company", "SUBMITTED_BY", "Company", "x.companyName AS companyName")),
+    (rf"^{TDOC}{SUBJ} 속한 Agenda(?: Item)?",
+     _tdoc_related("tdoc_agenda", "BELONGS_TO", "AgendaItem",
+                   "x.agendaNumber AS agendaNumber, x.agendaDescription AS agendaDescription")),
+    (rf"^{TDOC}의 Target Release",
+     _tdoc_related("tdoc_release", "TARGET_RELEASE", "Release", "x.releaseName AS releaseName")),
+    (rf"^{TDOC}{SUBJ} 관련된 Work Item",
+     _tdoc_related("tdoc_workitem", "RELATED_TO", "WorkItem", "x.workItemCode AS workItemCode")),
+    (rf"^{TDOC}의 revision 이전 문서",
+     _tdoc_related("tdoc_previous", "IS_REVISION_OF", "Tdoc", "x.tdocNumber AS previous, x.title AS title")),
+    (rf"^{TDOC}의 revision 이후 문서",
+     _tdoc_related("tdoc_next", "REVISED_TO", "Tdoc", "x.tdocNumber AS next, x.title AS title")),
+
+    # 회의별 Tdoc 목록
+    (rf"^{MEETING}에서 {COMPANY}{SUBJ} 제출한 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_company_tdocs", f"{AT_MEETING}\n{BY_COMPANY}", "", m,
+                             {"meeting": m["meeting"], "company": r.canonical(m["company"])})),
+    (rf"^{COMPANY}{SUBJ} {MEETING}에서 제출한 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_company_tdocs", f"{AT_MEETING}\n{BY_COMPANY}", "", m,
+                             {"meeting": m["meeting"], "company": r.canonical(m["company"])})),
+    (rf"^{MEETING}에서 Agenda(?: Item)? {AGENDA} 관련 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_agenda_tdocs",
+                             f"{AT_MEETING}\nMATCH (t)-[:BELONGS_TO]->(a:AgendaItem {{agendaNumber: $agenda}})", "", m,
+                             {"meeting": m["meeting"], "agenda": m["agenda"]})),
+    (rf"^{MEETING}에서 {STATUS} 상태인 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_status_tdocs", AT_MEETING, "toLower(t.status) = toLower($status)", m,
+                             {"meeting": m["meeting"], "status": m["status"]})),
+    (rf"^{MEETING}에서 type이 {QUOTED}인 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_type_tdocs", AT_MEETING, "t.type = $type", m,
+                             {"meeting": m["meeting"], "type": m["value"]})),
+    (rf"^{MEETING}에서 for 필드가 {QUOTED}인 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("meeting_for_tdocs", AT_MEETING, "t.`for` = $for", m,
+                             {"meeting": m["meeting"], "for": m["value"]})),
+    (rf"^{MEETING}의 Agenda Item 목록(?: {LIMIT})?",
+     lambda m, r: _template("meeting_agendas",
+                            f"{AT_MEETING}\nMATCH (t)-[:BELONGS_TO]->(a:AgendaItem)\n"
+                            "RETURN DISTINCT a.agendaNumber AS agendaNumber, a.agendaDescription AS agendaDescription\n"
+                            "ORDER BY agendaNumber\nLIMIT $limit",
+                            {"meeting": m["meeting"], "limit": _limit(m)})),
+
+    # 회사 / Release / 타입 / Spec
+    (rf"^{COMPANY}(?: 관련|{SUBJ} 제출한) Tdoc(?: {LIMIT})?",
+     lambda m, r: _tdoc_list("company_tdocs", "MATCH (t:Tdoc)-[:SUBMITTED_BY]->(c:Company {companyName: $company})",
+                             "", m, {"company": r.canonical(m["company"])})),
+    (rf"^{COMPANY} Tdoc 중 {STATUS} 상태인 것 {LIMIT}",
+     lambda m, r: _tdoc_list("company_status_tdocs", "MATCH (t:Tdoc)-[:SUBMITTED_BY]->(c:Company {companyName: $company})",
+                             "toLower(t.status) = toLower($status)", m,
+                             {"company": r.canonical(m["company"]), "status": m["status"]})),
+    (rf"^{RELEASE} 타겟 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("release_tdocs", "MATCH (t:Tdoc)-[:TARGET_RELEASE]->(:Release {releaseName: $release})",
+                             "", m, {"release": m["release"]})),
+    (rf"^type이 {QUOTED}인 Tdoc {LIMIT}",
+     lambda m, r: _tdoc_list("type_tdocs", "MATCH (t:Tdoc {type: $type})", "", m, {"type": m["value"]})),
+    (rf"^{SPEC} Spec을 수정하는 CR {LIMIT}",
+     lambda m, r: _tdoc_list("spec_crs", "MATCH (t:CR)-[:MODIFIES]->(:Spec {specNumber: $spec})", "", m,
+                             {"spec": m["spec"]})),
+    (rf"^CR 타입 Tdoc과 그 CR이 수정하는 Spec 정보(?: {LIMIT})?",
+     lambda m, r: _template("cr_specs",
+                            "MATCH (t:CR)-[:MODIFIES]->(s:Spec)\n"
+                            "RETURN t.tdocNumber AS tdocNumber, t.title AS title, s.specNumber AS specNumber\n"
+                            "ORDER BY tdocNumber, specNumber\nLIMIT $limit", {"limit": _limit(m)})),
+    (rf"^LS 타입 Tdoc과 그 LS가 (?P<rel>originated_from|sent_to|cc_to) 관계로 연결된 WorkingGroup(?: {LIMIT})?",
+     lambda m, r: _template("ls_working_groups",
+                            f"MATCH (t:LS)-[:{m['rel'].upper()}]->(w:WorkingGroup)\n"
+                            "RETURN t.tdocNumber AS tdocNumber, t.title AS title, w.wgName AS wgName\n"
+                            "ORDER BY tdocNumber, wgName\nLIMIT $limit", {"limit": _limit(m)})),
+    (rf"^reply_to 관계가 있는 LS Tdoc(?: {LIMIT})?",
+     lambda m, r: _template("ls_replies",
+                            "MATCH (t:LS)-[:REPLY_TO]->(o:Tdoc)\n"
+                            "RETURN t.tdocNumber AS tdocNumber, t.title AS title, o.tdocNumber AS replyTo\n"
+                            "ORDER BY tdocNumber\nLIMIT $limit", {"limit": _limit(m)})),
+    (r"^전체 WorkingGroup 목록",
+     lambda m, r: _template("working_groups", "MATCH (w:WorkingGroup)\nRETURN w.wgName AS wgName\nORDER BY wgName", {})),
+]
+
+
+class TemplateRouter:
+    """질문 → 템플릿 Route (회사 별칭 인덱스는 첫 사용 시 로드)"""
+
+    def __init__(self, companies: Optional[Iterable[Tuple[str, List[str]]]] = None,
+                 company_loader: Optional[Callable[[], Iterable[Tuple[str, List[str]]]]] = None):
+        self._company_loader = company_loader
+        self._aliases: Optional[Dict[str, str]] = None
+        self._rules: Optional[List[Tuple[re.Pattern, Callable]]] = None
+        self._loaded = False
+        if companies is not None:
+            self._build(companies)
+            self._loaded = True
+
+    def _build(self, companies: Iterable[Tuple[str, List[str]]]):
+        aliases: Dict[str, str] = {}
+        for name, names in companies:
+            for alias in [name, *(names or [])]:
+                if isinstance(alias, str) and len(alias) >= 2:
+                    aliases.setdefault(alias.lower(), name)
+        self._aliases = aliases
+
+        if aliases:
+            names = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+            company = rf"(?P<company>{names})(?![A-Za-z0-9])"
+        else:
+            company = r"(?!x)x"  # 회사 인덱스가 없으면 회사 템플릿은 매치하지 않음
+        self._rules = [(re.compile(pattern.replace(COMPANY, company), re.I), build) for pattern, build in RULES]
+
+    def load(self):
+        """회사 별칭 인덱스 로드 (이미 로드했으면 그대로, 실패하면 회사 템플릿 없이 진행하고 다음 호출에서 다시 로드)"""
+        if self._loaded:
+            return
+        companies = []
+        self._loaded = True
+        if self._company_loader is not None:
+            try:
+                companies = list(self._company_loader())
+            except Exception as e:
+                self._loaded = False
+                print(f"⚠️ 회사 별칭 로드 실패, 회사 템플릿 없이 진행 (다음 질문에서 다시 시도): {e}")
+        self._build(companies)
+
+    def canonical(self, company: str) -> str:
+        """회사 이름/별칭 → Company.companyName"""
+        self.load()
+        return self._aliases.get(company.lower(), company)
+
+    def is_company(self, name: str) -> bool:
+        """회사 이름/별칭이면 True (주제어 검색에서 제외, topic_router)"""
+        self.load()
+        return name.lower() in self._aliases
+
+    def route(self, question: str) -> Optional[Route]:
+        """알려진 질문 형태면 템플릿 Route, 아니면 None (LLM Cypher 생성)"""
+        self.load()
+        question = " ".join(question.split()).rstrip("?？. ")
+        for pattern, build in self._rules:
+            m = pattern.search(question)
+            if m:
+                return build(m, self)
+        return None
@@ -3,8 +3,10 @@ Step-3 Sub-step 3-3: Text-to-Cypher 구현
 자연어 질문을 Cypher 쿼리로 변환하여 Neo4j에서 실행
 """
 
-import config  # SSL 패치 적용
-from graph_store import get_llm, get_neo4j_driver
+import time
+
+import config
+from runtime import get_runtime
 
 
 # Cypher 생성 프롬프트 템플릿
@@ -16,7 +18,7 @@ CYPHER_GENERATION_PROMPT = """You are a Neo4j Cypher expert. Convert the user's
 - Tdoc: tdocNumber (unique ID like "R1-2401234"), title, type (e.g., "discussion", "CR", "draftCR", "LS in", "LS out"), status (e.g., "approved", "agreed", "noted", "revised", "withdrawn", "not treated", "postponed"), for (e.g., "Decision", "Approval", "Information")
 - CR (Change Request): tdocNumber, title, type="CR" or "draftCR"
 - LS (Liaison Statement): tdocNumber, title, type (values: "LS in", "LS out"), direction (values: "in", "out")
-- Meeting: meetingNumber (e.g., "RAN1#120"), meetingId
+- Meeting: meetingNumber (e.g., "RAN1#120")
 - Company: companyName, aliases (array)
 - Contact: contactName
 - WorkItem: workItemCode (e.g., "TEI16", "NB_IOTenh3-Core", "NR_unlic-Core")
@@ -39,7 +41,6 @@ CYPHER_GENERATION_PROMPT = """You are a Neo4j Cypher expert. Convert the user's
 - (LS)-[:CC_TO]->(WorkingGroup)
 - (LS)-[:ORIGINATED_FROM]->(WorkingGroup)
 - (LS)-[:REPLY_TO]->(Tdoc)
-- (Contact)-[:WORKS_FOR]->(Company)
 
 ### Important Notes:
 - Tdoc numbers follow pattern: R1-YYMNNNN (e.g., R1-2401234 = meeting 124, document 01234)
@@ -66,14 +67,22 @@ CYPHER_GENERATION_PROMPT = """You are a Neo4j Cypher expert. Convert the user's
 """
 
 
-def generate_cypher(question: str) -> str:
-    """자연어 질문을 Cypher 쿼리로 변환"""
-    llm = get_llm()
+def generate_cypher(question: str, use_cache: bool = True) -> str:
+    """자연어 질문을 Cypher 쿼리로 변환 (같은/엔티티만 다른 질문은 캐시에서)"""
+    if use_cache:
+        return get_runtime().cypher_cache.get_or_generate(question, _generate_with_llm)
+    return _generate_with_llm(question)
+
+
+def _generate_with_llm(question: str) -> str:
+    """LLM 으로 Cypher 생성 (알려진 스키마 실수는 캐시 저장 전에 수정)"""
     prompt = CYPHER_GENERATION_PROMPT.format(question=question)
-    response = llm.complete(prompt)
+    return get_runtime().cypher_validator.validate(clean_cypher(get_runtime().complete(prompt))).cypher
 
-    # 응답에서 Cypher 쿼리만 추출 (```cypher ... ``` 블록 처리)
-    cypher = response.text.strip()
+
+def clean_cypher(response: str) -> str:
+    """LLM 응답에서 Cypher 쿼리만 추출 (```cypher ... ``` 블록 처리)"""
+    cypher = response.strip()
     if cypher.startswith("```"):
         lines = cypher.split("\n")
         cypher = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
@@ -81,15 +90,21 @@ def generate_cypher(question: str) -> str:
     return cypher.strip()
 
 
-def execute_cypher(cypher: str) -> list:
-    """Cypher 쿼리 실행 및 결과 반환"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            result = session.run(cypher)
-            return [dict(record) for record in result]
-    finally:
-        driver.close()
+def validate_cypher(cypher: str, explain: bool = None) -> str:
+    """
+    생성된 Cypher 실행 전 검사 → 수정된 Cypher
+    스키마 위반이 남으면 CypherValidationError, EXPLAIN 실패면 Neo4j 예외 (둘 다 쿼리는 실행하지 않음)
+    """
+    runtime = get_runtime()
+    cypher = runtime.cypher_validator.check(cypher, record=False)  # 통계는 생성 시점에 반영
+    if config.CYPHER_VALIDATOR_CONFIG["explain"] if explain is None else explain:
+        runtime.explain(cypher)
+    return cypher
+
+
+def execute_cypher(cypher: str, params: dict = None) -> list:
+    """Cypher 쿼리 실행 및 결과 반환 (런타임의 풀링된 드라이버 사용)"""
+    return get_runtime().execute(cypher, params)
 
 
 def query(question: str, verbose: bool = True) -> dict:
@@ -104,8 +119,9 @@ def query(question: str, verbose: bool = True) -> dict:
         print(f"🔧 생성된 Cypher:\n{cypher}")
         print("-" * 60)
 
-    # 2. 쿼리 실행
+    # 2. 쿼리 검사 / 실행
     try:
+        cypher = validate_cypher(cypher)
         results = execute_cypher(cypher)
         if verbose:
             print(f"✅ 결과: {len(results)}건")
@@ -122,6 +138,7 @@ def query(question: str, verbose: bool = True) -> dict:
             "success": True,
         }
     except Exception as e:
+        get_runtime().cypher_cache.invalidate(question)
         if verbose:
             print(f"❌ 쿼리 실행 오류: {e}")
         return {
@@ -133,26 +150,48 @@ def query(question: str, verbose: bool = True) -> dict:
 
 
 def interactive_mode():
-    """대화형 질의 모드"""
+    """대화형 질의 모드 (Cypher → 첫 행 → 답변 토큰 순서로 바로 출력)"""
+    from qa_engine import ask_stream, print_event  # qa_engine 이 이 모듈을 import
+
     print("=" * 60)
     print("3GPP TDoc Knowledge Graph - Natural Language Query")
     print("=" * 60)
     print("질문을 입력하세요. 종료하려면 'exit' 또는 'quit' 입력")
     print()
 
+    # 연결 미리 수립 (첫 질문에서 연결 비용 제외, LLM 클라이언트는 입력을 기다리는 동안 로드)
+    try:
+        timings = get_runtime().warm_up(background_llm=True)
+        print(f"(연결 준비: Neo4j {timings['neo4j']*1000:.0f}ms)")
+        print()
+    except Exception as e:
+        print(f"⚠️ 연결 준비 실패: {e}")
+
     while True:
         try:
             question = input("질문> ").strip()
             if not question:
                 continue
             if question.lower() in ("exit", "quit", "q"):
+                print("\n".join(get_runtime().reports()))
                 print("종료합니다.")
                 break
 
-            query(question, verbose=True)
+            start = time.time()
+            first_output = first_token = None
+            for event in ask_stream(question):
+                if first_output is None:
+                    first_output = time.time() - start
+                if event["type"] == "token" and first_token is None:
+                    first_token = time.time() - start
+                print_event(event)
+            print(f"(첫 출력 {first_output*1000:.0f}ms"
+                  + (f", 첫 답변 토큰 {first_token*1000:.0f}ms" if first_token is not None else "")
+                  + f", 전체 {(time.time() - start)*1000:.0f}ms)")
             print()
         except KeyboardInterrupt:
-            print("\n종료합니다.")
+            print("\n" + "\n".join(get_runtime().reports()))
+            print("종료합니다.")
             break
 
 
@@ -0,0 +1,159 @@
+"""
+주제어 질문 라우팅 (하이브리드 검색 → 후보 키 → Cypher)
+"'SRS antenna switching' 관련 Agreement", "RAN1#116에서 beam failure recovery 관련 Tdoc 10개" 처럼
+제목/초록/결정 내용의 주제로 찾는 질문은 LLM Cypher 의 CONTAINS 전체 스캔 대신
+phase-2/retrieval 색인 (BM25 + 임베딩) 에서 후보 키를 찾아 고유 키 조회 Cypher 로 넘긴다.
+
+- 검색 순위 (RRF) 를 결과 순서로 유지 (UNWIND 순위 → ORDER BY rank)
+- 회의 조건은 Cypher 에서 거름 (이때는 후보를 candidates 개까지 넘김)
+- 주제는 영문 용어만 (한국어 조사가 붙은 "CR과 관련된 Resolution" 같은 관계 질문은 LLM 으로)
+- 주제가 회사 이름/별칭이면 ("Samsung 관련 Tdoc") 제출 회사 질문이므로 검색하지 않음 (템플릿 라우터 별칭 인덱스)
+- 색인이 없거나 후보가 없으면 None → LLM Cypher 생성
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import config
+from aggregate_router import Route
+from template_router import DEFAULT_LIMIT, MEETING
+
+TOPIC = r"(?:'(?P<quoted>[^']+)'|\"(?P<dquoted>[^\"]+)\"|(?P<topic>[A-Za-z0-9][A-Za-z0-9 .+/\-()]*?))"
+TARGET = (r"(?P<target>T[Dd]ocs?|기고서?|Agreements?|합의(?:사항)?|Conclusions?|결론|"
+          r"Working ?Assumptions?|Resolutions?|결정(?:사항)?)")
+
+# 질문의 대상 → 색인 라벨
+TARGET_LABELS = [
+    (r"tdoc|기고", ("Tdoc",)),
+    (r"agreement|합의", ("Agreement",)),
+    (r"conclusion|결론", ("Conclusion",)),
+    (r"working ?assumption", ("WorkingAssumption",)),
+    (r"resolution|결정", ("Resolution",)),
+]
+
+# 주제가 아니라 그래프 노드를 가리키는 말 (관계 / 템플릿 질문 → LLM)
+STRUCTURAL = re.compile(r"^(?:(?:CR|LS)(?: T[Dd]oc)?|T[Dd]oc|Spec|Agenda(?: Item)?(?: [\d.]+)?|Rel-\d+|"
+                        r"\d{2}\.\d{3}|[A-Z]\d-\d{6,7})$", re.I)
+
+PATTERNS = [
+    re.compile(rf"^(?:{MEETING}\s*에서\s+)?{TOPIC}\s*(?:관련(?:된)?|에 관한|에 대한)\s+{TARGET}", re.I),
+    re.compile(rf"^(?:(?:find|list|show|search)\s+)?{TARGET}\s+(?:about|on|regarding|related to|mentioning)\s+"
+               rf"{TOPIC}(?:\s+(?:at|in)\s+{MEETING})?$", re.I),
+]
+LIMIT = re.compile(r"(?:(?P<n>\d+)\s*개|(?:top|first)\s+(?P<top>\d+))", re.I)
+
+RESOLUTION_CYPHER = """UNWIND range(0, size($keys) - 1) AS rank
+MATCH (r:Resolution {{resolutionId: $keys[rank]}}){where}
+RETURN r.resolutionId AS resolutionId, [l IN labels(r) WHERE l <> 'Resolution'][0] AS type,
+       r.meeting AS meeting, r.agenda AS agenda, r.content AS content
+ORDER BY rank
+LIMIT $limit"""
+
+TDOC_CYPHER = """UNWIND range(0, size($keys) - 1) AS rank
+MATCH (t:Tdoc {{id: $keys[rank]}}){where}
+RETURN t.tdocNumber AS tdocNumber, t.title AS title, t.type AS type, t.status AS status
+ORDER BY rank
+LIMIT $limit"""
+
+
+def parse(question: str, is_company: Optional[Callable[[str], bool]] = None
+          ) -> Optional[Tuple[str, Tuple[str, ...], Optional[str], int]]:
+    """질문 → (주제, 라벨, 회의, limit), 주제어 질문이 아니면 (주제가 그래프 노드 / 회사면) None"""
+    question = " ".join(question.split()).rstrip("?？. ")
+    for pattern in PATTERNS:
+        m = pattern.search(question)
+        if not m:
+            continue
+        topic = (m["quoted"] or m["dquoted"] or m["topic"] or "").strip()
+        if not topic or STRUCTURAL.match(topic) or (is_company is not None and is_company(topic)):
+            return None
+        target = m["target"].lower()
+        labels = next(labels for key, labels in TARGET_LABELS if re.match(key, target))
+        limit = LIMIT.search(question[m.end():]) if pattern is PATTERNS[0] else LIMIT.search(question)
+        limit = int(limit["n"] or limit["top"]) if limit else DEFAULT_LIMIT
+        return topic, labels, m["meeting"], limit
+    return None
+
+
+class TopicRouter:
+    """질문 → 검색 후보 키 Route (색인은 첫 사용 시 로드, 없으면 항상 None)"""
+
+    def __init__(self, retriever_loader: Callable[[], object], candidates: int = 100,
+                 is_company: Optional[Callable[[str], bool]] = None):
+        self._retriever_loader = retriever_loader
+        self.candidates = candidates
+        self.is_company = is_company
+        self.retriever = None
+        self.error: Optional[str] = None
+        self._loaded = False
+        self.counters = {"routed": 0, "empty": 0, "seconds": 0.0}
+
+    @classmethod
+    def from_config(cls, is_company: Optional[Callable[[str], bool]] = None) -> "TopicRouter":
+        cfg = config.RETRIEVAL_CONFIG
+        if not cfg["enabled"]:
+            router = cls(lambda: None, cfg["candidates"], is_company)
+            router.error = "비활성 (RETRIEVAL=0)"
+            router._loaded = True
+            return router
+
+        def load():
+            sys.path.insert(0, str(Path(__file__).parent.parent / "retrieval"))
+            from hybrid_search import HybridRetriever
+            return HybridRetriever.load(Path(cfg["index_dir"]), vector=cfg["vector"], candidates=cfg["candidates"])
+
+        return cls(load, cfg["candidates"], is_company)
+
+    def load(self):
+        """색인 로드 (이미 로드했으면 그대로, 실패하면 주제어 라우팅 끔)"""
+        if not self._loaded:
+            try:
+                self.retriever = self._retriever_loader()
+            except (OSError, ValueError) as e:
+                self.error = f"색인 없음 ({e.__class__.__name__}: {e})"
+            self._loaded = True
+
+    def route(self, question: str) -> Optional[Route]:
+        """주제어 질문이면 후보 키 Route, 아니면 (또는 후보가 없으면) None"""
+        parsed = parse(question, self.is_company)
+        if parsed is None:
+            return None
+        self.load()
+        if self.retriever is None:
+            return None
+
+        topic, labels, meeting, limit = parsed
+        start = time.time()
+        try:
+            keys = self.retriever.keys(topic, self.candidates if meeting else limit, labels)
+        except Exception as e:  # 임베딩 모델 로드 실패 등 → LLM Cypher 생성
+            self.error = f"검색 실패 ({e.__class__.__name__}: {e})"
+            keys = []
+        self.counters["seconds"] += time.time() - start
+        if not keys:
+            self.counters["empty"] += 1
+            return None
+        self.counters["routed"] += 1
+
+        params: Dict[str, object] = {"keys": keys, "limit": limit}
+        if labels == ("Tdoc",):
+            where = "\nMATCH (t)-[:PRESENTED_AT]->(:Meeting {meetingNumber: $meeting})" if meeting else ""
+            cypher, dimension = TDOC_CYPHER.format(where=where), "retrieval:tdocs"
+        else:
+            where = "\nWHERE r.meeting = $meeting" if meeting else ""
+            cypher, dimension = RESOLUTION_CYPHER.format(where=where), "retrieval:resolutions"
+        if meeting:
+            params["meeting"] = meeting
+        return Route(dimension, cypher, params, kind="template")
+
+    def report(self) -> str:
+        if self.retriever is None:
+            return f"주제어 검색: {self.error or '미사용'}"
+        c = self.counters
+        searches = c["routed"] + c["empty"]
+        average = 1000 * c["seconds"] / searches if searches else 0.0
+        return (f"주제어 검색: 색인 {len(self.retriever.text):,}건 ({self.retriever.mode}), "
+                f"라우팅 {c['routed']}회, 후보 없음 {c['empty']}회, 평균 검색 {average:.1f}ms")
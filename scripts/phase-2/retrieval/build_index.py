@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+JSON-LD → 검색 색인 (BM25 + 선택적 임베딩)
+
+Phase-2 Tdoc (title + abstract) 과 Phase-3 Resolution (content) 을 읽어
+text_index.BM25Index, vector_index.VectorIndex 형식으로 저장한다.
+Neo4j 적재와 같은 원본을 쓰므로 적재(load_*.py, 01_load_decisions.py) 후 다시 실행한다.
+
+- Tdoc 키: @id (Neo4j Tdoc.id), 라벨 Tdoc (CR/LS 포함)
+- Resolution 키: resolutionId, 라벨 Agreement / Conclusion / WorkingAssumption
+- 내용이 빈 문서는 제외
+- 임베딩: sentence-transformers 가 있으면 로컬 CPU 모델로 계산 (hnswlib 가 있으면 HNSW 도 저장)
+
+출력: ontology/output/retrieval/phase-2/
+
+사용법:
+    python build_index.py
+    python build_index.py --no-vector                   # BM25 만
+    python build_index.py --model sentence-transformers/all-MiniLM-L6-v2 --batch-size 128
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "neo4j"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "phase-3" / "neo4j"))
+
+from text_index import BM25Index, INDEX_DIR
+from vector_index import DEFAULT_MODEL, EMBEDDING_AVAILABLE, HNSW_AVAILABLE, Embedder, VectorIndex
+from graph_mapping import INSTANCES_DIR, TDOC_FILE, iter_instances
+
+decisions = importlib.import_module("01_load_decisions")
+
+PREVIEW_LENGTH = 120
+
+
+def _preview(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= PREVIEW_LENGTH else text[:PREVIEW_LENGTH - 1] + "…"
+
+
+def tdoc_documents(instances_dir: Path) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """(Tdoc, @id) → (미리보기, title + abstract)"""
+    documents = {}
+    for item in iter_instances(TDOC_FILE, instances_dir):
+        title = item.get("tdoc:title") or ""
+        abstract = item.get("tdoc:abstract") or ""
+        if not (title or abstract):
+            continue
+        number = item.get("tdoc:tdocNumber")
+        if isinstance(number, list):
+            number = number[0] if number else None
+        preview = f"{number}: {title}" if number else title
+        documents[("Tdoc", item["@id"])] = (_preview(preview), f"{title}\n{abstract}")
+    return documents
+
+
+def resolution_documents(phase3_dir: Path) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """(Agreement|Conclusion|WorkingAssumption, resolutionId) → (미리보기, content)"""
+    documents = {}
+    for resolution_type, filename in decisions.RESOLUTION_FILES:
+        path = phase3_dir / filename
+        if not path.exists():
+            print(f"  ⚠️ {filename} 없음 - 건너뜀")
+            continue
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f).get("@graph", [])
+        count = 0
+        for row in decisions.flatten_resolutions(items, {})["nodes"]:
+            content = row["content"] or ""
+            if not content.strip():
+                continue
+            documents[(resolution_type, row["resolutionId"])] = (_preview(content), content)
+            count += 1
+        print(f"  {resolution_type}: {count:,}")
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON-LD → 검색 색인 (BM25 + 임베딩)")
+    parser.add_argument('--input-dir', type=Path, default=INSTANCES_DIR, help='Phase-2 JSON-LD 인스턴스 디렉토리')
+    parser.add_argument('--phase3-dir', type=Path, default=decisions.INSTANCES_DIR,
+                        help='Phase-3 Resolution JSON-LD 디렉토리')
+    parser.add_argument('--output-dir', type=Path, default=INDEX_DIR, help='색인 출력 디렉토리')
+    parser.add_argument('--no-phase3', action='store_true', help='Phase-3 Resolution 제외')
+    parser.add_argument('--no-vector', action='store_true', help='임베딩 색인 생략 (BM25 만)')
+    parser.add_argument('--no-hnsw', action='store_true', help='HNSW 생략 (검색 시 numpy 전수 내적)')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='sentence-transformers 모델')
+    parser.add_argument('--batch-size', type=int, default=64, help='임베딩 배치 크기')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("검색 색인 생성")
+    print("=" * 60)
+    start = time.time()
+
+    print("\n[1/3] 문서...")
+    documents = tdoc_documents(args.input_dir)
+    print(f"  Tdoc: {len(documents):,}")
+    if not args.no_phase3 and args.phase3_dir.exists():
+        documents.update(resolution_documents(args.phase3_dir))
+
+    print("\n[2/3] BM25 색인...")
+    text = BM25Index.build((label, key, preview, body) for (label, key), (preview, body) in documents.items())
+    text.save(args.output_dir, source=str(args.input_dir))
+    print(f"  문서 {len(text):,}개, 용어 {text.meta['term_count']:,}개, 포스팅 {text.meta['posting_count']:,}개")
+
+    print("\n[3/3] 임베딩 색인...")
+    for name in ("vectors.json", "vectors.npy", "vectors.hnsw"):  # 이전 문서 번호의 벡터가 남지 않도록
+        (args.output_dir / name).unlink(missing_ok=True)
+    if args.no_vector:
+        print("  --no-vector - 건너뜀")
+    elif not EMBEDDING_AVAILABLE:
+        print("  ⚠️ sentence-transformers 없음 - 건너뜀 (BM25 만 사용)")
+    else:
+        embed_start = time.time()
+        vectors = Embedder(args.model).encode([body for _, body in documents.values()],
+                                              batch_size=args.batch_size, show_progress=True)
+        index = VectorIndex.build(vectors, args.model, use_hnsw=not args.no_hnsw)
+        index.save(args.output_dir)
+        print(f"  {len(index):,} × {index.meta['dim']} ({args.model}, "
+              f"{'HNSW' if index.hnsw is not None else '전수 내적' + ('' if HNSW_AVAILABLE else ' - hnswlib 없음')}, "
+              f"{time.time() - embed_start:.1f}s)")
+
+    size = sum(p.stat().st_size for p in args.output_dir.rglob("*") if p.is_file())
+    print("\n" + "=" * 60)
+    print(f"문서 {len(text):,}개 → {args.output_dir} ({size / 1024 / 1024:.1f} MB, {time.time() - start:.1f}s)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
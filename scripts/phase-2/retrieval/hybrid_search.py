@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+하이브리드 검색 (BM25 + 임베딩, Reciprocal Rank Fusion)
+
+주제어 질문("SRS antenna switching 관련 Agreement")의 후보 문서를 디스크 색인에서 찾아
+(라벨, 키) 목록으로 돌려준다. query-interface/topic_router.py 가 키 목록을 Cypher 파라미터로 넘겨
+Neo4j 에서는 고유 키 조회만 한다 (CONTAINS 전체 스캔 없음).
+
+- BM25 (text_index.py) 는 항상 사용, 임베딩 색인 (vector_index.py) 은 있으면 함께 사용
+- 두 순위 목록을 RRF (1 / (60 + 순위)) 로 합침 → 점수 척도가 달라도 정규화 불필요
+- 라벨: Tdoc, Agreement, Conclusion, WorkingAssumption ("Resolution" 은 세 하위 라벨)
+
+사용법:
+    python hybrid_search.py "SRS antenna switching"
+    python hybrid_search.py "beam failure recovery" --label Agreement -k 10
+    python hybrid_search.py "NTN timing advance" --no-vector
+"""
+
+import argparse
+import heapq
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from text_index import BM25Index, INDEX_DIR
+from vector_index import EMBEDDING_AVAILABLE, Embedder, VectorIndex
+
+RRF_K = 60
+RESOLUTION_LABELS = ("Agreement", "Conclusion", "WorkingAssumption")
+LABEL_GROUPS = {"Resolution": RESOLUTION_LABELS}
+
+
+def expand_labels(labels: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """'Resolution' → 하위 라벨, None 은 전체"""
+    if labels is None:
+        return None
+    expanded = []
+    for label in labels:
+        expanded.extend(LABEL_GROUPS.get(label, (label,)))
+    return tuple(dict.fromkeys(expanded))
+
+
+@dataclass
+class Hit:
+    label: str
+    key: str
+    score: float
+    preview: str
+    sources: Tuple[str, ...]    # 이 문서를 찾은 색인 ("bm25", "vector")
+
+
+class HybridRetriever:
+    """BM25 색인 + (선택) 임베딩 색인, 같은 문서 번호 공유"""
+
+    def __init__(self, text: BM25Index, vectors: Optional[VectorIndex] = None,
+                 embedder: Optional[Embedder] = None, candidates: int = 100):
+        self.text = text
+        self.vectors = vectors if embedder is not None else None
+        self.embedder = embedder
+        self.candidates = candidates
+        self._positions: Dict[Tuple[str, ...], set] = {}
+
+    @classmethod
+    def load(cls, path: Path = INDEX_DIR, vector: bool = True, candidates: int = 100) -> "HybridRetriever":
+        """디스크 색인 로드 (임베딩 색인/모델이 없으면 BM25 만)"""
+        text = BM25Index.load(path)
+        vectors, embedder = None, None
+        if vector and EMBEDDING_AVAILABLE:
+            vectors = VectorIndex.load(path)
+            if vectors is not None and len(vectors) != len(text):
+                print(f"  ⚠️ 벡터 색인 문서 수 불일치 ({len(vectors)} != {len(text)}) - BM25 만 사용")
+                vectors = None
+            if vectors is not None:
+                embedder = Embedder(vectors.model_name)
+        return cls(text, vectors, embedder, candidates)
+
+    @property
+    def mode(self) -> str:
+        return "bm25+vector" if self.vectors is not None else "bm25"
+
+    def _allowed(self, labels: Optional[Tuple[str, ...]]) -> Optional[set]:
+        """라벨 조합 → 문서 번호 집합 (벡터 탐색 필터, 조합별 1회 계산)"""
+        if labels is None:
+            return None
+        if labels not in self._positions:
+            wanted = set(labels)
+            self._positions[labels] = {n for n, (label, _, _) in enumerate(self.text.docs) if label in wanted}
+        return self._positions[labels]
+
+    def search(self, query: str, k: int = 20, labels: Optional[Iterable[str]] = None) -> List[Hit]:
+        """상위 k 개 Hit (RRF 점수순)"""
+        labels = expand_labels(labels)
+        pool = max(k, self.candidates)
+        ranked = {"bm25": self.text.search(query, pool, labels)}
+        if self.vectors is not None:
+            query_vector = self.embedder.encode([query])[0]
+            ranked["vector"] = self.vectors.search(query_vector, pool, self._allowed(labels))
+
+        fused: Dict[int, float] = {}
+        sources: Dict[int, List[str]] = {}
+        for name, hits in ranked.items():
+            for rank, (doc, _) in enumerate(hits, 1):
+                fused[doc] = fused.get(doc, 0.0) + 1.0 / (RRF_K + rank)
+                sources.setdefault(doc, []).append(name)
+
+        results = []
+        for doc, score in heapq.nlargest(k, fused.items(), key=lambda item: item[1]):
+            label, key, preview = self.text.doc(doc)
+            results.append(Hit(label, key, score, preview, tuple(sources[doc])))
+        return results
+
+    def keys(self, query: str, k: int = 20, labels: Optional[Iterable[str]] = None) -> List[str]:
+        """Cypher 파라미터용 키 목록 (순위순)"""
+        return [hit.key for hit in self.search(query, k, labels)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이브리드 검색 (BM25 + 임베딩)")
+    parser.add_argument('query', help='검색어')
+    parser.add_argument('--index-dir', type=Path, default=INDEX_DIR, help='색인 디렉토리')
+    parser.add_argument('--label', action='append',
+                        help='라벨 필터 (Tdoc, Agreement, Conclusion, WorkingAssumption, Resolution), 반복 가능')
+    parser.add_argument('-k', type=int, default=10, help='결과 수')
+    parser.add_argument('--no-vector', action='store_true', help='임베딩 색인 사용 안 함')
+    args = parser.parse_args()
+
+    start = time.time()
+    retriever = HybridRetriever.load(args.index_dir, vector=not args.no_vector)
+    loaded = time.time() - start
+    start = time.time()
+    hits = retriever.search(args.query, args.k, args.label)
+    elapsed = time.time() - start
+
+    print(f"색인 {len(retriever.text):,}건 ({retriever.mode}), 로드 {loaded:.2f}s, 검색 {elapsed * 1000:.1f}ms")
+    for i, hit in enumerate(hits, 1):
+        print(f"{i:>3}. [{hit.label}] {hit.key}  {hit.score:.4f} ({'+'.join(hit.sources)})")
+        if hit.preview:
+            print(f"     {hit.preview}")
+
+
+if __name__ == "__main__":
+    main()
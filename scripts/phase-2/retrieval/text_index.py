@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+BM25 역색인 (Tdoc 제목/초록, Resolution 내용)
+
+build_index.py 가 만든 디스크 색인을 읽어 주제어 질의에 대한 후보 문서(라벨, 키)를 BM25 점수순으로 돌려준다.
+Neo4j 의 CONTAINS 전체 스캔 대신 후보 키 목록을 Cypher 에 넘기는 용도 (hybrid_search.py).
+
+형식 (ontology/output/retrieval/phase-2/):
+- index.json               메타데이터 (문서/용어 수, 라벨별 문서 수, k1/b, 바이트 순서)
+- docs.json.gz             문서 번호 → [라벨, 키, 미리보기]
+- terms.json.gz            용어 번호 → 용어 (사전순)
+- doc_lengths.i32          문서 번호 → 토큰 수
+- postings.{offsets,docs,tfs}.i32
+                           용어별 CSR 포스팅 (offsets[t]..offsets[t+1] 구간이 용어 t 의 (문서, 빈도))
+
+키: Tdoc 은 id (@id), Resolution 은 resolutionId (Neo4j 고유 제약 키)
+
+사용 예:
+    index = BM25Index.load()
+    index.search("SRS antenna switching", k=10, labels={"Agreement"})
+"""
+
+import gzip
+import heapq
+import json
+import math
+import re
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+
+ONTOLOGY_DIR = Path(__file__).parent.parent.parent.parent / "ontology"
+INDEX_DIR = ONTOLOGY_DIR / "output" / "retrieval" / "phase-2"
+
+_INT = "i"  # int32 (array itemsize 4)
+
+TOKEN = re.compile(r"[^\W_]+(?:[.\-/][^\W_]+)*")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+which not no can may should shall into than then there these those also such via per
+""".split())
+
+
+# ============================================================
+# 토큰화
+# ============================================================
+
+def _normalize(token: str) -> str:
+    """소문자 + 간단한 복수형 제거 (색인/질의 동일 적용)"""
+    if len(token) > 4 and token.endswith("s") and not token.endswith("ss") and token.isalpha():
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """'Multi-TRP PDSCH' → ['multi-trp', 'multi', 'trp', 'pdsch'] (복합어는 전체 + 부분)"""
+    tokens = []
+    for m in TOKEN.finditer((text or "").lower()):
+        token = m.group(0)
+        if token in STOPWORDS:
+            continue
+        tokens.append(_normalize(token))
+        if not any(sep in token for sep in ".-/"):
+            continue
+        if re.fullmatch(r"[\d.]+", token):  # 38.211, 15.4.0 은 부분으로 나누지 않음
+            continue
+        for part in re.split(r"[.\-/]", token):
+            if len(part) >= 2 and part not in STOPWORDS:
+                tokens.append(_normalize(part))
+    return tokens
+
+
+# ============================================================
+# 저장 헬퍼
+# ============================================================
+
+def write_array(path: Path, values: array):
+    with open(path, 'wb') as f:
+        values.tofile(f)
+
+
+def read_array(path: Path, swap: bool, typecode: str = _INT) -> array:
+    values = array(typecode)
+    with open(path, 'rb') as f:
+        values.frombytes(f.read())
+    if swap:
+        values.byteswap()
+    return values
+
+
+def write_json_gz(path: Path, data):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_json_gz(path: Path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================
+# BM25
+# ============================================================
+
+class BM25Index:
+    """문서 = (라벨, 키, 텍스트), 질의 용어의 포스팅만 훑어 점수 누적"""
+
+    def __init__(self, docs: List[list], terms: List[str], offsets: array, postings: array, tfs: array,
+                 doc_lengths: array, k1: float = 1.2, b: float = 0.75, meta: dict = None):
+        self.docs = docs
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.postings = postings
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self.meta = meta or {}
+        n = len(doc_lengths)
+        avgdl = (sum(doc_lengths) / n) if n else 1.0
+        # 문서 길이 정규화 항 k1 * (1 - b + b * dl / avgdl) 미리 계산
+        self.norms = array("d", (k1 * (1 - b + b * dl / avgdl) for dl in doc_lengths))
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str, str, str]], k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """(라벨, 키, 미리보기, 텍스트) → 색인 (같은 (라벨, 키) 는 마지막 값)"""
+        unique: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for label, key, preview, text in documents:
+            unique[(label, key)] = (preview, text)
+
+        docs, lengths, postings_by_term = [], array(_INT), {}
+        for n, ((label, key), (preview, text)) in enumerate(unique.items()):
+            tokens = tokenize(text)
+            docs.append([label, key, preview])
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings_by_term.setdefault(term, []).append((n, tf))
+
+        terms = sorted(postings_by_term)
+        offsets, postings, tfs = array(_INT, [0]), array(_INT), array(_INT)
+        for term in terms:
+            for doc, tf in postings_by_term[term]:
+                postings.append(doc)
+                tfs.append(tf)
+            offsets.append(len(postings))
+        return cls(docs, terms, offsets, postings, tfs, lengths, k1, b)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def save(self, path: Path = INDEX_DIR, source: str = ""):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        write_json_gz(path / "docs.json.gz", self.docs)
+        write_json_gz(path / "terms.json.gz", self.terms)
+        write_array(path / "doc_lengths.i32", self.doc_lengths)
+        write_array(path / "postings.offsets.i32", self.offsets)
+        write_array(path / "postings.docs.i32", self.postings)
+        write_array(path / "postings.tfs.i32", self.tfs)
+
+        self.meta = {
+            "version": INDEX_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "byteorder": sys.byteorder,
+            "doc_count": len(self.docs),
+            "term_count": len(self.terms),
+            "posting_count": len(self.postings),
+            "labels": dict(Counter(label for label, _, _ in self.docs)),
+            "k1": self.k1,
+            "b": self.b,
+        }
+        with open(path / "index.json", 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_DIR) -> "BM25Index":
+        path = Path(path)
+        with open(path / "index.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"색인 버전 불일치: {meta.get('version')} (필요: {INDEX_VERSION})")
+        swap = meta["byteorder"] != sys.byteorder
+        return cls(
+            docs=read_json_gz(path / "docs.json.gz"),
+            terms=read_json_gz(path / "terms.json.gz"),
+            offsets=read_array(path / "postings.offsets.i32", swap),
+            postings=read_array(path / "postings.docs.i32", swap),
+            tfs=read_array(path / "postings.tfs.i32", swap),
+            doc_lengths=read_array(path / "doc_lengths.i32", swap),
+            k1=meta["k1"], b=meta["b"], meta=meta,
+        )
+
+    def idf(self, term_id: int) -> float:
+        df = self.offsets[term_id + 1] - self.offsets[term_id]
+        n = len(self.docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """문서 번호 → BM25 점수 (질의 용어가 하나라도 있는 문서만)"""
+        scores: Dict[int, float] = {}
+        k1, norms, postings, tfs = self.k1, self.norms, self.postings, self.tfs
+        for term in dict.fromkeys(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            weight = self.idf(term_id) * (k1 + 1)
+            for i in range(self.offsets[term_id], self.offsets[term_id + 1]):
+                doc = postings[i]
+                tf = tfs[i]
+                scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + norms[doc])
+        return scores
+
+    def search(self, query: str, k: int = 20, labels: Optional[Iterable[str]] = None) -> List[Tuple[int, float]]:
+        """상위 k 개 (문서 번호, 점수), labels 가 있으면 해당 라벨 문서만"""
+        scores = self.scores(query)
+        if labels is not None:
+            labels = set(labels)
+            scores = {doc: score for doc, score in scores.items() if self.docs[doc][0] in labels}
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def doc(self, n: int) -> Tuple[str, str, str]:
+        """문서 번호 → (라벨, 키, 미리보기)"""
+        label, key, preview = self.docs[n]
+        return label, key, preview
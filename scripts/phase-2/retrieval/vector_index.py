@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+임베딩 색인 (선택): 로컬 CPU 문장 임베딩 + HNSW 근사 최근접 탐색
+
+text_index.BM25Index 와 같은 문서 번호로 벡터를 저장한다 (docs.json.gz 공유).
+"SRS 안테나 스위칭 개선" 처럼 표기가 다른 질의도 의미가 가까운 문서를 찾아 BM25 후보를 보완한다.
+
+- 임베딩: sentence-transformers (기본 all-MiniLM-L6-v2, 384차원, CPU), 정규화 벡터 → 내적 = 코사인 유사도
+- 탐색: hnswlib 가 있으면 디스크 HNSW 그래프, 없으면 numpy 전수 내적
+  (allowed 필터가 EXACT_FILTER_MAX 개 이하이거나 HNSW 필터 탐색이 k 개를 찾지 못하면 allowed 문서만 전수 내적)
+- sentence-transformers / numpy 가 없으면 벡터 색인 없이 BM25 만 사용 (hybrid_search.py)
+
+형식 (ontology/output/retrieval/phase-2/):
+- vectors.json   메타데이터 (모델, 차원, 문서 수, HNSW 파라미터)
+- vectors.npy    문서 번호 순 float32 행렬 (N × dim)
+- vectors.hnsw   hnswlib 색인 (hnswlib 가 있을 때)
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDING_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    EMBEDDING_AVAILABLE = False
+
+from text_index import INDEX_DIR
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# 필터 문서가 이 수 이하면 HNSW 대신 전수 내적 (작은 라벨 / 회의 그룹은 근사 필터 탐색이 k 개를 못 채움)
+EXACT_FILTER_MAX = 20000
+
+
+class Embedder:
+    """문장 임베딩 (모델은 첫 encode 때 로드, CPU)"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, device: str = "cpu"):
+        if not EMBEDDING_AVAILABLE:
+            raise RuntimeError("sentence-transformers / numpy 가 설치되지 않음 (pip install sentence-transformers)")
+        self.model_name = model_name
+        self.device = device
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    def encode(self, texts: Sequence[str], batch_size: int = 64, show_progress: bool = False):
+        """텍스트 → 정규화된 float32 행렬 (len(texts) × dim)"""
+        vectors = self.model.encode(list(texts), batch_size=batch_size, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=show_progress)
+        return vectors.astype(np.float32, copy=False)
+
+
+class VectorIndex:
+    """문서 번호 → 벡터, 질의 벡터와 내적이 큰 순으로 탐색"""
+
+    def __init__(self, vectors, model_name: str, hnsw=None, meta: dict = None):
+        self.vectors = vectors
+        self.model_name = model_name
+        self.hnsw = hnsw
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, vectors, model_name: str, use_hnsw: bool = True) -> "VectorIndex":
+        hnsw = None
+        if use_hnsw and HNSW_AVAILABLE and len(vectors):
+            hnsw = hnswlib.Index(space="ip", dim=vectors.shape[1])
+            hnsw.init_index(max_elements=len(vectors), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+            hnsw.add_items(vectors, np.arange(len(vectors)))
+            hnsw.set_ef(HNSW_EF_SEARCH)
+        return cls(vectors, model_name, hnsw)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def save(self, path: Path = INDEX_DIR):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "vectors.npy", self.vectors)
+        if self.hnsw is not None:
+            self.hnsw.save_index(str(path / "vectors.hnsw"))
+        elif (path / "vectors.hnsw").exists():
+            (path / "vectors.hnsw").unlink()
+
+        self.meta = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "model": self.model_name,
+            "dim": int(self.vectors.shape[1]) if len(self.vectors) else 0,
+            "doc_count": len(self.vectors),
+            "hnsw": {"M": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION} if self.hnsw is not None else None,
+        }
+        with open(path / "vectors.json", 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_DIR, ef: int = HNSW_EF_SEARCH) -> Optional["VectorIndex"]:
+        """벡터 색인 로드 (파일이 없거나 numpy 가 없으면 None)"""
+        path = Path(path)
+        if not NUMPY_AVAILABLE or not (path / "vectors.json").exists():
+            return None
+        with open(path / "vectors.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        hnsw = None
+        if HNSW_AVAILABLE and meta.get("hnsw") and (path / "vectors.hnsw").exists():
+            hnsw = hnswlib.Index(space="ip", dim=meta["dim"])
+            hnsw.load_index(str(path / "vectors.hnsw"), max_elements=meta["doc_count"])
+            hnsw.set_ef(max(ef, 1))
+        return cls(vectors, meta["model"], hnsw, meta)
+
+    def search(self, query_vector, k: int = 20, allowed: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """상위 k 개 (문서 번호, 코사인 유사도), allowed 가 있으면 그 문서만"""
+        n = len(self.vectors)
+        if not n or k <= 0:
+            return []
+        if self.hnsw is not None and (allowed is None or len(allowed) > EXACT_FILTER_MAX):
+            # 라벨 필터는 탐색 중에 적용 (hnswlib >= 0.7), ef 는 가져올 개수 이상이어야 함
+            k = min(k, n if allowed is None else len(allowed))
+            if not k:
+                return []
+            self.hnsw.set_ef(max(HNSW_EF_SEARCH, k))
+            try:
+                labels, distances = self.hnsw.knn_query(query_vector.reshape(1, -1), k=k,
+                                                        filter=None if allowed is None else allowed.__contains__)
+                return [(int(doc), 1.0 - float(distance)) for doc, distance in zip(labels[0], distances[0])]
+            except RuntimeError:
+                # 근사 탐색이 k 개를 채우지 못함 (hnswlib 는 부족하면 예외) → 아래 전수 내적
+                pass
+
+        if allowed is not None:
+            candidates = np.fromiter(sorted(allowed), dtype=np.int64, count=len(allowed))
+            scores = np.asarray(self.vectors[candidates] @ query_vector, dtype=np.float32)
+        else:
+            candidates = None
+            scores = np.asarray(self.vectors @ query_vector, dtype=np.float32)
+        k = min(k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        docs = candidates[top] if candidates is not None else top
+        return [(int(doc), float(scores[i])) for doc, i in zip(docs, top)]
@@ -0,0 +1,1659 @@
+#!/usr/bin/env python3
+"""
+스냅샷 대상 Cypher 부분집합 실행기
+
+CQ 데이터셋(validate_cq.py, test_cq_practical.py, validate_cq_cypher.py, qa_engine CQ_LIST)이
+실제로 쓰는 Cypher 부분집합을 GraphSnapshot 위에서 프로세스 내 실행한다.
+
+지원:
+- MATCH / OPTIONAL MATCH (고정 방향 ->, <-, 무방향 -, 관계 타입 |, 가변 길이 *m..n, path 변수)
+- WHERE (AND/OR/XOR/NOT, 비교, IN, CONTAINS, STARTS/ENDS WITH, =~, IS [NOT] NULL, 라벨 조건 n:Label)
+- WITH / RETURN (DISTINCT, 별칭, 집계 count/sum/avg/min/max/collect [DISTINCT], ORDER BY, SKIP, LIMIT)
+- UNWIND, CASE, 리스트 컴프리헨션, 파라미터($x), 스칼라 함수 일부
+- 같은 MATCH 안에서 관계 중복 사용 금지 (Cypher 관계 동형성)
+
+미지원 구문(CALL, UNION, EXISTS {...}, 패턴 식, 쓰기 절 등)은 CypherUnsupported 를 던진다.
+
+사용 예:
+    snap = GraphSnapshot.load()
+    rows = execute(snap, "MATCH (t:Tdoc)-[:PRESENTED_AT]->(m:Meeting) RETURN m.meetingNumber, count(t) AS n")
+"""
+
+import math
+import re
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from graph_snapshot import GraphSnapshot
+
+
+class CypherError(ValueError):
+    """구문 오류"""
+
+
+class CypherUnsupported(CypherError):
+    """이 실행기가 지원하지 않는 구문"""
+
+
+# ============================================================
+# 값 타입
+# ============================================================
+
+class NodeRef:
+    __slots__ = ("n",)
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __eq__(self, other):
+        return isinstance(other, NodeRef) and other.n == self.n
+
+    def __hash__(self):
+        return hash(("node", self.n))
+
+    def __repr__(self):
+        return f"NodeRef({self.n})"
+
+
+class RelRef:
+    __slots__ = ("type", "start", "end")
+
+    def __init__(self, rel_type: str, start: int, end: int):
+        self.type, self.start, self.end = rel_type, start, end
+
+    def key(self):
+        return (self.type, self.start, self.end)
+
+    def __eq__(self, other):
+        return isinstance(other, RelRef) and other.key() == self.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class PathRef:
+    __slots__ = ("nodes", "rels")
+
+    def __init__(self, nodes: List[NodeRef], rels: List[RelRef]):
+        self.nodes, self.rels = nodes, rels
+
+    def __eq__(self, other):
+        return isinstance(other, PathRef) and other.nodes == self.nodes and other.rels == self.rels
+
+    def __hash__(self):
+        return hash((tuple(self.nodes), tuple(self.rels)))
+
+
+def freeze(value):
+    """그룹 키/DISTINCT 용 해시 가능한 값"""
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+# ============================================================
+# 토크나이저
+# ============================================================
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+|//[^\n]*)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<ident>`[^`]+`|[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>\d+\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?|\.\d+)
+  | (?P<param>\$[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op><>|<=|>=|=~|->|<-|\.\.|[()\[\]{},:.|*+\-/%=<>^;])
+""", re.VERBOSE)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"'}
+
+
+class Token:
+    __slots__ = ("kind", "value", "pos", "end")
+
+    def __init__(self, kind, value, pos, end):
+        self.kind, self.value, self.pos, self.end = kind, value, pos, end
+
+    def __repr__(self):
+        return f"{self.kind}:{self.value!r}"
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens, pos = [], 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise CypherError(f"알 수 없는 문자 {text[pos]!r} (위치 {pos})")
+        kind = m.lastgroup
+        raw = m.group()
+        if kind == "string":
+            value = re.sub(r"\\(.)", lambda e: _ESCAPES.get(e.group(1), e.group(1)), raw[1:-1])
+            tokens.append(Token("string", value, pos, m.end()))
+        elif kind == "ident":
+            quoted = raw.startswith("`")
+            tokens.append(Token("qident" if quoted else "ident", raw[1:-1] if quoted else raw, pos, m.end()))
+        elif kind == "number":
+            value = float(raw) if any(c in raw for c in ".eE") else int(raw)
+            tokens.append(Token("number", value, pos, m.end()))
+        elif kind == "param":
+            tokens.append(Token("param", raw[1:], pos, m.end()))
+        elif kind == "op":
+            tokens.append(Token("op", raw, pos, m.end()))
+        pos = m.end()
+    tokens.append(Token("eof", None, len(text), len(text)))
+    return tokens
+
+
+# ============================================================
+# AST
+# ============================================================
+
+class Expr:
+    """식: fn(env) 으로 컴파일되는 노드"""
+    __slots__ = ("kind", "args", "text", "vars", "aggregate")
+
+    def __init__(self, kind: str, args: tuple, text: str = ""):
+        self.kind, self.args, self.text = kind, args, text
+        self.vars: Set[str] = set()
+        self.aggregate = False
+        for arg in args:
+            if isinstance(arg, Expr):
+                self.vars |= arg.vars
+                self.aggregate |= arg.aggregate
+            elif isinstance(arg, (list, tuple)):
+                for sub in arg:
+                    for e in (sub if isinstance(sub, tuple) else (sub,)):
+                        if isinstance(e, Expr):
+                            self.vars |= e.vars
+                            self.aggregate |= e.aggregate
+
+
+class NodePattern:
+    def __init__(self, var, labels, props):
+        self.var, self.labels, self.props = var, labels, props
+
+
+class RelPattern:
+    def __init__(self, var, types, direction, props, min_hops=1, max_hops=1, var_length=False):
+        self.var, self.types, self.direction, self.props = var, types, direction, props
+        self.min_hops, self.max_hops, self.var_length = min_hops, max_hops, var_length
+
+
+class PathPattern:
+    def __init__(self, var, elements):
+        self.var, self.elements = var, elements  # [NodePattern, RelPattern, NodePattern, ...]
+
+    @property
+    def nodes(self) -> List[NodePattern]:
+        return self.elements[0::2]
+
+    @property
+    def rels(self) -> List[RelPattern]:
+        return self.elements[1::2]
+
+
+class Projection:
+    def __init__(self):
+        self.distinct = False
+        self.star = False
+        self.items: List[Tuple[Expr, str]] = []
+        self.order: List[Tuple[Expr, bool]] = []
+        self.skip: Optional[Expr] = None
+        self.limit: Optional[Expr] = None
+        self.where: Optional[Expr] = None
+
+
+AGGREGATES = {"count", "sum", "avg", "min", "max", "collect"}
+
+KEYWORDS = {
+    "match", "optional", "where", "return", "with", "unwind", "as", "order", "by", "skip", "limit",
+    "asc", "ascending", "desc", "descending", "distinct", "and", "or", "xor", "not", "in", "contains",
+    "starts", "ends", "is", "null", "true", "false", "case", "when", "then", "else", "end",
+}
+UNSUPPORTED = {"call", "union", "create", "merge", "delete", "detach", "set", "remove", "foreach", "load", "exists"}
+
+
+# ============================================================
+# 파서
+# ============================================================
+
+class Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.i = 0
+        self.anon = 0
+
+    # -- 토큰 헬퍼 --
+    @property
+    def tok(self) -> Token:
+        return self.tokens[self.i]
+
+    def peek(self, offset=1) -> Token:
+        return self.tokens[min(self.i + offset, len(self.tokens) - 1)]
+
+    def is_kw(self, *words, offset=0) -> bool:
+        t = self.peek(offset) if offset else self.tok
+        return t.kind == "ident" and t.value.lower() in words
+
+    def is_op(self, *ops) -> bool:
+        return self.tok.kind == "op" and self.tok.value in ops
+
+    def advance(self) -> Token:
+        t = self.tok
+        self.i += 1
+        return t
+
+    def expect_kw(self, word):
+        if not self.is_kw(word):
+            raise CypherError(f"'{word.upper()}' 필요 (위치 {self.tok.pos}: {self.tok.value!r})")
+        return self.advance()
+
+    def expect_op(self, op):
+        if not self.is_op(op):
+            raise CypherError(f"'{op}' 필요 (위치 {self.tok.pos}: {self.tok.value!r})")
+        return self.advance()
+
+    def name(self) -> str:
+        if self.tok.kind not in ("ident", "qident"):
+            raise CypherError(f"이름 필요 (위치 {self.tok.pos}: {self.tok.value!r})")
+        return self.advance().value
+
+    def new_anon(self) -> str:
+        self.anon += 1
+        return f"  anon_{self.anon}"
+
+    # -- 쿼리 --
+    def parse(self) -> List[tuple]:
+        clauses = []
+        while self.tok.kind != "eof":
+            if self.is_op(";"):
+                self.advance()
+                continue
+            if self.is_kw(*UNSUPPORTED):
+                raise CypherUnsupported(f"미지원 절: {self.tok.value.upper()}")
+            if self.is_kw("optional"):
+                self.advance()
+                self.expect_kw("match")
+                clauses.append(self.match_clause(optional=True))
+            elif self.is_kw("match"):
+                self.advance()
+                clauses.append(self.match_clause(optional=False))
+            elif self.is_kw("unwind"):
+                self.advance()
+                expr = self.expression()
+                self.expect_kw("as")
+                clauses.append(("UNWIND", expr, self.name()))
+            elif self.is_kw("with"):
+                self.advance()
+                clauses.append(("WITH", self.projection(allow_where=True)))
+            elif self.is_kw("return"):
+                self.advance()
+                clauses.append(("RETURN", self.projection(allow_where=False)))
+            else:
+                raise CypherError(f"예상하지 못한 토큰 {self.tok.value!r} (위치 {self.tok.pos})")
+        if not clauses or clauses[-1][0] != "RETURN":
+            raise CypherUnsupported("RETURN 으로 끝나는 읽기 쿼리만 지원")
+        return clauses
+
+    def match_clause(self, optional: bool) -> tuple:
+        patterns = [self.path_pattern()]
+        while self.is_op(","):
+            self.advance()
+            patterns.append(self.path_pattern())
+        where = None
+        if self.is_kw("where"):
+            self.advance()
+            where = self.expression()
+        return ("MATCH", optional, patterns, where)
+
+    def path_pattern(self) -> PathPattern:
+        var = None
+        if self.tok.kind in ("ident", "qident") and self.peek().kind == "op" and self.peek().value == "=":
+            var = self.name()
+            self.advance()
+        if self.tok.kind == "ident" and self.tok.value.lower() in ("shortestpath", "allshortestpaths"):
+            raise CypherUnsupported("shortestPath 미지원")
+        elements = [self.node_pattern()]
+        while self.is_op("-", "<-"):
+            elements.append(self.rel_pattern())
+            elements.append(self.node_pattern())
+        return PathPattern(var, elements)
+
+    def node_pattern(self) -> NodePattern:
+        self.expect_op("(")
+        var = None
+        if self.tok.kind in ("ident", "qident"):
+            var = self.name()
+        labels = []
+        while self.is_op(":"):
+            self.advance()
+            labels.append(self.name())
+        props = self.map_literal_items() if self.is_op("{") else {}
+        self.expect_op(")")
+        return NodePattern(var or self.new_anon(), labels, props)
+
+    def rel_pattern(self) -> RelPattern:
+        left = self.advance().value  # '-' or '<-'
+        var, types, props = None, [], {}
+        min_hops = max_hops = 1
+        var_length = False
+        if self.is_op("["):
+            self.advance()
+            if self.tok.kind in ("ident", "qident"):
+                var = self.name()
+            if self.is_op(":"):
+                self.advance()
+                types.append(self.name())
+                while self.is_op("|"):
+                    self.advance()
+                    if self.is_op(":"):
+                        self.advance()
+                    types.append(self.name())
+            if self.is_op("*"):
+                self.advance()
+                var_length = True
+                min_hops, max_hops = 1, None
+                if self.tok.kind == "number":
+                    min_hops = max_hops = int(self.advance().value)
+                if self.is_op(".."):
+                    self.advance()
+                    max_hops = int(self.advance().value) if self.tok.kind == "number" else None
+                    if min_hops == max_hops and max_hops is None:
+                        min_hops = 1
+            if self.is_op("{"):
+                props = self.map_literal_items()
+            self.expect_op("]")
+        right = self.advance().value
+        if right not in ("-", "->"):
+            raise CypherError(f"관계 패턴 오류 (위치 {self.tok.pos})")
+        if left == "<-" and right == "->":
+            raise CypherError("양방향 화살표 관계 패턴")
+        direction = "out" if right == "->" else ("in" if left == "<-" else "both")
+        return RelPattern(var or self.new_anon(), types, direction, props, min_hops, max_hops, var_length)
+
+    def map_literal_items(self) -> Dict[str, Expr]:
+        self.expect_op("{")
+        items = {}
+        while not self.is_op("}"):
+            key = self.name()
+            self.expect_op(":")
+            items[key] = self.expression()
+            if self.is_op(","):
+                self.advance()
+        self.expect_op("}")
+        return items
+
+    def projection(self, allow_where: bool) -> Projection:
+        proj = Projection()
+        if self.is_kw("distinct"):
+            self.advance()
+            proj.distinct = True
+        while True:
+            if self.is_op("*"):
+                self.advance()
+                proj.star = True
+            else:
+                start = self.tok.pos
+                expr = self.expression()
+                text = self.text[start:self.tokens[self.i - 1].end].strip()
+                alias = None
+                if self.is_kw("as"):
+                    self.advance()
+                    alias = self.name()
+                proj.items.append((expr, alias or text))
+            if not self.is_op(","):
+                break
+            self.advance()
+
+        while True:
+            if self.is_kw("order") and self.is_kw("by", offset=1):
+                self.advance()
+                self.advance()
+                while True:
+                    expr = self.expression()
+                    desc = False
+                    if self.is_kw("desc", "descending"):
+                        self.advance()
+                        desc = True
+                    elif self.is_kw("asc", "ascending"):
+                        self.advance()
+                    proj.order.append((expr, desc))
+                    if not self.is_op(","):
+                        break
+                    self.advance()
+            elif self.is_kw("skip"):
+                self.advance()
+                proj.skip = self.expression()
+            elif self.is_kw("limit"):
+                self.advance()
+                proj.limit = self.expression()
+            elif allow_where and self.is_kw("where"):
+                self.advance()
+                proj.where = self.expression()
+            else:
+                break
+        return proj
+
+    # -- 식 (우선순위 낮은 것부터) --
+    def expression(self) -> Expr:
+        return self.or_expr()
+
+    def _binary(self, sub, words, kind):
+        start = self.tok.pos
+        left = sub()
+        while self.is_kw(*words):
+            self.advance()
+            right = sub()
+            left = Expr(kind, (left, right), self.text[start:self.tokens[self.i - 1].end])
+        return left
+
+    def or_expr(self):
+        return self._binary(self.xor_expr, ("or",), "or")
+
+    def xor_expr(self):
+        return self._binary(self.and_expr, ("xor",), "xor")
+
+    def and_expr(self):
+        return self._binary(self.not_expr, ("and",), "and")
+
+    def not_expr(self):
+        if self.is_kw("not"):
+            start = self.advance().pos
+            operand = self.not_expr()
+            return Expr("not", (operand,), self.text[start:self.tokens[self.i - 1].end])
+        return self.comparison()
+
+    def comparison(self):
+        start = self.tok.pos
+        left = self.additive()
+        while True:
+            if self.is_op("=", "<>", "<", ">", "<=", ">=", "=~"):
+                op = self.advance().value
+                right = self.additive()
+                left = Expr("cmp", (op, left, right))
+            elif self.is_kw("in"):
+                self.advance()
+                left = Expr("in", (left, self.additive()))
+            elif self.is_kw("contains"):
+                self.advance()
+                left = Expr("str", ("contains", left, self.additive()))
+            elif self.is_kw("starts") and self.is_kw("with", offset=1):
+                self.advance()
+                self.advance()
+                left = Expr("str", ("starts", left, self.additive()))
+            elif self.is_kw("ends") and self.is_kw("with", offset=1):
+                self.advance()
+                self.advance()
+                left = Expr("str", ("ends", left, self.additive()))
+            elif self.is_kw("is"):
+                self.advance()
+                negate = False
+                if self.is_kw("not"):
+                    self.advance()
+                    negate = True
+                self.expect_kw("null")
+                left = Expr("isnull", (negate, left))
+            else:
+                break
+            left.text = self.text[start:self.tokens[self.i - 1].end]
+        return left
+
+    def additive(self):
+        start = self.tok.pos
+        left = self.multiplicative()
+        while self.is_op("+", "-"):
+            op = self.advance().value
+            left = Expr("arith", (op, left, self.multiplicative()), self.text[start:self.tokens[self.i - 1].end])
+        return left
+
+    def multiplicative(self):
+        start = self.tok.pos
+        left = self.power()
+        while self.is_op("*", "/", "%"):
+            op = self.advance().value
+            left = Expr("arith", (op, left, self.power()), self.text[start:self.tokens[self.i - 1].end])
+        return left
+
+    def power(self):
+        start = self.tok.pos
+        left = self.unary()
+        while self.is_op("^"):
+            self.advance()
+            left = Expr("arith", ("^", left, self.unary()), self.text[start:self.tokens[self.i - 1].end])
+        return left
+
+    def unary(self):
+        if self.is_op("-", "+"):
+            start = self.tok.pos
+            op = self.advance().value
+            operand = self.unary()
+            if op == "+":
+                return operand
+            return Expr("neg", (operand,), self.text[start:self.tokens[self.i - 1].end])
+        return self.postfix()
+
+    def postfix(self):
+        start = self.tok.pos
+        expr = self.atom()
+        while True:
+            if self.is_op("."):
+                self.advance()
+                expr = Expr("prop", (expr, self.name()))
+            elif self.is_op("["):
+                self.advance()
+                lo = hi = None
+                is_slice = False
+                if not self.is_op(".."):
+                    lo = self.expression()
+                if self.is_op(".."):
+                    self.advance()
+                    is_slice = True
+                    if not self.is_op("]"):
+                        hi = self.expression()
+                self.expect_op("]")
+                expr = Expr("slice", (expr, lo, hi)) if is_slice else Expr("index", (expr, lo))
+            elif self.is_op(":") and expr.kind == "var" and self.peek().kind in ("ident", "qident"):
+                labels = []
+                while self.is_op(":"):
+                    self.advance()
+                    labels.append(self.name())
+                expr = Expr("labels", (expr, tuple(labels)))
+            else:
+                break
+            expr.text = self.text[start:self.tokens[self.i - 1].end]
+        return expr
+
+    def atom(self) -> Expr:
+        t = self.tok
+        start = t.pos
+        if t.kind == "string" or t.kind == "number":
+            self.advance()
+            return Expr("lit", (t.value,), self.text[start:t.end])
+        if t.kind == "param":
+            self.advance()
+            return Expr("param", (t.value,), self.text[start:t.end])
+        if t.kind == "ident" and t.value.lower() in ("true", "false", "null"):
+            self.advance()
+            return Expr("lit", ({"true": True, "false": False, "null": None}[t.value.lower()],), t.value)
+        if t.kind == "ident" and t.value.lower() == "case":
+            return self.case_expr()
+        if self.is_op("("):
+            self.advance()
+            expr = self.expression()
+            self.expect_op(")")
+            expr.text = self.text[start:self.tokens[self.i - 1].end]
+            return expr
+        if self.is_op("["):
+            return self.list_expr()
+        if self.is_op("{"):
+            items = self.map_literal_items()
+            return Expr("map", (tuple(items.items()),), self.text[start:self.tokens[self.i - 1].end])
+        if t.kind in ("ident", "qident"):
+            if t.kind == "ident" and t.value.lower() in UNSUPPORTED and self.peek().kind == "op" and self.peek().value in ("(", "{"):
+                raise CypherUnsupported(f"미지원 식: {t.value}")
+            if t.kind == "ident" and self.peek().kind == "op" and self.peek().value == "(":
+                return self.function_call()
+            self.advance()
+            expr = Expr("var", (t.value,), t.value)
+            expr.vars = {t.value}
+            return expr
+        raise CypherError(f"식 필요 (위치 {t.pos}: {t.value!r})")
+
+    def function_call(self) -> Expr:
+        start = self.tok.pos
+        name = self.advance().value.lower()
+        self.expect_op("(")
+        distinct = False
+        args = []
+        if name == "count" and self.is_op("*"):
+            self.advance()
+            self.expect_op(")")
+            expr = Expr("agg", ("count", False, None), self.text[start:self.tokens[self.i - 1].end])
+            expr.aggregate = True
+            return expr
+        if self.is_kw("distinct"):
+            self.advance()
+            distinct = True
+        while not self.is_op(")"):
+            args.append(self.expression())
+            if self.is_op(","):
+                self.advance()
+        self.expect_op(")")
+        text = self.text[start:self.tokens[self.i - 1].end]
+        if name in AGGREGATES:
+            if len(args) != 1:
+                raise CypherError(f"{name}() 인자 1개 필요")
+            if args[0].aggregate:
+                raise CypherError("중첩 집계")
+            expr = Expr("agg", (name, distinct, args[0]), text)
+            expr.aggregate = True
+            return expr
+        if name not in FUNCTIONS:
+            raise CypherUnsupported(f"미지원 함수: {name}()")
+        return Expr("call", (name, tuple(args)), text)
+
+    def list_expr(self) -> Expr:
+        start = self.tok.pos
+        self.expect_op("[")
+        # 리스트 컴프리헨션: [x IN list WHERE cond | expr]
+        if self.tok.kind in ("ident", "qident") and self.is_kw("in", offset=1):
+            var = self.name()
+            self.advance()
+            source = self.expression()
+            cond = mapped = None
+            if self.is_kw("where"):
+                self.advance()
+                cond = self.expression()
+            if self.is_op("|"):
+                self.advance()
+                mapped = self.expression()
+            self.expect_op("]")
+            expr = Expr("comp", (var, source, cond, mapped), self.text[start:self.tokens[self.i - 1].end])
+            inner = set()
+            for e in (cond, mapped):
+                if e is not None:
+                    inner |= e.vars
+            expr.vars = source.vars | (inner - {var})
+            return expr
+        items = []
+        while not self.is_op("]"):
+            items.append(self.expression())
+            if self.is_op(","):
+                self.advance()
+        self.expect_op("]")
+        return Expr("list", (tuple(items),), self.text[start:self.tokens[self.i - 1].end])
+
+    def case_expr(self) -> Expr:
+        start = self.advance().pos
+        subject = None
+        if not self.is_kw("when"):
+            subject = self.expression()
+        branches = []
+        while self.is_kw("when"):
+            self.advance()
+            cond = self.expression()
+            self.expect_kw("then")
+            branches.append((cond, self.expression()))
+        default = None
+        if self.is_kw("else"):
+            self.advance()
+            default = self.expression()
+        self.expect_kw("end")
+        return Expr("case", (subject, tuple(branches), default), self.text[start:self.tokens[self.i - 1].end])
+
+
+# ============================================================
+# 값 연산 (Cypher null 의미론)
+# ============================================================
+
+def _num(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _compare(op: str, a, b):
+    if a is None or b is None:
+        return None
+    if op == "=":
+        return _equals(a, b)
+    if op == "<>":
+        eq = _equals(a, b)
+        return None if eq is None else not eq
+    if op == "=~":
+        if not isinstance(a, str) or not isinstance(b, str):
+            return None
+        return re.fullmatch(b, a) is not None
+    if not ((_num(a) and _num(b)) or (isinstance(a, str) and isinstance(b, str))
+            or (isinstance(a, bool) and isinstance(b, bool))):
+        return None
+    return {"<": a < b, ">": a > b, "<=": a <= b, ">=": a >= b}[op]
+
+
+def _equals(a, b):
+    if a is None or b is None:
+        return None
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return False
+        result = True
+        for x, y in zip(a, b):
+            eq = _equals(x, y)
+            if eq is False:
+                return False
+            if eq is None:
+                result = None
+        return result
+    if _num(a) and _num(b):
+        return a == b
+    if type(a) is not type(b) and not (isinstance(a, str) and isinstance(b, str)):
+        return False
+    return a == b
+
+
+def _in(value, items):
+    if items is None:
+        return None
+    if not isinstance(items, list):
+        raise CypherError("IN 의 오른쪽은 리스트여야 함")
+    if value is None:
+        return None if items else False
+    saw_null = False
+    for item in items:
+        eq = _equals(value, item)
+        if eq:
+            return True
+        if eq is None:
+            saw_null = True
+    return None if saw_null else False
+
+
+def _and(a, b):
+    if a is False or b is False:
+        return False
+    if a is None or b is None:
+        return None
+    return True
+
+
+def _or(a, b):
+    if a is True or b is True:
+        return True
+    if a is None or b is None:
+        return None
+    return False
+
+
+def _arith(op, a, b):
+    if a is None or b is None:
+        return None
+    if op == "+":
+        if isinstance(a, list) or isinstance(b, list):
+            return (a if isinstance(a, list) else [a]) + (b if isinstance(b, list) else [b])
+        if isinstance(a, str) or isinstance(b, str):
+            return f"{_to_string(a)}{_to_string(b)}"
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        if isinstance(a, int) and isinstance(b, int) and not isinstance(a, bool):
+            if b == 0:
+                raise CypherError("/ by zero")
+            q = abs(a) // abs(b)
+            return q if (a >= 0) == (b >= 0) else -q
+        return a / b if b != 0 else (math.nan if a == 0 else math.copysign(math.inf, a) * (1 if b >= 0 else -1))
+    if op == "%":
+        if isinstance(a, int) and isinstance(b, int):
+            return int(math.fmod(a, b))
+        return math.fmod(a, b)
+    if op == "^":
+        return float(a) ** float(b)
+    raise CypherError(f"연산자 {op}")
+
+
+def _to_string(v):
+    if v is None:
+        return None
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, float) and v.is_integer():
+        return f"{v:.1f}"
+    return str(v)
+
+
+def _round(value, precision=0, mode=None):
+    if value is None:
+        return None
+    if precision is None:
+        return None
+    quant = Decimal(1).scaleb(-int(precision))
+    return float(Decimal(repr(float(value))).quantize(quant, rounding=ROUND_HALF_UP))
+
+
+def _to_integer(v):
+    if v is None:
+        return None
+    try:
+        return int(float(v)) if isinstance(v, str) else int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(v):
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _size(v):
+    if v is None:
+        return None
+    return len(v)
+
+
+def _length(v):
+    if v is None:
+        return None
+    if isinstance(v, PathRef):
+        return len(v.rels)
+    return len(v)
+
+
+def _substring(s, start, length=None):
+    if s is None:
+        return None
+    return s[start:] if length is None else s[start:start + length]
+
+
+FUNCTIONS: Dict[str, Callable] = {
+    "size": _size,
+    "length": _length,
+    "tolower": lambda s: None if s is None else s.lower(),
+    "toupper": lambda s: None if s is None else s.upper(),
+    "tostring": _to_string,
+    "tointeger": _to_integer,
+    "toint": _to_integer,
+    "tofloat": _to_float,
+    "round": _round,
+    "abs": lambda v: None if v is None else abs(v),
+    "ceil": lambda v: None if v is None else float(math.ceil(v)),
+    "floor": lambda v: None if v is None else float(math.floor(v)),
+    "sqrt": lambda v: None if v is None else math.sqrt(v),
+    "substring": _substring,
+    "left": lambda s, n: None if s is None else s[:n],
+    "right": lambda s, n: None if s is None else (s[-n:] if n else ""),
+    "trim": lambda s: None if s is None else s.strip(),
+    "ltrim": lambda s: None if s is None else s.lstrip(),
+    "rtrim": lambda s: None if s is None else s.rstrip(),
+    "split": lambda s, d: None if s is None or d is None else s.split(d),
+    "replace": lambda s, a, b: None if s is None else s.replace(a, b),
+    "reverse": lambda v: None if v is None else v[::-1],
+    "head": lambda v: v[0] if v else None,
+    "last": lambda v: v[-1] if v else None,
+    "tail": lambda v: None if v is None else v[1:],
+    "range": lambda a, b, step=1: list(range(a, b + (1 if step > 0 else -1), step)),
+    "coalesce": lambda *args: next((a for a in args if a is not None), None),
+    # 그래프 함수는 컨텍스트 필요 → Compiler 에서 처리
+    "nodes": None, "relationships": None, "labels": None, "type": None, "id": None,
+    "keys": None, "properties": None, "startnode": None, "endnode": None, "exists": None,
+}
+
+
+# ============================================================
+# 컴파일러 (Expr → fn(env))
+# ============================================================
+
+class Compiler:
+    def __init__(self, snapshot: GraphSnapshot, params: Dict[str, Any]):
+        self.snap = snapshot
+        self.params = params
+
+    def property(self, target, name):
+        if target is None:
+            return None
+        if isinstance(target, NodeRef):
+            return self.snap.get(target.n, name)
+        if isinstance(target, dict):
+            return target.get(name)
+        if isinstance(target, RelRef):
+            return None
+        raise CypherError(f"속성 접근 불가: {type(target).__name__}.{name}")
+
+    def compile(self, e: Expr, agg_slots: Optional[Dict[int, int]] = None) -> Callable[[dict], Any]:
+        """agg_slots: 집계 식 id → 그룹 결과 슬롯 (env['  agg'][slot])"""
+        c = lambda sub: self.compile(sub, agg_slots)  # noqa: E731
+        kind, args = e.kind, e.args
+
+        if kind == "lit":
+            value = args[0]
+            return lambda env: value
+        if kind == "param":
+            name = args[0]
+            if name not in self.params:
+                raise CypherError(f"파라미터 없음: ${name}")
+            value = self.params[name]
+            return lambda env: value
+        if kind == "var":
+            name = args[0]
+
+            def var(env):
+                try:
+                    return env[name]
+                except KeyError:
+                    raise CypherError(f"정의되지 않은 변수: {name}")
+            return var
+        if kind == "prop":
+            target, name = c(args[0]), args[1]
+            return lambda env: self.property(target(env), name)
+        if kind == "index":
+            target, index = c(args[0]), c(args[1])
+
+            def idx(env):
+                t, i = target(env), index(env)
+                if t is None or i is None:
+                    return None
+                if isinstance(t, dict) or isinstance(i, str):
+                    return self.property(t, i)
+                try:
+                    return t[i]
+                except IndexError:
+                    return None
+            return idx
+        if kind == "slice":
+            target = c(args[0])
+            lo = c(args[1]) if args[1] is not None else (lambda env: None)
+            hi = c(args[2]) if args[2] is not None else (lambda env: None)
+
+            def slc(env):
+                t = target(env)
+                return None if t is None else t[lo(env):hi(env)]
+            return slc
+        if kind == "labels":
+            target, labels = c(args[0]), args[1]
+
+            def has_labels(env):
+                t = target(env)
+                if t is None:
+                    return None
+                return all(self.snap.has_label(t.n, label) for label in labels)
+            return has_labels
+        if kind == "and":
+            a, b = c(args[0]), c(args[1])
+
+            def and_(env):
+                left = a(env)
+                if left is False:
+                    return False
+                return _and(left, b(env))
+            return and_
+        if kind == "or":
+            a, b = c(args[0]), c(args[1])
+
+            def or_(env):
+                left = a(env)
+                if left is True:
+                    return True
+                return _or(left, b(env))
+            return or_
+        if kind == "xor":
+            a, b = c(args[0]), c(args[1])
+
+            def xor(env):
+                x, y = a(env), b(env)
+                return None if x is None or y is None else x != y
+            return xor
+        if kind == "not":
+            a = c(args[0])
+
+            def not_(env):
+                v = a(env)
+                return None if v is None else not v
+            return not_
+        if kind == "cmp":
+            op, a, b = args[0], c(args[1]), c(args[2])
+            return lambda env: _compare(op, a(env), b(env))
+        if kind == "in":
+            a, b = c(args[0]), c(args[1])
+            return lambda env: _in(a(env), b(env))
+        if kind == "str":
+            op, a, b = args[0], c(args[1]), c(args[2])
+
+            def string_op(env):
+                x, y = a(env), b(env)
+                if not isinstance(x, str) or not isinstance(y, str):
+                    return None
+                return (y in x) if op == "contains" else (x.startswith(y) if op == "starts" else x.endswith(y))
+            return string_op
+        if kind == "isnull":
+            negate, a = args[0], c(args[1])
+            return (lambda env: a(env) is not None) if negate else (lambda env: a(env) is None)
+        if kind == "arith":
+            op, a, b = args[0], c(args[1]), c(args[2])
+            return lambda env: _arith(op, a(env), b(env))
+        if kind == "neg":
+            a = c(args[0])
+            return lambda env: None if a(env) is None else -a(env)
+        if kind == "list":
+            items = [c(item) for item in args[0]]
+            return lambda env: [item(env) for item in items]
+        if kind == "map":
+            items = [(key, c(value)) for key, value in args[0]]
+            return lambda env: {key: value(env) for key, value in items}
+        if kind == "comp":
+            var, source = args[0], c(args[1])
+            cond = c(args[2]) if args[2] is not None else None
+            mapped = c(args[3]) if args[3] is not None else None
+
+            def comprehension(env):
+                values = source(env)
+                if values is None:
+                    return None
+                out = []
+                inner = dict(env)
+                for v in values:
+                    inner[var] = v
+                    if cond is not None and cond(inner) is not True:
+                        continue
+                    out.append(mapped(inner) if mapped is not None else v)
+                return out
+            return comprehension
+        if kind == "case":
+            subject = c(args[0]) if args[0] is not None else None
+            branches = [(c(cond), c(value)) for cond, value in args[1]]
+            default = c(args[2]) if args[2] is not None else (lambda env: None)
+
+            def case(env):
+                if subject is not None:
+                    s = subject(env)
+                    for cond, value in branches:
+                        if _equals(s, cond(env)):
+                            return value(env)
+                else:
+                    for cond, value in branches:
+                        if cond(env) is True:
+                            return value(env)
+                return default(env)
+            return case
+        if kind == "agg":
+            if agg_slots is None or id(e) not in agg_slots:
+                raise CypherError(f"집계 함수는 WITH/RETURN 에서만 사용: {e.text}")
+            slot = agg_slots[id(e)]
+            return lambda env: env["  agg"][slot]
+        if kind == "call":
+            return self.compile_call(args[0], [c(a) for a in args[1]], args[1])
+        raise CypherError(f"알 수 없는 식: {kind}")
+
+    def compile_call(self, name: str, fns: List[Callable], raw: Sequence[Expr]):
+        snap = self.snap
+        if name == "exists":
+            if len(raw) != 1 or raw[0].kind != "prop":
+                raise CypherUnsupported("exists() 는 속성 인자만 지원")
+            f = fns[0]
+            return lambda env: f(env) is not None
+        graph = {
+            "nodes": lambda v: None if v is None else list(v.nodes),
+            "relationships": lambda v: None if v is None else list(v.rels),
+            "labels": lambda v: None if v is None else list(snap.labels(v.n)),
+            "type": lambda v: None if v is None else v.type,
+            "id": lambda v: None if v is None else (v.n if isinstance(v, NodeRef) else None),
+            "keys": lambda v: None if v is None else list(self.to_value(v).keys()),
+            "properties": lambda v: None if v is None else self.to_value(v),
+            "startnode": lambda v: None if v is None else NodeRef(v.start),
+            "endnode": lambda v: None if v is None else NodeRef(v.end),
+        }
+        fn = graph.get(name) or FUNCTIONS[name]
+        if len(fns) == 1:
+            f0 = fns[0]
+            return lambda env: fn(f0(env))
+        return lambda env: fn(*[f(env) for f in fns])
+
+    def to_value(self, v):
+        """결과 출력용 변환 (노드 → 속성 dict, 경로 → 노드 dict 목록)"""
+        if isinstance(v, NodeRef):
+            return self.snap.properties(v.n)
+        if isinstance(v, RelRef):
+            return {}
+        if isinstance(v, PathRef):
+            return [self.snap.properties(n.n) for n in v.nodes]
+        if isinstance(v, list):
+            return [self.to_value(x) for x in v]
+        if isinstance(v, dict):
+            return {k: self.to_value(x) for k, x in v.items()}
+        return v
+
+
+# ============================================================
+# 정렬 (Cypher ORDER BY: null 은 오름차순에서 마지막)
+# ============================================================
+
+def _type_rank(v):
+    if v is None:
+        return 9
+    if isinstance(v, bool):
+        return 3
+    if _num(v):
+        return 4
+    if isinstance(v, str):
+        return 2
+    if isinstance(v, list):
+        return 1
+    return 0
+
+
+def _sort_key(v):
+    rank = _type_rank(v)
+    if rank in (2, 3, 4):
+        return (rank, v)
+    if rank == 1:
+        return (rank, tuple(_sort_key(x) for x in v))
+    if isinstance(v, NodeRef):
+        return (rank, v.n)
+    return (rank, 0)
+
+
+def sort_rows(rows: list, keys: List[Tuple[Callable, bool]]):
+    for key_fn, desc in reversed(keys):
+        rows.sort(key=lambda r: _sort_key(key_fn(r)), reverse=desc)
+
+
+# ============================================================
+# 실행기
+# ============================================================
+
+def _conjuncts(e: Optional[Expr]) -> List[Expr]:
+    if e is None:
+        return []
+    if e.kind == "and":
+        return _conjuncts(e.args[0]) + _conjuncts(e.args[1])
+    return [e]
+
+
+class Executor:
+    def __init__(self, snapshot: GraphSnapshot, params: Optional[Dict[str, Any]] = None):
+        self.snap = snapshot
+        self.compiler = Compiler(snapshot, params or {})
+
+    def run(self, query: str) -> List[dict]:
+        clauses = Parser(query).parse()
+        rows: List[dict] = [{}]
+        columns: List[str] = []
+        for clause in clauses:
+            kind = clause[0]
+            if kind == "MATCH":
+                rows = self.match(rows, *clause[1:])
+            elif kind == "UNWIND":
+                rows = self.unwind(rows, clause[1], clause[2])
+            elif kind == "WITH":
+                rows, columns = self.project(rows, clause[1])
+            elif kind == "RETURN":
+                rows, columns = self.project(rows, clause[1])
+        return [{col: self.compiler.to_value(row.get(col)) for col in columns} for row in rows]
+
+    # -- UNWIND --
+    def unwind(self, rows, expr, alias):
+        fn = self.compiler.compile(expr)
+        out = []
+        for row in rows:
+            values = fn(row)
+            if values is None:
+                continue
+            for v in (values if isinstance(values, list) else [values]):
+                new = dict(row)
+                new[alias] = v
+                out.append(new)
+        return out
+
+    # -- MATCH --
+    def match(self, rows, optional: bool, patterns: List[PathPattern], where: Optional[Expr]):
+        if not rows:
+            return rows
+        bound = set(rows[0].keys())
+        conjuncts = _conjuncts(where)
+        plan = self.plan(patterns, bound, conjuncts)
+        new_vars = [v for v in plan.new_vars if not v.startswith("  ")]
+
+        out = []
+        for row in rows:
+            matched = False
+            for env in plan.execute(row):
+                matched = True
+                out.append({k: v for k, v in env.items() if not k.startswith("  ")})
+            if optional and not matched:
+                new = dict(row)
+                for var in new_vars:
+                    new.setdefault(var, None)
+                out.append(new)
+        return out
+
+    def plan(self, patterns, bound, conjuncts) -> "MatchPlan":
+        return MatchPlan(self, patterns, bound, conjuncts)
+
+    # -- WITH / RETURN --
+    def project(self, rows: List[dict], proj: Projection):
+        compiler = self.compiler
+        items = list(proj.items)
+        if proj.star:
+            visible = [k for k in (rows[0].keys() if rows else []) if not k.startswith("  ")]
+            items = [(Expr("var", (k,), k), k) for k in visible] + items
+
+        aggregating = any(expr.aggregate for expr, _ in items)
+        columns = [alias for _, alias in items]
+
+        if aggregating:
+            out = self.aggregate(rows, items)
+        else:
+            fns = [(compiler.compile(expr), alias) for expr, alias in items]
+            out = []
+            for row in rows:
+                projected = {alias: fn(row) for fn, alias in fns}
+                out.append((row, projected))
+
+        if proj.distinct:
+            seen, unique = set(), []
+            for source, projected in out:
+                key = tuple(freeze(projected[c]) for c in columns)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append((source, projected))
+            out = unique
+
+        if proj.order:
+            keys = []
+            texts = {" ".join(expr.text.split()): alias for expr, alias in items}
+            for expr, desc in proj.order:
+                alias = texts.get(" ".join(expr.text.split()))
+                if alias is not None:
+                    keys.append(((lambda a: lambda pair: pair[1][a])(alias), desc))
+                else:
+                    fn = compiler.compile(expr)
+                    if aggregating or proj.distinct:
+                        keys.append(((lambda f: lambda pair: f(pair[1]))(fn), desc))
+                    else:
+                        keys.append(((lambda f: lambda pair: f({**pair[0], **pair[1]}))(fn), desc))
+            sort_rows(out, keys)
+
+        if proj.skip is not None:
+            out = out[int(compiler.compile(proj.skip)({})):]
+        if proj.limit is not None:
+            out = out[:int(compiler.compile(proj.limit)({}))]
+
+        result = [projected for _, projected in out]
+        if proj.where is not None:
+            cond = compiler.compile(proj.where)
+            result = [row for row in result if cond(row) is True]
+        return result, columns
+
+    def aggregate(self, rows: List[dict], items):
+        compiler = self.compiler
+        agg_exprs: List[Expr] = []
+
+        def collect_aggs(e):
+            if not isinstance(e, Expr):
+                return
+            if e.kind == "agg":
+                agg_exprs.append(e)
+                return
+            for arg in e.args:
+                if isinstance(arg, Expr):
+                    collect_aggs(arg)
+                elif isinstance(arg, (list, tuple)):
+                    for sub in arg:
+                        for x in (sub if isinstance(sub, tuple) else (sub,)):
+                            collect_aggs(x)
+
+        keys, values = [], []
+        for expr, alias in items:
+            if expr.aggregate:
+                collect_aggs(expr)
+                values.append((expr, alias))
+            else:
+                keys.append((compiler.compile(expr), alias))
+
+        slots = {id(e): i for i, e in enumerate(agg_exprs)}
+        agg_fns = [(e.args[0], e.args[1], compiler.compile(e.args[2]) if e.args[2] is not None else None)
+                   for e in agg_exprs]
+        value_fns = [(compiler.compile(expr, slots), alias) for expr, alias in values]
+
+        groups: Dict[tuple, list] = {}
+        for row in rows:
+            key_values = [(alias, fn(row)) for fn, alias in keys]
+            group_key = tuple(freeze(v) for _, v in key_values)
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = [dict(key_values), [_Accumulator(name, distinct) for name, distinct, _ in agg_fns]]
+            for acc, (_, _, fn) in zip(group[1], agg_fns):
+                acc.add(fn(row) if fn is not None else True)
+
+        # 그룹 키가 없으면 입력이 비어도 1행 (count(*) = 0)
+        if not groups and not keys:
+            groups[()] = [{}, [_Accumulator(name, distinct) for name, distinct, _ in agg_fns]]
+
+        out = []
+        for key_env, accumulators in groups.values():
+            env = dict(key_env)
+            env["  agg"] = [acc.result() for acc in accumulators]
+            projected = dict(key_env)
+            for fn, alias in value_fns:
+                projected[alias] = fn(env)
+            ordered = {alias: projected[alias] for _, alias in items}
+            out.append((env, ordered))
+        return out
+
+
+class _Accumulator:
+    __slots__ = ("name", "distinct", "values", "seen")
+
+    def __init__(self, name: str, distinct: bool):
+        self.name, self.distinct = name, distinct
+        self.values = []
+        self.seen = set() if distinct else None
+
+    def add(self, value):
+        if value is None:
+            return
+        if self.distinct:
+            key = freeze(value)
+            if key in self.seen:
+                return
+            self.seen.add(key)
+        self.values.append(value)
+
+    def result(self):
+        values = self.values
+        if self.name == "count":
+            return len(values)
+        if self.name == "collect":
+            return list(values)
+        if not values:
+            return 0 if self.name == "sum" else None
+        if self.name == "sum":
+            return sum(values)
+        if self.name == "avg":
+            return sum(values) / len(values)
+        if self.name == "min":
+            return min(values, key=_sort_key)
+        if self.name == "max":
+            return max(values, key=_sort_key)
+        raise CypherError(self.name)
+
+
+# ============================================================
+# MATCH 계획 / 실행
+# ============================================================
+
+class MatchPlan:
+    """
+    패턴별 시작 노드(앵커)를 고르고 좌우로 확장하는 단계 목록.
+    WHERE 의 AND 항은 필요한 변수가 모두 바인딩되는 즉시 검사한다.
+    """
+
+    def __init__(self, executor: Executor, patterns: List[PathPattern], bound: Set[str], conjuncts: List[Expr]):
+        self.snap = executor.snap
+        self.compiler = executor.compiler
+        self.patterns = patterns
+        self.steps: List[tuple] = []
+        self.new_vars: List[str] = []
+
+        known = set(bound)
+        pending = list(conjuncts)
+        checks_at: Dict[int, List[Callable]] = {}
+
+        def schedule():
+            ready = [e for e in pending if e.vars <= known]
+            for e in ready:
+                pending.remove(e)
+            if ready:
+                checks_at.setdefault(len(self.steps), []).extend(self.compiler.compile(e) for e in ready)
+
+        schedule()
+        for p_index, pattern in enumerate(patterns):
+            nodes, rels = pattern.nodes, pattern.rels
+            anchor = self.choose_anchor(nodes, known, conjuncts)
+            self.add_node_step(p_index, anchor, nodes[anchor], known, first=True, conjuncts=conjuncts)
+            schedule()
+            for i in range(anchor, len(rels)):
+                self.add_hop(p_index, i, nodes[i], rels[i], nodes[i + 1], forward=True, known=known)
+                schedule()
+            for i in range(anchor - 1, -1, -1):
+                self.add_hop(p_index, i, nodes[i + 1], rels[i], nodes[i], forward=False, known=known)
+                schedule()
+            if pattern.var:
+                self.steps.append(("path", p_index, pattern))
+                self.new_vars.append(pattern.var)
+                known.add(pattern.var)
+                schedule()
+
+        # 남은 조건 (알 수 없는 변수 참조 포함) 은 마지막에
+        if pending:
+            checks_at.setdefault(len(self.steps), []).extend(self.compiler.compile(e) for e in pending)
+        self.checks_at = checks_at
+
+    # -- 계획 --
+    def candidates_estimate(self, node: NodePattern, known: Set[str], conjuncts: List[Expr]) -> Tuple[int, Optional[tuple]]:
+        """(예상 후보 수, 조회 방법)"""
+        snap = self.snap
+        if node.var in known:
+            return 0, ("bound",)
+        label = node.labels[0] if node.labels else None
+        for prop, expr in node.props.items():
+            if not expr.vars - known and label:
+                return 1, ("lookup", label, prop, expr, False)
+        for e in conjuncts:
+            # var.prop = <상수/바인딩된 식>  |  var.prop IN <리스트>
+            if e.kind == "cmp" and e.args[0] == "=":
+                for left, right in ((e.args[1], e.args[2]), (e.args[2], e.args[1])):
+                    if (left.kind == "prop" and left.args[0].kind == "var" and left.args[0].args[0] == node.var
+                            and not right.vars - known and label):
+                        return 2, ("lookup", label, left.args[1], right, False)
+            if e.kind == "in":
+                left, right = e.args
+                if (left.kind == "prop" and left.args[0].kind == "var" and left.args[0].args[0] == node.var
+                        and not right.vars - known and label):
+                    return 3, ("lookup", label, left.args[1], right, True)
+        if label:
+            size = min(len(snap.nodes(lbl)) for lbl in node.labels)
+            best = min(node.labels, key=lambda lbl: len(snap.nodes(lbl)))
+            return 10 + size, ("label", best)
+        return 10 + len(snap), ("all",)
+
+    def choose_anchor(self, nodes: List[NodePattern], known: Set[str], conjuncts) -> int:
+        estimates = [self.candidates_estimate(n, known, conjuncts)[0] for n in nodes]
+        return min(range(len(nodes)), key=lambda i: estimates[i])
+
+    def add_node_step(self, p_index, index, node: NodePattern, known, first, conjuncts):
+        _, method = self.candidates_estimate(node, known, conjuncts)
+        check = self.node_check(node)
+        self.steps.append(("anchor", p_index, index, node.var, method, check))
+        if node.var not in known:
+            self.new_vars.append(node.var)
+            known.add(node.var)
+
+    def node_check(self, node: NodePattern) -> Callable[[int, dict], bool]:
+        labels = node.labels
+        props = [(name, self.compiler.compile(expr)) for name, expr in node.props.items()]
+        snap = self.snap
+
+        def check(n: int, env: dict) -> bool:
+            for label in labels:
+                if not snap.has_label(n, label):
+                    return False
+            for name, fn in props:
+                if _equals(snap.get(n, name), fn(env)) is not True:
+                    return False
+            return True
+        return check
+
+    def add_hop(self, p_index, r_index, from_node, rel: RelPattern, to_node, forward: bool, known):
+        if rel.var in known and not rel.var.startswith("  "):
+            raise CypherUnsupported(f"이미 바인딩된 관계 변수 재사용: {rel.var}")
+        if rel.props:
+            raise CypherUnsupported("관계 속성 조건 미지원 (관계 속성 없음)")
+        direction = rel.direction
+        if not forward and direction != "both":
+            direction = "in" if direction == "out" else "out"
+        types = rel.types or list(self.snap.out_edges)
+        check = self.node_check(to_node)
+        self.steps.append(("hop", p_index, r_index, from_node.var, rel, types, direction, to_node.var, check, forward))
+        for var in (rel.var, to_node.var):
+            if var not in known:
+                self.new_vars.append(var)
+                known.add(var)
+
+    # -- 실행 --
+    def execute(self, row: dict) -> Iterator[dict]:
+        env = dict(row)
+        used: Set[tuple] = set()
+        trace: Dict[tuple, Any] = {}
+        yield from self._run(0, env, used, trace)
+
+    def _checks(self, step_index: int, env: dict) -> bool:
+        for fn in self.checks_at.get(step_index, ()):
+            if fn(env) is not True:
+                return False
+        return True
+
+    def _run(self, k: int, env: dict, used: Set[tuple], trace: dict) -> Iterator[dict]:
+        if not self._checks(k, env):
+            return
+        if k == len(self.steps):
+            yield dict(env)
+            return
+        step = self.steps[k]
+        kind = step[0]
+
+        if kind == "anchor":
+            _, p_index, index, var, method, check = step
+            for n in self._anchor_candidates(var, method, env):
+                if not check(n, env):
+                    continue
+                previous = env.get(var, _MISSING)
+                env[var] = NodeRef(n)
+                trace[(p_index, "n", index)] = NodeRef(n)
+                yield from self._run(k + 1, env, used, trace)
+                if previous is _MISSING:
+                    del env[var]
+                else:
+                    env[var] = previous
+            return
+
+        if kind == "hop":
+            _, p_index, r_index, from_var, rel, types, direction, to_var, check, forward = step
+            source = env.get(from_var)
+            if source is None:
+                return
+            target_bound = env.get(to_var, _MISSING)
+            if target_bound is None:
+                return
+            for end, rels, inner in self._expand(source.n, rel, types, direction, used):
+                if target_bound is not _MISSING and target_bound.n != end:
+                    continue
+                if not check(end, env):
+                    continue
+                keys = [r.key() for r in rels]
+                for key in keys:
+                    used.add(key)
+                previous_rel = env.get(rel.var, _MISSING)
+                if rel.var_length:
+                    ordered = rels if forward else list(reversed(rels))
+                    env[rel.var] = ordered
+                    trace[(p_index, "r", r_index)] = (ordered, inner if forward else list(reversed(inner)))
+                else:
+                    env[rel.var] = rels[0]
+                    trace[(p_index, "r", r_index)] = ([rels[0]], [])
+                env[to_var] = NodeRef(end)
+                trace[(p_index, "n", r_index + 1 if forward else r_index)] = NodeRef(end)
+                yield from self._run(k + 1, env, used, trace)
+                for key in keys:
+                    used.discard(key)
+                if target_bound is _MISSING:
+                    del env[to_var]
+                if previous_rel is _MISSING:
+                    env.pop(rel.var, None)
+                else:
+                    env[rel.var] = previous_rel
+            return
+
+        if kind == "path":
+            _, p_index, pattern = step
+            nodes = [trace[(p_index, "n", 0)]]
+            rels = []
+            for i in range(len(pattern.rels)):
+                rel_list, inner = trace[(p_index, "r", i)]
+                rels.extend(rel_list)
+                nodes.extend(inner)
+                nodes.append(trace[(p_index, "n", i + 1)])
+            env[pattern.var] = PathRef(nodes, rels)
+            yield from self._run(k + 1, env, used, trace)
+            del env[pattern.var]
+
+    def _anchor_candidates(self, var, method, env) -> Sequence[int]:
+        kind = method[0]
+        if kind == "bound":
+            value = env.get(var)
+            if value is None:
+                return []
+            if not isinstance(value, NodeRef):
+                raise CypherError(f"{var} 는 노드가 아님")
+            return [value.n]
+        if kind == "lookup":
+            _, label, prop, expr, is_list = method
+            value = self.compiler.compile(expr)(env)
+            table = self.snap.lookup(label, prop)
+            if is_list:
+                if not isinstance(value, list):
+                    return []
+                seen = {}
+                for v in value:
+                    for n in table.get(freeze(v), []) if v is not None else []:
+                        seen[n] = None
+                return list(seen)
+            if value is None:
+                return []
+            if isinstance(value, list):
+                # 배열 속성 동등 비교는 원소 lookup 후 node_check/WHERE 에서 확인
+                candidates = table.get(value[0], []) if value else []
+                return [n for n in candidates if self.snap.get(n, prop) == value]
+            return [n for n in table.get(value, []) if not isinstance(self.snap.get(n, prop), list)]
+        if kind == "label":
+            return self.snap.nodes(method[1])
+        return range(len(self.snap))
+
+    def _expand(self, start: int, rel: RelPattern, types, direction, used) -> Iterator[Tuple[int, List[RelRef], List[NodeRef]]]:
+        """(끝 노드, 관계 목록(탐색 순서), 중간 노드 목록)"""
+        snap = self.snap
+
+        def step(n):
+            for rel_type in types:
+                if direction in ("out", "both"):
+                    for t in snap.out(rel_type, n):
+                        yield t, RelRef(rel_type, n, t)
+                if direction in ("in", "both"):
+                    for s in snap.in_(rel_type, n):
+                        if direction == "both" and s == n:
+                            continue
+                        yield s, RelRef(rel_type, s, n)
+
+        if not rel.var_length:
+            for end, r in step(start):
+                if r.key() not in used:
+                    yield end, [r], []
+            return
+
+        max_hops = rel.max_hops if rel.max_hops is not None else len(snap)
+        path_rels: List[RelRef] = []
+        path_nodes: List[int] = []
+        local: Set[tuple] = set()
+
+        def dfs(n, depth):
+            if depth >= rel.min_hops:
+                yield n, list(path_rels), [NodeRef(m) for m in path_nodes[:-1]] if path_nodes else []
+            if depth == max_hops:
+                return
+            for nxt, r in step(n):
+                key = r.key()
+                if key in used or key in local:
+                    continue
+                local.add(key)
+                path_rels.append(r)
+                path_nodes.append(nxt)
+                yield from dfs(nxt, depth + 1)
+                path_nodes.pop()
+                path_rels.pop()
+                local.discard(key)
+
+        if rel.min_hops == 0:
+            raise CypherUnsupported("*0.. 가변 길이 미지원")
+        yield from dfs(start, 0)
+
+
+_MISSING = object()
+
+
+def execute(snapshot: GraphSnapshot, query: str, params: Optional[Dict[str, Any]] = None) -> List[dict]:
+    """Cypher 부분집합 실행 → 레코드(dict) 목록"""
+    return Executor(snapshot, params).run(query)
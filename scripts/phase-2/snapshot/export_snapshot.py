@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+JSON-LD → 그래프 스냅샷 내보내기
+
+ontology/output/instances/phase-2 의 JSON-LD(샤드 포함)를 읽어
+graph_snapshot.GraphSnapshot 형식(열 저장 속성 + 관계 타입별 CSR)으로 저장한다.
+Neo4j 없이 CQ 조회/회귀 테스트에 사용한다.
+
+load_cypher.py / load_unwind.py / export_csv.py 와 같은 그래프 (graph_mapping.py 매핑):
+- 관계 키는 tdoc: 접두사 / 접두사 없는 표기 모두 읽음 (graph_mapping.item_refs, load_cypher 의 coalesce 와 같음)
+- 같은 @id 노드는 마지막 값
+- 대상 노드가 없는 관계는 제외, 중복 관계는 1개
+
+Phase-3 Resolution JSON-LD 가 있으면 01_load_decisions.py 와 같은 모양으로 함께 넣는다:
+- Resolution + 하위 라벨 (Agreement / Conclusion / WorkingAssumption)
+- MADE_AT, REFERENCES, RESOLUTION_BELONGS_TO (→ {meetingNumber, agendaNumber} AgendaItem)
+- Neo4j 에서 id 가 없는 노드는 '_:' 로 시작하는 내부 id 사용 (get('id') 는 None)
+
+출력: ontology/output/snapshot/phase-2/
+
+사용법:
+    python export_snapshot.py
+    python export_snapshot.py --input-dir <instances> --output-dir <snapshot>
+    python export_snapshot.py --no-phase3
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "neo4j"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "phase-3" / "neo4j"))
+
+from graph_snapshot import GraphSnapshot, SNAPSHOT_DIR
+from graph_mapping import (
+    INSTANCES_DIR, REFERENCE_NODES, TDOC_FILE, TDOC_PROPERTIES, RELATIONSHIPS,
+    item_refs, tdoc_labels, node_properties, iter_instances, instance_path,
+)
+
+decisions = importlib.import_module("01_load_decisions")
+
+
+def meeting_ids(meetings: dict) -> dict:
+    """canonicalMeetingNumber → Meeting @id 목록 (01_load_decisions.meeting_ids 와 같은 결과)"""
+    result = {}
+    for node_id, props in meetings.items():
+        if props.get("canonicalMeetingNumber") is not None:
+            result.setdefault(props["canonicalMeetingNumber"], []).append(node_id)
+    return result
+
+
+def add_resolutions(phase3_dir: Path, nodes: dict, extra_labels: dict, edges: dict, properties: dict):
+    """Phase-3 Resolution 노드/관계 추가"""
+    meetings = meeting_ids(nodes["Meeting"])
+    tdoc_numbers = {}
+    for node_id, props in nodes["Tdoc"].items():
+        number = props.get("tdocNumber")
+        for value in (number if isinstance(number, list) else [number]):
+            if value is not None:
+                tdoc_numbers.setdefault(value, []).append(node_id)
+
+    resolutions = {}
+    agendas = nodes["AgendaItem"]
+    properties["AgendaItem"] = list(dict.fromkeys(properties["AgendaItem"] + decisions.AGENDA_ITEM_PROPERTIES))
+    properties["Resolution"] = decisions.RESOLUTION_PROPERTIES
+    pairs = {"MADE_AT": {}, "RESOLUTION_BELONGS_TO": {}, "REFERENCES": {}}
+
+    for resolution_type, filename in decisions.RESOLUTION_FILES:
+        path = phase3_dir / filename
+        if not path.exists():
+            print(f"  ⚠️ {filename} 없음 - 건너뜀")
+            continue
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f).get("@graph", [])
+        rows = decisions.flatten_resolutions(items, meetings)
+
+        for row in rows["nodes"]:
+            node_id = f"_:resolution/{row['resolutionId']}"
+            if resolution_type != "Conclusion":
+                row = dict(row, hasConsensus=None,
+                           hasFFS=row["hasFFS"] or False, hasTBD=row["hasTBD"] or False)
+            else:
+                row = dict(row, hasFFS=None, hasTBD=None)
+            resolutions[node_id] = row
+            extra_labels[node_id] = (resolution_type,)
+        for row in rows["made_at"]:
+            pairs["MADE_AT"][(f"_:resolution/{row['resolutionId']}", row["meetingId"])] = None
+        for row in rows["belongs_to"]:
+            agenda_id = f"_:agenda/{row['meetingNumber']}-{row['agendaNumber']}"
+            agendas.setdefault(agenda_id, {"meetingNumber": row["meetingNumber"], "agendaNumber": row["agendaNumber"]})
+            pairs["RESOLUTION_BELONGS_TO"][(f"_:resolution/{row['resolutionId']}", agenda_id)] = None
+        for row in rows["references"]:
+            for tdoc_id in tdoc_numbers.get(row["tdocNumber"], []):
+                pairs["REFERENCES"][(f"_:resolution/{row['resolutionId']}", tdoc_id)] = None
+        print(f"  {resolution_type}: {len(rows['nodes']):,}")
+
+    if resolutions:
+        nodes["Resolution"] = resolutions
+        for rel_type, found in pairs.items():
+            edges[rel_type] = list(found)
+            print(f"  {rel_type}: {len(found):,}")
+
+
+def build_snapshot(instances_dir: Path, phase3_dir: Path = None) -> GraphSnapshot:
+    nodes, properties, extra_labels = {}, {}, {}
+
+    print("\n[1/3] Reference 노드...")
+    for label, filename, mapping in REFERENCE_NODES:
+        properties[label] = [name for name, _ in mapping.values()]
+        nodes[label] = {}
+        if instance_path(filename, instances_dir) is None:
+            print(f"  ⚠️ {filename} 없음 - 건너뜀")
+            continue
+        for item in iter_instances(filename, instances_dir):
+            nodes[label][item["@id"]] = node_properties(item, mapping)
+        print(f"  {label}: {len(nodes[label]):,}")
+
+    print("\n[2/3] Tdoc 노드...")
+    tdocs = {}
+    for item in iter_instances(TDOC_FILE, instances_dir):
+        tdocs[item["@id"]] = item
+    properties["Tdoc"] = [name for name, _ in TDOC_PROPERTIES.values()]
+    nodes["Tdoc"] = {node_id: node_properties(item, TDOC_PROPERTIES) for node_id, item in tdocs.items()}
+    for node_id, item in tdocs.items():
+        labels = tuple(tdoc_labels(item)[1:])
+        if labels:
+            extra_labels[node_id] = labels
+    print(f"  Tdoc/CR/LS: {len(tdocs):,}")
+
+    print("\n[3/3] 관계...")
+    edges = {}
+    for prop, rel_type, target_label in RELATIONSHIPS:
+        targets = nodes[target_label]
+        pairs = {}
+        for source_id, item in tdocs.items():
+            for ref in item_refs(item, prop):
+                if ref in targets:
+                    pairs[(source_id, ref)] = None
+        edges[rel_type] = list(pairs)
+        print(f"  {rel_type}: {len(pairs):,}")
+
+    if phase3_dir is not None and phase3_dir.exists():
+        print("\n[+] Phase-3 Resolution...")
+        add_resolutions(phase3_dir, nodes, extra_labels, edges, properties)
+
+    return GraphSnapshot.build(nodes, extra_labels, edges, properties)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON-LD → 그래프 스냅샷")
+    parser.add_argument('--input-dir', type=Path, default=INSTANCES_DIR, help='JSON-LD 인스턴스 디렉토리')
+    parser.add_argument('--output-dir', type=Path, default=SNAPSHOT_DIR, help='스냅샷 출력 디렉토리')
+    parser.add_argument('--phase3-dir', type=Path, default=decisions.INSTANCES_DIR,
+                        help='Phase-3 Resolution JSON-LD 디렉토리')
+    parser.add_argument('--no-phase3', action='store_true', help='Phase-3 Resolution 제외')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("그래프 스냅샷 내보내기")
+    print("=" * 60)
+    start = time.time()
+
+    snapshot = build_snapshot(args.input_dir, None if args.no_phase3 else args.phase3_dir)
+    snapshot.save(args.output_dir, source=str(args.input_dir))
+
+    size = sum(p.stat().st_size for p in args.output_dir.rglob("*") if p.is_file())
+    rels = sum(snapshot.meta["relationships"].values())
+    print("\n" + "=" * 60)
+    print(f"노드 {len(snapshot):,}개, 관계 {rels:,}개 → {args.output_dir} "
+          f"({size / 1024 / 1024:.1f} MB, {time.time() - start:.1f}s)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
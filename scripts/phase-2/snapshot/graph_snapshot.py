@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+그래프 스냅샷 (Neo4j 서버 없이 CQ 조회)
+
+export_snapshot.py 가 ontology JSON-LD 에서 만든 디스크 스냅샷을 읽어
+load_cypher.py 와 같은 그래프(라벨/속성/관계 타입)를 프로세스 안에서 조회한다.
+
+형식 (ontology/output/snapshot/phase-2/):
+- snapshot.json            메타데이터 (라벨 블록, 라벨 조합, 관계 타입, 바이트 순서)
+- ids.json.gz              노드 번호 → @id
+- node_labels.i32          노드 번호 → 라벨 조합 번호
+- columns/<Label>.json.gz  라벨 블록별 열 저장 속성 {속성: [값...]}
+- rels/<TYPE>.{out,in}.{offsets,targets}.i32
+                           관계 타입별 CSR 인접 배열 (정방향/역방향)
+
+노드는 라벨 블록(Meeting, ..., Tdoc) 순서로 0..N-1 번호를 가진다.
+CR/LS 는 Tdoc 블록 안의 추가 라벨(라벨 조합)로 표현한다.
+Phase-3 Resolution(+ 하위 라벨)은 마지막 블록이고, Neo4j 에서 id 속성이 없는 노드
+(Resolution, {meetingNumber, agendaNumber} AgendaItem)는 '_:' 내부 id 를 가진다.
+
+사용 예:
+    snap = GraphSnapshot.load()
+    tdocs = snap.tdocs_at("RAN1#120")
+    snap.count_by(tdocs, "SUBMITTED_BY", "companyName").most_common(5)
+    snap.revision_chain("R1-2400001")
+"""
+
+import gzip
+import json
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SNAPSHOT_VERSION = 1
+
+ONTOLOGY_DIR = Path(__file__).parent.parent.parent.parent / "ontology"
+SNAPSHOT_DIR = ONTOLOGY_DIR / "output" / "snapshot" / "phase-2"
+
+_INT = "i"  # int32 (array itemsize 4)
+INTERNAL_ID = "_:"  # id 속성으로 노출하지 않는 노드
+
+
+# ============================================================
+# 저장 헬퍼
+# ============================================================
+
+def _write_array(path: Path, values: array):
+    with open(path, 'wb') as f:
+        values.tofile(f)
+
+
+def _read_array(path: Path, swap: bool) -> array:
+    values = array(_INT)
+    with open(path, 'rb') as f:
+        values.frombytes(f.read())
+    if swap:
+        values.byteswap()
+    return values
+
+
+def _write_json_gz(path: Path, data):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_json_gz(path: Path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================
+# CSR 인접 배열
+# ============================================================
+
+class CSR:
+    """관계 타입 1개의 인접 배열: offsets[n]..offsets[n+1] 구간이 n 의 이웃"""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets: array, targets: array):
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_pairs(cls, node_count: int, pairs: Sequence[Tuple[int, int]]) -> "CSR":
+        """(시작, 끝) 쌍 → CSR (계수 정렬, 시작 노드별 입력 순서 유지)"""
+        offsets = array(_INT, [0]) * (node_count + 1)
+        for source, _ in pairs:
+            offsets[source + 1] += 1
+        for n in range(node_count):
+            offsets[n + 1] += offsets[n]
+
+        targets = array(_INT, [0]) * len(pairs)
+        cursor = array(_INT, offsets)
+        for source, target in pairs:
+            targets[cursor[source]] = target
+            cursor[source] += 1
+        return cls(offsets, targets)
+
+    def pairs(self) -> Iterable[Tuple[int, int]]:
+        offsets, targets = self.offsets, self.targets
+        for source in range(len(offsets) - 1):
+            for i in range(offsets[source], offsets[source + 1]):
+                yield source, targets[i]
+
+    def neighbors(self, n: int) -> array:
+        return self.targets[self.offsets[n]:self.offsets[n + 1]]
+
+    def degree(self, n: int) -> int:
+        return self.offsets[n + 1] - self.offsets[n]
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def save(self, prefix: Path):
+        _write_array(prefix.with_name(prefix.name + ".offsets.i32"), self.offsets)
+        _write_array(prefix.with_name(prefix.name + ".targets.i32"), self.targets)
+
+    @classmethod
+    def read(cls, prefix: Path, swap: bool) -> "CSR":
+        return cls(_read_array(prefix.with_name(prefix.name + ".offsets.i32"), swap),
+                   _read_array(prefix.with_name(prefix.name + ".targets.i32"), swap))
+
+
+# ============================================================
+# 스냅샷
+# ============================================================
+
+class GraphSnapshot:
+    """열 저장 속성 + 관계 타입별 CSR 로 구성된 읽기 전용 그래프"""
+
+    def __init__(self, ids: List[str], label_sets: List[Tuple[str, ...]], node_labels: array,
+                 blocks: Dict[str, Tuple[int, int]], columns: Dict[str, Dict[str, list]],
+                 out_edges: Dict[str, CSR], in_edges: Dict[str, CSR], meta: Optional[dict] = None):
+        self.ids = ids
+        self.label_sets = label_sets
+        self.node_labels = node_labels
+        self.blocks = blocks
+        self.columns = columns
+        self.out_edges = out_edges
+        self.in_edges = in_edges
+        self.meta = meta or {}
+        self._index: Optional[Dict[str, int]] = None
+        self._lookups: Dict[Tuple[str, str], Dict[object, List[int]]] = {}
+
+    # --------------------------------------------------------
+    # 생성 / 저장 / 로드
+    # --------------------------------------------------------
+
+    @classmethod
+    def build(cls, nodes: Dict[str, Dict[str, dict]], extra_labels: Dict[str, Tuple[str, ...]],
+              edges: Dict[str, List[Tuple[str, str]]], properties: Dict[str, List[str]]) -> "GraphSnapshot":
+        """
+        nodes: {라벨: {@id: 속성 dict}} (라벨 블록 순서 = dict 순서)
+        extra_labels: {@id: 추가 라벨} (CR/LS)
+        edges: {관계 타입: [(시작 @id, 끝 @id)]} (대상이 있는 중복 없는 쌍)
+        properties: {라벨: [속성명...]} (열 순서)
+        """
+        ids: List[str] = []
+        blocks: Dict[str, Tuple[int, int]] = {}
+        columns: Dict[str, Dict[str, list]] = {}
+        label_sets: List[Tuple[str, ...]] = []
+        label_codes: Dict[Tuple[str, ...], int] = {}
+        node_labels = array(_INT)
+
+        for label, records in nodes.items():
+            start = len(ids)
+            names = properties[label]
+            block = {name: [] for name in names}
+            for node_id, props in records.items():
+                ids.append(node_id)
+                labels = (label,) + extra_labels.get(node_id, ())
+                if labels not in label_codes:
+                    label_codes[labels] = len(label_sets)
+                    label_sets.append(labels)
+                node_labels.append(label_codes[labels])
+                for name in names:
+                    block[name].append(props.get(name))
+            blocks[label] = (start, len(ids))
+            columns[label] = block
+
+        index = {node_id: n for n, node_id in enumerate(ids)}
+        out_edges, in_edges = {}, {}
+        for rel_type, pairs in edges.items():
+            numbered = [(index[s], index[t]) for s, t in pairs]
+            out_edges[rel_type] = CSR.from_pairs(len(ids), numbered)
+            in_edges[rel_type] = CSR.from_pairs(len(ids), [(t, s) for s, t in numbered])
+
+        snapshot = cls(ids, label_sets, node_labels, blocks, columns, out_edges, in_edges)
+        snapshot._index = index
+        return snapshot
+
+    def save(self, path: Path = SNAPSHOT_DIR, source: str = ""):
+        path = Path(path)
+        (path / "columns").mkdir(parents=True, exist_ok=True)
+        (path / "rels").mkdir(parents=True, exist_ok=True)
+
+        _write_json_gz(path / "ids.json.gz", self.ids)
+        _write_array(path / "node_labels.i32", self.node_labels)
+        for label, block in self.columns.items():
+            _write_json_gz(path / "columns" / f"{label}.json.gz", block)
+        for rel_type in self.out_edges:
+            self.out_edges[rel_type].save(path / "rels" / f"{rel_type}.out")
+            self.in_edges[rel_type].save(path / "rels" / f"{rel_type}.in")
+
+        self.meta = {
+            "version": SNAPSHOT_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "byteorder": sys.byteorder,
+            "node_count": len(self.ids),
+            "blocks": {label: list(span) for label, span in self.blocks.items()},
+            "label_sets": [list(labels) for labels in self.label_sets],
+            "relationships": {rel_type: len(csr) for rel_type, csr in self.out_edges.items()},
+        }
+        with open(path / "snapshot.json", 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Path = SNAPSHOT_DIR) -> "GraphSnapshot":
+        path = Path(path)
+        with open(path / "snapshot.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"스냅샷 버전 불일치: {meta.get('version')} (필요: {SNAPSHOT_VERSION})")
+        swap = meta["byteorder"] != sys.byteorder
+
+        blocks = {label: tuple(span) for label, span in meta["blocks"].items()}
+        columns = {label: _read_json_gz(path / "columns" / f"{label}.json.gz") for label in blocks}
+        out_edges, in_edges = {}, {}
+        for rel_type in meta["relationships"]:
+            out_edges[rel_type] = CSR.read(path / "rels" / f"{rel_type}.out", swap)
+            in_edges[rel_type] = CSR.read(path / "rels" / f"{rel_type}.in", swap)
+
+        return cls(
+            ids=_read_json_gz(path / "ids.json.gz"),
+            label_sets=[tuple(labels) for labels in meta["label_sets"]],
+            node_labels=_read_array(path / "node_labels.i32", swap),
+            blocks=blocks, columns=columns, out_edges=out_edges, in_edges=in_edges, meta=meta,
+        )
+
+    # --------------------------------------------------------
+    # 노드 / 속성
+    # --------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def node(self, node_id: str) -> Optional[int]:
+        """@id → 노드 번호"""
+        if self._index is None:
+            self._index = {value: n for n, value in enumerate(self.ids)}
+        return self._index.get(node_id)
+
+    def labels(self, n: int) -> Tuple[str, ...]:
+        return self.label_sets[self.node_labels[n]]
+
+    def has_label(self, n: int, label: str) -> bool:
+        return label in self.label_sets[self.node_labels[n]]
+
+    def nodes(self, label: Optional[str] = None) -> Sequence[int]:
+        """라벨의 노드 번호 (블록 라벨은 range, 추가 라벨은 필터)"""
+        if label is None:
+            return range(len(self.ids))
+        if label in self.blocks:
+            return range(*self.blocks[label])
+        codes = {code for code, labels in enumerate(self.label_sets) if label in labels}
+        return [n for n, code in enumerate(self.node_labels) if code in codes]
+
+    def _block_of(self, n: int) -> Tuple[str, int]:
+        label = self.label_sets[self.node_labels[n]][0]
+        return label, n - self.blocks[label][0]
+
+    def get(self, n: int, prop: str, default=None):
+        """노드 속성 (id 포함, '_:' 내부 id 는 속성 없음)"""
+        if prop == "id":
+            return default if self.ids[n].startswith(INTERNAL_ID) else self.ids[n]
+        label, offset = self._block_of(n)
+        column = self.columns[label].get(prop)
+        if column is None:
+            return default
+        value = column[offset]
+        return default if value is None else value
+
+    def properties(self, n: int) -> dict:
+        label, offset = self._block_of(n)
+        props = {} if self.ids[n].startswith(INTERNAL_ID) else {"id": self.ids[n]}
+        for name, column in self.columns[label].items():
+            if column[offset] is not None:
+                props[name] = column[offset]
+        return props
+
+    def lookup(self, label: str, prop: str) -> Dict[object, List[int]]:
+        """(라벨, 속성) 값 → 노드 번호 (배열 속성은 원소별, 첫 호출 시 생성)"""
+        key = (label, prop)
+        if key not in self._lookups:
+            table: Dict[object, List[int]] = {}
+            for n in self.nodes(label):
+                value = self.get(n, prop)
+                for v in (value if isinstance(value, list) else [value]):
+                    if v is not None:
+                        table.setdefault(v, []).append(n)
+            self._lookups[key] = table
+        return self._lookups[key]
+
+    def where(self, label: str, **equals) -> List[int]:
+        """라벨 + 속성 동등 조건 (첫 조건은 lookup 사용)"""
+        if not equals:
+            return list(self.nodes(label))
+        (prop, value), *rest = equals.items()
+        candidates = self.lookup(label, prop).get(value, [])
+        return [n for n in candidates if all(self.get(n, p) == v for p, v in rest)]
+
+    # --------------------------------------------------------
+    # 관계
+    # --------------------------------------------------------
+
+    def out(self, rel_type: str, n: int) -> array:
+        csr = self.out_edges.get(rel_type)
+        return csr.neighbors(n) if csr is not None else array(_INT)
+
+    def in_(self, rel_type: str, n: int) -> array:
+        csr = self.in_edges.get(rel_type)
+        return csr.neighbors(n) if csr is not None else array(_INT)
+
+    def relationship_count(self, rel_type: str) -> int:
+        csr = self.out_edges.get(rel_type)
+        return len(csr) if csr is not None else 0
+
+    def sources(self, rel_type: str, targets: Iterable[int]) -> List[int]:
+        """targets 로 rel_type 관계를 가진 시작 노드 (중복 제거, 순서 유지)"""
+        seen = {}
+        for target in targets:
+            for source in self.in_(rel_type, target):
+                seen[source] = None
+        return list(seen)
+
+    # --------------------------------------------------------
+    # CQ 패턴
+    # --------------------------------------------------------
+
+    def _resolve(self, label: str, ref, props: Sequence[str]) -> List[int]:
+        """@id / 노드 번호 / 속성 값 (props 순서로 시도) → 노드 번호"""
+        if isinstance(ref, int):
+            return [ref]
+        n = self.node(ref)
+        if n is not None and self.has_label(n, label):
+            return [n]
+        for prop in props:
+            found = self.lookup(label, prop).get(ref)
+            if found:
+                return found
+        return []
+
+    def meetings(self, ref) -> List[int]:
+        """'RAN1#120' / 'tdoc:meeting/RAN1_120' → Meeting (e-meeting 접미사 포함)"""
+        found = self._resolve("Meeting", ref, ("meetingNumber", "canonicalMeetingNumber"))
+        if found or not isinstance(ref, str):
+            return found
+        return [n for value, nodes in self.lookup("Meeting", "meetingNumber").items()
+                if isinstance(value, str) and value.startswith(ref + "-") for n in nodes]
+
+    def companies(self, ref) -> List[int]:
+        return self._resolve("Company", ref, ("companyName", "aliases"))
+
+    def tdoc(self, ref) -> Optional[int]:
+        found = self._resolve("Tdoc", ref, ("tdocNumber",))
+        return found[0] if found else None
+
+    def tdocs_at(self, meeting) -> List[int]:
+        return self.sources("PRESENTED_AT", self.meetings(meeting))
+
+    def tdocs_by(self, company) -> List[int]:
+        return self.sources("SUBMITTED_BY", self.companies(company))
+
+    def tdocs_in_agenda(self, agenda_number: str, meeting=None) -> List[int]:
+        tdocs = self.sources("BELONGS_TO", self.lookup("AgendaItem", "agendaNumber").get(agenda_number, []))
+        if meeting is None:
+            return tdocs
+        at_meeting = set(self.tdocs_at(meeting))
+        return [n for n in tdocs if n in at_meeting]
+
+    def filter(self, nodes: Iterable[int], **equals) -> List[int]:
+        """속성 동등 조건 (값이 list/tuple/set 이면 IN)"""
+        def match(n):
+            for prop, expected in equals.items():
+                value = self.get(n, prop)
+                if isinstance(expected, (list, tuple, set)):
+                    if value not in expected:
+                        return False
+                elif value != expected:
+                    return False
+            return True
+        return [n for n in nodes if match(n)]
+
+    def revision_chain(self, tdoc) -> List[str]:
+        """IS_REVISION_OF / REVISED_TO 를 따라 이전 → 이후 순서의 Tdoc @id 목록"""
+        start = tdoc if isinstance(tdoc, int) else self.tdoc(tdoc)
+        if start is None:
+            return []
+
+        def step(n, forward):
+            if forward:
+                candidates = list(self.in_("IS_REVISION_OF", n)) + list(self.out("REVISED_TO", n))
+            else:
+                candidates = list(self.out("IS_REVISION_OF", n)) + list(self.in_("REVISED_TO", n))
+            return candidates[0] if candidates else None
+
+        seen = {start}
+        before, n = [], step(start, False)
+        while n is not None and n not in seen:
+            seen.add(n)
+            before.append(n)
+            n = step(n, False)
+        after, n = [], step(start, True)
+        while n is not None and n not in seen:
+            seen.add(n)
+            after.append(n)
+            n = step(n, True)
+        return [self.ids[m] for m in reversed(before)] + [self.ids[start]] + [self.ids[m] for m in after]
+
+    def count_by(self, nodes: Iterable[int], rel_type: Optional[str], prop: str) -> Counter:
+        """노드(또는 rel_type 대상 노드)의 prop 값별 개수"""
+        counts: Counter = Counter()
+        for n in nodes:
+            targets = self.out(rel_type, n) if rel_type else (n,)
+            for target in targets:
+                counts[self.get(target, prop)] += 1
+        return counts
+
+    def count(self, label: str) -> int:
+        return len(self.nodes(label))
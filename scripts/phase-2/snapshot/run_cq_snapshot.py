@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+CQ 스위트 스냅샷 실행 (Neo4j 없이, 전체 코어 병렬)
+
+validate_cq.py / test_cq_practical.py / validate_cq_cypher.py 의 고정 Cypher 를
+cypher_executor 로 그래프 스냅샷 위에서 실행한다. 워커 프로세스마다 스냅샷을 한 번 로드한다.
+
+--parity 를 주면 같은 쿼리를 Neo4j 에서도 실행해 결과를 비교한다:
+- match    : 행/순서 일치
+- order    : 같은 행 집합, 순서만 다름 (ORDER BY 동점 또는 ORDER BY 없음)
+- ties     : LIMIT 경계 (마지막 행) 와 ORDER BY 값이 같은 동점 행만 다름 (그 앞 행은 모두 같음, 행 수 동일)
+- mismatch : 결과 다름
+
+사용법:
+    python run_cq_snapshot.py                          # 전체 스위트
+    python run_cq_snapshot.py --suite practical --workers 4
+    python run_cq_snapshot.py --parity                 # Neo4j 결과와 비교
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from graph_snapshot import GraphSnapshot, SNAPSHOT_DIR
+from cypher_executor import execute, CypherError, CypherUnsupported, Parser
+
+SCRIPTS_DIR = Path(__file__).parent.parent.parent
+
+SUITES = {
+    "phase2": SCRIPTS_DIR / "phase-2" / "neo4j" / "validate_cq.py",
+    "practical": SCRIPTS_DIR / "phase-2" / "neo4j" / "test_cq_practical.py",
+    "phase3": SCRIPTS_DIR / "phase-3" / "validation" / "validate_cq_cypher.py",
+}
+
+FLOAT_DIGITS = 6
+
+
+def load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(f"cq_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_suite(name: str) -> Tuple[object, List[Tuple[str, str]]]:
+    """스위트 모듈과 (CQ id, 쿼리) 목록"""
+    module = load_module(name, SUITES[name])
+    if name == "phase2":
+        queries = [(cq_id, cq["query"]) for cq_id, cq in module.CQ_QUERIES.items()]
+    elif name == "practical":
+        queries = [(cq_id, cq["query"]) for cq_id, cq in module.TEST_CQS.items()]
+    else:
+        queries = [(cq_id, query) for cq_id, _, _, query in module.CQ_DATASET]
+    return module, queries
+
+
+# ============================================================
+# 스냅샷 실행 (워커)
+# ============================================================
+
+_SNAPSHOT: Optional[GraphSnapshot] = None
+
+
+def init_worker(snapshot_dir: str):
+    global _SNAPSHOT
+    _SNAPSHOT = GraphSnapshot.load(Path(snapshot_dir))
+
+
+def run_query(task: Tuple[str, str, str]) -> dict:
+    suite, cq_id, query = task
+    start = time.time()
+    try:
+        rows = execute(_SNAPSHOT, query)
+        status, error = "ok", None
+    except CypherUnsupported as e:
+        rows, status, error = None, "unsupported", str(e)
+    except Exception as e:
+        rows, status, error = None, "error", f"{type(e).__name__}: {e}"
+    return {"suite": suite, "id": cq_id, "status": status, "error": error,
+            "rows": rows, "time": time.time() - start}
+
+
+# ============================================================
+# Neo4j 비교
+# ============================================================
+
+def normalize(value):
+    """Neo4j / 스냅샷 값 비교용 (노드 → 속성 dict, float 반올림)"""
+    if hasattr(value, "items") and not isinstance(value, dict):
+        value = dict(value.items())
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize(v)) for k, v in value.items() if v is not None))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, float):
+        return round(value, FLOAT_DIGITS)
+    return value
+
+
+def normalize_rows(rows: List[dict]) -> List[tuple]:
+    return [tuple(normalize(row.get(key)) for key in sorted(row)) for row in rows]
+
+
+def order_columns(query: str) -> Optional[List[str]]:
+    """마지막 RETURN 의 ORDER BY → 결과 열 이름 (LIMIT / ORDER BY 가 없거나 결과 열이 아닌 정렬 식이면 None)"""
+    try:
+        proj = Parser(query).parse()[-1][1]
+    except CypherError:
+        return None
+    if proj.limit is None or not proj.order:
+        return None
+    texts = {" ".join(expr.text.split()): alias for expr, alias in proj.items}
+    aliases = set(texts.values())
+    columns = []
+    for expr, _ in proj.order:
+        text = " ".join(expr.text.split())
+        column = text if text in aliases else texts.get(text)
+        if column is None:
+            return None
+        columns.append(column)
+    return columns
+
+
+def tie_only(columns: List[str], expected: List[dict], actual: List[dict]) -> bool:
+    """마지막 행과 정렬 값이 같은 행 (LIMIT 경계의 동점) 만 다르고, 그 앞 행은 정렬 값 순서와 행 집합이 같은지"""
+    def sort_key(row):
+        return tuple(normalize(row.get(column)) for column in columns)
+
+    if not expected or len(expected) != len(actual):
+        return False
+    boundary = sort_key(expected[-1])
+    head = len(expected) - sum(sort_key(row) == boundary for row in expected)
+    if any(sort_key(row) != boundary for row in actual[head:]):
+        return False
+    if [sort_key(row) for row in expected[:head]] != [sort_key(row) for row in actual[:head]]:
+        return False
+    return Counter(map(repr, normalize_rows(expected[:head]))) == Counter(map(repr, normalize_rows(actual[:head])))
+
+
+def compare(query: str, expected: List[dict], actual: List[dict]) -> str:
+    expected_rows, actual_rows = normalize_rows(expected), normalize_rows(actual)
+    if expected_rows == actual_rows:
+        return "match"
+    if Counter(map(repr, expected_rows)) == Counter(map(repr, actual_rows)):
+        return "order"
+    columns = order_columns(query)
+    if columns and tie_only(columns, expected, actual):
+        return "ties"
+    return "mismatch"
+
+
+def run_neo4j(uri: str, auth, queries: List[Tuple[str, str]]) -> Dict[str, dict]:
+    from neo4j import GraphDatabase
+
+    results = {}
+    driver = GraphDatabase.driver(uri, auth=auth)
+    try:
+        with driver.session() as session:
+            for cq_id, query in queries:
+                start = time.time()
+                try:
+                    rows = [record.data() for record in session.run(query)]
+                    results[cq_id] = {"rows": rows, "error": None, "time": time.time() - start}
+                except Exception as e:
+                    results[cq_id] = {"rows": None, "error": f"{type(e).__name__}: {e}",
+                                      "time": time.time() - start}
+    finally:
+        driver.close()
+    return results
+
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="CQ 스위트 스냅샷 실행")
+    parser.add_argument('--suite', choices=[*SUITES, "all"], default="all", help='실행할 CQ 스위트')
+    parser.add_argument('--snapshot', type=Path, default=SNAPSHOT_DIR, help='스냅샷 디렉토리')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='워커 프로세스 수')
+    parser.add_argument('--parity', action='store_true', help='Neo4j 결과와 비교')
+    parser.add_argument('--uri', default=None, help='비교용 Neo4j URI (기본: 스위트 모듈의 URI)')
+    parser.add_argument('--verbose', action='store_true', help='CQ별 결과 출력')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CQ 스냅샷 실행")
+    print("=" * 60)
+
+    names = list(SUITES) if args.suite == "all" else [args.suite]
+    suites = {name: load_suite(name) for name in names}
+    tasks = [(name, cq_id, query) for name, (_, queries) in suites.items() for cq_id, query in queries]
+    print(f"스냅샷: {args.snapshot}")
+    print(f"CQ {len(tasks)}개 ({', '.join(f'{n}: {len(q)}' for n, (_, q) in suites.items())}), "
+          f"워커 {args.workers}개")
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(str(args.snapshot),)) as pool:
+        results = list(pool.map(run_query, tasks, chunksize=max(1, len(tasks) // (args.workers * 4))))
+    snapshot_time = time.time() - start
+
+    statuses = Counter(r["status"] for r in results)
+    print(f"\n[스냅샷] {snapshot_time:.2f}s - " + ", ".join(f"{k}: {v}" for k, v in statuses.items()))
+    for r in results:
+        if r["status"] != "ok":
+            print(f"  ❌ {r['suite']}/{r['id']}: {r['status']} - {r['error']}")
+        elif args.verbose:
+            print(f"  ✅ {r['suite']}/{r['id']}: {len(r['rows'])} rows ({r['time'] * 1000:.1f}ms)")
+
+    if not args.parity:
+        return
+
+    print("\n[Neo4j 비교]")
+    parity = Counter()
+    neo4j_time = 0.0
+    by_key = {(r["suite"], r["id"]): r for r in results}
+    for name, (module, queries) in suites.items():
+        uri = args.uri or module.URI
+        print(f"  {name}: {uri}")
+        expected = run_neo4j(uri, module.AUTH, queries)
+        for cq_id, query in queries:
+            local, remote = by_key[(name, cq_id)], expected[cq_id]
+            neo4j_time += remote["time"]
+            if remote["error"] or local["status"] != "ok":
+                status = "error"
+                detail = remote["error"] or local["error"]
+            else:
+                status = compare(query, remote["rows"], local["rows"])
+                detail = f"neo4j {len(remote['rows'])} rows / snapshot {len(local['rows'])} rows"
+            parity[status] += 1
+            if status in ("mismatch", "error") or args.verbose:
+                print(f"    {'✅' if status in ('match', 'order', 'ties') else '❌'} {cq_id}: {status} ({detail})")
+
+    print("\n" + "=" * 60)
+    print(", ".join(f"{k}: {v}" for k, v in parity.items()))
+    print(f"Neo4j 순차 {neo4j_time:.2f}s vs 스냅샷 병렬 {snapshot_time:.2f}s")
+    print("=" * 60)
+    if parity["mismatch"] or parity["error"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
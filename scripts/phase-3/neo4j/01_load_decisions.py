@@ -11,13 +11,25 @@ Creates relationships:
 - RESOLUTION_BELONGS_TO (Resolution -> AgendaItem)
 - MADE_AT (Resolution -> Meeting)
 - REFERENCES (Resolution -> Tdoc)
+
+(resolution, meeting/agenda/tdoc) pairs are flattened client-side and sent as
+parameterized UNWIND batches (--batch-size), so load time is bounded by
+Neo4j write speed rather than per-row round-trips.
 """
 
+import argparse
 import json
+import sys
+import time
 from pathlib import Path
-from neo4j import GraphDatabase
 import os
 
+# Shared Neo4j schema (constraints / indexes) from the Phase-2 loaders
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "phase-2" / "neo4j"))
+
+from schema import apply_schema
+from graph_version import bump_graph_version
+
 
 # Paths
 INSTANCES_DIR = Path(__file__).parent.parent.parent.parent / "ontology" / "output" / "instances" / "phase-3"
@@ -36,147 +48,208 @@ def load_jsonld(filename: str) -> list[dict]:
     return data.get("@graph", [])
 
 
-def create_resolution_nodes(tx, resolutions: list[dict], resolution_type: str):
-    """Create Resolution nodes (Agreement, Conclusion, or WorkingAssumption)."""
-    query = f"""
-    UNWIND $resolutions AS r
-    MERGE (res:Resolution:{resolution_type} {{resolutionId: r.resolutionId}})
-    SET res.content = r.content,
-        res.hasFFS = COALESCE(r.hasFFS, false),
-        res.hasTBD = COALESCE(r.hasTBD, false),
-        res.sessionContext = r.sessionContext,
-        res.note = r.note
-    """
+DEFAULT_BATCH_SIZE = 1000
+
+RESOLUTION_FILES = [
+    ("Agreement", "resolutions_agreements.jsonld"),
+    ("Conclusion", "resolutions_conclusions.jsonld"),
+    ("WorkingAssumption", "resolutions_working_assumptions.jsonld"),
+]
+
+# Graph schema written by this loader (also used by the query-interface Cypher validator)
+RESOLUTION_LABEL = "Resolution"
+RESOLUTION_PROPERTIES = [
+    "resolutionId", "content", "hasFFS", "hasTBD", "hasConsensus",
+    "sessionContext", "note", "meeting", "agenda",
+]
+RESOLUTION_RELATIONSHIPS = [
+    ("MADE_AT", "Meeting"),
+    ("RESOLUTION_BELONGS_TO", "AgendaItem"),
+    ("REFERENCES", "Tdoc"),
+]
+AGENDA_ITEM_PROPERTIES = ["meetingNumber", "agendaNumber"]  # MERGE keys in BELONGS_TO_QUERY
 
-    if resolution_type == "Conclusion":
-        query = f"""
-        UNWIND $resolutions AS r
-        MERGE (res:Resolution:{resolution_type} {{resolutionId: r.resolutionId}})
-        SET res.content = r.content,
-            res.hasConsensus = r.hasConsensus,
-            res.sessionContext = r.sessionContext,
-            res.note = r.note
-        """
-
-    tx.run(query, resolutions=resolutions)
-
-
-def create_resolution_relationships(tx, resolutions: list[dict]):
-    """Create relationships for resolutions."""
-    # MADE_AT relationship (Resolution -> Meeting)
-    # DB format: canonicalMeetingNumber = 'RAN1#100' (hash format, from Phase-2 JSON-LD)
-    # JSON-LD format: madeAt = 'tdoc:meeting/RAN1_100' (underscore format)
-    # Fix: Convert underscore to hash to match canonicalMeetingNumber
-    tx.run("""
-        UNWIND $resolutions AS r
-        MATCH (res:Resolution {resolutionId: r.resolutionId})
-        MATCH (m:Meeting {canonicalMeetingNumber: r.canonicalMeetingNum})
-        MERGE (res)-[:MADE_AT]->(m)
-    """, resolutions=[
-        {
-            "resolutionId": r["resolutionId"],
-            # Extract "RAN1_100" from "tdoc:meeting/RAN1_100" → convert to "RAN1#100"
-            "canonicalMeetingNum": r["madeAt"].replace("tdoc:meeting/", "").replace("_", "#")
-        }
-        for r in resolutions if "madeAt" in r
-    ])
-
-    # RESOLUTION_BELONGS_TO relationship (Resolution -> AgendaItem)
-    for r in resolutions:
-        if "resolutionBelongsTo" not in r:
-            continue
 
-        agenda_ref = r["resolutionBelongsTo"]
-        # Parse "tdoc:agenda/112-8.1" -> meeting=112, agenda=8.1
-        parts = agenda_ref.replace("tdoc:agenda/", "").split("-", 1)
-        if len(parts) != 2:
-            continue
+def batched(rows: list, size: int):
+    """Yield consecutive slices of at most `size` rows."""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
 
-        meeting_num, agenda_item = parts
 
-        tx.run("""
-            MATCH (res:Resolution {resolutionId: $resolutionId})
-            MERGE (ai:AgendaItem {agendaNumber: $agendaItem, meetingNumber: $meetingNum})
-            MERGE (res)-[:RESOLUTION_BELONGS_TO]->(ai)
-        """, resolutionId=r["resolutionId"], agendaItem=agenda_item, meetingNum=meeting_num)
+def write_batches(session, query: str, rows: list, batch_size: int) -> int:
+    """Send rows as parameterized UNWIND batches, one transaction per batch."""
+    def work(tx, batch):
+        tx.run(query, rows=batch).consume()
 
+    for batch in batched(rows, batch_size):
+        session.execute_write(work, batch)
+    return len(rows)
+
+
+def canonical_meeting(made_at: str) -> str:
+    """'tdoc:meeting/RAN1_100' -> 'RAN1#100' (Phase-2 canonicalMeetingNumber format)."""
+    return made_at.replace("tdoc:meeting/", "").replace("_", "#")
+
+
+def parse_agenda_ref(agenda_ref: str):
+    """'tdoc:agenda/112-8.1' -> ('112', '8.1'), or None if malformed."""
+    parts = agenda_ref.replace("tdoc:agenda/", "").split("-", 1)
+    return tuple(parts) if len(parts) == 2 else None
+
+
+def meeting_ids(session) -> dict[str, list[str]]:
+    """canonicalMeetingNumber -> Meeting ids, resolved once instead of per row."""
+    result = session.run("""
+        MATCH (m:Meeting) WHERE m.canonicalMeetingNumber IS NOT NULL
+        RETURN m.canonicalMeetingNumber AS number, collect(m.id) AS ids
+    """)
+    return {record["number"]: record["ids"] for record in result}
+
+
+def flatten_resolutions(resolutions: list[dict], meetings: dict[str, list[str]]) -> dict[str, list[dict]]:
+    """Flatten resolutions into node rows and (resolution, target) pair rows.
+
+    Returns rows for: nodes, made_at, belongs_to, references, plus the
+    resolutionIds whose meeting could not be resolved (unresolved_meetings).
+    """
+    rows = {"nodes": [], "made_at": [], "belongs_to": [], "references": [], "unresolved_meetings": []}
 
-def create_references_relationships(tx, resolutions: list[dict]):
-    """Create REFERENCES relationships (Resolution -> Tdoc)."""
-    # DB format: tdocNumber = ['R1-2000138'] (array)
     for r in resolutions:
+        resolution_id = r["resolutionId"]
+        meeting = canonical_meeting(r["madeAt"]) if "madeAt" in r else None
+        agenda = parse_agenda_ref(r["resolutionBelongsTo"]) if "resolutionBelongsTo" in r else None
+
+        rows["nodes"].append({
+            "resolutionId": resolution_id,
+            "content": r.get("content"),
+            "hasFFS": r.get("hasFFS"),
+            "hasTBD": r.get("hasTBD"),
+            "hasConsensus": r.get("hasConsensus"),
+            "sessionContext": r.get("sessionContext"),
+            "note": r.get("note"),
+            "meeting": meeting,
+            "agenda": agenda[1] if agenda else None,
+        })
+
+        if meeting is not None:
+            if meeting in meetings:
+                for meeting_id in meetings[meeting]:
+                    rows["made_at"].append({"resolutionId": resolution_id, "meetingId": meeting_id})
+            else:
+                rows["unresolved_meetings"].append(resolution_id)
+
+        if agenda:
+            rows["belongs_to"].append({
+                "resolutionId": resolution_id, "meetingNumber": agenda[0], "agendaNumber": agenda[1]
+            })
+
         refs = r.get("references", [])
         if isinstance(refs, str):
             refs = [refs]
+        for tdoc_num in dict.fromkeys(ref.replace("tdoc:", "") for ref in refs):
+            rows["references"].append({"resolutionId": resolution_id, "tdocNumber": tdoc_num})
 
-        for ref in refs:
-            tdoc_num = ref.replace("tdoc:", "")
-            tx.run("""
-                MATCH (res:Resolution {resolutionId: $resolutionId})
-                MATCH (t:Tdoc) WHERE $tdocNum IN t.tdocNumber
-                MERGE (res)-[:REFERENCES]->(t)
-            """, resolutionId=r["resolutionId"], tdocNum=tdoc_num)
+    return rows
 
 
-def create_indexes(tx):
-    """Create indexes for Resolution nodes."""
-    tx.run("CREATE INDEX IF NOT EXISTS FOR (r:Resolution) ON (r.resolutionId)")
-    tx.run("CREATE INDEX IF NOT EXISTS FOR (ai:AgendaItem) ON (ai.agendaNumber, ai.meetingNumber)")
+def resolution_node_query(resolution_type: str) -> str:
+    """Node MERGE for one Resolution subtype (backed by the resolutionId constraint)."""
+    if resolution_type == "Conclusion":
+        properties = """res.hasConsensus = r.hasConsensus,"""
+    else:
+        properties = """res.hasFFS = COALESCE(r.hasFFS, false),
+            res.hasTBD = COALESCE(r.hasTBD, false),"""
+    return f"""
+        UNWIND $rows AS r
+        MERGE (res:Resolution:{resolution_type} {{resolutionId: r.resolutionId}})
+        SET res.content = r.content,
+            {properties}
+            res.sessionContext = r.sessionContext,
+            res.note = r.note,
+            res.meeting = r.meeting,
+            res.agenda = r.agenda
+    """
+
+
+# MADE_AT (Resolution -> Meeting), meeting id pre-resolved from canonicalMeetingNumber
+MADE_AT_QUERY = """
+    UNWIND $rows AS row
+    MATCH (res:Resolution {resolutionId: row.resolutionId})
+    MATCH (m:Meeting {id: row.meetingId})
+    MERGE (res)-[:MADE_AT]->(m)
+"""
+
+# RESOLUTION_BELONGS_TO (Resolution -> AgendaItem), MERGE on the composite index
+BELONGS_TO_QUERY = """
+    UNWIND $rows AS row
+    MATCH (res:Resolution {resolutionId: row.resolutionId})
+    MERGE (ai:AgendaItem {meetingNumber: row.meetingNumber, agendaNumber: row.agendaNumber})
+    MERGE (res)-[:RESOLUTION_BELONGS_TO]->(ai)
+"""
+
+# REFERENCES (Resolution -> Tdoc)
+# tdocNumber is a string (load_cypher) or a single-element array (n10s);
+# both equality forms are served by idx_tdoc_number.
+REFERENCES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (res:Resolution {resolutionId: row.resolutionId})
+    CALL {
+        WITH row
+        MATCH (t:Tdoc {tdocNumber: row.tdocNumber}) RETURN t
+        UNION
+        WITH row
+        MATCH (t:Tdoc {tdocNumber: [row.tdocNumber]}) RETURN t
+    }
+    MERGE (res)-[:REFERENCES]->(t)
+"""
+
+
+def load_resolutions(session, resolution_type: str, resolutions: list[dict],
+                     meetings: dict[str, list[str]], batch_size: int) -> dict[str, int]:
+    """Load one Resolution subtype: nodes first, then the three relationship types."""
+    rows = flatten_resolutions(resolutions, meetings)
+    counts = {
+        "nodes": write_batches(session, resolution_node_query(resolution_type), rows["nodes"], batch_size),
+        "MADE_AT": write_batches(session, MADE_AT_QUERY, rows["made_at"], batch_size),
+        "RESOLUTION_BELONGS_TO": write_batches(session, BELONGS_TO_QUERY, rows["belongs_to"], batch_size),
+        "REFERENCES": write_batches(session, REFERENCES_QUERY, rows["references"], batch_size),
+    }
+    if rows["unresolved_meetings"]:
+        print(f"  Warning: {len(rows['unresolved_meetings'])} resolutions with unknown meeting "
+              f"(e.g. {rows['unresolved_meetings'][0]})")
+    return counts
 
 
 def main():
     """Main function to load all resolutions into Neo4j."""
+    parser = argparse.ArgumentParser(description="Load Phase-3 resolutions into Neo4j")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per UNWIND transaction")
+    args = parser.parse_args()
+
+    from neo4j import GraphDatabase
+
     print("Connecting to Neo4j...")
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
     try:
+        # Constraints / indexes (resolutionId uniqueness, AgendaItem composite, full-text)
+        print("Applying schema...")
+        apply_schema(driver)
+
         with driver.session() as session:
-            # Create indexes
-            print("Creating indexes...")
-            session.execute_write(create_indexes)
-
-            # Load Agreements
-            print("\nLoading Agreements...")
-            agreements = load_jsonld("resolutions_agreements.jsonld")
-            print(f"  Loaded {len(agreements)} agreements from JSON-LD")
-
-            # Batch insert agreements
-            batch_size = 1000
-            for i in range(0, len(agreements), batch_size):
-                batch = agreements[i:i+batch_size]
-                session.execute_write(create_resolution_nodes, batch, "Agreement")
-                print(f"  Created nodes: {i+len(batch)}/{len(agreements)}")
-
-            # Create relationships
-            print("  Creating relationships...")
-            session.execute_write(create_resolution_relationships, agreements)
-            session.execute_write(create_references_relationships, agreements)
-
-            # Load Conclusions
-            print("\nLoading Conclusions...")
-            conclusions = load_jsonld("resolutions_conclusions.jsonld")
-            print(f"  Loaded {len(conclusions)} conclusions from JSON-LD")
-
-            for i in range(0, len(conclusions), batch_size):
-                batch = conclusions[i:i+batch_size]
-                session.execute_write(create_resolution_nodes, batch, "Conclusion")
-                print(f"  Created nodes: {i+len(batch)}/{len(conclusions)}")
-
-            session.execute_write(create_resolution_relationships, conclusions)
-            session.execute_write(create_references_relationships, conclusions)
-
-            # Load Working Assumptions
-            print("\nLoading Working Assumptions...")
-            was = load_jsonld("resolutions_working_assumptions.jsonld")
-            print(f"  Loaded {len(was)} working assumptions from JSON-LD")
-
-            for i in range(0, len(was), batch_size):
-                batch = was[i:i+batch_size]
-                session.execute_write(create_resolution_nodes, batch, "WorkingAssumption")
-                print(f"  Created nodes: {i+len(batch)}/{len(was)}")
-
-            session.execute_write(create_resolution_relationships, was)
-            session.execute_write(create_references_relationships, was)
+            meetings = meeting_ids(session)
+            print(f"Resolved {len(meetings)} meetings")
+
+            for resolution_type, filename in RESOLUTION_FILES:
+                print(f"\nLoading {resolution_type}...")
+                resolutions = load_jsonld(filename)
+                print(f"  Loaded {len(resolutions)} from JSON-LD")
+
+                start = time.time()
+                counts = load_resolutions(session, resolution_type, resolutions, meetings, args.batch_size)
+                print("  " + ", ".join(f"{name}: {count}" for name, count in counts.items())
+                      + f" ({time.time() - start:.2f}s)")
 
             # Summary
             result = session.run("""
@@ -206,6 +279,8 @@ def main():
             for record in result:
                 print(f"  {record['type']}: {record['count']}")
 
+        bump_graph_version(driver, "01_load_decisions")
+
     finally:
         driver.close()
 
@@ -9,13 +9,26 @@ Creates/Updates nodes:
 Creates relationships:
 - MODERATED_BY (Summary -> Company)
 - CHAIRED_BY (SessionNotes -> Company)
+- PRESENTED_AT (Summary/SessionNotes -> Meeting)
+
+Tdocs are matched on the scalar, indexed tdocKey (backfilled from tdocNumber,
+which may be list-valued), and company/meeting ids are resolved once up front,
+so each relationship type is a few UNWIND batches (--batch-size).
 """
 
+import argparse
 import json
+import sys
+import time
 from pathlib import Path
-from neo4j import GraphDatabase
 import os
 
+# Shared Neo4j schema (constraints / indexes) from the Phase-2 loaders
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "phase-2" / "neo4j"))
+
+from schema import apply_schema
+from graph_version import bump_graph_version
+
 
 # Paths
 INSTANCES_DIR = Path(__file__).parent.parent.parent.parent / "ontology" / "output" / "instances" / "phase-3"
@@ -34,10 +47,43 @@ def load_jsonld(filename: str) -> list[dict]:
     return data.get("@graph", [])
 
 
+DEFAULT_BATCH_SIZE = 1000
+
+# Graph schema written by this loader (also used by the query-interface Cypher validator)
+ROLE_PARENT_LABEL = "Tdoc"
+ROLE_LABELS = {
+    "Summary": ["summaryType", "roundNumber"],
+    "SessionNotes": [],
+}
+ROLE_RELATIONSHIPS = [
+    ("Summary", "MODERATED_BY", "Company"),
+    ("SessionNotes", "CHAIRED_BY", "Company"),
+    ("Summary", "PRESENTED_AT", "Meeting"),
+    ("SessionNotes", "PRESENTED_AT", "Meeting"),
+]
+TDOC_KEY_PROPERTY = "tdocKey"  # scalar Tdoc key backfilled by ensure_tdoc_keys
+
+
+def batched(rows: list, size: int):
+    """Yield consecutive slices of at most `size` rows."""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def write_batches(session, query: str, rows: list, batch_size: int) -> int:
+    """Send rows as parameterized UNWIND batches, one transaction per batch."""
+    def work(tx, batch):
+        tx.run(query, rows=batch).consume()
+
+    for batch in batched(rows, batch_size):
+        session.execute_write(work, batch)
+    return len(rows)
+
+
 def parse_meeting_uri(uri: str) -> str:
     """Parse meeting URI to get meeting number."""
-    # "tdoc:meeting/RAN1-112" -> "112"
-    return uri.replace("tdoc:meeting/RAN1-", "")
+    # "tdoc:meeting/RAN1-100" -> "RAN1#100"
+    return uri.replace("tdoc:meeting/", "").replace("-", "#")
 
 
 def parse_company_uri(uri: str) -> str:
@@ -46,146 +92,173 @@ def parse_company_uri(uri: str) -> str:
     return uri.replace("tdoc:company/", "").replace("_", " ")
 
 
-def create_summary_nodes(tx, summaries: list[dict]):
-    """Create or update Summary nodes (which are also Tdocs)."""
-    # DB format: tdocNumber = ['R1-2000138'] (array)
-    # Match existing Tdoc nodes and add Summary label
-    for s in summaries:
-        tx.run("""
-            MATCH (t:Tdoc) WHERE $tdocNumber IN t.tdocNumber
-            SET t:Summary,
-                t.summaryType = $summaryType,
-                t.roundNumber = $roundNumber
-        """,
-            tdocNumber=s["tdocNumber"],
-            summaryType=s.get("summaryType"),
-            roundNumber=s.get("roundNumber")
-        )
-
-    # For summaries without existing Tdoc node, create new
-    tx.run("""
-        UNWIND $summaries AS s
-        MERGE (sum:Tdoc:Summary {tdocNumber: [s.tdocNumber]})
-        ON CREATE SET sum.title = s.title,
-            sum.summaryType = s.summaryType,
-            sum.roundNumber = s.roundNumber
-    """, summaries=[
-        {
-            "tdocNumber": s["tdocNumber"],
-            "title": s["title"],
-            "summaryType": s.get("summaryType"),
-            "roundNumber": s.get("roundNumber"),
-        }
-        for s in summaries
-    ])
-
-
-def create_session_notes_nodes(tx, session_notes: list[dict]):
-    """Create or update SessionNotes nodes (which are also Tdocs)."""
-    # DB format: tdocNumber = ['R1-2000138'] (array)
-    # Match existing Tdoc nodes and add SessionNotes label
-    for n in session_notes:
-        tx.run("""
-            MATCH (t:Tdoc) WHERE $tdocNumber IN t.tdocNumber
-            SET t:SessionNotes
-        """, tdocNumber=n["tdocNumber"])
-
-    # For session notes without existing Tdoc node, create new
-    tx.run("""
-        UNWIND $notes AS n
-        MERGE (sn:Tdoc:SessionNotes {tdocNumber: [n.tdocNumber]})
-        ON CREATE SET sn.title = n.title
-    """, notes=[
-        {
-            "tdocNumber": n["tdocNumber"],
-            "title": n["title"],
-        }
-        for n in session_notes
-    ])
-
-
-def create_summary_relationships(tx, summaries: list[dict]):
-    """Create relationships for Summary nodes."""
-    for s in summaries:
-        # MODERATED_BY relationship
-        # DB format: companyName = ['Huawei'] (array), tdocNumber = ['R1-xxx'] (array)
-        if "moderatedBy" in s:
-            company_name = parse_company_uri(s["moderatedBy"])
-            tx.run("""
-                MATCH (sum:Summary) WHERE $tdocNumber IN sum.tdocNumber
-                MATCH (c:Company) WHERE $companyName IN c.companyName OR $companyName IN c.aliases
-                MERGE (sum)-[:MODERATED_BY]->(c)
-            """, tdocNumber=s["tdocNumber"], companyName=company_name)
-
-        # Link to meeting
-        # DB format: meetingNumber = ['RAN1#100'] or ['RAN1#100-e'] (array, -e suffix for e-meetings)
-        # JSON-LD format: meeting = 'tdoc:meeting/RAN1-100'
-        # Fix: Use STARTS WITH to handle -e suffix mismatch
-        if "meeting" in s:
-            # Convert "tdoc:meeting/RAN1-100" -> "RAN1#100"
-            meeting_num = s["meeting"].replace("tdoc:meeting/", "").replace("-", "#")
-            tx.run("""
-                MATCH (sum:Summary) WHERE $tdocNumber IN sum.tdocNumber
-                MATCH (m:Meeting) WHERE ANY(num IN m.meetingNumber WHERE num = $meetingNum OR num STARTS WITH $meetingNum + '-')
-                MERGE (sum)-[:PRESENTED_AT]->(m)
-            """, tdocNumber=s["tdocNumber"], meetingNum=meeting_num)
-
-
-def create_session_notes_relationships(tx, session_notes: list[dict]):
-    """Create relationships for SessionNotes nodes."""
-    for n in session_notes:
-        # CHAIRED_BY relationship
-        # DB format: companyName = ['CMCC'] (array), tdocNumber = ['R1-xxx'] (array)
-        if "chairedBy" in n:
-            company_name = parse_company_uri(n["chairedBy"])
-            tx.run("""
-                MATCH (sn:SessionNotes) WHERE $tdocNumber IN sn.tdocNumber
-                MATCH (c:Company) WHERE $companyName IN c.companyName OR $companyName IN c.aliases
-                MERGE (sn)-[:CHAIRED_BY]->(c)
-            """, tdocNumber=n["tdocNumber"], companyName=company_name)
-
-        # Link to meeting
-        # DB format: meetingNumber = ['RAN1#100'] or ['RAN1#100-e'] (array, -e suffix for e-meetings)
-        # JSON-LD format: meeting = 'tdoc:meeting/RAN1-100'
-        # Fix: Use STARTS WITH to handle -e suffix mismatch
-        if "meeting" in n:
-            # Convert "tdoc:meeting/RAN1-100" -> "RAN1#100"
-            meeting_num = n["meeting"].replace("tdoc:meeting/", "").replace("-", "#")
-            tx.run("""
-                MATCH (sn:SessionNotes) WHERE $tdocNumber IN sn.tdocNumber
-                MATCH (m:Meeting) WHERE ANY(num IN m.meetingNumber WHERE num = $meetingNum OR num STARTS WITH $meetingNum + '-')
-                MERGE (sn)-[:PRESENTED_AT]->(m)
-            """, tdocNumber=n["tdocNumber"], meetingNum=meeting_num)
+def as_list(value) -> list:
+    """DB values are strings (load_cypher) or arrays (n10s)."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def ensure_tdoc_keys(session):
+    """Backfill the scalar Tdoc.tdocKey (indexed) from tdocNumber, which may be list-valued."""
+    session.run("""
+        MATCH (t:Tdoc) WHERE t.tdocKey IS NULL AND t.tdocNumber IS NOT NULL
+        CALL {
+            WITH t
+            SET t.tdocKey = CASE WHEN valueType(t.tdocNumber) STARTS WITH 'LIST'
+                                 THEN t.tdocNumber[0] ELSE t.tdocNumber END
+        } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+
+
+def company_ids(session) -> dict[str, list[str]]:
+    """Company name/alias -> Company ids, resolved once instead of per row."""
+    lookup: dict[str, list[str]] = {}
+    result = session.run("MATCH (c:Company) RETURN c.id AS id, c.companyName AS name, c.aliases AS aliases")
+    for record in result:
+        for name in dict.fromkeys(as_list(record["name"]) + as_list(record["aliases"])):
+            lookup.setdefault(name, []).append(record["id"])
+    return lookup
+
+
+def meeting_ids(session) -> dict[str, list[str]]:
+    """Meeting number -> Meeting ids.
+
+    A meeting number 'RAN1#100b-e' is reachable as 'RAN1#100b-e' and 'RAN1#100b',
+    i.e. the exact number or any prefix followed by '-' (e-meeting suffix).
+    """
+    lookup: dict[str, list[str]] = {}
+    result = session.run("MATCH (m:Meeting) RETURN m.id AS id, m.meetingNumber AS numbers")
+    for record in result:
+        keys = set()
+        for number in as_list(record["numbers"]):
+            parts = number.split("-")
+            keys.update("-".join(parts[:i]) for i in range(1, len(parts) + 1))
+        for key in keys:
+            lookup.setdefault(key, []).append(record["id"])
+    return lookup
+
+
+def flatten_roles(items: list[dict], role_key: str, companies: dict[str, list[str]],
+                  meetings: dict[str, list[str]]) -> dict[str, list[dict]]:
+    """Flatten Summary/SessionNotes records into node, role and meeting rows."""
+    rows = {"nodes": [], "roles": [], "meetings": [], "unresolved": []}
+    for item in items:
+        tdoc_key = item["tdocNumber"]
+        rows["nodes"].append({
+            "tdocKey": tdoc_key,
+            "title": item.get("title"),
+            "summaryType": item.get("summaryType"),
+            "roundNumber": item.get("roundNumber"),
+        })
+
+        if role_key in item:
+            company_name = parse_company_uri(item[role_key])
+            for company_id in companies.get(company_name, []):
+                rows["roles"].append({"tdocKey": tdoc_key, "companyId": company_id})
+            if company_name not in companies:
+                rows["unresolved"].append(company_name)
+
+        if "meeting" in item:
+            for meeting_id in meetings.get(parse_meeting_uri(item["meeting"]), []):
+                rows["meetings"].append({"tdocKey": tdoc_key, "meetingId": meeting_id})
+    return rows
+
+
+# Summary nodes: label existing Tdocs, create the missing ones (tdocNumber kept as array)
+SUMMARY_NODE_QUERY = """
+    UNWIND $rows AS s
+    MERGE (t:Tdoc {tdocKey: s.tdocKey})
+    ON CREATE SET t.tdocNumber = [s.tdocKey], t.title = s.title
+    SET t:Summary,
+        t.summaryType = s.summaryType,
+        t.roundNumber = s.roundNumber
+"""
+
+SESSION_NOTES_NODE_QUERY = """
+    UNWIND $rows AS n
+    MERGE (t:Tdoc {tdocKey: n.tdocKey})
+    ON CREATE SET t.tdocNumber = [n.tdocKey], t.title = n.title
+    SET t:SessionNotes
+"""
+
+
+def role_query(rel_type: str) -> str:
+    return f"""
+        UNWIND $rows AS row
+        MATCH (t:Tdoc {{tdocKey: row.tdocKey}})
+        MATCH (c:Company {{id: row.companyId}})
+        MERGE (t)-[:{rel_type}]->(c)
+    """
+
+
+PRESENTED_AT_QUERY = """
+    UNWIND $rows AS row
+    MATCH (t:Tdoc {tdocKey: row.tdocKey})
+    MATCH (m:Meeting {id: row.meetingId})
+    MERGE (t)-[:PRESENTED_AT]->(m)
+"""
+
+
+def load_roles(session, items: list[dict], node_query: str, role_key: str, rel_type: str,
+               companies: dict[str, list[str]], meetings: dict[str, list[str]],
+               batch_size: int) -> dict[str, int]:
+    """Load one role document type: nodes, then role and PRESENTED_AT relationships."""
+    rows = flatten_roles(items, role_key, companies, meetings)
+    counts = {
+        "nodes": write_batches(session, node_query, rows["nodes"], batch_size),
+        rel_type: write_batches(session, role_query(rel_type), rows["roles"], batch_size),
+        "PRESENTED_AT": write_batches(session, PRESENTED_AT_QUERY, rows["meetings"], batch_size),
+    }
+    if rows["unresolved"]:
+        unique = sorted(set(rows["unresolved"]))
+        print(f"  Warning: {len(unique)} unknown companies (e.g. {unique[0]})")
+    return counts
 
 
 def main():
     """Main function to load all role data into Neo4j."""
+    parser = argparse.ArgumentParser(description="Load Phase-3 role data into Neo4j")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per UNWIND transaction")
+    args = parser.parse_args()
+
+    from neo4j import GraphDatabase
+
     print("Connecting to Neo4j...")
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
     try:
+        print("Applying schema...")
+        apply_schema(driver)
+
         with driver.session() as session:
+            ensure_tdoc_keys(session)
+            companies = company_ids(session)
+            meetings = meeting_ids(session)
+            print(f"Resolved {len(companies)} company names, {len(meetings)} meeting numbers")
+
             # Load Summaries
             print("\nLoading Summaries...")
             summaries = load_jsonld("summaries.jsonld")
             print(f"  Loaded {len(summaries)} summaries from JSON-LD")
 
-            session.execute_write(create_summary_nodes, summaries)
-            print("  Created/updated Summary nodes")
-
-            session.execute_write(create_summary_relationships, summaries)
-            print("  Created relationships")
+            start = time.time()
+            counts = load_roles(session, summaries, SUMMARY_NODE_QUERY, "moderatedBy", "MODERATED_BY",
+                                companies, meetings, args.batch_size)
+            print("  " + ", ".join(f"{name}: {count}" for name, count in counts.items())
+                  + f" ({time.time() - start:.2f}s)")
 
             # Load Session Notes
             print("\nLoading Session Notes...")
             session_notes = load_jsonld("session_notes.jsonld")
             print(f"  Loaded {len(session_notes)} session notes from JSON-LD")
 
-            session.execute_write(create_session_notes_nodes, session_notes)
-            print("  Created/updated SessionNotes nodes")
-
-            session.execute_write(create_session_notes_relationships, session_notes)
-            print("  Created relationships")
+            start = time.time()
+            counts = load_roles(session, session_notes, SESSION_NOTES_NODE_QUERY, "chairedBy", "CHAIRED_BY",
+                                companies, meetings, args.batch_size)
+            print("  " + ", ".join(f"{name}: {count}" for name, count in counts.items())
+                  + f" ({time.time() - start:.2f}s)")
 
             # Summary
             result = session.run("""
@@ -211,6 +284,8 @@ def main():
             for record in result:
                 print(f"  {record['type']}: {record['count']}")
 
+        bump_graph_version(driver, "02_load_roles")
+
     finally:
         driver.close()
 
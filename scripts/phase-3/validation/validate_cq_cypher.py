@@ -7,7 +7,6 @@ CQ Validation: IP/특허 담당자 실무 관점 100개 질문 검증
 
 import json
 from datetime import datetime
-from neo4j import GraphDatabase
 from pathlib import Path
 
 URI = "bolt://localhost:7687"
@@ -340,6 +339,8 @@ CQ_DATASET = [
 
 def run_validation():
     """CQ 100개 검증 실행"""
+    from neo4j import GraphDatabase
+
     driver = GraphDatabase.driver(URI, auth=AUTH)
     results = []
     
@@ -6,6 +6,8 @@ Validate CQ Test Cases using LlamaIndex Text2Cypher + Neo4j.
 PropertyGraphStore 대신 Text2CypherRetriever를 사용하여 배열 속성 문제 우회.
 """
 
+import argparse
+import asyncio
 import json
 import os
 import sys
@@ -33,12 +35,16 @@ def _patched_async_init(self, *args, **kwargs):
     _original_async_init(self, *args, **kwargs)
 httpx.AsyncClient.__init__ = _patched_async_init
 
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase, GraphDatabase
 from llama_index.llms.openrouter import OpenRouter
 from llama_index.core import Settings
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "scripts" / "phase-2" / "query-interface"))
+
+from async_qa import AsyncQAPipeline, QAHooks
+
 TEST_DATASET = BASE_DIR / "logs" / "phase-3" / "cq_test_dataset.json"
 OUTPUT_DIR = BASE_DIR / "logs" / "phase-3"
 
@@ -399,7 +405,13 @@ def setup_llm():
 
 def generate_cypher(llm, question: str) -> str:
     """Generate Cypher query from natural language question."""
-    prompt = f"""You are a Neo4j Cypher expert. Convert the following natural language question to a Cypher query.
+    response = llm.complete(build_cypher_prompt(question))
+    return clean_cypher(str(response))
+
+
+def build_cypher_prompt(question: str) -> str:
+    """Text2Cypher prompt (schema + few-shot examples)."""
+    return f"""You are a Neo4j Cypher expert. Convert the following natural language question to a Cypher query.
 
 Schema Information:
 {SCHEMA_INFO}
@@ -426,8 +438,10 @@ Question: {question}
 Return ONLY the Cypher query, no explanation. The query should return useful information to answer the question.
 """
 
-    response = llm.complete(prompt)
-    cypher = str(response).strip()
+
+def clean_cypher(response: str) -> str:
+    """Extract the Cypher query from an LLM response."""
+    cypher = response.strip()
 
     # Clean up response (remove markdown code blocks if present)
     if cypher.startswith("```"):
@@ -497,10 +511,16 @@ def generate_answer(llm, question: str, cypher: str, result: dict) -> str:
     if not result["records"]:
         return "No results found for this query."
 
+    response = llm.complete(build_answer_prompt(question, cypher, result))
+    return str(response).strip()
+
+
+def build_answer_prompt(question: str, cypher: str, result: dict) -> str:
+    """Answer prompt for a successful, non-empty query result."""
     # Limit records for context
     records_str = json.dumps(result["records"][:10], ensure_ascii=False, indent=2)
 
-    prompt = f"""Based on the following Neo4j query results, provide a concise answer to the question.
+    return f"""Based on the following Neo4j query results, provide a concise answer to the question.
 
 Question: {question}
 
@@ -512,9 +532,6 @@ Query Results ({result['count']} total records, showing first 10):
 Provide a direct, concise answer in Korean. Include specific numbers and examples from the results.
 """
 
-    response = llm.complete(prompt)
-    return str(response).strip()
-
 
 def validate_test_case(llm, driver, tc: dict) -> dict:
     """Validate a single test case using Text2Cypher approach."""
@@ -564,7 +581,71 @@ def validate_test_case(llm, driver, tc: dict) -> dict:
     }
 
 
+class Text2CypherHooks(QAHooks):
+    """Prompts for the async pipeline (same as validate_test_case)."""
+
+    def cypher_prompt(self, question):
+        return build_cypher_prompt(question)
+
+    def parse_cypher(self, response):
+        return clean_cypher(response)
+
+    def convert(self, record):
+        return {key: serialize_value(value) for key, value in record.items()}
+
+    def answer_prompt(self, task):
+        if task.success and task.results:
+            return build_answer_prompt(task.question, task.cypher,
+                                       {"records": task.results, "count": len(task.results)})
+        return None
+
+
+def validate_all_async(llm, test_cases: list, concurrency: int) -> list:
+    """Validate all test cases concurrently; results keep test case order."""
+    async def run():
+        driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD),
+                                           max_connection_pool_size=concurrency)
+        pipeline = AsyncQAPipeline(llm, driver, Text2CypherHooks(), llm_concurrency=concurrency,
+                                   neo4j_concurrency=concurrency, verbose=False)
+        try:
+            tasks = await pipeline.run([tc["question"] for tc in test_cases], test_cases)
+        finally:
+            await driver.close()
+        print(f"  Elapsed: {pipeline.stats['elapsed']:.1f}s "
+              f"({pipeline.stats['llm_calls']} LLM calls, {pipeline.stats['retries']} retries)")
+        return tasks
+
+    results = []
+    for task in asyncio.run(run()):
+        tc = task.meta
+        if task.cypher is None:
+            status, answer = "FAIL", None
+        elif task.success and task.results:
+            status, answer = ("PASS", task.answer) if task.answer_error is None else \
+                ("PARTIAL", f"Answer generation failed: {task.answer_error}")
+        elif task.success:
+            status, answer = "NO_DATA", "No results found"
+        else:
+            status, answer = "FAIL", task.error
+        results.append({
+            "test_case_id": tc["id"],
+            "cq_type": tc["cq_type"],
+            "question": task.question,
+            "status": status,
+            "cypher": task.cypher,
+            "result_count": len(task.results),
+            "response": answer,
+            "error": task.error
+        })
+    return results
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Validate CQ test cases with Text2Cypher + Neo4j")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Concurrent LLM calls / Neo4j sessions (1 = sequential)")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("CQ VALIDATION WITH LLAMAINDEX TEXT2CYPHER + NEO4J")
     print("=" * 70)
@@ -596,6 +677,9 @@ def main():
     print("\n[4/4] Executing Text2Cypher validation...")
     print("=" * 70)
 
+    # With --concurrency, all cases run up front and are reported below in order
+    prefetched = validate_all_async(llm, test_cases, args.concurrency) if args.concurrency > 1 else None
+
     results = []
     passed = 0
     failed = 0
@@ -606,7 +690,7 @@ def main():
         print(f"\n[{i+1}/100] {tc['id']} - {tc['cq_type']}")
         print(f"  Q: {tc['question'][:60]}...")
 
-        result = validate_test_case(llm, driver, tc)
+        result = prefetched[i] if prefetched is not None else validate_test_case(llm, driver, tc)
         results.append(result)
 
         if result["status"] == "PASS":